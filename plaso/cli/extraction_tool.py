@@ -43,6 +43,7 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
     super(ExtractionTool, self).__init__(
         input_reader=input_reader, output_writer=output_writer)
     self._buffer_size = 0
+    self._compress_storage = True
     self._enable_profiling = False
     self._filter_object = None
     self._hasher_names_string = None
@@ -161,6 +162,8 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
               serializer_format))
     self._storage_serializer_format = serializer_format
 
+    self._compress_storage = not getattr(options, u'no_compression', False)
+
   def AddExtractionOptions(self, argument_group):
     """Adds the extraction options to the argument group.
 
@@ -284,6 +287,12 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
             u'objects. This parameter can be used to change that behavior. '
             u'The choices are "proto" and "json".'))
 
+    argument_group.add_argument(
+        u'--no_compression', u'--no-compression', dest=u'no_compression',
+        action=u'store_true', default=False, help=(
+            u'Store the event object streams uncompressed. This results in '
+            u'a larger storage file that can be memory mapped when read.'))
+
   def ParseOptions(self, options):
     """Parses tool specific options.
 
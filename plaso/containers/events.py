@@ -212,6 +212,171 @@ class EventObject(interface.AttributeContainer):
     return attribute_names
 
 
+class LazyEventObject(EventObject):
+  """Class to represent an event attribute container that is decoded lazily.
+
+  The lazy event object is produced by the storage reader. The timestamp,
+  data type and the values that are stored separately from the serialized
+  event object are set when the lazy event object is created. The serialized
+  event object is decoded on the first access of any other attribute or
+  on the first use of a function that depends on all the attributes.
+
+  Attributes that are set before the serialized event object is decoded
+  take precedence over the decoded attributes.
+  """
+
+  # The serialized event object is stored in slots, so that it is not part
+  # of the attributes of the event object.
+  __slots__ = (u'_event_object_data', u'_event_object_serializer')
+
+  # pylint: disable=super-init-not-called,non-parent-init-called
+  def __init__(
+      self, event_object_serializer, event_object_data, data_type=None,
+      timestamp=None):
+    """Initializes a lazy event object.
+
+    Args:
+      event_object_serializer: the event object serializer (subclass of
+                               EventObjectSerializer).
+      event_object_data: a binary string containing the serialized event
+                         object.
+      data_type: optional string containing the event data type indicator.
+      timestamp: optional integer containing the timestamp.
+    """
+    # The event object is not initialized since its default attributes
+    # are set when the serialized event object is decoded.
+    interface.AttributeContainer.__init__(self)
+    self._event_object_data = event_object_data
+    self._event_object_serializer = event_object_serializer
+    self.data_type = data_type
+    self.timestamp = timestamp
+
+  def __eq__(self, event_object):
+    """Return a boolean indicating if two event objects are considered equal.
+
+    Args:
+      event_object: The event object to compare to (instance of EventObject).
+
+    Returns:
+      A boolean value indicating if both event objects are considered equal.
+    """
+    self._Decode()
+    if isinstance(event_object, LazyEventObject):
+      event_object._Decode()
+    return super(LazyEventObject, self).__eq__(event_object)
+
+  def __getattr__(self, name):
+    """Retrieves an attribute that has not been decoded.
+
+    This function is only called when the attribute is not found by
+    the normal attribute lookup.
+
+    Args:
+      name: string containing the name of the attribute.
+
+    Returns:
+      The attribute value.
+
+    Raises:
+      AttributeError: if the event object does not have the attribute.
+    """
+    if name.startswith(u'__') or name in LazyEventObject.__slots__:
+      raise AttributeError(name)
+
+    if not self._Decode() or name not in self.__dict__:
+      raise AttributeError(
+          u'\'{0:s}\' object has no attribute \'{1:s}\''.format(
+              self.__class__.__name__, name))
+
+    return self.__dict__[name]
+
+  def __getstate__(self):
+    """Retrieves the state of the event object for pickling.
+
+    Returns:
+      A dictionary containing the decoded attributes.
+    """
+    self._Decode()
+    return self.__dict__
+
+  def __setstate__(self, state):
+    """Sets the state of the event object when unpickling.
+
+    Args:
+      state: a dictionary containing the decoded attributes.
+    """
+    self._event_object_data = None
+    self._event_object_serializer = None
+    self.__dict__.update(state)
+
+  def _Decode(self):
+    """Decodes the serialized event object.
+
+    Returns:
+      A boolean value indicating the serialized event object was decoded
+      by this call.
+    """
+    event_object_data = getattr(self, u'_event_object_data', None)
+    if event_object_data is None:
+      return False
+
+    event_object = self._event_object_serializer.ReadSerialized(
+        event_object_data)
+
+    self._event_object_data = None
+    self._event_object_serializer = None
+
+    attributes = self.__dict__
+    for attribute_name, attribute_value in iter(event_object.__dict__.items()):
+      if attribute_name not in attributes:
+        attributes[attribute_name] = attribute_value
+
+    return True
+
+  def CopyToDict(self):
+    """Copies the event object to a dictionary.
+
+    Returns:
+      A dictionary containing the event object attributes.
+    """
+    self._Decode()
+    return super(LazyEventObject, self).CopyToDict()
+
+  def EqualityString(self):
+    """Returns a string describing the event object in terms of object equality.
+
+    Returns:
+      A string representation of the event object that can be used for equality
+      comparison.
+    """
+    self._Decode()
+    return super(LazyEventObject, self).EqualityString()
+
+  def GetAttributeNames(self):
+    """Retrieves the attribute names from the event object.
+
+    Attributes that are set to None are ignored.
+
+    Returns:
+      A list of strings containing the attribute names.
+    """
+    self._Decode()
+    return super(LazyEventObject, self).GetAttributeNames()
+
+  def GetAttributes(self):
+    """Retrieves the attributes from the event object.
+
+    Attributes that are set to None are ignored.
+
+    Yields:
+      A tuple containing the event object attribute name and value.
+    """
+    self._Decode()
+    for attribute_name, attribute_value in super(
+        LazyEventObject, self).GetAttributes():
+      yield attribute_name, attribute_value
+
+
 # TODO: deprecate store number and index.
 
 class EventTag(interface.AttributeContainer):
@@ -375,3 +540,51 @@ class EventTag(interface.AttributeContainer):
       return True
 
     return False
+
+
+class SerializedEventObject(interface.AttributeContainer):
+  """Class to represent a serialized event attribute container.
+
+  The serialized event object is used to pass an event object that was
+  already serialized by an extraction worker to the storage writer.
+
+  Attributes:
+    data: a binary string containing the serialized event object.
+    parser: a string containing the parser chain of the event object or None.
+    path_spec_data: a binary string containing the serialized path
+                    specification of the event object or None if the path
+                    specification is part of the serialized event object.
+    plugin: a string containing the parser plugin name of the event object
+            or None.
+    string_values: a tuple containing the values of the shared string
+                   attributes of the event object or None if the values
+                   are part of the serialized event object.
+    timestamp: an integer containing a timestamp of the number
+               of micro seconds since January 1, 1970, 00:00:00 UTC.
+  """
+
+  def __init__(
+      self, timestamp, data, parser=None, path_spec_data=None, plugin=None,
+      string_values=None):
+    """Initializes a serialized event object.
+
+    Args:
+      timestamp: an integer containing a timestamp of the number
+                 of micro seconds since January 1, 1970, 00:00:00 UTC.
+      data: a binary string containing the serialized event object.
+      parser: optional string containing the parser chain of the event object.
+      path_spec_data: optional binary string containing the serialized path
+                      specification of the event object.
+      plugin: optional string containing the parser plugin name of the event
+              object.
+      string_values: optional tuple containing the values of the shared
+                     string attributes of the event object, where None
+                     represents an attribute without a shared value.
+    """
+    super(SerializedEventObject, self).__init__()
+    self.data = data
+    self.parser = parser
+    self.path_spec_data = path_spec_data
+    self.plugin = plugin
+    self.string_values = string_values
+    self.timestamp = timestamp
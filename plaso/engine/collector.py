@@ -10,6 +10,7 @@ from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.lib import errors as dfvfs_errors
 from dfvfs.resolver import resolver as path_spec_resolver
 
+from plaso.engine import path_spec_scheduler
 from plaso.engine import plaso_queue
 from plaso.lib import definitions
 
@@ -32,8 +33,10 @@ class Collector(plaso_queue.ItemQueueProducer):
       resolver_context: optional resolver context (instance of dfvfs.Context).
     """
     super(Collector, self).__init__(path_spec_queue)
+    self._completed_path_specs = None
     self._filter_find_specs = None
     self._fs_collector = FileSystemCollector(path_spec_queue)
+    self._path_spec_scheduler = None
     self._resolver_context = resolver_context
 
     # Attributes that contain the current status of the collector.
@@ -99,7 +102,18 @@ class Collector(plaso_queue.ItemQueueProducer):
       return
 
     if file_entry.IsFile():
-      self.ProduceItem(path_spec)
+      if (self._completed_path_specs and
+          path_spec.comparable in self._completed_path_specs):
+        return
+
+      if not self._path_spec_scheduler:
+        self.ProduceItem(path_spec)
+
+      else:
+        cost = self._path_spec_scheduler.EstimateCost(file_entry)
+        path_spec = self._path_spec_scheduler.Schedule(path_spec, cost)
+        if path_spec:
+          self.ProduceItem(path_spec)
 
     else:
       self._ProcessFileSystem(path_spec, find_specs=find_specs)
@@ -115,6 +129,8 @@ class Collector(plaso_queue.ItemQueueProducer):
       logging.warning(u'No files to collect.')
       return
 
+    self._fs_collector.SetVolumesWithStores(source_path_specs)
+
     for source_path_spec in source_path_specs:
       if self._abort:
         break
@@ -123,6 +139,12 @@ class Collector(plaso_queue.ItemQueueProducer):
       self._ProcessPathSpec(
           source_path_spec, find_specs=self._filter_find_specs)
 
+    if self._path_spec_scheduler and not self._abort:
+      for path_spec in self._path_spec_scheduler.Flush():
+        if self._abort:
+          break
+        self.ProduceItem(path_spec)
+
     if self._abort:
       self._status = definitions.PROCESSING_STATUS_ABORTED
     else:
@@ -149,6 +171,28 @@ class Collector(plaso_queue.ItemQueueProducer):
     """
     self._fs_collector.SetCollectDirectoryMetadata(collect_directory_metadata)
 
+  def SetCompletedPathSpecs(self, completed_path_specs):
+    """Sets the path specifications that were completed previously.
+
+    Args:
+      completed_path_specs: a set of the comparables of the path
+                            specifications that should not be produced.
+    """
+    self._completed_path_specs = completed_path_specs
+    self._fs_collector.SetCompletedPathSpecs(completed_path_specs)
+
+  def SetDuplicateFileCheck(self, duplicate_file_check):
+    """Sets the duplicate file check flag.
+
+    The check only applies to the volumes of which VSS stores are collected.
+
+    Args:
+      duplicate_file_check: boolean value to indicate to skip files in VSS
+                            stores that have not changed since they were
+                            collected from the volume or another store.
+    """
+    self._fs_collector.SetDuplicateFileCheck(duplicate_file_check)
+
   def SetFilter(self, filter_find_specs):
     """Sets the collection filter find specifications.
 
@@ -158,6 +202,25 @@ class Collector(plaso_queue.ItemQueueProducer):
     """
     self._filter_find_specs = filter_find_specs
 
+  def SetPathSpecReorderWindow(self, maximum_number_of_path_specs):
+    """Sets the size of the path specification reorder window.
+
+    Within the reorder window the path specifications are produced in order
+    of decreasing estimated processing cost instead of in collection order.
+
+    Args:
+      maximum_number_of_path_specs: the maximum number of path specifications
+                                    held back in the reorder window, where 0
+                                    represents reordering is disabled.
+    """
+    if maximum_number_of_path_specs > 0:
+      self._path_spec_scheduler = path_spec_scheduler.PathSpecScheduler(
+          maximum_number_of_path_specs)
+    else:
+      self._path_spec_scheduler = None
+
+    self._fs_collector.SetPathSpecScheduler(self._path_spec_scheduler)
+
   def SignalAbort(self):
     """Signals the collector to abort."""
     self._fs_collector.SignalAbort()
@@ -183,9 +246,21 @@ class FileSystemCollector(plaso_queue.ItemQueueProducer):
     """
     super(FileSystemCollector, self).__init__(path_spec_queue)
     self._collect_directory_metadata = True
+    self._completed_path_specs = None
     self._duplicate_file_check = False
-    self._hashlist = {}
+    self._file_identities = set()
+    self._file_system_in_vss_store = False
+    self._file_system_volume_index = None
+    self._maximum_number_of_path_specs = 0
+    self._number_of_duplicate_files = 0
+    self._path_spec_scheduler = None
     self._resolver_context = resolver_context
+    self._volume_indexes = {}
+
+  @property
+  def number_of_duplicate_files(self):
+    """The number of duplicate files that were skipped."""
+    return self._number_of_duplicate_files
 
   def _CalculateNTFSTimeHash(self, file_entry):
     """Return a hash value calculated from a NTFS file's metadata.
@@ -201,23 +276,72 @@ class FileSystemCollector(plaso_queue.ItemQueueProducer):
     ret_hash = hashlib.md5()
 
     ret_hash.update(b'atime:{0:d}.{1:d}'.format(
-        getattr(stat_object, u'atime', 0),
-        getattr(stat_object, u'atime_nano', 0)))
+        getattr(stat_object, u'atime', None) or 0,
+        getattr(stat_object, u'atime_nano', None) or 0))
 
     ret_hash.update(b'crtime:{0:d}.{1:d}'.format(
-        getattr(stat_object, u'crtime', 0),
-        getattr(stat_object, u'crtime_nano', 0)))
+        getattr(stat_object, u'crtime', None) or 0,
+        getattr(stat_object, u'crtime_nano', None) or 0))
 
     ret_hash.update(b'mtime:{0:d}.{1:d}'.format(
-        getattr(stat_object, u'mtime', 0),
-        getattr(stat_object, u'mtime_nano', 0)))
+        getattr(stat_object, u'mtime', None) or 0,
+        getattr(stat_object, u'mtime_nano', None) or 0))
 
     ret_hash.update(b'ctime:{0:d}.{1:d}'.format(
-        getattr(stat_object, u'ctime', 0),
-        getattr(stat_object, u'ctime_nano', 0)))
+        getattr(stat_object, u'ctime', None) or 0,
+        getattr(stat_object, u'ctime_nano', None) or 0))
 
     return ret_hash.hexdigest()
 
+  def _GetVolumePathSpec(self, path_spec):
+    """Retrieves the path specification of the volume of a file system.
+
+    Args:
+      path_spec: the path specification (instance of dfvfs.PathSpec) of
+                 the file system.
+
+    Returns:
+      A tuple of the path specification (instance of dfvfs.PathSpec) of
+      the volume or None if not available, and a boolean value to indicate
+      the file system is in a VSS store.
+    """
+    volume_path_spec = getattr(path_spec, u'parent', None)
+    if (volume_path_spec and volume_path_spec.type_indicator ==
+        dfvfs_definitions.TYPE_INDICATOR_VSHADOW):
+      return getattr(volume_path_spec, u'parent', None), True
+
+    return volume_path_spec, False
+
+  def _IsDuplicateFile(self, file_entry):
+    """Determines if a file in a VSS store was already collected.
+
+    The identity of a file consists of its volume, inode (MFT entry), size
+    and a hash of its timestamps. A file in a volume shadow snapshot (VSS)
+    store with the same identity as a file collected from the volume or
+    from another store has not changed and is a duplicate.
+
+    Args:
+      file_entry: the file entry (instance of dfvfs.FileEntry).
+
+    Returns:
+      A boolean value that indicates the file is a duplicate.
+    """
+    inode = getattr(file_entry.path_spec, u'inode', None)
+    if inode is None:
+      return False
+
+    stat_object = file_entry.GetStat()
+    file_identity = (
+        self._file_system_volume_index, inode,
+        getattr(stat_object, u'size', None),
+        self._CalculateNTFSTimeHash(file_entry))
+
+    if file_identity in self._file_identities:
+      return self._file_system_in_vss_store
+
+    self._file_identities.add(file_identity)
+    return False
+
   def _ProcessDataStreams(self, file_entry):
     """Processes the data streams in a file entry.
 
@@ -232,14 +356,56 @@ class FileSystemCollector(plaso_queue.ItemQueueProducer):
       path_spec = copy.deepcopy(file_entry.path_spec)
       if data_stream.name:
         setattr(path_spec, u'data_stream', data_stream.name)
-      self.ProduceItem(path_spec)
+      self._ProducePathSpec(
+          path_spec, file_entry=file_entry, data_stream_name=data_stream.name)
 
       if not data_stream.name:
         produced_main_path_spec = True
 
     if (not produced_main_path_spec and (
         not file_entry.IsDirectory() or self._collect_directory_metadata)):
-      self.ProduceItem(file_entry.path_spec)
+      self._ProducePathSpec(file_entry.path_spec)
+
+  def _ProducePathSpec(self, path_spec, file_entry=None, data_stream_name=u''):
+    """Produces a path specification onto the queue.
+
+    If a path specification scheduler is set the path specification is
+    scheduled by its estimated processing cost.
+
+    Args:
+      path_spec: the path specification (instance of dfvfs.PathSpec).
+      file_entry: optional file entry (instance of dfvfs.FileEntry) of which
+                  the data stream is used to estimate the processing cost.
+      data_stream_name: optional data stream name. The default is
+                        an empty string which represents the default
+                        data stream.
+    """
+    if (self._maximum_number_of_path_specs and
+        self.number_of_produced_items >= self._maximum_number_of_path_specs):
+      if not self._abort:
+        logging.warning((
+            u'Maximum number of path specifications: {0:d} reached, '
+            u'skipping the remaining file entries.').format(
+                self._maximum_number_of_path_specs))
+        self._abort = True
+      return
+
+    if (self._completed_path_specs and
+        path_spec.comparable in self._completed_path_specs):
+      return
+
+    if not self._path_spec_scheduler:
+      self.ProduceItem(path_spec)
+      return
+
+    cost = 0
+    if file_entry:
+      cost = self._path_spec_scheduler.EstimateCost(
+          file_entry, data_stream_name=data_stream_name)
+
+    path_spec = self._path_spec_scheduler.Schedule(path_spec, cost)
+    if path_spec:
+      self.ProduceItem(path_spec)
 
   def _ProcessDirectory(self, file_entry):
     """Processes a directory and extract its metadata if necessary.
@@ -276,19 +442,12 @@ class FileSystemCollector(plaso_queue.ItemQueueProducer):
         sub_directories.append(sub_file_entry)
 
       elif sub_file_entry.IsFile():
-        # If we are dealing with a VSS we want to calculate a hash
-        # value based on available timestamps and compare that to previously
-        # calculated hash values, and only include the file into the queue if
-        # the hash does not match.
-        if self._duplicate_file_check:
-          hash_value = self._CalculateNTFSTimeHash(sub_file_entry)
-
-          inode = getattr(sub_file_entry.path_spec, u'inode', 0)
-          if inode in self._hashlist:
-            if hash_value in self._hashlist[inode]:
-              continue
-
-          self._hashlist.setdefault(inode, []).append(hash_value)
+        # Files in VSS stores that have not changed since they were collected
+        # from the volume or another store are skipped.
+        if (self._file_system_volume_index is not None and
+            self._IsDuplicateFile(sub_file_entry)):
+          self._number_of_duplicate_files += 1
+          continue
 
       self._ProcessDataStreams(sub_file_entry)
 
@@ -306,12 +465,20 @@ class FileSystemCollector(plaso_queue.ItemQueueProducer):
   def Collect(self, file_system, path_spec, find_specs=None):
     """Collects files from the file system.
 
+    The duplicate file check only applies to the file systems of volumes
+    of which VSS stores are collected. It is not applied to the matches
+    of find specifications, since the searcher does not provide their
+    file entries.
+
     Args:
       file_system: the file system (instance of dfvfs.FileSystem).
       path_spec: the path specification (instance of dfvfs.PathSpec).
       find_specs: optional list of find specifications (instances of
                   dfvfs.FindSpec).
     """
+    self._file_system_in_vss_store = False
+    self._file_system_volume_index = None
+
     if find_specs:
       searcher = file_system_searcher.FileSystemSearcher(file_system, path_spec)
 
@@ -319,9 +486,20 @@ class FileSystemCollector(plaso_queue.ItemQueueProducer):
         if self._abort:
           return
 
-        self.ProduceItem(path_spec)
+        file_entry = None
+        if self._path_spec_scheduler:
+          file_entry = file_system.GetFileEntryByPathSpec(path_spec)
+
+        self._ProducePathSpec(path_spec, file_entry=file_entry)
 
     else:
+      if self._duplicate_file_check and self._volume_indexes:
+        volume_path_spec, self._file_system_in_vss_store = (
+            self._GetVolumePathSpec(path_spec))
+        if volume_path_spec:
+          self._file_system_volume_index = self._volume_indexes.get(
+              volume_path_spec.comparable, None)
+
       file_entry = file_system.GetFileEntryByPathSpec(path_spec)
 
       self._ProcessDirectory(file_entry)
@@ -334,3 +512,66 @@ class FileSystemCollector(plaso_queue.ItemQueueProducer):
                                   directory metadata.
     """
     self._collect_directory_metadata = collect_directory_metadata
+
+  def SetCompletedPathSpecs(self, completed_path_specs):
+    """Sets the path specifications that were completed previously.
+
+    Args:
+      completed_path_specs: a set of the comparables of the path
+                            specifications that should not be produced.
+    """
+    self._completed_path_specs = completed_path_specs
+
+  def SetDuplicateFileCheck(self, duplicate_file_check):
+    """Sets the duplicate file check flag.
+
+    The check only applies to the volumes of which VSS stores are collected.
+
+    Args:
+      duplicate_file_check: boolean value to indicate to skip files in VSS
+                            stores that have not changed since they were
+                            collected from the volume or another store.
+    """
+    self._duplicate_file_check = duplicate_file_check
+
+  def SetMaximumNumberOfPathSpecs(self, maximum_number_of_path_specs):
+    """Sets the maximum number of path specifications to produce.
+
+    The limit protects against archive files that contain an excessive
+    number of file entries, such as ZIP bombs.
+
+    Args:
+      maximum_number_of_path_specs: the maximum number of path specifications
+                                    to produce, where 0 represents no limit.
+    """
+    self._maximum_number_of_path_specs = maximum_number_of_path_specs
+
+  def SetPathSpecScheduler(self, path_spec_scheduler_object):
+    """Sets the path specification scheduler.
+
+    Args:
+      path_spec_scheduler_object: the path specification scheduler (instance
+                                  of PathSpecScheduler) or None to produce
+                                  the path specifications in collection order.
+    """
+    self._path_spec_scheduler = path_spec_scheduler_object
+
+  def SetVolumesWithStores(self, source_path_specs):
+    """Sets the volumes of which VSS stores are collected.
+
+    The file identities used by the duplicate file check are only recorded
+    for the file systems of these volumes and of their VSS stores.
+
+    Args:
+      source_path_specs: list of path specifications (instances of
+                         dfvfs.PathSpec) to collect from.
+    """
+    for source_path_spec in source_path_specs:
+      volume_path_spec, in_vss_store = self._GetVolumePathSpec(
+          source_path_spec)
+      if not in_vss_store or not volume_path_spec:
+        continue
+
+      # Map the volume to an index to reduce the size of the file identities.
+      self._volume_indexes.setdefault(
+          volume_path_spec.comparable, len(self._volume_indexes))
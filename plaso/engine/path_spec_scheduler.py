@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""The path specification scheduler."""
+
+import heapq
+import logging
+
+from dfvfs.lib import errors as dfvfs_errors
+
+
+class PathSpecScheduler(object):
+  """Class that schedules path specifications by estimated processing cost.
+
+  The path specifications are held back in a reorder window of a maximum
+  size. When the window is full the path specification with the highest
+  estimated processing cost is released first, such that expensive file
+  entries are processed early and do not keep a single worker busy after
+  the other workers have finished (longest processing time first).
+  The size of the reorder window bounds the memory used by the scheduler.
+  """
+
+  # Factors to scale the size of file entries of which the processing time
+  # is known to be high relative to their size.
+  _COST_FACTORS_PER_FILE_EXTENSION = {
+      u'db': 4,
+      u'edb': 4,
+      u'evt': 4,
+      u'evtx': 4,
+      u'pf': 2,
+      u'sqlite': 4}
+
+  _COST_FACTORS_PER_FILENAME = {
+      u'$mft': 4,
+      u'$usnjrnl': 4,
+      u'ntuser.dat': 4,
+      u'sam': 4,
+      u'security': 4,
+      u'software': 4,
+      u'system': 4,
+      u'usrclass.dat': 4}
+
+  def __init__(self, maximum_number_of_path_specs):
+    """Initializes the path specification scheduler.
+
+    Args:
+      maximum_number_of_path_specs: the maximum number of path specifications
+                                    held back in the reorder window.
+    """
+    super(PathSpecScheduler, self).__init__()
+    self._heap = []
+    self._maximum_number_of_path_specs = maximum_number_of_path_specs
+    self._sequence_number = 0
+
+  @property
+  def number_of_path_specs(self):
+    """The number of path specifications held back."""
+    return len(self._heap)
+
+  def _GetCostFactor(self, filename):
+    """Retrieves the cost factor of a file name.
+
+    Args:
+      filename: string containing the name of the file entry.
+
+    Returns:
+      An integer containing the cost factor.
+    """
+    filename = filename.lower()
+    cost_factor = self._COST_FACTORS_PER_FILENAME.get(filename, None)
+    if cost_factor:
+      return cost_factor
+
+    _, separator, extension = filename.rpartition(u'.')
+    if not separator:
+      return 1
+
+    return self._COST_FACTORS_PER_FILE_EXTENSION.get(extension, 1)
+
+  def EstimateCost(self, file_entry, data_stream_name=u''):
+    """Estimates the processing cost of a data stream of a file entry.
+
+    Args:
+      file_entry: the file entry (instance of dfvfs.FileEntry).
+      data_stream_name: optional data stream name. The default is
+                        an empty string which represents the default
+                        data stream.
+
+    Returns:
+      An integer containing the estimated processing cost.
+    """
+    size = 0
+    if not data_stream_name:
+      stat_object = file_entry.GetStat()
+      size = getattr(stat_object, u'size', None) or 0
+
+    else:
+      try:
+        file_object = file_entry.GetFileObject(
+            data_stream_name=data_stream_name)
+      except (dfvfs_errors.AccessError, dfvfs_errors.BackEndError) as exception:
+        logging.debug((
+            u'Unable to open data stream: {0:s} of: {1:s} with error: '
+            u'{2:s}').format(data_stream_name, file_entry.name, exception))
+        file_object = None
+
+      if file_object:
+        try:
+          size = file_object.get_size()
+        finally:
+          file_object.close()
+
+    return size * self._GetCostFactor(file_entry.name or u'')
+
+  def Flush(self):
+    """Releases all path specifications held back.
+
+    Yields:
+      Path specifications (instances of dfvfs.PathSpec) in order of
+      decreasing estimated processing cost.
+    """
+    while self._heap:
+      _, _, path_spec = heapq.heappop(self._heap)
+      yield path_spec
+
+  def Schedule(self, path_spec, cost):
+    """Schedules a path specification.
+
+    Args:
+      path_spec: the path specification (instance of dfvfs.PathSpec).
+      cost: an integer containing the estimated processing cost.
+
+    Returns:
+      The path specification (instance of dfvfs.PathSpec) with the highest
+      estimated processing cost that is released from the reorder window
+      or None if the reorder window is not full.
+    """
+    # The sequence number keeps the order stable for path specifications
+    # with the same cost and prevents path specifications being compared.
+    heapq.heappush(self._heap, (-cost, self._sequence_number, path_spec))
+    self._sequence_number += 1
+
+    if len(self._heap) <= self._maximum_number_of_path_specs:
+      return
+
+    _, _, path_spec = heapq.heappop(self._heap)
+    return path_spec
@@ -11,14 +11,58 @@ scalability.
 
 import abc
 import logging
+import time
 
+from plaso.containers import events
 from plaso.lib import errors
+from plaso.serializer import shared_values
+
+
+class PathSpecCompleted(object):
+  """Class that implements a path specification completed marker.
+
+  The marker is pushed onto the event object queue by an extraction worker
+  after all the event objects of a path specification have been pushed, so
+  that the storage writer can keep track of which path specifications were
+  completely processed.
+
+  Attributes:
+    path_spec_comparable: string containing the comparable of the path
+                          specification.
+  """
+
+  def __init__(self, path_spec_comparable):
+    """Initializes the path specification completed marker.
+
+    Args:
+      path_spec_comparable: string containing the comparable of the path
+                            specification.
+    """
+    super(PathSpecCompleted, self).__init__()
+    self.path_spec_comparable = path_spec_comparable
 
 
 class QueueAbort(object):
   """Class that implements a queue abort."""
 
 
+class QueueItemBatch(object):
+  """Class that implements a batch of queue items.
+
+  Attributes:
+    items: a list of the item objects in the batch.
+  """
+
+  def __init__(self, items):
+    """Initializes the queue item batch.
+
+    Args:
+      items: a list of item objects.
+    """
+    super(QueueItemBatch, self).__init__()
+    self.items = items
+
+
 class Queue(object):
   """Class that implements the queue interface."""
 
@@ -27,9 +71,14 @@ class Queue(object):
     """Determines if the queue is empty."""
 
   @abc.abstractmethod
-  def PushItem(self, item):
+  def PushItem(self, item, block=True):
     """Pushes an item onto the queue.
 
+    Args:
+      item: the item object.
+      block: optional boolean value to indicate the push should block
+             if the queue is full.
+
     Raises:
       QueueFull: when the next call to PushItem would exceed the limit of items
                  in the queue.
@@ -141,6 +190,12 @@ class ItemQueueConsumer(QueueConsumer):
         logging.debug(u'ConsumeItems exiting, dequeued QueueAbort object.')
         break
 
+      if isinstance(item, QueueItemBatch):
+        for batch_item in item.items:
+          self._number_of_consumed_items += 1
+          self._ConsumeItem(batch_item, **kwargs)
+        continue
+
       self._number_of_consumed_items += 1
       self._ConsumeItem(item, **kwargs)
 
@@ -148,40 +203,104 @@ class ItemQueueConsumer(QueueConsumer):
 class ItemQueueProducer(QueueProducer):
   """Class that implements an item queue producer.
 
-  The producer generates updates on the queue.
+  The producer generates updates on the queue. If batching is enabled
+  the items are pushed onto the queue as a batch (instance of QueueItemBatch)
+  when either the maximum batch size or the maximum batch interval is
+  reached or when the producer is explicitly flushed.
   """
 
-  def __init__(self, queue_object):
+  def __init__(
+      self, queue_object, maximum_batch_size=0, maximum_batch_interval=1.0):
     """Initializes the item queue producer.
 
     Args:
       queue_object: the queue object (instance of Queue).
+      maximum_batch_size: optional maximum number of items in a batch.
+                          The default is 0, which represents batching
+                          is disabled.
+      maximum_batch_interval: optional maximum number of seconds the first
+                              item of a batch is held back before the batch
+                              is pushed onto the queue.
     """
     super(ItemQueueProducer, self).__init__(queue_object)
+    self._batch_items = []
+    self._batch_start_time = None
+    self._maximum_batch_interval = maximum_batch_interval
+    self._maximum_batch_size = maximum_batch_size
+    self._number_of_produced_batches = 0
     self._number_of_produced_items = 0
+    self._queue_wait_time = 0.0
+
+  @property
+  def number_of_produced_batches(self):
+    """The number of produced batches."""
+    return self._number_of_produced_batches
 
   @property
   def number_of_produced_items(self):
     """The number of produced items."""
     return self._number_of_produced_items
 
+  @property
+  def queue_wait_time(self):
+    """The number of seconds spent waiting to push items onto the queue."""
+    return self._queue_wait_time
+
   def _FlushQueue(self):
     """Flushes the queue callback for the QueueFull exception."""
     return
 
-  def ProduceItem(self, item):
-    """Produces an item onto the queue.
+  def _PushItem(self, item):
+    """Pushes an item onto the queue.
 
     Args:
       item: the item object.
     """
+    push_start_time = time.time()
     try:
-      self._number_of_produced_items += 1
       self._queue.PushItem(item)
 
     except errors.QueueFull:
       self._FlushQueue()
 
+    finally:
+      self._queue_wait_time += time.time() - push_start_time
+
+  def Flush(self):
+    """Pushes the pending batch of items onto the queue."""
+    if not self._batch_items:
+      return
+
+    item_batch = QueueItemBatch(self._batch_items)
+    self._batch_items = []
+    self._batch_start_time = None
+
+    self._number_of_produced_batches += 1
+    self._PushItem(item_batch)
+
+  def ProduceItem(self, item):
+    """Produces an item onto the queue.
+
+    Args:
+      item: the item object.
+    """
+    self._number_of_produced_items += 1
+
+    if not self._maximum_batch_size:
+      self._PushItem(item)
+      return
+
+    current_time = time.time()
+    if not self._batch_items:
+      self._batch_start_time = current_time
+
+    self._batch_items.append(item)
+
+    if (len(self._batch_items) >= self._maximum_batch_size or
+        current_time - self._batch_start_time >= (
+            self._maximum_batch_interval)):
+      self.Flush()
+
   def ProduceItems(self, items):
     """Produces items onto the queue.
 
@@ -196,4 +315,87 @@ class ItemQueueProducer(QueueProducer):
 
     The closing of the queue indicates the produce will not produce any more
     items."""
+    self.Flush()
     self._queue.Close()
+
+
+class SerializedEventObjectQueueProducer(ItemQueueProducer):
+  """Class that implements a serialized event object queue producer.
+
+  The producer serializes the event objects before they are pushed onto
+  the queue so that the storage writer only has to merge and write them.
+  If a path specification serializer is provided the values that event
+  objects typically share, such as the path specification, are serialized
+  separately, so that the storage writer can store them once per store.
+  """
+
+  def __init__(
+      self, queue_object, event_object_serializer, maximum_batch_size=0,
+      maximum_batch_interval=1.0, path_spec_serializer=None):
+    """Initializes the serialized event object queue producer.
+
+    Args:
+      queue_object: the queue object (instance of Queue).
+      event_object_serializer: the event object serializer (subclass of
+                               EventObjectSerializer).
+      maximum_batch_size: optional maximum number of items in a batch.
+                          The default is 0, which represents batching
+                          is disabled.
+      maximum_batch_interval: optional maximum number of seconds the first
+                              item of a batch is held back before the batch
+                              is pushed onto the queue.
+      path_spec_serializer: optional path specification serializer (subclass
+                            of PathSpecSerializer).
+    """
+    super(SerializedEventObjectQueueProducer, self).__init__(
+        queue_object, maximum_batch_size=maximum_batch_size,
+        maximum_batch_interval=maximum_batch_interval)
+    self._event_object_serializer = event_object_serializer
+    self._shared_values_serializer = None
+
+    if path_spec_serializer:
+      self._shared_values_serializer = (
+          shared_values.SharedValuesEventObjectSerializer(
+              event_object_serializer, path_spec_serializer))
+
+  def ProduceItem(self, item):
+    """Produces an item onto the queue.
+
+    Args:
+      item: the event object (instance of EventObject) or path specification
+            completed marker (instance of PathSpecCompleted).
+    """
+    if isinstance(item, PathSpecCompleted):
+      super(SerializedEventObjectQueueProducer, self).ProduceItem(item)
+      return
+
+    try:
+      if self._shared_values_serializer:
+        serialized_event_object = (
+            self._shared_values_serializer.WriteSerialized(item))
+
+      else:
+        serialized_event_object = None
+        event_object_data = self._event_object_serializer.WriteSerialized(
+            item)
+
+        # TODO: Re-think this approach with the re-design of the storage.
+        # Check if the event object failed to serialize (none is returned).
+        if event_object_data is not None:
+          serialized_event_object = events.SerializedEventObject(
+              item.timestamp, event_object_data,
+              parser=getattr(item, u'parser', None),
+              plugin=getattr(item, u'plugin', None))
+
+    except UnicodeDecodeError:
+      logging.error((
+          u'Unicode error while serializing event. It will be excluded from '
+          u'output. Details: Event: "{0:s}" data type: "{1:s}" '
+          u'parser: "{2:s}"').format(item.uuid, item.data_type, item.parser))
+      return
+
+    if serialized_event_object is None:
+      return
+
+    super(SerializedEventObjectQueueProducer, self).ProduceItem(
+        serialized_event_object)
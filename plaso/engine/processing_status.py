@@ -49,9 +49,16 @@ class ExtractionWorkerStatus(object):
                                          consumed since the last status update.
     display_name: the display name of the file entry currently being
                   processed by the extraction worker.
+    event_batch_size: the average number of events in an event batch pushed
+                      onto the event object queue by the extraction worker.
+    event_queue_wait_time: the total number of seconds the extraction worker
+                           spent waiting to push events onto the event object
+                           queue.
     identifier: the extraction worker identifier.
     last_running_time: timestamp of the last update when the process
                        had a running process status.
+    number_of_event_batches: the total number of event batches pushed onto
+                             the event object queue by the extraction worker.
     number_of_events: the total number of events extracted
                       by the extraction worker.
     number_of_events_delta: the number of events since the last status update.
@@ -61,7 +68,11 @@ class ExtractionWorkerStatus(object):
                                    produced by the collector.
     produced_number_of_path_specs_delta: the number of path specifications
                                          produced since the last status update.
+    signature_scanned_bytes: the number of bytes scanned for signatures
+                             of the file entry currently being processed.
     status: string containing the extraction worker status.
+    total_signature_scanned_bytes: the total number of bytes scanned for
+                                   signatures by the extraction worker.
     """
 
   def __init__(self):
@@ -70,15 +81,20 @@ class ExtractionWorkerStatus(object):
     self.consumed_number_of_path_specs = 0
     self.consumed_number_of_path_specs_delta = 0
     self.display_name = None
+    self.event_batch_size = 0
+    self.event_queue_wait_time = 0.0
     self.identifier = None
     self.last_running_time = 0
+    self.number_of_event_batches = 0
     self.number_of_events = 0
     self.number_of_events_delta = 0
     self.pid = None
     self.process_status = None
     self.produced_number_of_path_specs = 0
     self.produced_number_of_path_specs_delta = 0
+    self.signature_scanned_bytes = 0
     self.status = None
+    self.total_signature_scanned_bytes = 0
 
 
 class StorageWriterStatus(object):
@@ -196,6 +212,21 @@ class ProcessingStatus(object):
 
     return not workers_running
 
+  def GetEventQueueWaitTime(self):
+    """Retrieves the number of seconds the workers waited on the event queue."""
+    event_queue_wait_time = 0.0
+    for extraction_worker_status in iter(self._extraction_workers.values()):
+      event_queue_wait_time += extraction_worker_status.event_queue_wait_time
+    return event_queue_wait_time
+
+  def GetNumberOfEventBatches(self):
+    """Retrieves the number of event batches produced by the workers."""
+    number_of_event_batches = 0
+    for extraction_worker_status in iter(self._extraction_workers.values()):
+      number_of_event_batches += (
+          extraction_worker_status.number_of_event_batches)
+    return number_of_event_batches
+
   def GetNumberOfExtractedEvents(self):
     """Retrieves the number of extracted events."""
     number_of_events = 0
@@ -289,7 +320,8 @@ class ProcessingStatus(object):
   def UpdateExtractionWorkerStatus(
       self, identifier, pid, display_name, number_of_events,
       consumed_number_of_path_specs, produced_number_of_path_specs, status,
-      process_status):
+      process_status, event_queue_wait_time=0.0, number_of_event_batches=0,
+      signature_scanned_bytes=0, total_signature_scanned_bytes=0):
     """Updates the extraction worker status.
 
     Args:
@@ -305,6 +337,16 @@ class ProcessingStatus(object):
                                      produced by the collector.
       status: string containing the extraction worker status.
       process_status: string containing the process status.
+      event_queue_wait_time: optional total number of seconds the extraction
+                             worker spent waiting to push events onto
+                             the event object queue.
+      number_of_event_batches: optional total number of event batches pushed
+                               onto the event object queue by the extraction
+                               worker.
+      signature_scanned_bytes: optional number of bytes scanned for signatures
+                               of the file entry currently being processed.
+      total_signature_scanned_bytes: optional total number of bytes scanned
+                                     for signatures by the extraction worker.
     """
     if identifier not in self._extraction_workers:
       self._extraction_workers[identifier] = ExtractionWorkerStatus()
@@ -330,7 +372,9 @@ class ProcessingStatus(object):
     extraction_worker_status.consumed_number_of_path_specs_delta = (
         consumed_number_of_path_specs_delta)
     extraction_worker_status.display_name = display_name
+    extraction_worker_status.event_queue_wait_time = event_queue_wait_time
     extraction_worker_status.identifier = identifier
+    extraction_worker_status.number_of_event_batches = number_of_event_batches
     extraction_worker_status.number_of_events = number_of_events
     extraction_worker_status.number_of_events_delta = number_of_events_delta
     extraction_worker_status.pid = pid
@@ -339,7 +383,14 @@ class ProcessingStatus(object):
         produced_number_of_path_specs)
     extraction_worker_status.produced_number_of_path_specs_delta = (
         produced_number_of_path_specs_delta)
+    extraction_worker_status.signature_scanned_bytes = signature_scanned_bytes
     extraction_worker_status.status = status
+    extraction_worker_status.total_signature_scanned_bytes = (
+        total_signature_scanned_bytes)
+
+    if number_of_event_batches > 0:
+      extraction_worker_status.event_batch_size = (
+          number_of_events // number_of_event_batches)
 
     if (number_of_events_delta > 0 or
         consumed_number_of_path_specs_delta > 0 or
@@ -100,8 +100,8 @@ class SingleProcessEngine(engine.BaseEngine):
     self._storage_writer = None
 
   def _CreateCollector(
-      self, filter_find_specs=None, include_directory_stat=True,
-      resolver_context=None):
+      self, duplicate_file_check=False, filter_find_specs=None,
+      include_directory_stat=True, resolver_context=None):
     """Creates a collector object.
 
        The collector discovers all the files that need to be processed by
@@ -109,6 +109,9 @@ class SingleProcessEngine(engine.BaseEngine):
        as a path specification (instance of dfvfs.PathSpec).
 
     Args:
+      duplicate_file_check: optional boolean value to indicate to skip files
+                            in VSS stores that have not changed since they
+                            were collected from the volume or another store.
       filter_find_specs: optional list of filter find specifications (instances
                          of dfvfs.FindSpec).
       include_directory_stat: optional boolean value to indicate whether
@@ -122,6 +125,7 @@ class SingleProcessEngine(engine.BaseEngine):
         self._path_spec_queue, resolver_context=resolver_context)
 
     collector_object.SetCollectDirectoryMetadata(include_directory_stat)
+    collector_object.SetDuplicateFileCheck(duplicate_file_check)
 
     if filter_find_specs:
       collector_object.SetFilter(filter_find_specs)
@@ -214,6 +218,9 @@ class SingleProcessEngine(engine.BaseEngine):
     number_of_events = status.get(u'number_of_events', 0)
     produced_number_of_path_specs = status.get(
         u'produced_number_of_path_specs', 0)
+    signature_scanned_bytes = status.get(u'signature_scanned_bytes', 0)
+    total_signature_scanned_bytes = status.get(
+        u'total_signature_scanned_bytes', 0)
 
     if processing_completed:
       status_indicator = definitions.PROCESSING_STATUS_COMPLETED
@@ -227,7 +234,9 @@ class SingleProcessEngine(engine.BaseEngine):
     self._processing_status.UpdateExtractionWorkerStatus(
         u'Worker', os.getpid(), display_name, number_of_events,
         consumed_number_of_path_specs, produced_number_of_path_specs,
-        status_indicator, None)
+        status_indicator, None,
+        signature_scanned_bytes=signature_scanned_bytes,
+        total_signature_scanned_bytes=total_signature_scanned_bytes)
 
   def _UpdateStorageWriterStatus(self, processing_completed=False):
     """Updates the storage writer status.
@@ -275,9 +284,11 @@ class SingleProcessEngine(engine.BaseEngine):
     self._last_status_update_timestamp = current_timestamp
 
   def ProcessSources(
-      self, source_path_specs, storage_writer, filter_find_specs=None,
-      filter_object=None, hasher_names_string=None, include_directory_stat=True,
-      mount_path=None, parser_filter_string=None, process_archive_files=False,
+      self, source_path_specs, storage_writer, completed_path_specs=None,
+      duplicate_file_check=False, enable_checkpoints=False,
+      filter_find_specs=None, filter_object=None, hasher_names_string=None,
+      include_directory_stat=True, mount_path=None,
+      parser_filter_string=None, process_archive_files=False,
       resolver_context=None, status_update_callback=None, text_prepend=None):
     """Processes the sources and extract event objects.
 
@@ -285,6 +296,15 @@ class SingleProcessEngine(engine.BaseEngine):
       source_path_specs: list of path specifications (instances of
                          dfvfs.PathSpec) to process.
       storage_writer: a storage writer object (instance of BaseStorageWriter).
+      completed_path_specs: optional set of the comparables of the path
+                            specifications that were completed by a previous
+                            extraction and should be skipped.
+      duplicate_file_check: optional boolean value to indicate to skip files
+                            in VSS stores that have not changed since they
+                            were collected from the volume or another store.
+      enable_checkpoints: optional boolean value to indicate the worker
+                          should mark the path specifications it completed
+                          for the storage writer checkpoints.
       filter_find_specs: optional list of filter find specifications (instances
                          of dfvfs.FindSpec).
       filter_object: optional filter object (instance of objectfilter.Filter).
@@ -305,6 +325,7 @@ class SingleProcessEngine(engine.BaseEngine):
       The processing status (instance of ProcessingStatus).
     """
     self._collector = self._CreateCollector(
+        duplicate_file_check=duplicate_file_check,
         filter_find_specs=filter_find_specs,
         include_directory_stat=include_directory_stat,
         resolver_context=resolver_context)
@@ -318,6 +339,12 @@ class SingleProcessEngine(engine.BaseEngine):
 
     self._status_update_callback = status_update_callback
 
+    if completed_path_specs:
+      self._collector.SetCompletedPathSpecs(completed_path_specs)
+      self._extraction_worker.SetCompletedPathSpecs(completed_path_specs)
+
+    self._extraction_worker.SetEnableCheckpoints(enable_checkpoints)
+
     if hasher_names_string:
       self._extraction_worker.SetHashers(hasher_names_string)
 
@@ -521,9 +548,17 @@ class SingleProcessQueue(plaso_queue.Queue):
     """Determines if the queue is empty."""
     return len(self._queue) == 0
 
-  def PushItem(self, item):
+  def PushItem(self, item, block=True):
     """Pushes an item onto the queue.
 
+    Args:
+      item: the item object.
+      block: optional boolean value to indicate the push is blocking. A
+             blocking push raises QueueFull when the queue is full after
+             the item was pushed, such that the queue can be flushed. A non
+             blocking push only raises QueueFull when the item could not
+             be pushed.
+
     Raises:
       QueueFull: when the queue is full.
     """
@@ -534,7 +569,11 @@ class SingleProcessQueue(plaso_queue.Queue):
       self._queue.append(item)
       number_of_items += 1
 
-    if self._queue.maxlen and number_of_items == self._queue.maxlen:
+    elif not block:
+      raise errors.QueueFull
+
+    if (block and self._queue.maxlen and
+        number_of_items == self._queue.maxlen):
       raise errors.QueueFull
 
   def PopItem(self):
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """The event extraction worker."""
 
+import collections
 import logging
 import os
 import re
+import time
 
 import pysigscan
 
@@ -21,6 +23,77 @@ from plaso.lib import errors
 from plaso.hashers import manager as hashers_manager
 from plaso.parsers import interface as parsers_interface
 from plaso.parsers import manager as parsers_manager
+from plaso.parsers import text_parser
+
+
+class PathSpecFanOutQueue(plaso_queue.Queue):
+  """Class that implements a path specification fan-out queue.
+
+  The fan-out queue pushes the path specifications produced by a worker,
+  such as the members of archive files, onto the shared path specification
+  queue so that they can be processed by other workers. The items are pushed
+  without blocking, to prevent workers waiting on each other, and are kept
+  in the fan-out queue if the shared queue is full or does not support
+  pushing items. The worker processes the items kept in the fan-out queue
+  itself.
+  """
+
+  def __init__(self, queue_object):
+    """Initializes the fan-out queue.
+
+    Args:
+      queue_object: the shared path specification queue (instance of Queue).
+    """
+    super(PathSpecFanOutQueue, self).__init__()
+    self._items = collections.deque()
+    self._queue = queue_object
+    self.number_of_items = 0
+    self.number_of_pushed_items = 0
+
+  def Close(self):
+    """Closes the queue."""
+    return
+
+  def IsEmpty(self):
+    """Determines if there are no items kept in the fan-out queue."""
+    return not self._items
+
+  def Open(self):
+    """Opens the queue."""
+    return
+
+  def PopItem(self):
+    """Pops an item kept in the fan-out queue.
+
+    Raises:
+      QueueEmpty: when there are no items kept in the fan-out queue.
+    """
+    if not self._items:
+      raise errors.QueueEmpty
+    return self._items.popleft()
+
+  def PushItem(self, item, block=True):
+    """Pushes an item onto the shared queue or keeps it if that fails.
+
+    Args:
+      item: the item object.
+      block: optional boolean value, which is ignored since items are never
+             pushed onto the shared queue in blocking mode.
+    """
+    self.number_of_items += 1
+
+    # Once an item is kept all the following items are kept as well
+    # to preserve their order.
+    if not self._items:
+      try:
+        self._queue.PushItem(item, block=False)
+        self.number_of_pushed_items += 1
+        return
+
+      except (errors.QueueFull, errors.WrongQueueType):
+        pass
+
+    self._items.append(item)
 
 
 class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
@@ -37,6 +110,29 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
 
   _DEFAULT_HASH_READ_SIZE = 4096
 
+  # The type indicators of the path specifications of archive files and
+  # compressed streams.
+  _ARCHIVE_TYPE_INDICATORS = frozenset([
+      dfvfs_definitions.TYPE_INDICATOR_COMPRESSED_STREAM,
+      dfvfs_definitions.TYPE_INDICATOR_GZIP,
+      dfvfs_definitions.TYPE_INDICATOR_TAR,
+      dfvfs_definitions.TYPE_INDICATOR_ZIP])
+
+  # The maximum number of nested archive files and compressed streams
+  # of which the contents are extracted.
+  _MAXIMUM_ARCHIVE_DEPTH = 4
+
+  # The maximum number of path specifications produced per archive file.
+  _MAXIMUM_NUMBER_OF_ARCHIVE_MEMBERS = 100000
+
+  # The maximum number of bytes at the start of the data that is scanned
+  # for signatures that are not bound to an offset, unless the full data
+  # is scanned.
+  _MAXIMUM_FLOATING_SIGNATURE_SCAN_SIZE = 64 * 1024
+
+  # The maximum number of signature scan results that are cached.
+  _MAXIMUM_NUMBER_OF_CACHED_SIGNATURE_SCAN_RESULTS = 1024
+
   # TSK metadata files that need special handling.
   _METADATA_FILE_LOCATIONS_TSK = frozenset([
       # NTFS
@@ -93,23 +189,31 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
                         or process must have its own resolver context.
     """
     super(BaseEventExtractionWorker, self).__init__(path_spec_queue)
-    self._compressed_stream_path_spec = None
+    self._completed_path_specs = None
     self._current_display_name = u''
     self._current_file_entry = None
+    self._current_parser = None
+    self._enable_checkpoints = False
     self._enable_debug_mode = False
     self._identifier = identifier
     self._identifier_string = u'Worker_{0:d}'.format(identifier)
     self._file_scanner = None
     self._filestat_parser_object = None
+    self._floating_signatures_scanner = None
+    self._full_signature_scan = False
     self._hasher_names = None
     self._mft_parser_object = None
     self._non_sigscan_parser_names = None
     self._open_files = False
     self._parser_mediator = parser_mediator
     self._parser_objects = None
+    self._path_spec_fan_out_queue = PathSpecFanOutQueue(path_spec_queue)
     self._process_archive_files = False
-    self._produced_number_of_path_specs = 0
+    self._processing_path_spec = None
+    self._recycle_event = None
+    self._recycled = False
     self._resolver_context = resolver_context
+    self._signature_scan_results = collections.OrderedDict()
     self._specification_store = None
     self._usnjrnl_parser_object = None
 
@@ -117,7 +221,9 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     self._parse_error_queue_producer = parse_error_queue_producer
 
     # Attributes that contain the current status of the worker.
+    self._signature_scanned_bytes = 0
     self._status = definitions.PROCESSING_STATUS_INITIALIZED
+    self._total_signature_scanned_bytes = 0
 
     # Attributes for profiling.
     self._enable_profiling = False
@@ -224,42 +330,132 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     Raises:
       QueueFull: If a queue is full.
     """
-    self._ProcessPathSpec(path_spec)
+    self._processing_path_spec = path_spec
+
+    self._ProcessPathSpecAndMarkCompleted(path_spec)
+
+    # The path specifications that could not be pushed onto the path
+    # specification queue are processed by this worker.
+    while not self._abort and not self._path_spec_fan_out_queue.IsEmpty():
+      self._ProcessPathSpecAndMarkCompleted(
+          self._path_spec_fan_out_queue.PopItem())
 
-    # TODO: work-around for now the compressed stream path spec
-    # needs to be processed after the current path spec.
-    if self._compressed_stream_path_spec:
-      self._ProcessPathSpec(self._compressed_stream_path_spec)
-      self._compressed_stream_path_spec = None
+    # Make sure the batched event objects of the file entry are pushed onto
+    # the queue before the next path specification is processed.
+    self._event_queue_producer.Flush()
+
+    self._processing_path_spec = None
+
+    # The worker stops after the path specification, including the path
+    # specifications it produced, was processed, so that it can be replaced
+    # by a new worker.
+    if self._recycle_event and self._recycle_event.is_set():
+      logging.debug(u'Worker {0:d} (PID: {1:d}) recycled.'.format(
+          self._identifier, os.getpid()))
+      self._recycled = True
+      self._abort = True
 
   def _DebugProcessPathSpec(self):
     """Callback for debugging path specification processing failures."""
     return
 
-  def _GetSignatureMatchParserNames(self, file_object):
+  def _GetArchiveDepth(self, path_spec):
+    """Determines the number of archive files that contain a path specification.
+
+    Args:
+      path_spec: a path specification (instance of dfvfs.PathSpec).
+
+    Returns:
+      An integer containing the number of archive files and compressed
+      streams that contain the path specification.
+    """
+    archive_depth = 0
+    while path_spec:
+      if path_spec.type_indicator in self._ARCHIVE_TYPE_INDICATORS:
+        archive_depth += 1
+      path_spec = getattr(path_spec, u'parent', None)
+
+    return archive_depth
+
+  def _GetSignatureMatchParserNames(
+      self, file_entry, file_object, data_stream_name=u''):
     """Determines if a file-like object matches one of the known signatures.
 
+    The results are cached per path specification, data stream, size and
+    modification time of the file entry.
+
     Args:
+      file_entry: the file entry object (instance of dfvfs.FileEntry) that
+                  contains the data stream.
       file_object: the file-like object whose contents will be checked
                    for known signatures.
+      data_stream_name: optional data stream name. The default is
+                        an empty string which represents the default
+                        data stream.
 
     Returns:
       A list of parser names for which the file entry matches their
       known signatures.
     """
-    parser_name_list = []
-    scan_state = pysigscan.scan_state()
-    self._file_scanner.scan_file_object(scan_state, file_object)
+    self._signature_scanned_bytes = 0
+
+    cache_key = self._GetSignatureScanCacheKey(
+        file_entry, file_object, data_stream_name=data_stream_name)
+    if cache_key:
+      parser_name_list = self._signature_scan_results.pop(cache_key, None)
+      if parser_name_list is not None:
+        self._signature_scan_results[cache_key] = parser_name_list
+        return list(parser_name_list)
+
+    if self._full_signature_scan:
+      signature_identifiers = self._ScanFileObject(file_object)
+    else:
+      signature_identifiers = self._ScanFileObjectRanges(file_object)
+
+    self._total_signature_scanned_bytes += self._signature_scanned_bytes
 
-    for scan_result in scan_state.scan_results:
+    parser_name_list = []
+    for signature_identifier in signature_identifiers:
       format_specification = (
           self._specification_store.GetSpecificationBySignature(
-              scan_result.identifier))
+              signature_identifier))
 
       if format_specification.identifier not in parser_name_list:
         parser_name_list.append(format_specification.identifier)
 
-    return parser_name_list
+    if cache_key:
+      self._signature_scan_results[cache_key] = parser_name_list
+      if (len(self._signature_scan_results) >
+          self._MAXIMUM_NUMBER_OF_CACHED_SIGNATURE_SCAN_RESULTS):
+        self._signature_scan_results.popitem(last=False)
+
+    return list(parser_name_list)
+
+  def _GetSignatureScanCacheKey(
+      self, file_entry, file_object, data_stream_name=u''):
+    """Retrieves the key of the signature scan result of a data stream.
+
+    Args:
+      file_entry: the file entry object (instance of dfvfs.FileEntry) that
+                  contains the data stream.
+      file_object: the file-like object of the data stream.
+      data_stream_name: optional data stream name. The default is
+                        an empty string which represents the default
+                        data stream.
+
+    Returns:
+      A tuple that contains the cache key or None if the file entry
+      has no modification time.
+    """
+    stat_object = file_entry.GetStat()
+    modification_time = getattr(stat_object, u'mtime', None)
+    if modification_time is None:
+      return
+
+    return (
+        file_entry.path_spec.comparable, data_stream_name,
+        file_object.get_size(), modification_time,
+        getattr(stat_object, u'mtime_nano', None))
 
   def _HashDataStream(self, file_entry, data_stream_name=u''):
     """Hashes the contents of a specific data stream of a file entry.
@@ -333,7 +529,7 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     return False
 
   def _ParseFileEntryWithParser(
-      self, parser_object, file_entry, file_object=None):
+      self, parser_object, file_entry, file_object=None, text_file_head=None):
     """Parses a file entry with a specific parser.
 
     Args:
@@ -342,6 +538,9 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
       file_object: optional file-like object to parse. If not set the parser
                    will use the parser mediator to open the file entry's
                    default data stream as a file-like object
+      text_file_head: optional head of the file-like object (instance of
+                      TextFileHead) that is shared by the single-line text
+                      parsers.
     """
     self._parser_mediator.ClearParserChain()
 
@@ -351,9 +550,17 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     if self._parsers_profiler:
       self._parsers_profiler.StartTiming(parser_object.NAME)
 
+    # The parser is stored as a single tuple, since the status can be
+    # retrieved from another thread, e.g. by the process status RPC server.
+    self._current_parser = (
+        parser_object.NAME, file_entry.path_spec, time.time())
+
     try:
       if isinstance(parser_object, parsers_interface.FileEntryParser):
         parser_object.Parse(self._parser_mediator)
+      elif text_file_head:
+        parser_object.Parse(
+            self._parser_mediator, file_object, text_file_head=text_file_head)
       elif isinstance(parser_object, parsers_interface.FileObjectParser):
         parser_object.Parse(self._parser_mediator, file_object)
       else:
@@ -373,6 +580,8 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
               parser_object.NAME, self._current_display_name, exception))
 
     finally:
+      self._current_parser = None
+
       if self._parsers_profiler:
         self._parsers_profiler.StopTiming(parser_object.NAME)
 
@@ -382,6 +591,19 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
             u'[{0:s}] did not explicitly close file-object for file: '
             u'{1:s}.').format(parser_object.NAME, self._current_display_name))
 
+  def _IsSingleLineTextParser(self, parser_object):
+    """Determines if a parser is a single-line text parser.
+
+    Args:
+      parser_object: a parser object (instance of BaseParser).
+
+    Returns:
+      A boolean value that indicates the parser is a single-line text parser.
+    """
+    return (
+        isinstance(parser_object, text_parser.PyparsingSingleLineTextParser) and
+        not isinstance(parser_object, text_parser.PyparsingMultiLineTextParser))
+
   def _ProcessArchiveFile(self, file_entry):
     """Processes an archive file (file that contains file entries).
 
@@ -440,14 +662,14 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
 
           try:
             # TODO: make sure to handle the abort here.
-
-            # TODO: change this to pass the archive file path spec to
-            # the collector process and have the collector implement a maximum
-            # path spec "depth" to prevent ZIP bombs and equiv.
-            file_system_collector = collector.FileSystemCollector(self._queue)
+            file_system_collector = collector.FileSystemCollector(
+                self._path_spec_fan_out_queue)
+            file_system_collector.SetMaximumNumberOfPathSpecs(
+                self._MAXIMUM_NUMBER_OF_ARCHIVE_MEMBERS)
+            if self._completed_path_specs:
+              file_system_collector.SetCompletedPathSpecs(
+                  self._completed_path_specs)
             file_system_collector.Collect(file_system, archive_path_spec)
-            self._produced_number_of_path_specs += (
-                file_system_collector.number_of_produced_items)
 
           finally:
             file_system.Close()
@@ -512,17 +734,94 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
 
         compressed_stream_path_spec = None
 
-      if compressed_stream_path_spec:
-        # TODO: disabled for now since it can cause a deadlock.
-        # self._queue.PushItem(compressed_stream_path_spec)
-        # self._produced_number_of_path_specs += 1
-
-        # TODO: work-around for now the compressed stream path spec
-        # needs to be processed after the current path spec.
-        self._compressed_stream_path_spec = compressed_stream_path_spec
+      if compressed_stream_path_spec and not (
+          self._completed_path_specs and
+          compressed_stream_path_spec.comparable in self._completed_path_specs):
+        self._path_spec_fan_out_queue.PushItem(compressed_stream_path_spec)
 
     return True
 
+  def _ScanFileObject(self, file_object):
+    """Scans all the data of a file-like object for known signatures.
+
+    Args:
+      file_object: the file-like object whose contents will be checked
+                   for known signatures.
+
+    Returns:
+      A list of the identifiers of the matching signatures.
+    """
+    scan_state = pysigscan.scan_state()
+    self._file_scanner.scan_file_object(scan_state, file_object)
+
+    self._signature_scanned_bytes = file_object.get_size()
+
+    return [scan_result.identifier for scan_result in scan_state.scan_results]
+
+  def _ScanFileObjectRanges(self, file_object):
+    """Scans the head and tail of a file-like object for known signatures.
+
+    Only the ranges at the start and end of the data that contain the
+    signatures that are bound to an offset are read. Signatures that are
+    not bound to an offset are only scanned for in the first part of
+    the data.
+
+    Args:
+      file_object: the file-like object whose contents will be checked
+                   for known signatures.
+
+    Returns:
+      A list of the identifiers of the matching signatures.
+    """
+    file_size = file_object.get_size()
+
+    header_size = self._specification_store.header_size
+    if self._floating_signatures_scanner:
+      header_size = max(
+          header_size, self._MAXIMUM_FLOATING_SIGNATURE_SCAN_SIZE)
+    header_size = min(header_size, file_size)
+
+    header_data = b''
+    if header_size > 0:
+      file_object.seek(0, os.SEEK_SET)
+      header_data = file_object.read(header_size)
+      self._signature_scanned_bytes += len(header_data)
+
+    footer_size = min(self._specification_store.footer_size, file_size)
+    footer_offset = file_size - footer_size
+
+    footer_data = b''
+    if footer_size > 0:
+      if len(header_data) >= file_size:
+        footer_data = header_data[footer_offset:]
+      else:
+        file_object.seek(footer_offset, os.SEEK_SET)
+        footer_data = file_object.read(footer_size)
+        self._signature_scanned_bytes += footer_size - max(
+            0, len(header_data) - footer_offset)
+
+    signature_identifiers = []
+    for signature in self._specification_store.bound_signatures:
+      if signature.offset < 0:
+        result = signature.Matches(
+            footer_data, data_offset=footer_offset, data_size=file_size)
+      else:
+        result = signature.Matches(header_data, data_size=file_size)
+
+      if result:
+        signature_identifiers.append(signature.identifier)
+
+    if self._floating_signatures_scanner and header_data:
+      scan_state = pysigscan.scan_state()
+      self._floating_signatures_scanner.scan_start(scan_state)
+      self._floating_signatures_scanner.scan_buffer(scan_state, header_data)
+      self._floating_signatures_scanner.scan_stop(scan_state)
+
+      for scan_result in scan_state.scan_results:
+        signature_identifiers.append(scan_result.identifier)
+
+    return signature_identifiers
+
   def _ProcessDataStream(self, file_entry, data_stream_name=u''):
     """Processes a specific data stream of a file entry.
 
@@ -541,7 +840,10 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
           u'Unable to retrieve file-like object from file entry.')
 
     try:
-      parser_name_list = self._GetSignatureMatchParserNames(file_object)
+      text_file_head = None
+
+      parser_name_list = self._GetSignatureMatchParserNames(
+          file_entry, file_object, data_stream_name=data_stream_name)
       if not parser_name_list:
         parser_name_list = self._non_sigscan_parser_names
 
@@ -556,12 +858,25 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
           if not self._CanProcessFileEntryWithParser(file_entry, parser_object):
             continue
 
+        parser_text_file_head = None
+        if self._IsSingleLineTextParser(parser_object):
+          # The head of the file is read once and shared by the single-line
+          # text parsers.
+          if not text_file_head:
+            text_file_head = text_parser.TextFileHead(file_object)
+
+          if text_file_head.is_binary:
+            continue
+
+          parser_text_file_head = text_file_head
+
         logging.debug((
             u'[ProcessDataStream] parsing file: {0:s} with parser: '
             u'{1:s}').format(self._current_display_name, parser_name))
 
         self._ParseFileEntryWithParser(
-            parser_object, file_entry, file_object=file_object)
+            parser_object, file_entry, file_object=file_object,
+            text_file_head=parser_text_file_head)
 
     finally:
       file_object.close()
@@ -676,9 +991,18 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
           is_compressed_stream = False
 
           if file_entry.IsFile():
-            is_compressed_stream = self._ProcessCompressedStreamFile(file_entry)
-            if not is_compressed_stream:
-              is_archive = self._ProcessArchiveFile(file_entry)
+            archive_depth = self._GetArchiveDepth(file_entry.path_spec)
+            if archive_depth >= self._MAXIMUM_ARCHIVE_DEPTH:
+              logging.warning((
+                  u'Not extracting the contents of: {0:s} since it exceeds '
+                  u'the maximum archive depth: {1:d}').format(
+                      self._current_display_name, self._MAXIMUM_ARCHIVE_DEPTH))
+
+            else:
+              is_compressed_stream = self._ProcessCompressedStreamFile(
+                  file_entry)
+              if not is_compressed_stream:
+                is_archive = self._ProcessArchiveFile(file_entry)
 
           if has_data_stream and not is_archive and not is_compressed_stream:
             self._ProcessDataStream(
@@ -758,6 +1082,33 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     # Make sure frame.f_locals does not keep a reference to file_entry.
     file_entry = None
 
+  def _ProcessPathSpecAndMarkCompleted(self, path_spec):
+    """Processes a path specification and marks it completed.
+
+    If checkpoints are enabled a path specification completed marker is
+    produced after the event objects of the path specification.
+
+    Args:
+      path_spec: A path specification object (instance of dfvfs.PathSpec).
+    """
+    number_of_items = self._path_spec_fan_out_queue.number_of_items
+
+    self._ProcessPathSpec(path_spec)
+
+    if not self._enable_checkpoints or self._abort:
+      return
+
+    # A path specification that produced other path specifications, such as
+    # an archive file, is not marked completed since the path specifications
+    # it produced can still be pending. When resumed, the path specification
+    # is processed again and the completed path specifications it produces
+    # are skipped.
+    if self._path_spec_fan_out_queue.number_of_items != number_of_items:
+      return
+
+    self._event_queue_producer.ProduceItem(
+        plaso_queue.PathSpecCompleted(path_spec.comparable))
+
   def _ProfilingSampleMemory(self):
     """Create a memory profiling sample."""
     if not self._memory_profiler:
@@ -791,15 +1142,50 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
       return
     return self._current_file_entry.path_spec
 
+  @property
+  def processing_path_spec(self):
+    """The path specification consumed from the queue being processed.
+
+    The path specification is None when the worker is not processing
+    a path specification consumed from the path specification queue.
+    """
+    return self._processing_path_spec
+
   def GetStatus(self):
-    """Returns a dictionary containing the status."""
+    """Returns a dictionary containing the status.
+
+    While a parser is running the status contains the name of the parser,
+    the comparable of the path specification of the file entry it parses
+    and the number of seconds it has been parsing the file entry, which
+    the engine uses to enforce the parse timeout.
+    """
+    parser_name = None
+    parser_path_spec = None
+    parsing_time = 0.0
+
+    current_parser = self._current_parser
+    if current_parser:
+      parser_name, path_spec, parser_start_time = current_parser
+      parser_path_spec = path_spec.comparable
+      parsing_time = time.time() - parser_start_time
+
     return {
         u'consumed_number_of_path_specs': self.number_of_consumed_items,
         u'display_name': self._current_display_name,
         u'identifier': self._identifier_string,
+        u'event_queue_wait_time': self._event_queue_producer.queue_wait_time,
+        u'number_of_event_batches': (
+            self._event_queue_producer.number_of_produced_batches),
         u'number_of_events': self._parser_mediator.number_of_events,
+        u'parser_name': parser_name,
+        u'parser_path_spec': parser_path_spec,
+        u'parsing_time': parsing_time,
         u'processing_status': self._status,
-        u'produced_number_of_path_specs': self._produced_number_of_path_specs,
+        u'produced_number_of_path_specs': (
+            self._path_spec_fan_out_queue.number_of_pushed_items),
+        u'recycled': self._recycled,
+        u'signature_scanned_bytes': self._signature_scanned_bytes,
+        u'total_signature_scanned_bytes': self._total_signature_scanned_bytes,
         u'type': definitions.PROCESS_TYPE_WORKER}
 
   def InitializeParserObjects(self, parser_filter_string=None):
@@ -830,6 +1216,14 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     self._file_scanner = parsers_manager.ParsersManager.GetScanner(
         self._specification_store)
 
+    self._floating_signatures_scanner = None
+    if self._specification_store.floating_signatures:
+      self._floating_signatures_scanner = (
+          parsers_manager.ParsersManager.GetScanner(
+              self._specification_store, floating_signatures_only=True))
+
+    self._signature_scan_results = collections.OrderedDict()
+
     self._parser_objects = parsers_manager.ParsersManager.GetParserObjects(
         parser_filter_string=parser_filter_string)
 
@@ -868,6 +1262,26 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     if self._enable_profiling:
       self._ProfilingStop()
 
+  def SetCompletedPathSpecs(self, completed_path_specs):
+    """Sets the path specifications that were completed previously.
+
+    Args:
+      completed_path_specs: a set of the comparables of the path
+                            specifications that should not be produced
+                            again, such as the members of archive files.
+    """
+    self._completed_path_specs = completed_path_specs
+
+  def SetEnableCheckpoints(self, enable_checkpoints):
+    """Enables or disables checkpoints.
+
+    Args:
+      enable_checkpoints: boolean value to indicate if a path specification
+                          completed marker should be produced after the event
+                          objects of a path specification.
+    """
+    self._enable_checkpoints = enable_checkpoints
+
   def SetEnableDebugMode(self, enable_debug_mode):
     """Enables or disables debug mode.
 
@@ -908,6 +1322,17 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     """
     self._parser_mediator.SetFilterObject(filter_object)
 
+  def SetFullSignatureScan(self, full_signature_scan):
+    """Sets the full signature scan mode.
+
+    Args:
+      full_signature_scan: boolean value to indicate if the worker should
+                           scan all the data of a data stream for signatures
+                           instead of only the ranges that contain the
+                           signatures that are bound to an offset.
+    """
+    self._full_signature_scan = full_signature_scan
+
   def SetHashers(self, hasher_names_string):
     """Initializes the hasher objects.
 
@@ -937,6 +1362,17 @@ class BaseEventExtractionWorker(plaso_queue.ItemQueueConsumer):
     """
     self._process_archive_files = process_archive_files
 
+  def SetRecycleEvent(self, recycle_event):
+    """Sets the recycle event.
+
+    Args:
+      recycle_event: an event object (instance of multiprocessing.Event)
+                     that signals the worker should stop after the path
+                     specification it is processing, so that it can be
+                     replaced by a new worker.
+    """
+    self._recycle_event = recycle_event
+
   def SetTextPrepend(self, text_prepend):
     """Sets the text prepend.
 
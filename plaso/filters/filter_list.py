@@ -19,6 +19,29 @@ class ObjectFilterList(interface.FilterObject):
     super(ObjectFilterList, self).__init__()
     self.filters = None
 
+  @property
+  def event_predicates(self):
+    """The event predicates an event object must meet to match the filter.
+
+    An event object matches the filter list if it matches any of the filters
+    hence the event predicates are the union of those of the filters.
+    """
+    if not self.filters:
+      return
+
+    event_predicates = None
+    for _, matcher, _ in self.filters:
+      matcher_event_predicates = getattr(matcher, u'event_predicates', None)
+      if not matcher_event_predicates:
+        return
+
+      if event_predicates is None:
+        event_predicates = matcher_event_predicates
+      else:
+        event_predicates = event_predicates.Union(matcher_event_predicates)
+
+    return event_predicates
+
   def _IncludeKeyword(self, loader, node):
     """Callback for YAML add_constructor.
 
@@ -4,6 +4,7 @@
 import abc
 
 from plaso.lib import errors
+from plaso.lib import filter_compiler
 from plaso.lib import pfilter
 
 
@@ -16,6 +17,17 @@ class FilterObject(object):
     self._filter_expression = None
     self._matcher = None
 
+  @property
+  def event_predicates(self):
+    """The event predicates an event object must meet to match the filter.
+
+    The event predicates (instance of EventPredicates) allow the storage
+    to skip event objects that cannot match the filter or None if not
+    available.
+    """
+    if self._matcher:
+      return getattr(self._matcher, u'event_predicates', None)
+
   @property
   def fields(self):
     """Return a list of fields for adaptive output modules."""
@@ -49,11 +61,12 @@ class FilterObject(object):
       filter_expression: string that contains the filter expression.
 
     Returns:
-      A filter object (instance of objectfilter.TODO) or None.
+      A compiled filter object (instance of filter_compiler.CompiledFilter)
+      or None.
     """
     try:
       parser = pfilter.BaseParser(filter_expression).Parse()
-      return parser.Compile(pfilter.PlasoAttributeFilterImplementation)
+      return filter_compiler.FilterCompiler().CompileExpression(parser)
 
     except errors.ParseError:
       pass
@@ -12,6 +12,7 @@ from dfvfs.resolver import context
 import plaso
 from plaso import parsers   # pylint: disable=unused-import
 from plaso import hashers   # pylint: disable=unused-import
+from plaso.engine import knowledge_base
 from plaso.engine import single_process
 from plaso.engine import utils as engine_utils
 from plaso.frontend import frontend
@@ -23,6 +24,7 @@ from plaso.lib import timelib
 from plaso.multi_processing import multi_process
 from plaso.hashers import manager as hashers_manager
 from plaso.parsers import manager as parsers_manager
+from plaso.storage import journal as storage_journal
 from plaso.storage import writer as storage_writer
 from plaso.storage import zip_file as storage_zip_file
 
@@ -43,15 +45,19 @@ class ExtractionFrontend(frontend.Frontend):
     self._buffer_size = 0
     self._collection_process = None
     self._debug_mode = False
+    self._duplicate_file_check = True
+    self._enable_checkpoints = True
     self._enable_preprocessing = False
     self._enable_profiling = False
     self._engine = None
+    self._event_batch_size = 0
     self._filter_expression = None
     self._filter_object = None
     self._hasher_names = []
     self._mount_path = None
     self._operating_system = None
     self._output_module = None
+    self._parse_timeout = 0
     self._parser_names = None
     self._process_archive_files = False
     self._profiling_sample_rate = self._DEFAULT_PROFILING_SAMPLE_RATE
@@ -60,10 +66,13 @@ class ExtractionFrontend(frontend.Frontend):
     self._use_zeromq = False
     self._queue_size = self._DEFAULT_QUEUE_SIZE
     self._resolver_context = context.Context()
+    self._serialize_in_workers = False
     self._single_process_mode = False
     self._show_worker_memory_information = False
     self._storage_file_path = None
     self._text_prepend = None
+    self._worker_memory_limit = 0
+    self._worker_path_spec_limit = 0
 
   def _CheckStorageFile(self, storage_file_path):
     """Checks if the storage file path is valid.
@@ -151,39 +160,121 @@ class ExtractionFrontend(frontend.Frontend):
 
     return parser_filter_string
 
-  def _PreprocessSources(self, source_path_specs, source_type):
+  def _GetIncrementalParserFilterString(
+      self, storage_information, parser_filter_string):
+    """Determines the parser filter string of an incremental extraction.
+
+    The parsers and plugins that were run by prior extractions, according
+    to the collection information in the storage file, are removed from
+    the parser filter string.
+
+    Args:
+      storage_information: list of preprocessing objects (instances of
+                           PreprocessObject) of the prior extractions.
+      parser_filter_string: the parser filter string of the parsers and
+                            plugins to add.
+
+    Returns:
+      The parser filter string of the parsers and plugins that were not run
+      by the prior extractions.
+
+    Raises:
+      BadConfigOption: if all parsers and plugins were run by the prior
+                       extractions.
+    """
+    parsers_manager_class = parsers_manager.ParsersManager
+    parser_classes = dict(parsers_manager_class.GetParsers())
+
+    processed_names = set()
+    for pre_obj in storage_information:
+      collection_information = getattr(
+          pre_obj, u'collection_information', None) or {}
+      parser_selection = collection_information.get(u'parser_selection', None)
+      if parser_selection == u'(no list set)':
+        parser_selection = None
+
+      if parser_selection:
+        includes, excludes = parsers_manager_class.GetFilterListsFromString(
+            parser_selection)
+        processed_names.update(
+            name for name in includes if name not in excludes)
+
+      for parser_name in collection_information.get(u'parsers', []):
+        processed_names.add(parser_name)
+
+        parser_class = parser_classes.get(parser_name, None)
+        if parser_class and parser_class.SupportsPlugins():
+          processed_names.update(parser_class.GetPluginNames(
+              parser_filter_string=parser_selection))
+
+    includes, excludes = parsers_manager_class.GetFilterListsFromString(
+        parser_filter_string)
+
+    filter_strings = []
+    for name in includes:
+      if name not in processed_names and name not in filter_strings:
+        filter_strings.append(name)
+
+    if not filter_strings:
+      raise errors.BadConfigOption(
+          u'Parsers and plugins: {0:s} were already run.'.format(
+              parser_filter_string))
+
+    for name in excludes:
+      filter_strings.append(u'-{0:s}'.format(name))
+
+    return u','.join(filter_strings)
+
+  def _GetStorageInformation(self):
+    """Retrieves the preprocessing information of prior extractions.
+
+    Returns:
+      A list of preprocessing objects (instances of PreprocessObject) stored
+      in the storage file, which is empty if not available.
+    """
+    if not os.path.isfile(self._storage_file_path):
+      return []
+
+    storage_file = None
+    try:
+      # TODO: refactor to use storage reader interface.
+      storage_file = storage_zip_file.StorageFile(
+          self._storage_file_path, read_only=True)
+      return storage_file.GetStorageInformation()
+
+    except IOError:
+      logging.warning(
+          u'Unable to retrieve preprocessing information from storage file.')
+      return []
+
+    finally:
+      if storage_file:
+        storage_file.Close()
+
+  def _PreprocessSources(
+      self, source_path_specs, source_type, storage_information=None):
     """Preprocesses the sources.
 
     Args:
       source_path_specs: list of path specifications (instances of
                          dfvfs.PathSpec) to process.
       source_type: the dfVFS source type definition.
+      storage_information: optional list of preprocessing objects (instances
+                           of PreprocessObject) of prior extractions. If set
+                           the preprocessing information of the last one is
+                           carried over instead of preprocessing the sources.
 
     Returns:
       The preprocessing object (instance of PreprocessObject).
     """
-    pre_obj = None
+    if not storage_information and self._use_old_preprocess:
+      storage_information = self._GetStorageInformation()
 
-    if self._use_old_preprocess and os.path.isfile(self._storage_file_path):
-      # Check if the storage file contains a preprocessing object.
-      storage_file = None
-      try:
-        # TODO: refactor to use storage reader interface.
-        storage_file = storage_zip_file.StorageFile(
-            self._storage_file_path, read_only=True)
-        storage_information = storage_file.GetStorageInformation()
-        if storage_information:
-          logging.info(u'Using preprocessing information from a prior run.')
-          pre_obj = storage_information[-1]
-          self._enable_preprocessing = False
-
-      except IOError:
-        logging.warning(
-            u'Unable to retrieve preprocessing information from storage file.')
-
-      finally:
-        if storage_file:
-          storage_file.Close()
+    if storage_information:
+      logging.info(u'Using preprocessing information from a prior run.')
+      self._engine.knowledge_base = knowledge_base.KnowledgeBase(
+          pre_obj=storage_information[-1])
+      self._enable_preprocessing = False
 
     logging.debug(u'Starting preprocessing.')
 
@@ -403,9 +494,11 @@ class ExtractionFrontend(frontend.Frontend):
 
   def ProcessSources(
       self, source_path_specs, source_type, command_line_arguments=None,
-      enable_sigsegv_handler=False, filter_file=None, hasher_names_string=None,
+      compress_storage=True, enable_sigsegv_handler=False, filter_file=None,
+      hasher_names_string=None, incremental=False,
       number_of_extraction_workers=0, parser_filter_string=None,
-      preferred_encoding=u'utf-8', single_process_mode=False,
+      preferred_encoding=u'utf-8', resume=False,
+      single_process_mode=False,
       status_update_callback=None,
       storage_serializer_format=definitions.SERIALIZER_FORMAT_PROTOBUF,
       timezone=pytz.UTC):
@@ -417,16 +510,28 @@ class ExtractionFrontend(frontend.Frontend):
       source_type: the dfVFS source type definition.
       command_line_arguments: optional string of the command line arguments or
                               None if not set.
+      compress_storage: optional boolean value to indicate the event object
+                        streams in the storage file should be compressed.
       enable_sigsegv_handler: optional boolean value to indicate the SIGSEGV
                               handler should be enabled.
       filter_file: optional path to a file that contains find specifications.
       hasher_names_string: optional comma separated string of names of
                            hashers to enable.
+      incremental: optional boolean value to indicate the front-end should
+                   only run the parsers and plugins of the parser filter
+                   string that were not run by prior extractions stored in
+                   the storage file. The preprocessing information of the
+                   prior extractions is carried over and the event objects
+                   are appended to the storage file as new stores.
       number_of_extraction_workers: the number of extraction workers to run. If
                                     0, the number will be selected
                                     automatically.
       parser_filter_string: optional parser filter string.
       preferred_encoding: optional preferred encoding.
+      resume: optional boolean value to indicate the front-end should resume
+              an interrupted extraction. The storage file is restored to its
+              last checkpoint, the path specifications completed by then are
+              skipped and the event objects are appended to the storage file.
       single_process_mode: optional boolean value to indicate if the front-end
                            should run in single process mode.
       status_update_callback: optional callback function for status updates.
@@ -437,10 +542,45 @@ class ExtractionFrontend(frontend.Frontend):
       The processing status (instance of ProcessingStatus) or None.
 
     Raises:
+      BadConfigOption: if the extraction cannot be resumed or if the
+                       incremental extraction is not possible.
       SourceScannerError: if the source scanner could not find a supported
                           file system.
       UserAbort: if the user initiated an abort.
     """
+    if resume and self._output_module:
+      raise errors.BadConfigOption(
+          u'Unable to resume an extraction with an output module.')
+
+    if resume and not self._enable_checkpoints:
+      raise errors.BadConfigOption(
+          u'Unable to resume an extraction with checkpoints disabled.')
+
+    storage_information = None
+    if incremental:
+      if resume or self._output_module:
+        raise errors.BadConfigOption(
+            u'Unable to run an incremental extraction with an output module '
+            u'or when resuming an extraction.')
+
+      if not parser_filter_string:
+        raise errors.BadConfigOption(
+            u'Missing parser filter string of the parsers and plugins to add.')
+
+      storage_information = self._GetStorageInformation()
+      if not storage_information:
+        raise errors.BadConfigOption(
+            u'Unable to run an incremental extraction without preprocessing '
+            u'information in storage file: {0:s}.'.format(
+                self._storage_file_path))
+
+      parser_filter_string = self._GetIncrementalParserFilterString(
+          storage_information, parser_filter_string)
+
+      logging.info(
+          u'Incremental extraction with parser filter expression: {0:s}'.format(
+              parser_filter_string))
+
     # If the source is a directory or a storage media image
     # run pre-processing.
     # TODO: move source_scanner.SourceScannerContext.SOURCE_TYPE_
@@ -475,7 +615,9 @@ class ExtractionFrontend(frontend.Frontend):
         profiling_sample_rate=self._profiling_sample_rate,
         profiling_type=self._profiling_type)
 
-    pre_obj = self._PreprocessSources(source_path_specs, source_type)
+    pre_obj = self._PreprocessSources(
+        source_path_specs, source_type,
+        storage_information=storage_information)
 
     self._operating_system = getattr(pre_obj, u'guessed_os', None)
 
@@ -519,14 +661,40 @@ class ExtractionFrontend(frontend.Frontend):
         parser_filter_string=parser_filter_string,
         preferred_encoding=preferred_encoding)
 
+    checkpoint_journal = None
+    completed_path_specs = None
+
     if self._output_module:
       storage_writer_object = storage_writer.BypassStorageWriter(
           self._engine.event_object_queue, self._storage_file_path,
           pre_obj, output_module_string=self._output_module)
     else:
+      checkpoint_journal = storage_journal.CheckpointJournal(
+          u'{0:s}.journal'.format(self._storage_file_path))
+
+      if resume:
+        try:
+          completed_path_specs = checkpoint_journal.RestoreStorageFile(
+              self._storage_file_path)
+        except IOError as exception:
+          raise errors.BadConfigOption(
+              u'Unable to resume extraction with error: {0:s}'.format(
+                  exception))
+
+        logging.info((
+            u'Resuming extraction, skipping: {0:d} completed path '
+            u'specifications.').format(len(completed_path_specs)))
+
+      else:
+        checkpoint_journal.Clear()
+
+      if not self._enable_checkpoints:
+        checkpoint_journal = None
+
       storage_writer_object = storage_zip_file.ZIPStorageFileWriter(
           self._engine.event_object_queue, self._storage_file_path,
           pre_obj, buffer_size=self._buffer_size,
+          checkpoint_journal=checkpoint_journal, compress=compress_storage,
           serializer_format=storage_serializer_format)
 
       storage_writer_object.SetEnableProfiling(
@@ -540,6 +708,9 @@ class ExtractionFrontend(frontend.Frontend):
 
         processing_status = self._engine.ProcessSources(
             source_path_specs, storage_writer_object,
+            completed_path_specs=completed_path_specs,
+            duplicate_file_check=self._duplicate_file_check,
+            enable_checkpoints=bool(checkpoint_journal),
             filter_find_specs=filter_find_specs,
             filter_object=self._filter_object,
             hasher_names_string=hasher_names_string,
@@ -554,21 +725,36 @@ class ExtractionFrontend(frontend.Frontend):
       else:
         logging.debug(u'Starting extraction in multi process mode.')
 
+        # The bypass storage writer passes the event objects to an output
+        # module hence the workers cannot serialize them.
+        if self._serialize_in_workers and not self._output_module:
+          event_serializer_format = storage_serializer_format
+        else:
+          event_serializer_format = None
+
         # TODO: pass number_of_extraction_workers.
         processing_status = self._engine.ProcessSources(
             source_path_specs, storage_writer_object,
+            completed_path_specs=completed_path_specs,
+            duplicate_file_check=self._duplicate_file_check,
+            enable_checkpoints=bool(checkpoint_journal),
             enable_sigsegv_handler=enable_sigsegv_handler,
+            event_batch_size=self._event_batch_size,
+            event_serializer_format=event_serializer_format,
             filter_find_specs=filter_find_specs,
             filter_object=self._filter_object,
             hasher_names_string=hasher_names_string,
             include_directory_stat=include_directory_stat,
             mount_path=self._mount_path,
+            parse_timeout=self._parse_timeout,
             number_of_extraction_workers=number_of_extraction_workers,
             parser_filter_string=parser_filter_string,
             process_archive_files=self._process_archive_files,
             status_update_callback=status_update_callback,
             show_memory_usage=self._show_worker_memory_information,
-            text_prepend=self._text_prepend)
+            text_prepend=self._text_prepend,
+            worker_memory_limit=self._worker_memory_limit,
+            worker_path_spec_limit=self._worker_path_spec_limit)
 
     except KeyboardInterrupt:
       self._CleanUpAfterAbort()
@@ -587,6 +773,12 @@ class ExtractionFrontend(frontend.Frontend):
       if self._debug_mode:
         pdb.post_mortem()
 
+    # The checkpoint journal is only needed to resume an interrupted
+    # extraction.
+    if (checkpoint_journal and processing_status and
+        not processing_status.error_detected):
+      checkpoint_journal.Clear()
+
     return processing_status
 
   def SetDebugMode(self, enable_debug=False):
@@ -599,6 +791,31 @@ class ExtractionFrontend(frontend.Frontend):
     """
     self._debug_mode = enable_debug
 
+  def SetDuplicateFileCheck(self, duplicate_file_check):
+    """Sets whether unchanged files in VSS stores should be skipped.
+
+    The check only applies to the volumes of which VSS stores are processed.
+
+    Args:
+      duplicate_file_check: boolean value to indicate to skip files in VSS
+                            stores that have not changed since they were
+                            collected from the volume or another store.
+    """
+    self._duplicate_file_check = duplicate_file_check
+
+  def SetEnableCheckpoints(self, enable_checkpoints):
+    """Enables or disables checkpoints.
+
+    Checkpoints periodically commit the storage file and record the path
+    specifications completed by then, which is needed to resume an
+    interrupted extraction.
+
+    Args:
+      enable_checkpoints: boolean value to indicate if checkpoints should
+                          be written.
+    """
+    self._enable_checkpoints = enable_checkpoints
+
   def SetEnablePreprocessing(self, enable_preprocessing):
     """Enables or disables preprocessing.
 
@@ -625,6 +842,40 @@ class ExtractionFrontend(frontend.Frontend):
     self._profiling_sample_rate = profiling_sample_rate
     self._profiling_type = profiling_type
 
+  def SetParseTimeout(self, parse_timeout):
+    """Sets the parse timeout.
+
+    An extraction worker process with a parser that exceeds the timeout is
+    killed and replaced by a new worker process. The parse timeout is not
+    supported in single process mode.
+
+    Args:
+      parse_timeout: number of seconds a parser can spend parsing a file
+                     entry, where 0 represents no timeout.
+    """
+    self._parse_timeout = parse_timeout
+
+  def SetSerializeInWorkers(self, serialize_in_workers=False):
+    """Sets whether the extraction workers should serialize the event objects.
+
+    Args:
+      serialize_in_workers: optional boolean value to indicate if the event
+                            objects should be serialized by the extraction
+                            workers instead of the storage writer.
+    """
+    self._serialize_in_workers = serialize_in_workers
+
+  def SetEventBatchSize(self, event_batch_size):
+    """Sets the maximum number of event objects in a batch.
+
+    Args:
+      event_batch_size: integer value that contains the maximum number of event
+                        objects the extraction workers push onto the event
+                        object queue as a single batch, where 0 represents
+                        batching is disabled.
+    """
+    self._event_batch_size = event_batch_size
+
   def SetShowMemoryInformation(self, show_memory=True):
     """Sets a flag telling the worker monitor to show memory information.
 
@@ -669,3 +920,19 @@ class ExtractionFrontend(frontend.Frontend):
                   for queuing.
     """
     self._use_zeromq = use_zeromq
+
+  def SetWorkerLimits(self, memory_limit=0, path_spec_limit=0):
+    """Sets the limits of the extraction worker processes.
+
+    A worker process that reaches one of its limits stops after the path
+    specification it is processing and is replaced by a new worker process.
+
+    Args:
+      memory_limit: optional maximum number of bytes of resident memory (RSS)
+                    a worker process can use, where 0 represents no limit.
+      path_spec_limit: optional maximum number of path specifications
+                       a worker process processes, where 0 represents
+                       no limit.
+    """
+    self._worker_memory_limit = memory_limit
+    self._worker_path_spec_limit = path_spec_limit
@@ -49,6 +49,7 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     self._filter_expression = None
     # Instance of EventObjectFilter.
     self._filter_object = None
+    self._number_of_merge_processes = 0
     self._output_format = None
     self._preferred_language = u'en-US'
     self._quiet_mode = False
@@ -388,7 +389,16 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     if not analysis_queues:
       analysis_queues = []
 
-    for event_object in storage_reader.GetEvents(time_range=time_slice):
+    # The storage reader can skip the event objects that cannot match
+    # the filter before they are deserialized. This is not possible when
+    # a filter buffer is used since the time slice contains event objects
+    # that do not match the filter.
+    event_predicates = None
+    if my_filter and not filter_buffer:
+      event_predicates = getattr(my_filter, u'event_predicates', None)
+
+    for event_object in storage_reader.GetEvents(
+        event_predicates=event_predicates, time_range=time_slice):
       # TODO: clean up this function.
       if not my_filter:
         counter[u'Events Included'] += 1
@@ -433,6 +443,11 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
           else:
             counter[u'Events Filtered Out'] += 1
 
+    # The events that the storage reader skipped did not match the filter.
+    if event_predicates:
+      counter[u'Events Filtered Out'] += (
+          storage_reader.number_of_filtered_events)
+
     for analysis_queue in analysis_queues:
       analysis_queue.Close()
 
@@ -519,7 +534,14 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     output_buffer = output_event_buffer.EventBuffer(
         output_module, deduplicate_events)
     with output_buffer:
-      storage_reader = storage_zip_file.ZIPStorageFileReader(storage_file)
+      if self._number_of_merge_processes > 1:
+        storage_reader = storage_zip_file.ZIPStorageFileParallelReader(
+            storage_file, number_of_processes=self._number_of_merge_processes)
+      else:
+        # Events that are filtered out or deduplicated before the output
+        # module formats them are only partially decoded.
+        storage_reader = storage_zip_file.ZIPStorageFileReader(
+            storage_file, lazy_decoding=True)
       counter = self.ProcessEventsFromStorage(
           storage_reader, output_buffer, analysis_queues=event_queue_producers,
           filter_buffer=self._filter_buffer, my_filter=self._filter_object,
@@ -551,6 +573,17 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     self._filter_object = filter_object
     self._filter_expression = filter_expression
 
+  def SetNumberOfMergeProcesses(self, number_of_merge_processes=0):
+    """Sets the number of processes used to merge the event object streams.
+
+    Args:
+      number_of_merge_processes: optional integer containing the number of
+                                 processes used to decode and merge the event
+                                 object streams, where 0 or 1 represents that
+                                 the streams are merged in the main process.
+    """
+    self._number_of_merge_processes = number_of_merge_processes
+
   def SetPreferredLanguageIdentifier(self, language_identifier):
     """Sets the preferred language identifier.
 
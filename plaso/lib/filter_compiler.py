@@ -0,0 +1,872 @@
+# -*- coding: utf-8 -*-
+"""A compiler that turns object filters into trees of match nodes.
+
+The object filter evaluates a filter expression by walking the tree of
+filter objects for every event object, where every attribute access goes
+through a value expander. The filter compiler converts the filter objects
+tree once into a tree of match nodes that are specialized for the operators
+and operands of the filter expression:
+
+* the paths of the attributes are split and lowercased at compile time;
+* the right operands, such as the regular expressions and the timestamps of
+  date comparisons, are prepared at compile time;
+* the formatted message and source strings are determined at most once per
+  evaluation.
+
+The match nodes are instances of module level classes, hence a compiled
+filter can be pickled, e.g. to pass it to a worker process.
+
+The filter compiler also determines the event predicates of the filter,
+such as the timestamp bounds and the parser names, that the storage can
+evaluate before the event objects are deserialized.
+"""
+
+import logging
+import operator
+
+from plaso.formatters import manager as formatters_manager
+from plaso.formatters import mediator as formatters_mediator
+from plaso.lib import objectfilter
+from plaso.lib import pfilter
+from plaso.lib import py2to3
+from plaso.lib import utils
+from plaso.storage import event_predicates as storage_event_predicates
+
+
+class _EventValues(object):
+  """Class that determines the values of the attributes of event objects."""
+
+  def __init__(self):
+    """Initializes an event values object."""
+    super(_EventValues, self).__init__()
+    self._formatter_mediator = None
+
+  def __getstate__(self):
+    """Retrieves the state of the event values object for pickling.
+
+    The formatter mediator is not pickled, since it can refer to an open
+    database, it is created again when needed.
+
+    Returns:
+      A dictionary containing the attributes.
+    """
+    state = dict(self.__dict__)
+    state[u'_formatter_mediator'] = None
+    return state
+
+  def _GetMessage(self, event_object, cache):
+    """Retrieves the formatted message string.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+      cache: a dictionary that caches the values determined for the object
+             or None if the values should not be cached.
+
+    Returns:
+      A string containing the formatted message.
+    """
+    if cache is not None and u'message' in cache:
+      return cache[u'message']
+
+    if not self._formatter_mediator:
+      self._formatter_mediator = formatters_mediator.FormatterMediator()
+
+    message = u''
+    try:
+      message, _ = formatters_manager.FormattersManager.GetMessageStrings(
+          self._formatter_mediator, event_object)
+    except KeyError as exception:
+      logging.warning(u'Unable to correctly assemble event: {0:s}'.format(
+          exception))
+
+    if cache is not None:
+      cache[u'message'] = message
+    return message
+
+  def _GetSources(self, event_object, cache):
+    """Retrieves the formatted source strings.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+      cache: a dictionary that caches the values determined for the object
+             or None if the values should not be cached.
+
+    Returns:
+      A tuple containing the short and long source string.
+    """
+    if cache is not None and u'sources' in cache:
+      return cache[u'sources']
+
+    sources = (None, None)
+    try:
+      sources = formatters_manager.FormattersManager.GetSourceStrings(
+          event_object)
+    except KeyError as exception:
+      logging.warning(u'Unable to correctly assemble event: {0:s}'.format(
+          exception))
+
+    if cache is not None:
+      cache[u'sources'] = sources
+    return sources
+
+  def ExpandValues(self, obj, path_segments, cache):
+    """Expands the values of a path in an object.
+
+    Args:
+      obj: the object.
+      path_segments: a list of strings containing the lowercased path segments.
+      cache: a dictionary that caches the values determined for the object
+             or None if the values should not be cached.
+
+    Yields:
+      The values of the path in the object.
+    """
+    attribute_value = self.GetValue(obj, path_segments[0], cache)
+    if attribute_value is None:
+      return
+
+    if len(path_segments) == 1:
+      yield attribute_value
+      return
+
+    try:
+      if isinstance(attribute_value, dict):
+        yield attribute_value
+      else:
+        for sub_object in attribute_value:
+          for value in self.ExpandValues(sub_object, path_segments[1:], None):
+            yield value
+
+    except TypeError:
+      for value in self.ExpandValues(
+          attribute_value, path_segments[1:], None):
+        yield value
+
+  def GetValue(self, obj, attribute_name, cache):
+    """Retrieves the value of an attribute.
+
+    Args:
+      obj: the object.
+      attribute_name: string containing the lowercased name of the attribute.
+      cache: a dictionary that caches the values determined for the object
+             or None if the values should not be cached.
+
+    Returns:
+      The value of the attribute or None if not available.
+    """
+    value = getattr(obj, attribute_name, None)
+    if value:
+      if isinstance(value, dict):
+        value = pfilter.DictObject(value)
+
+      if attribute_name == u'tag':
+        return value.tags
+
+      return value
+
+    if attribute_name == u'message':
+      return self._GetMessage(obj, cache)
+
+    if attribute_name in (u'source', u'source_short'):
+      source_short, _ = self._GetSources(obj, cache)
+      return source_short
+
+    if attribute_name in (u'source_long', u'sourcetype'):
+      _, source_long = self._GetSources(obj, cache)
+      return source_long
+
+
+class _AttributeValues(object):
+  """Class that retrieves the value of an attribute."""
+
+  def __init__(self, event_values, attribute_name):
+    """Initializes an attribute values object.
+
+    Args:
+      event_values: the event values (instance of _EventValues).
+      attribute_name: string containing the lowercased name of the attribute.
+    """
+    super(_AttributeValues, self).__init__()
+    self._attribute_name = attribute_name
+    self._event_values = event_values
+
+  def GetValues(self, obj, cache):
+    """Retrieves the values.
+
+    Args:
+      obj: the object.
+      cache: a dictionary that caches the values determined for the object.
+
+    Returns:
+      A tuple containing the value of the attribute or an empty tuple if
+      not available.
+    """
+    value = self._event_values.GetValue(obj, self._attribute_name, cache)
+    if value is None:
+      return ()
+    return (value,)
+
+
+class _PathValues(object):
+  """Class that expands the values of a path."""
+
+  def __init__(self, event_values, path_segments):
+    """Initializes a path values object.
+
+    Args:
+      event_values: the event values (instance of _EventValues).
+      path_segments: a list of strings containing the lowercased path segments.
+    """
+    super(_PathValues, self).__init__()
+    self._event_values = event_values
+    self._path_segments = path_segments
+
+  def GetValues(self, obj, cache):
+    """Retrieves the values.
+
+    Args:
+      obj: the object.
+      cache: a dictionary that caches the values determined for the object.
+
+    Returns:
+      A generator that yields the values of the path in the object.
+    """
+    return self._event_values.ExpandValues(obj, self._path_segments, cache)
+
+
+class _ComparisonOperation(object):
+  """Class that compares a value with the right operand."""
+
+  def __init__(self, comparison_function, right_operand):
+    """Initializes a comparison operation object.
+
+    Args:
+      comparison_function: the comparison function, such as operator.eq.
+      right_operand: the right operand.
+    """
+    super(_ComparisonOperation, self).__init__()
+    self._comparison_function = comparison_function
+    self._right_operand = right_operand
+
+  def Apply(self, value):
+    """Applies the operation on a value.
+
+    Args:
+      value: the value.
+
+    Returns:
+      A boolean value that indicates the result of the operation.
+    """
+    return self._comparison_function(value, self._right_operand)
+
+
+class _ContainsOperation(object):
+  """Class that determines if a value contains a string, case insensitive."""
+
+  def __init__(self, right_operand):
+    """Initializes a contains operation object.
+
+    Args:
+      right_operand: string containing the right operand.
+    """
+    super(_ContainsOperation, self).__init__()
+    self._lower_case_right_operand = right_operand.lower()
+    self._right_operand = right_operand
+
+  def Apply(self, value):
+    """Applies the operation on a value.
+
+    Args:
+      value: the value.
+
+    Returns:
+      A boolean value that indicates the result of the operation.
+    """
+    if isinstance(value, py2to3.STRING_TYPES):
+      return self._lower_case_right_operand in value.lower()
+    return self._right_operand in value
+
+
+class _DateComparisonOperation(object):
+  """Class that compares a value with a date.
+
+  Integer values, such as timestamps, are compared directly with the
+  timestamp of the date instead of the date compare object.
+  """
+
+  def __init__(self, comparison_function, right_operand):
+    """Initializes a date comparison operation object.
+
+    Args:
+      comparison_function: the comparison function, such as operator.eq.
+      right_operand: the date compare object (instance of
+                     pfilter.DateCompareObject).
+    """
+    super(_DateComparisonOperation, self).__init__()
+    self._comparison_function = comparison_function
+    self._right_operand = right_operand
+    self._timestamp = right_operand.data
+
+  def Apply(self, value):
+    """Applies the operation on a value.
+
+    Args:
+      value: the value.
+
+    Returns:
+      A boolean value that indicates the result of the operation.
+    """
+    if isinstance(value, py2to3.INTEGER_TYPES):
+      return self._comparison_function(value, self._timestamp)
+    return self._comparison_function(value, self._right_operand)
+
+
+class _FilterObjectOperation(object):
+  """Class that applies the operation of a binary operator filter object."""
+
+  def __init__(self, filter_object):
+    """Initializes a filter object operation object.
+
+    Args:
+      filter_object: the filter object (instance of
+                     objectfilter.GenericBinaryOperator).
+    """
+    super(_FilterObjectOperation, self).__init__()
+    self._filter_object = filter_object
+
+  def Apply(self, value):
+    """Applies the operation on a value.
+
+    Args:
+      value: the value.
+
+    Returns:
+      A boolean value that indicates the result of the operation.
+    """
+    return self._filter_object.Operation(
+        value, self._filter_object.right_operand)
+
+
+class _RegexpOperation(object):
+  """Class that searches a value with a regular expression."""
+
+  def __init__(self, compiled_re):
+    """Initializes a regular expression operation object.
+
+    Args:
+      compiled_re: the compiled regular expression.
+    """
+    super(_RegexpOperation, self).__init__()
+    self._compiled_re = compiled_re
+
+  def Apply(self, value):
+    """Applies the operation on a value.
+
+    Args:
+      value: the value.
+
+    Returns:
+      A boolean value that indicates the result of the operation.
+    """
+    try:
+      match = self._compiled_re.search(utils.GetUnicodeString(value))
+    except TypeError:
+      return False
+
+    return match is not None
+
+
+class _AndMatchNode(object):
+  """Class that matches if all its child match nodes match."""
+
+  def __init__(self, match_nodes):
+    """Initializes an AND match node object.
+
+    Args:
+      match_nodes: a list of the child match nodes.
+    """
+    super(_AndMatchNode, self).__init__()
+    self._match_nodes = match_nodes
+
+  def Matches(self, obj, cache):
+    """Determines if an object matches.
+
+    Args:
+      obj: the object.
+      cache: a dictionary that caches the values determined for the object.
+
+    Returns:
+      A boolean value that indicates a match.
+    """
+    for match_node in self._match_nodes:
+      if not match_node.Matches(obj, cache):
+        return False
+    return True
+
+
+class _BinaryOperatorMatchNode(object):
+  """Class that matches if the operation succeeds for one of the values."""
+
+  def __init__(self, values, operation, bool_value):
+    """Initializes a binary operator match node object.
+
+    Args:
+      values: the values of the left operand (instance of _AttributeValues
+              or _PathValues).
+      operation: the operation with the right operand, such as
+                 _ComparisonOperation.
+      bool_value: the boolean value that is returned when the operation
+                  succeeds for one of the values.
+    """
+    super(_BinaryOperatorMatchNode, self).__init__()
+    self._bool_value = bool_value
+    self._operation = operation
+    self._values = values
+
+  def Matches(self, obj, cache):
+    """Determines if an object matches.
+
+    Args:
+      obj: the object.
+      cache: a dictionary that caches the values determined for the object.
+
+    Returns:
+      A boolean value that indicates a match.
+    """
+    for value in self._values.GetValues(obj, cache):
+      try:
+        if self._operation.Apply(value):
+          return self._bool_value
+      except (TypeError, ValueError):
+        continue
+    return not self._bool_value
+
+
+class _ContextMatchNode(object):
+  """Class that matches if the condition matches one of the sub objects."""
+
+  def __init__(self, values, match_node):
+    """Initializes a context match node object.
+
+    Args:
+      values: the values of the context (instance of _AttributeValues
+              or _PathValues).
+      match_node: the match node of the condition.
+    """
+    super(_ContextMatchNode, self).__init__()
+    self._match_node = match_node
+    self._values = values
+
+  def Matches(self, obj, cache):
+    """Determines if an object matches.
+
+    Args:
+      obj: the object.
+      cache: a dictionary that caches the values determined for the object.
+
+    Returns:
+      A boolean value that indicates a match.
+    """
+    for object_list in self._values.GetValues(obj, cache):
+      for sub_object in object_list:
+        if self._match_node.Matches(sub_object, {}):
+          return True
+    return False
+
+
+class _FilterObjectMatchNode(object):
+  """Class that matches if the filter object matches."""
+
+  def __init__(self, filter_object):
+    """Initializes a filter object match node object.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.Filter).
+    """
+    super(_FilterObjectMatchNode, self).__init__()
+    self._filter_object = filter_object
+
+  def Matches(self, obj, unused_cache):
+    """Determines if an object matches.
+
+    Args:
+      obj: the object.
+
+    Returns:
+      A boolean value that indicates a match.
+    """
+    return self._filter_object.Matches(obj)
+
+
+class _IdentityMatchNode(object):
+  """Class that matches any object."""
+
+  def Matches(self, unused_obj, unused_cache):
+    """Determines if an object matches.
+
+    Returns:
+      True.
+    """
+    return True
+
+
+class _OrMatchNode(object):
+  """Class that matches if one of its child match nodes matches."""
+
+  def __init__(self, match_nodes):
+    """Initializes an OR match node object.
+
+    Args:
+      match_nodes: a list of the child match nodes.
+    """
+    super(_OrMatchNode, self).__init__()
+    self._match_nodes = match_nodes
+
+  def Matches(self, obj, cache):
+    """Determines if an object matches.
+
+    Args:
+      obj: the object.
+      cache: a dictionary that caches the values determined for the object.
+
+    Returns:
+      A boolean value that indicates a match.
+    """
+    for match_node in self._match_nodes:
+      if match_node.Matches(obj, cache):
+        return True
+    return False
+
+
+class CompiledFilter(object):
+  """Class that implements a compiled filter.
+
+  Attributes:
+    event_predicates: the event predicates (instance of EventPredicates)
+                      an event object must meet to match the filter or
+                      None if not available.
+  """
+
+  def __init__(self, match_node, event_predicates=None):
+    """Initializes a compiled filter object.
+
+    Args:
+      match_node: the match node that determines if an object matches
+                  the filter.
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) an event object must meet to
+                        match the filter.
+    """
+    super(CompiledFilter, self).__init__()
+    self._match_node = match_node
+    self.event_predicates = event_predicates
+
+  def Filter(self, objects):
+    """Filters objects.
+
+    Args:
+      objects: a list of objects.
+
+    Returns:
+      A list of the objects that match the filter.
+    """
+    return [obj for obj in objects if self._match_node.Matches(obj, {})]
+
+  def Matches(self, obj):
+    """Determines if an object matches the filter.
+
+    Args:
+      obj: the object.
+
+    Returns:
+      A boolean value that indicates a match.
+    """
+    return self._match_node.Matches(obj, {})
+
+
+class FilterCompiler(object):
+  """Class that implements the filter compiler.
+
+  The compiled filter has the same semantics as a filter compiled with
+  the plaso attribute filter implementation. Filter objects the compiler
+  has no specialization for are evaluated by the filter object itself.
+  """
+
+  # The comparison functions of the comparison operators.
+  _COMPARISON_FUNCTIONS = {
+      objectfilter.Equals: operator.eq,
+      objectfilter.Greater: operator.gt,
+      objectfilter.GreaterEqual: operator.ge,
+      objectfilter.Less: operator.lt,
+      objectfilter.LessEqual: operator.le,
+      objectfilter.NotEquals: operator.eq}
+
+  # The attributes of which the values can be used as event predicates.
+  _EVENT_PREDICATE_ATTRIBUTES = frozenset([
+      u'data_type', u'parser', u'store_number', u'timestamp'])
+
+  def __init__(self):
+    """Initializes a filter compiler object."""
+    super(FilterCompiler, self).__init__()
+    self._event_values = _EventValues()
+
+  def _CompileAndFilter(self, filter_object):
+    """Compiles an AND filter.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.AndFilter).
+
+    Returns:
+      The match node (instance of _AndMatchNode).
+    """
+    match_nodes = [
+        self._CompileFilter(child_filter)
+        for child_filter in filter_object.args]
+    return _AndMatchNode(match_nodes)
+
+  def _CompileBinaryOperator(self, filter_object):
+    """Compiles a binary operator.
+
+    Args:
+      filter_object: the filter object (instance of
+                     objectfilter.GenericBinaryOperator).
+
+    Returns:
+      The match node (instance of _BinaryOperatorMatchNode).
+    """
+    values = self._CompileGetValues(filter_object.left_operand)
+    operation = self._CompileOperation(filter_object)
+    return _BinaryOperatorMatchNode(
+        values, operation, filter_object.bool_value)
+
+  def _CompileContext(self, filter_object):
+    """Compiles a context operator.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.Context).
+
+    Returns:
+      The match node (instance of _ContextMatchNode).
+    """
+    values = self._CompileGetValues(filter_object.context)
+    match_node = self._CompileFilter(filter_object.condition)
+    return _ContextMatchNode(values, match_node)
+
+  def _CompileFilter(self, filter_object):
+    """Compiles a filter object.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.Filter).
+
+    Returns:
+      The match node that determines if an object matches the filter. Its
+      Matches method takes the object and a dictionary that caches the values
+      determined for the object as arguments.
+    """
+    filter_type = type(filter_object)
+    if filter_type is objectfilter.AndFilter:
+      return self._CompileAndFilter(filter_object)
+
+    elif filter_type is objectfilter.OrFilter:
+      return self._CompileOrFilter(filter_object)
+
+    elif filter_type is objectfilter.IdentityFilter:
+      return _IdentityMatchNode()
+
+    elif filter_type is objectfilter.Context:
+      return self._CompileContext(filter_object)
+
+    elif isinstance(filter_object, objectfilter.GenericBinaryOperator):
+      return self._CompileBinaryOperator(filter_object)
+
+    logging.debug(u'Unable to compile filter: {0:s}'.format(
+        filter_type.__name__))
+    return _FilterObjectMatchNode(filter_object)
+
+  def _CompileGetValues(self, path):
+    """Compiles the expansion of the values of a path.
+
+    Args:
+      path: string containing the path.
+
+    Returns:
+      The values of the path (instance of _AttributeValues or _PathValues).
+    """
+    field_separator = objectfilter.ValueExpander.FIELD_SEPARATOR
+    path_segments = [
+        path_segment.lower() for path_segment in path.split(field_separator)]
+
+    if len(path_segments) > 1:
+      return _PathValues(self._event_values, path_segments)
+
+    return _AttributeValues(self._event_values, path_segments[0])
+
+  def _CompileOperation(self, filter_object):
+    """Compiles the operation of a binary operator.
+
+    Args:
+      filter_object: the filter object (instance of
+                     objectfilter.GenericBinaryOperator).
+
+    Returns:
+      The operation that is applied on a value with the right operand.
+    """
+    filter_type = type(filter_object)
+    right_operand = filter_object.right_operand
+
+    if filter_type in (objectfilter.Regexp, objectfilter.RegexpInsensitive):
+      return _RegexpOperation(filter_object.compiled_re)
+
+    elif (filter_type is objectfilter.Contains and
+          isinstance(right_operand, py2to3.STRING_TYPES)):
+      return _ContainsOperation(right_operand)
+
+    comparison_function = self._COMPARISON_FUNCTIONS.get(filter_type, None)
+    if comparison_function:
+      if isinstance(right_operand, pfilter.DateCompareObject):
+        return _DateComparisonOperation(comparison_function, right_operand)
+
+      return _ComparisonOperation(comparison_function, right_operand)
+
+    return _FilterObjectOperation(filter_object)
+
+  def _CompileOrFilter(self, filter_object):
+    """Compiles an OR filter.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.OrFilter).
+
+    Returns:
+      The match node (instance of _IdentityMatchNode or _OrMatchNode).
+    """
+    match_nodes = [
+        self._CompileFilter(child_filter)
+        for child_filter in filter_object.args]
+
+    if not match_nodes:
+      return _IdentityMatchNode()
+
+    return _OrMatchNode(match_nodes)
+
+  def _ExtractBinaryOperatorEventPredicates(self, filter_object):
+    """Extracts event predicates from a binary operator.
+
+    Args:
+      filter_object: the filter object (instance of
+                     objectfilter.GenericBinaryOperator).
+
+    Returns:
+      The event predicates (instance of EventPredicates).
+    """
+    event_predicates = storage_event_predicates.EventPredicates()
+
+    # A negated operator can match any value except the right operand.
+    if not filter_object.bool_value:
+      return event_predicates
+
+    attribute_name = getattr(filter_object, u'left_operand', None)
+    if not isinstance(attribute_name, py2to3.STRING_TYPES):
+      return event_predicates
+
+    attribute_name = attribute_name.lower()
+    if attribute_name not in self._EVENT_PREDICATE_ATTRIBUTES:
+      return event_predicates
+
+    filter_type = type(filter_object)
+    right_operand = filter_object.right_operand
+
+    if attribute_name == u'timestamp':
+      if not isinstance(right_operand, pfilter.DateCompareObject):
+        return event_predicates
+
+      timestamp = right_operand.data
+      if filter_type is objectfilter.Equals:
+        event_predicates.start_timestamp = timestamp
+        event_predicates.end_timestamp = timestamp
+
+      elif filter_type in (objectfilter.Greater, objectfilter.GreaterEqual):
+        event_predicates.start_timestamp = timestamp
+
+      elif filter_type in (objectfilter.Less, objectfilter.LessEqual):
+        event_predicates.end_timestamp = timestamp
+
+    elif attribute_name == u'parser' and filter_type is pfilter.ParserList:
+      event_predicates.parsers = frozenset(filter_object.compiled_list)
+
+    elif filter_type is objectfilter.Equals:
+      if attribute_name == u'store_number':
+        if isinstance(right_operand, py2to3.INTEGER_TYPES):
+          event_predicates.store_numbers = frozenset([right_operand])
+
+      elif isinstance(right_operand, py2to3.STRING_TYPES):
+        if attribute_name == u'data_type':
+          event_predicates.data_types = frozenset([right_operand])
+        else:
+          event_predicates.parsers = frozenset([right_operand])
+
+    return event_predicates
+
+  def _ExtractEventPredicates(self, filter_object):
+    """Extracts the event predicates from a filter object.
+
+    The event predicates are conservative, an event object that matches
+    the filter always meets the event predicates.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.Filter).
+
+    Returns:
+      The event predicates (instance of EventPredicates).
+    """
+    filter_type = type(filter_object)
+    if filter_type in (objectfilter.AndFilter, objectfilter.OrFilter):
+      child_event_predicates = [
+          self._ExtractEventPredicates(child_filter)
+          for child_filter in filter_object.args]
+
+      if not child_event_predicates:
+        return storage_event_predicates.EventPredicates()
+
+      event_predicates = child_event_predicates[0]
+      for other_event_predicates in child_event_predicates[1:]:
+        if filter_type is objectfilter.AndFilter:
+          event_predicates = event_predicates.Intersection(
+              other_event_predicates)
+        else:
+          event_predicates = event_predicates.Union(other_event_predicates)
+
+      return event_predicates
+
+    elif isinstance(filter_object, objectfilter.GenericBinaryOperator):
+      return self._ExtractBinaryOperatorEventPredicates(filter_object)
+
+    return storage_event_predicates.EventPredicates()
+
+  def Compile(self, filter_object):
+    """Compiles a filter object.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.Filter)
+                     compiled with the plaso attribute filter implementation.
+
+    Returns:
+      A compiled filter (instance of CompiledFilter).
+    """
+    event_predicates = self._ExtractEventPredicates(filter_object)
+    return CompiledFilter(
+        self._CompileFilter(filter_object), event_predicates=event_predicates)
+
+  def CompileExpression(self, expression):
+    """Compiles a parsed filter expression.
+
+    Args:
+      expression: the parsed filter expression (instance of
+                  lexer.Expression) e.g. the result of
+                  pfilter.BaseParser.Parse().
+
+    Returns:
+      A compiled filter (instance of CompiledFilter).
+    """
+    filter_object = expression.Compile(
+        pfilter.PlasoAttributeFilterImplementation)
+    return self.Compile(filter_object)
@@ -30,6 +30,44 @@ class Signature(object):
     self.offset = offset
     self.pattern = pattern
 
+  @property
+  def is_bound(self):
+    """Determines if the signature is bound to an offset."""
+    return self.offset is not None
+
+  def Matches(self, data, data_offset=0, data_size=None):
+    """Determines if the signature matches data of a bound range.
+
+    Args:
+      data: a binary string containing the data of the range.
+      data_offset: optional integer containing the offset of the range
+                   relative to the start of the data.
+      data_size: optional integer containing the size of all the data,
+                 which is required for signatures that are bound to the end
+                 of the data. The default is the size of the range.
+
+    Returns:
+      A boolean value that indicates the signature matches, False if the
+      signature is not bound to an offset.
+    """
+    if self.offset is None:
+      return False
+
+    if data_size is None:
+      data_size = data_offset + len(data)
+
+    if self.offset < 0:
+      pattern_offset = data_size + self.offset
+    else:
+      pattern_offset = self.offset
+
+    pattern_offset -= data_offset
+    if pattern_offset < 0:
+      return False
+
+    pattern_size = len(self.pattern)
+    return data[pattern_offset:pattern_offset + pattern_size] == self.pattern
+
   def SetIdentifier(self, identifier):
     """Sets the identifier of the signature in the specification store.
 
@@ -67,14 +105,35 @@ class FormatSpecification(object):
 
 
 class FormatSpecificationStore(object):
-  """Class that serves as a store for specifications."""
+  """Class that serves as a store for specifications.
+
+  Attributes:
+    footer_size: the size of the range at the end of the data that contains
+                 all the signatures that are bound to the end of the data.
+    header_size: the size of the range at the start of the data that contains
+                 all the signatures that are bound to the start of the data.
+  """
 
   def __init__(self):
     """Initializes the specification store."""
     super(FormatSpecificationStore, self).__init__()
+    self._bound_signatures = []
+    self._floating_signatures = []
     self._format_specifications = {}
     # Maps signature identifiers to format specifications.
     self._signature_map = {}
+    self.footer_size = 0
+    self.header_size = 0
+
+  @property
+  def bound_signatures(self):
+    """The signatures that are bound to an offset."""
+    return self._bound_signatures
+
+  @property
+  def floating_signatures(self):
+    """The signatures that are not bound to an offset."""
+    return self._floating_signatures
 
   @property
   def specifications(self):
@@ -135,6 +194,17 @@ class FormatSpecificationStore(object):
       signature.SetIdentifier(signature_identifier)
       self._signature_map[signature_identifier] = specification
 
+      if signature.offset is None:
+        self._floating_signatures.append(signature)
+        continue
+
+      self._bound_signatures.append(signature)
+      if signature.offset < 0:
+        self.footer_size = max(self.footer_size, -signature.offset)
+      else:
+        self.header_size = max(
+            self.header_size, signature.offset + len(signature.pattern))
+
   def GetSpecificationBySignature(self, signature_identifier):
     """Retrieves a specification mapped to a signature identifier.
 
@@ -13,6 +13,7 @@ import sys
 import time
 
 from dfvfs.resolver import context
+from dfvfs.serializer import protobuf_serializer as dfvfs_protobuf_serializer
 
 from plaso.engine import collector
 from plaso.engine import engine
@@ -24,6 +25,8 @@ from plaso.lib import errors
 from plaso.multi_processing import process_info
 from plaso.multi_processing import xmlrpc
 from plaso.parsers import mediator as parsers_mediator
+from plaso.serializer import json_serializer
+from plaso.serializer import protobuf_serializer
 
 
 class MultiProcessBaseProcess(multiprocessing.Process):
@@ -229,8 +232,14 @@ class MultiProcessBaseProcess(multiprocessing.Process):
 class MultiProcessCollectorProcess(MultiProcessBaseProcess):
   """Class that defines a multi-processing collector process."""
 
+  # The maximum number of path specifications the collector holds back
+  # to produce the path specifications with the highest estimated
+  # processing cost first.
+  _PATH_SPEC_REORDER_WINDOW_SIZE = 5000
+
   def __init__(
       self, stop_collector_event, source_path_specs, path_spec_queue,
+      completed_path_specs=None, duplicate_file_check=False,
       filter_find_specs=None, include_directory_stat=True, **kwargs):
     """Initializes the process object.
 
@@ -242,6 +251,11 @@ class MultiProcessCollectorProcess(MultiProcessBaseProcess):
                          dfvfs.PathSpec) to process.
       path_spec_queue: the path specification queue object (instance of
                        MultiProcessingQueue).
+      completed_path_specs: Optional set of the comparables of the path
+                            specifications that should be skipped.
+      duplicate_file_check: Optional boolean value to indicate to skip files
+                            in VSS stores that have not changed since they
+                            were collected from the volume or another store.
       filter_find_specs: Optional list of filter find specifications (instances
                          of dfvfs.FindSpec).
       include_directory_stat: Optional boolean value to indicate whether
@@ -259,6 +273,12 @@ class MultiProcessCollectorProcess(MultiProcessBaseProcess):
     self._source_path_specs = source_path_specs
     self._stop_collector_event = stop_collector_event
     self._collector.SetCollectDirectoryMetadata(include_directory_stat)
+    self._collector.SetDuplicateFileCheck(duplicate_file_check)
+    self._collector.SetPathSpecReorderWindow(
+        self._PATH_SPEC_REORDER_WINDOW_SIZE)
+
+    if completed_path_specs:
+      self._collector.SetCompletedPathSpecs(completed_path_specs)
 
     if filter_find_specs:
       self._collector.SetFilter(filter_find_specs)
@@ -321,7 +341,8 @@ class MultiProcessEngine(engine.BaseEngine):
   * the current file entry a worker is processing;
   * the number of events extracted by each worker;
   * an indicator whether a process is alive or not;
-  * the memory consumption of the processes.
+  * the memory consumption of the processes;
+  * the time a worker spends parsing a file entry with a single parser.
   """
 
   _PROCESS_ABORT_TIMEOUT = 2.0
@@ -375,8 +396,13 @@ class MultiProcessEngine(engine.BaseEngine):
     super(MultiProcessEngine, self).__init__(
         path_spec_queue, event_object_queue, parse_error_queue)
 
+    self._completed_path_specs = None
+    self._duplicate_file_check = False
+    self._enable_checkpoints = False
     self._enable_sigsegv_handler = False
+    self._event_batch_size = 0
     self._event_object_queue_port = None
+    self._event_serializer_format = None
     self._extraction_complete_event = None
     self._filter_find_specs = None
     self._filter_object = None
@@ -386,17 +412,23 @@ class MultiProcessEngine(engine.BaseEngine):
     self._mount_path = None
     self._number_of_extraction_workers = 0
     self._parse_error_queue_port = None
+    self._parse_timeout = 0
     self._parser_filter_string = None
     self._path_spec_queue_port = None
     self._process_archive_files = False
     self._process_information_per_pid = {}
     self._processes_per_pid = {}
+    self._processing_path_specs_per_pid = {}
+    self._recycle_events_per_pid = {}
+    self._requeued_path_specs = set()
     self._rpc_clients_per_pid = {}
     self._rpc_errors_per_pid = {}
     self._show_memory_usage = False
     self._storage_writer_complete_event = None
     self._stop_collector_event = None
     self._text_prepend = None
+    self._worker_memory_limit = 0
+    self._worker_path_spec_limit = 0
 
   def _AbortJoin(self, timeout=None):
     """Aborts all registered processes by joining with the parent process.
@@ -491,6 +523,10 @@ class MultiProcessEngine(engine.BaseEngine):
       self._rpc_errors_per_pid[pid] = 0
       status_indicator = process_status.get(u'processing_status', None)
 
+      if process.type == definitions.PROCESS_TYPE_WORKER:
+        self._processing_path_specs_per_pid[pid] = process_status.get(
+            u'processing_path_spec', None)
+
     else:
       rpc_errors = self._rpc_errors_per_pid.get(pid, 0) + 1
       self._rpc_errors_per_pid[pid] = rpc_errors
@@ -516,11 +552,6 @@ class MultiProcessEngine(engine.BaseEngine):
           u'type': process.type,
       }
 
-    if status_indicator == definitions.PROCESSING_STATUS_ERROR:
-      path_spec = process_status.get(u'path_spec', None)
-      if path_spec:
-        self._processing_status.error_path_specs.append(path_spec)
-
     self._UpdateProcessingStatus(pid, process_status)
 
     if status_indicator not in (
@@ -543,12 +574,8 @@ class MultiProcessEngine(engine.BaseEngine):
       if process.type == definitions.PROCESS_TYPE_STORAGE_WRITER:
         raise errors.EngineAbort(u'Storage writer unexpectedly terminated')
 
-      self._TerminateProcess(pid)
-
-      logging.info(u'Starting replacement worker process for {0:s}'.format(
-          process.name))
-      worker_process = self._StartExtractionWorkerProcess()
-      self._StartMonitoringProcess(worker_process.pid)
+      self._ReplaceWorkerProcess(
+          pid, failed_path_spec=process_status.get(u'path_spec', None))
 
     elif status_indicator == definitions.PROCESSING_STATUS_COMPLETED:
       if process.type == definitions.PROCESS_TYPE_WORKER:
@@ -559,6 +586,15 @@ class MultiProcessEngine(engine.BaseEngine):
             u'Process {0:s} (PID: {1:d}) has completed its processing. '
             u'Total of {2:d} events extracted from {3:d} pathspecs').format(
                 process.name, pid, number_of_events, number_of_pathspecs))
+
+        self._processing_path_specs_per_pid.pop(pid, None)
+        self._recycle_events_per_pid.pop(pid, None)
+
+        if process_status.get(u'recycled', False):
+          logging.info(u'Starting replacement worker process for {0:s}'.format(
+              process.name))
+          worker_process = self._StartExtractionWorkerProcess()
+          self._StartMonitoringProcess(worker_process.pid)
       elif process.type == definitions.PROCESS_TYPE_COLLECTOR:
         number_of_pathspecs = process_status.get(
             u'produced_number_of_path_specs', 0)
@@ -574,8 +610,102 @@ class MultiProcessEngine(engine.BaseEngine):
 
       self._StopMonitoringProcess(pid)
 
-    elif self._show_memory_usage:
-      self._LogMemoryUsage(pid)
+    else:
+      if process.type == definitions.PROCESS_TYPE_WORKER:
+        if self._CheckWorkerParseTimeout(pid, process_status):
+          return
+
+        self._CheckWorkerLimits(pid, process_status)
+
+      if self._show_memory_usage:
+        self._LogMemoryUsage(pid)
+
+  def _CheckWorkerLimits(self, pid, process_status):
+    """Checks if an extraction worker process reached its limits.
+
+    A worker process that reached its memory or path specification limit
+    is signaled to stop after the path specification it is processing.
+    When it has stopped a new worker process is started to replace it.
+
+    Args:
+      pid: The process ID (PID).
+      process_status: A process status dictionary.
+
+    Raises:
+      KeyError: if the process is not registered with the engine.
+    """
+    self._RaiseIfNotRegistered(pid)
+    self._RaiseIfNotMonitored(pid)
+
+    recycle_event = self._recycle_events_per_pid.get(pid, None)
+    if not recycle_event or recycle_event.is_set():
+      return
+
+    process = self._processes_per_pid[pid]
+
+    consumed_number_of_path_specs = process_status.get(
+        u'consumed_number_of_path_specs', 0)
+    if (self._worker_path_spec_limit and
+        consumed_number_of_path_specs >= self._worker_path_spec_limit):
+      logging.info((
+          u'Process {0:s} (PID: {1:d}) reached the limit of {2:d} path '
+          u'specifications and will be recycled.').format(
+              process.name, pid, self._worker_path_spec_limit))
+      recycle_event.set()
+      return
+
+    if self._worker_memory_limit:
+      process_information = self._process_information_per_pid[pid]
+      memory_info = process_information.GetMemoryInformation()
+      if memory_info and memory_info.rss >= self._worker_memory_limit:
+        logging.info((
+            u'Process {0:s} (PID: {1:d}) reached the memory limit with RSS: '
+            u'{2:d} and will be recycled.').format(
+                process.name, pid, memory_info.rss))
+        recycle_event.set()
+
+  def _CheckWorkerParseTimeout(self, pid, process_status):
+    """Checks if the parser of an extraction worker process timed out.
+
+    A worker process with a parser that exceeds the parse timeout is killed,
+    since the parser cannot be interrupted reliably from within the worker
+    process, for example when it is stuck in native code. The file entry is
+    recorded as failed and a new worker process is started to replace it.
+
+    Args:
+      pid: The process ID (PID).
+      process_status: A process status dictionary.
+
+    Returns:
+      A boolean value indicating the worker process timed out and was
+      replaced.
+
+    Raises:
+      KeyError: if the process is not registered with the engine.
+    """
+    if not self._parse_timeout:
+      return False
+
+    parsing_time = process_status.get(u'parsing_time', 0.0)
+    if parsing_time < self._parse_timeout:
+      return False
+
+    self._RaiseIfNotRegistered(pid)
+
+    process = self._processes_per_pid[pid]
+    parser_name = process_status.get(u'parser_name', None)
+    path_spec = process_status.get(u'parser_path_spec', None)
+
+    logging.error((
+        u'Process {0:s} (PID: {1:d}) exceeded the parse timeout of {2:d} '
+        u'seconds with parser: {3!s} for path specification: {4!s}').format(
+            process.name, pid, self._parse_timeout, parser_name, path_spec))
+
+    # The path specification is not requeued, since it is expected to
+    # exceed the parse timeout again.
+    self._ReplaceWorkerProcess(
+        pid, failed_path_spec=path_spec, requeue_path_spec=False)
+    return True
 
   def _CloseStorageZeroMQQueues(self):
     """Closes all ZeroMQ queues being used by the storage writer."""
@@ -667,7 +797,8 @@ class MultiProcessEngine(engine.BaseEngine):
           linger_seconds=0)
       # The high water mark is set to 2 for these queues so that data
       # doesn't build up in the workers, to prevent data loss in the case
-      # that they crash.
+      # that they crash. Note that if event batching is enabled the high
+      # water mark applies to the number of event batches.
       parse_error_queue = zeromq_queue.ZeroMQPushConnectQueue(
           delay_open=True, port=self._parse_error_queue_port,
           name=u'{0:s} parse error'.format(process_name),
@@ -681,25 +812,38 @@ class MultiProcessEngine(engine.BaseEngine):
       path_spec_queue = self._path_spec_queue
       event_object_queue = self.event_object_queue
 
+    if self._worker_memory_limit or self._worker_path_spec_limit:
+      recycle_event = multiprocessing.Event()
+    else:
+      recycle_event = None
+
     worker_process = MultiProcessEventExtractionWorkerProcess(
         path_spec_queue, event_object_queue,
         parse_error_queue, self.knowledge_base, self._last_worker_number,
+        completed_path_specs=self._completed_path_specs,
+        enable_checkpoints=self._enable_checkpoints,
         enable_debug_output=self._enable_debug_output,
         enable_profiling=self._enable_profiling,
         enable_sigsegv_handler=self._enable_sigsegv_handler,
+        event_batch_size=self._event_batch_size,
+        event_serializer_format=self._event_serializer_format,
         filter_object=self._filter_object,
         hasher_names_string=self._hasher_names_string,
         mount_path=self._mount_path, name=process_name,
         parser_filter_string=self._parser_filter_string,
         process_archive_files=self._process_archive_files,
         profiling_sample_rate=self._profiling_sample_rate,
-        profiling_type=self._profiling_type, text_prepend=self._text_prepend)
+        profiling_type=self._profiling_type, recycle_event=recycle_event,
+        text_prepend=self._text_prepend)
 
     worker_process.start()
     self._last_worker_number += 1
 
     self._RegisterProcess(worker_process)
 
+    if recycle_event:
+      self._recycle_events_per_pid[worker_process.pid] = recycle_event
+
     return worker_process
 
   def _StopExtractionProcesses(self, abort=False):
@@ -734,9 +878,20 @@ class MultiProcessEngine(engine.BaseEngine):
 
       # Wake the processes to make sure that they are not blocking
       # waiting for new items.
+      # Since the queues were emptied a full queue is ignored. Every push
+      # is tried separately so that a full queue does not prevent the other
+      # processes from being woken.
       for _ in range(self._number_of_extraction_workers):
-        self._path_spec_queue.PushItem(plaso_queue.QueueAbort(), block=False)
-      self.event_object_queue.PushItem(plaso_queue.QueueAbort(), block=False)
+        try:
+          self._path_spec_queue.PushItem(
+              plaso_queue.QueueAbort(), block=False)
+        except errors.QueueFull:
+          pass
+
+      try:
+        self.event_object_queue.PushItem(plaso_queue.QueueAbort(), block=False)
+      except errors.QueueFull:
+        pass
 
       # TODO: The following line is commented out as a work around for
       # infinite blocking wait in storage writer process. Fix this by
@@ -875,6 +1030,88 @@ class MultiProcessEngine(engine.BaseEngine):
 
     self._processes_per_pid[process.pid] = process
 
+  def _ReplaceWorkerProcess(
+      self, pid, failed_path_spec=None, requeue_path_spec=True):
+    """Replaces a failed extraction worker process.
+
+    The worker process is terminated and a new worker process is started to
+    replace it. The path specification the worker process was processing is
+    requeued once before it is considered to have failed.
+
+    Args:
+      pid: The process ID (PID).
+      failed_path_spec: Optional comparable of the path specification that
+                        caused the worker process to fail.
+      requeue_path_spec: Optional boolean value to indicate the path
+                         specification the worker process was processing
+                         should be requeued.
+
+    Raises:
+      KeyError: if the process is not registered with the engine.
+    """
+    self._RaiseIfNotRegistered(pid)
+
+    process = self._processes_per_pid[pid]
+
+    self._TerminateProcess(pid)
+    self._recycle_events_per_pid.pop(pid, None)
+
+    if not requeue_path_spec:
+      self._processing_path_specs_per_pid.pop(pid, None)
+
+    if not requeue_path_spec or not self._RequeuePathSpec(pid):
+      if (failed_path_spec and
+          failed_path_spec not in self._processing_status.error_path_specs):
+        self._processing_status.error_path_specs.append(failed_path_spec)
+
+    logging.info(u'Starting replacement worker process for {0:s}'.format(
+        process.name))
+    worker_process = self._StartExtractionWorkerProcess()
+    self._StartMonitoringProcess(worker_process.pid)
+
+  def _RequeuePathSpec(self, pid):
+    """Requeues the path specification of a failed worker process.
+
+    The path specification that the worker process was processing when it
+    failed is pushed onto the path specification queue again, unless it was
+    requeued before, in which case it is considered to have failed.
+
+    Args:
+      pid: The process ID (PID).
+
+    Returns:
+      A boolean value indicating the path specification was requeued.
+    """
+    serialized_path_spec = self._processing_path_specs_per_pid.pop(pid, None)
+    if not serialized_path_spec:
+      return False
+
+    path_spec = json_serializer.JSONPathSpecSerializer.ReadSerialized(
+        serialized_path_spec)
+    path_spec_comparable = path_spec.comparable
+
+    # The path specification queue of the collector is not accessible from
+    # the engine when ZeroMQ is used.
+    if (self._use_zeromq or
+        path_spec_comparable in self._requeued_path_specs):
+      logging.error(u'Processing of path specification: {0:s} failed.'.format(
+          path_spec_comparable))
+      if path_spec_comparable not in self._processing_status.error_path_specs:
+        self._processing_status.error_path_specs.append(path_spec_comparable)
+      return False
+
+    logging.warning(u'Requeuing path specification: {0:s}.'.format(
+        path_spec_comparable))
+
+    try:
+      self._path_spec_queue.PushItem(path_spec, block=False)
+    except errors.QueueFull:
+      logging.error(u'Unable to requeue path specification: {0:s}.'.format(
+          path_spec_comparable))
+      return False
+
+    self._requeued_path_specs.add(path_spec_comparable)
+    return True
 
   def _StopMonitoringProcess(self, pid):
     """Stops monitoring a process.
@@ -973,30 +1210,66 @@ class MultiProcessEngine(engine.BaseEngine):
       consumed_number_of_path_specs = process_status.get(
           u'consumed_number_of_path_specs', 0)
       display_name = process_status.get(u'display_name', u'')
+      event_queue_wait_time = process_status.get(
+          u'event_queue_wait_time', 0.0)
+      number_of_event_batches = process_status.get(
+          u'number_of_event_batches', 0)
       number_of_events = process_status.get(u'number_of_events', 0)
       produced_number_of_path_specs = process_status.get(
           u'produced_number_of_path_specs', 0)
+      signature_scanned_bytes = process_status.get(
+          u'signature_scanned_bytes', 0)
+      total_signature_scanned_bytes = process_status.get(
+          u'total_signature_scanned_bytes', 0)
 
       self._processing_status.UpdateExtractionWorkerStatus(
           process.name, pid, display_name, number_of_events,
           consumed_number_of_path_specs, produced_number_of_path_specs,
-          status_indicator, process_information.status)
+          status_indicator, process_information.status,
+          event_queue_wait_time=event_queue_wait_time,
+          number_of_event_batches=number_of_event_batches,
+          signature_scanned_bytes=signature_scanned_bytes,
+          total_signature_scanned_bytes=total_signature_scanned_bytes)
 
   def ProcessSources(
-      self, source_path_specs, storage_writer, enable_sigsegv_handler=False,
-      filter_find_specs=None, filter_object=None, hasher_names_string=None,
+      self, source_path_specs, storage_writer, completed_path_specs=None,
+      duplicate_file_check=False, enable_checkpoints=False,
+      enable_sigsegv_handler=False, event_batch_size=0,
+      event_serializer_format=None, filter_find_specs=None,
+      filter_object=None, hasher_names_string=None,
       include_directory_stat=True, mount_path=None,
-      number_of_extraction_workers=0, parser_filter_string=None,
-      process_archive_files=False, status_update_callback=None,
-      show_memory_usage=False, text_prepend=None):
+      number_of_extraction_workers=0, parse_timeout=0,
+      parser_filter_string=None, process_archive_files=False,
+      status_update_callback=None,
+      show_memory_usage=False, text_prepend=None, worker_memory_limit=0,
+      worker_path_spec_limit=0):
     """Processes the sources and extract event objects.
 
     Args:
       source_path_specs: list of path specifications (instances of
                          dfvfs.PathSpec) to process.
       storage_writer: A storage writer object (instance of BaseStorageWriter).
+      completed_path_specs: optional set of the comparables of the path
+                            specifications that were completed by a previous
+                            extraction and should be skipped.
+      duplicate_file_check: optional boolean value to indicate to skip files
+                            in VSS stores that have not changed since they
+                            were collected from the volume or another store.
+      enable_checkpoints: optional boolean value to indicate the workers
+                          should mark the path specifications they completed
+                          for the storage writer checkpoints.
       enable_sigsegv_handler: optional boolean value to indicate the SIGSEGV
                               handler should be enabled.
+      event_batch_size: optional maximum number of event objects the
+                        extraction workers push onto the event object queue
+                        as a single batch. The default is 0, which represents
+                        batching is disabled.
+      event_serializer_format: optional string containing the serializer
+                               format the extraction workers should use to
+                               serialize event objects before they are
+                               pushed onto the event object queue. The
+                               default is None, which indicates the workers
+                               push the event objects as-is.
       filter_find_specs: Optional list of filter find specifications (instances
                          of dfvfs.FindSpec).
       filter_object: Optional filter object (instance of objectfilter.Filter).
@@ -1010,6 +1283,10 @@ class MultiProcessEngine(engine.BaseEngine):
                                     processes. The default is 0 which means
                                     the function will determine the suitable
                                     number.
+      parse_timeout: Optional number of seconds a parser can spend parsing
+                     a file entry, after which the worker process is killed
+                     and replaced. The default is 0, which represents
+                     no timeout.
       parser_filter_string: Optional parser filter string.
       process_archive_files: Optional boolean value to indicate if the worker
                              should scan for file entries inside files.
@@ -1018,6 +1295,14 @@ class MultiProcessEngine(engine.BaseEngine):
                          should be included in logging.
       text_prepend: Optional string that contains the text to prepend to every
                     event object.
+      worker_memory_limit: Optional maximum number of bytes of resident
+                           memory (RSS) an extraction worker process can use
+                           before it is replaced by a new worker process.
+                           The default is 0, which represents no limit.
+      worker_path_spec_limit: Optional maximum number of path specifications
+                              an extraction worker process processes before
+                              it is replaced by a new worker process.
+                              The default is 0, which represents no limit.
 
     Returns:
       The processing status (instance of ProcessingStatus).
@@ -1042,15 +1327,23 @@ class MultiProcessEngine(engine.BaseEngine):
       number_of_extraction_workers = cpu_count
 
     self._enable_sigsegv_handler = enable_sigsegv_handler
+    self._event_batch_size = event_batch_size
+    self._event_serializer_format = event_serializer_format
     self._number_of_extraction_workers = number_of_extraction_workers
     self._show_memory_usage = show_memory_usage
+    self._worker_memory_limit = worker_memory_limit
+    self._worker_path_spec_limit = worker_path_spec_limit
 
     # Keep track of certain values so we can spawn new extraction workers.
+    self._completed_path_specs = completed_path_specs
+    self._duplicate_file_check = duplicate_file_check
+    self._enable_checkpoints = enable_checkpoints
     self._filter_find_specs = filter_find_specs
     self._filter_object = filter_object
     self._hasher_names_string = hasher_names_string
     self._include_directory_stat = include_directory_stat
     self._mount_path = mount_path
+    self._parse_timeout = parse_timeout
     self._parser_filter_string = parser_filter_string
     self._process_archive_files = process_archive_files
     self._text_prepend = text_prepend
@@ -1087,6 +1380,8 @@ class MultiProcessEngine(engine.BaseEngine):
     self._stop_collector_event = multiprocessing.Event()
     collector_process = MultiProcessCollectorProcess(
         self._stop_collector_event, source_path_specs, self._path_spec_queue,
+        completed_path_specs=self._completed_path_specs,
+        duplicate_file_check=self._duplicate_file_check,
         enable_sigsegv_handler=self._enable_sigsegv_handler,
         filter_find_specs=self._filter_find_specs,
         include_directory_stat=self._include_directory_stat, name=u'Collector')
@@ -1198,11 +1493,13 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
 
   def __init__(
       self, path_spec_queue, event_object_queue, parse_error_queue,
-      knowledge_base, worker_number, enable_debug_output=False,
-      enable_profiling=False, filter_object=None, hasher_names_string=None,
-      mount_path=None, parser_filter_string=None, process_archive_files=False,
-      profiling_sample_rate=1000, profiling_type=u'all', text_prepend=None,
-      **kwargs):
+      knowledge_base, worker_number, completed_path_specs=None,
+      enable_checkpoints=False, enable_debug_output=False,
+      enable_profiling=False, event_batch_size=0, event_serializer_format=None,
+      filter_object=None, hasher_names_string=None, mount_path=None,
+      parser_filter_string=None, process_archive_files=False,
+      profiling_sample_rate=1000, profiling_type=u'all', recycle_event=None,
+      text_prepend=None, **kwargs):
     """Initializes the process object.
 
     Args:
@@ -1216,10 +1513,22 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
                       which contains information from the source data needed
                       for parsing.
       worker_number: A number that identifies the worker.
+      completed_path_specs: Optional set of the comparables of the path
+                            specifications that should not be produced again.
+      enable_checkpoints: Optional boolean value to indicate if the worker
+                          should mark the path specifications it completed.
       enable_debug_output: Optional boolean value to indicate if the debug
                            output should be enabled.
       enable_profiling: Optional boolean value to indicate if profiling should
                         be enabled.
+      event_batch_size: Optional maximum number of event objects pushed onto
+                        the event object queue as a single batch. The default
+                        is 0, which represents batching is disabled.
+      event_serializer_format: Optional string containing the serializer
+                               format used to serialize event objects before
+                               they are pushed onto the event object queue.
+                               The default is None, which indicates the event
+                               objects are not serialized by the worker.
       filter_object: Optional filter object (instance of objectfilter.Filter).
       hasher_names_string: Optional comma separated string of names of
                            hashers to enable enable.
@@ -1232,21 +1541,29 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
                              rate. The value contains the number of files
                              processed. The default value is 1000.
       profiling_type: optional profiling type.
+      recycle_event: Optional event object (instance of multiprocessing.Event)
+                     that signals the worker should stop after the path
+                     specification it is processing.
       text_prepend: Optional string that contains the text to prepend to every
                     event object.
       kwargs: keyword arguments to pass to multiprocessing.Process.
     """
     super(MultiProcessEventExtractionWorkerProcess, self).__init__(
         definitions.PROCESS_TYPE_WORKER, **kwargs)
+    self._completed_path_specs = completed_path_specs
     self._critical_error = False
+    self._enable_checkpoints = enable_checkpoints
     self._enable_debug_output = enable_debug_output
     self._event_object_queue = event_object_queue
+    self._event_batch_size = event_batch_size
     self._event_queue_producer = None
+    self._event_serializer_format = event_serializer_format
     self._extraction_worker = None
     self._knowledge_base = knowledge_base
     self._parse_error_queue = parse_error_queue
     self._path_spec_queue = path_spec_queue
     self._parse_error_queue_producer = None
+    self._recycle_event = recycle_event
     self._worker_number = worker_number
 
     # Attributes for profiling.
@@ -1270,6 +1587,15 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
     else:
       status = self._extraction_worker.GetStatus()
 
+    if self._extraction_worker:
+      # The path specification is serialized so that the engine can requeue
+      # it if the worker fails.
+      processing_path_spec = self._extraction_worker.processing_path_spec
+      if processing_path_spec:
+        status[u'processing_path_spec'] = (
+            json_serializer.JSONPathSpecSerializer.WriteSerialized(
+                processing_path_spec))
+
     if self._critical_error:
       # Note seem unable to pass objects here.
       current_path_spec = self._extraction_worker.current_path_spec
@@ -1281,8 +1607,27 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
 
   def _Main(self):
     """The main loop."""
-    self._event_queue_producer = plaso_queue.ItemQueueProducer(
-        self._event_object_queue)
+    if self._event_serializer_format == definitions.SERIALIZER_FORMAT_JSON:
+      self._event_queue_producer = (
+          plaso_queue.SerializedEventObjectQueueProducer(
+              self._event_object_queue,
+              json_serializer.JSONEventObjectSerializer,
+              maximum_batch_size=self._event_batch_size,
+              path_spec_serializer=json_serializer.JSONPathSpecSerializer))
+
+    elif self._event_serializer_format == (
+        definitions.SERIALIZER_FORMAT_PROTOBUF):
+      self._event_queue_producer = (
+          plaso_queue.SerializedEventObjectQueueProducer(
+              self._event_object_queue,
+              protobuf_serializer.ProtobufEventObjectSerializer,
+              maximum_batch_size=self._event_batch_size,
+              path_spec_serializer=(
+                  dfvfs_protobuf_serializer.ProtobufPathSpecSerializer)))
+
+    else:
+      self._event_queue_producer = plaso_queue.ItemQueueProducer(
+          self._event_object_queue, maximum_batch_size=self._event_batch_size)
     self._parse_error_queue_producer = plaso_queue.ItemQueueProducer(
         self._parse_error_queue)
 
@@ -1306,6 +1651,14 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
 
     self._extraction_worker.SetProcessArchiveFiles(self._process_archive_files)
 
+    if self._completed_path_specs:
+      self._extraction_worker.SetCompletedPathSpecs(self._completed_path_specs)
+
+    self._extraction_worker.SetEnableCheckpoints(self._enable_checkpoints)
+
+    if self._recycle_event:
+      self._extraction_worker.SetRecycleEvent(self._recycle_event)
+
     if self._filter_object:
       self._extraction_worker.SetFilterObject(self._filter_object)
 
@@ -1531,17 +1884,19 @@ class MultiProcessingQueue(plaso_queue.Queue):
     """Pushes an item onto the queue.
 
     Args:
+      item: the item object.
       block: boolean value to indicate put should block
              if the queue is full.
+
+    Raises:
+      QueueFull: if the queue is full and block is False.
     """
     try:
       self._queue.put(item, block=block)
 
-    # Queue.Full can be raised if block is False.
-    # Since this should only be used in the abort code path
-    # the exception is ignored.
+    # Queue.Full can only be raised if block is False.
     except Queue.Full:
-      pass
+      raise errors.QueueFull
 
   def PopItem(self):
     """Pops an item off the queue.
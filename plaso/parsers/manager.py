@@ -285,12 +285,15 @@ class ParsersManager(object):
     return sorted(parser_names)
 
   @classmethod
-  def GetScanner(cls, specification_store):
+  def GetScanner(cls, specification_store, floating_signatures_only=False):
     """Initializes the scanner object form the specification store.
 
     Args:
       specification_store: a specification store (instance of
                            FormatSpecificationStore).
+      floating_signatures_only: optional boolean value to indicate the scanner
+                                should only scan for the signatures that are
+                                not bound to an offset.
 
     Returns:
       A scanner object (instance of pysigscan.scanner).
@@ -299,6 +302,9 @@ class ParsersManager(object):
 
     for format_specification in specification_store.specifications:
       for signature in format_specification.signatures:
+        if floating_signatures_only and signature.is_bound:
+          continue
+
         pattern_offset = signature.offset
 
         if pattern_offset is None:
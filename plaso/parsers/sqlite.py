@@ -3,6 +3,7 @@
 
 import logging
 import os
+import sys
 import tempfile
 
 try:
@@ -10,6 +11,13 @@ try:
 except ImportError:
   import sqlite3
 
+try:
+  from urllib.request import pathname2url
+except ImportError:
+  from urllib import pathname2url
+
+from dfvfs.lib import definitions as dfvfs_definitions
+
 from plaso.lib import errors
 from plaso.lib import specification
 from plaso.parsers import interface
@@ -20,6 +28,12 @@ from plaso.parsers import plugins
 class SQLiteCache(plugins.BasePluginCache):
   """A cache storing query results for SQLite plugins."""
 
+  def __init__(self):
+    """Initializes the cache object."""
+    super(SQLiteCache, self).__init__()
+    self._number_of_query_users = {}
+    self._query_results = {}
+
   def CacheQueryResults(
       self, sql_results, attribute_name, key_name, column_names):
     """Build a dict object based on a SQL command.
@@ -81,6 +95,45 @@ class SQLiteCache(plugins.BasePluginCache):
 
       row = sql_results.fetchone()
 
+  def GetQueryResults(self, database, query):
+    """Retrieves the results of a query.
+
+    The results of a query that is registered by more than one plugin are
+    read from the database once and kept until all plugins retrieved them.
+
+    Args:
+      database: A database object (instance of SQLiteDatabase).
+      query: string containing an SQL query.
+
+    Returns:
+      An iterable of rows (instances of sqlite3.Row).
+    """
+    number_of_users = self._number_of_query_users.get(query, 0)
+    if number_of_users < 2 and query not in self._query_results:
+      return database.Query(query)
+
+    query_results = self._query_results.get(query, None)
+    if query_results is None:
+      query_results = database.Query(query).fetchall()
+      self._query_results[query] = query_results
+
+    number_of_users -= 1
+    self._number_of_query_users[query] = number_of_users
+    if number_of_users <= 0:
+      del self._query_results[query]
+
+    return query_results
+
+  def RegisterQueries(self, queries):
+    """Registers the queries a plugin runs.
+
+    Args:
+      queries: a list of strings containing SQL queries.
+    """
+    for query in queries:
+      self._number_of_query_users.setdefault(query, 0)
+      self._number_of_query_users[query] += 1
+
 
 class SQLiteDatabase(object):
   """A simple wrapper for opening up a SQLite database."""
@@ -104,6 +157,100 @@ class SQLiteDatabase(object):
     """Returns a list of the names of all the tables."""
     return self._table_names
 
+  def _ConnectInPlace(self, location):
+    """Connects to a SQLite database file in place.
+
+    The database file is opened read-only and immutable, which prevents
+    SQLite from writing to or locking the file and from reading or creating
+    the journal files next to it. This is equivalent to reading a copy of
+    the database file without its journal files.
+
+    Args:
+      location: string containing the location of the database file.
+
+    Returns:
+      A database connection object (instance of sqlite3.Connection) or None
+      if the database file cannot be opened in place.
+    """
+    # Only the sqlite3 module of Python 3.4 and later supports URIs. Without
+    # an URI the database file cannot be opened read-only and SQLite could
+    # create or roll back journal files next to it, hence a temporary copy
+    # of the database file must be used instead.
+    if sys.version_info < (3, 4):
+      return
+
+    uri = u'file:{0:s}?mode=ro&immutable=1'.format(pathname2url(location))
+
+    try:
+      return sqlite3.connect(uri, uri=True)
+
+    except (TypeError, sqlite3.Error) as exception:
+      logging.debug((
+          u'Unable to open SQLite database: {0:s} in place with error: '
+          u'{1!s}').format(self._filename, exception))
+
+  def _ConnectToCopy(self, file_object):
+    """Connects to a temporary copy of a SQLite database file.
+
+    Since pysqlite cannot read directly from a file-like object a temporary
+    copy of the file is made.
+
+    Args:
+      file_object: the file-like object.
+
+    Returns:
+      A database connection object (instance of sqlite3.Connection).
+
+    Raises:
+      IOError: if the file-like object cannot be read.
+    """
+    # TODO: Change this into a proper implementation using APSW
+    # and virtual filesystems when that will be available.
+    # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
+    # http://apidoc.apsw.googlecode.com/hg/example.html#example-vfs
+    # Until then, just copy the file into a tempfile and parse it.
+
+    # Note that data is filled here with the file header data and
+    # that with will explicitly close the temporary files and thus
+    # making sure it is available for sqlite3.connect().
+    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+      self._temp_file_name = temp_file.name
+
+      try:
+        data = file_object.read(self._READ_BUFFER_SIZE)
+        while data:
+          temp_file.write(data)
+          data = file_object.read(self._READ_BUFFER_SIZE)
+      except IOError:
+        os.remove(self._temp_file_name)
+        self._temp_file_name = u''
+        raise
+
+    return sqlite3.connect(self._temp_file_name)
+
+  def _GetOSLocation(self, path_spec):
+    """Retrieves the location of an operating system database file.
+
+    Args:
+      path_spec: the path specification (instance of dfvfs.PathSpec) of
+                 the database file or None.
+
+    Returns:
+      A string containing the location or None if the database file is not
+      an operating system file.
+    """
+    if not path_spec or path_spec.parent:
+      return
+
+    if path_spec.type_indicator != dfvfs_definitions.TYPE_INDICATOR_OS:
+      return
+
+    location = getattr(path_spec, u'location', None)
+    if not location or not os.path.isfile(location):
+      return
+
+    return location
+
   def Close(self):
     """Close the database connection and clean up the temporary file."""
     self._table_names = []
@@ -112,7 +259,7 @@ class SQLiteDatabase(object):
       self._database.close()
     self._database = None
 
-    if os.path.exists(self._temp_file_name):
+    if self._temp_file_name and os.path.exists(self._temp_file_name):
       try:
         os.remove(self._temp_file_name)
       except (OSError, IOError) as exception:
@@ -125,16 +272,18 @@ class SQLiteDatabase(object):
 
     self._is_open = False
 
-  def Open(self, file_object):
+  def Open(self, file_object, path_spec=None):
     """Opens a SQLite database file.
 
-    Since pysqlite cannot read directly from a file-like object a temporary
-    copy of the file is made. After creating a copy the database file this
-    function sets up a connection with the database and determines the names
-    of the tables.
+    If the database file is an operating system file it is opened in place,
+    where supported, otherwise a temporary copy of the file is made. After
+    opening the database file this function sets up a connection with
+    the database and determines the names of the tables.
 
     Args:
       file_object: the file-like object.
+      path_spec: optional path specification (instance of dfvfs.PathSpec)
+                 of the database file.
 
     Raises:
       IOError: if the file-like object cannot be read.
@@ -144,36 +293,15 @@ class SQLiteDatabase(object):
     if not file_object:
       raise ValueError(u'Missing file object.')
 
-    # TODO: Current design copies the entire file into a buffer
-    # that is parsed by each SQLite parser. This is not very efficient,
-    # especially when many SQLite parsers are ran against a relatively
-    # large SQLite database. This temporary file that is created should
-    # be usable by all SQLite parsers so the file should only be read
-    # once in memory and then deleted when all SQLite parsers have completed.
-
-    # TODO: Change this into a proper implementation using APSW
-    # and virtual filesystems when that will be available.
-    # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
-    # http://apidoc.apsw.googlecode.com/hg/example.html#example-vfs
-    # Until then, just copy the file into a tempfile and parse it.
+    self._database = None
 
-    # Note that data is filled here with the file header data and
-    # that with will explicitly close the temporary files and thus
-    # making sure it is available for sqlite3.connect().
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-      self._temp_file_name = temp_file.name
+    location = self._GetOSLocation(path_spec)
+    if location:
+      self._database = self._ConnectInPlace(location)
 
-      try:
-        data = file_object.read(self._READ_BUFFER_SIZE)
-        while data:
-          temp_file.write(data)
-          data = file_object.read(self._READ_BUFFER_SIZE)
-      except IOError:
-        os.remove(self._temp_file_name)
-        self._temp_file_name = u''
-        raise
+    if not self._database:
+      self._database = self._ConnectToCopy(file_object)
 
-    self._database = sqlite3.connect(self._temp_file_name)
     try:
       self._database.row_factory = sqlite3.Row
       cursor = self._database.cursor()
@@ -187,8 +315,9 @@ class SQLiteDatabase(object):
       self._database.close()
       self._database = None
 
-      os.remove(self._temp_file_name)
-      self._temp_file_name = u''
+      if self._temp_file_name:
+        os.remove(self._temp_file_name)
+        self._temp_file_name = u''
 
       logging.debug(
           u'Unable to parse SQLite database: {0:s} with error: {1:s}'.format(
@@ -224,8 +353,49 @@ class SQLiteParser(interface.FileObjectParser):
     super(SQLiteParser, self).__init__()
     self._local_zone = False
     self._plugins = SQLiteParser.GetPluginObjects()
+    self._plugins_per_required_tables = {}
+    self._plugins_without_required_tables = []
+    self._required_tables_per_table_name = {}
     self.db = None
 
+    for plugin_object in self._plugins:
+      required_tables = plugin_object.REQUIRED_TABLES
+      if not required_tables:
+        self._plugins_without_required_tables.append(plugin_object)
+        continue
+
+      self._plugins_per_required_tables.setdefault(required_tables, [])
+      self._plugins_per_required_tables[required_tables].append(plugin_object)
+
+      for table_name in required_tables:
+        self._required_tables_per_table_name.setdefault(table_name, set())
+        self._required_tables_per_table_name[table_name].add(required_tables)
+
+  def _GetPluginsForTables(self, table_names):
+    """Retrieves the plugins that can process a database.
+
+    Args:
+      table_names: a list of strings containing the names of the tables
+                   in the database.
+
+    Returns:
+      A list of plugin objects (instances of SQLitePlugin) in the order
+      they are registered.
+    """
+    table_names = frozenset(table_names)
+
+    matching_plugins = set(self._plugins_without_required_tables)
+    for table_name in table_names:
+      for required_tables in self._required_tables_per_table_name.get(
+          table_name, []):
+        if required_tables <= table_names:
+          matching_plugins.update(
+              self._plugins_per_required_tables[required_tables])
+
+    return [
+        plugin_object for plugin_object in self._plugins
+        if plugin_object in matching_plugins]
+
   @classmethod
   def GetFormatSpecification(cls):
     """Retrieves the format specification."""
@@ -244,9 +414,12 @@ class SQLiteParser(interface.FileObjectParser):
       UnableToParseFile: when the file cannot be parsed.
     """
     filename = parser_mediator.GetFilename()
+    file_entry = parser_mediator.GetFileEntry()
+    path_spec = getattr(file_entry, u'path_spec', None)
+
     database = SQLiteDatabase(filename)
     try:
-      database.Open(file_object)
+      database.Open(file_object, path_spec=path_spec)
 
     except (IOError, ValueError) as exception:
       raise errors.UnableToParseFile(
@@ -258,11 +431,16 @@ class SQLiteParser(interface.FileObjectParser):
           u'Unable to parse SQLite database with error: {0:s}.'.format(
               exception))
 
-    # Create a cache in which the resulting tables are cached.
+    plugin_objects = self._GetPluginsForTables(database.tables)
+
+    # Create a cache in which the resulting tables are cached. Plugins that
+    # run the same query share the results.
     cache = SQLiteCache()
+    for plugin_object in plugin_objects:
+      cache.RegisterQueries([query for query, _ in plugin_object.QUERIES])
+
     try:
-      # TODO: add a table name filter and do the plugin selection here.
-      for plugin_object in self._plugins:
+      for plugin_object in plugin_objects:
         try:
           plugin_object.UpdateChainAndProcess(
               parser_mediator, cache=cache, database=database)
@@ -44,15 +44,15 @@ class SQLitePlugin(plugins.BasePlugin):
                   self.NAME, callback_method, query))
           continue
 
-        sql_results = database.Query(query)
-        row = sql_results.fetchone()
+        if cache:
+          sql_results = cache.GetQueryResults(database, query)
+        else:
+          sql_results = database.Query(query)
 
-        while row:
+        for row in sql_results:
           callback(
               parser_mediator, row, query=query, cache=cache, database=database)
 
-          row = sql_results.fetchone()
-
       except sqlite3.DatabaseError as exception:
         logging.debug(u'SQLite error occurred: {0:s}'.format(exception))
 
@@ -8,6 +8,7 @@ parser.
 
 import abc
 import csv
+import io
 import logging
 import os
 
@@ -699,6 +700,71 @@ class PyparsingConstants(object):
       pyparsing.nums, min=1, max=5).setParseAction(PyParseIntCast)
 
 
+class TextFileHead(object):
+  """Class that contains the head of a file for the text parsers.
+
+  The head of a file is read once and shared by the text parsers that
+  determine if they can parse the file, instead of every text parser
+  reading and decoding the start of the file.
+
+  Attributes:
+    data: a binary string containing the head of the file.
+    lines: a dictionary that caches the first lines that the text parsers
+           read from the head of the file.
+  """
+
+  DEFAULT_MAXIMUM_SIZE = 4096
+
+  def __init__(self, file_object, maximum_size=DEFAULT_MAXIMUM_SIZE):
+    """Initializes the text file head object.
+
+    Args:
+      file_object: the file-like object.
+      maximum_size: optional maximum number of bytes of the head.
+    """
+    super(TextFileHead, self).__init__()
+    file_object.seek(0, os.SEEK_SET)
+    self.data = file_object.read(maximum_size)
+    file_object.seek(0, os.SEEK_SET)
+
+    self._is_complete = len(self.data) < maximum_size
+    self.lines = {}
+
+  @property
+  def is_binary(self):
+    """Determines if the head does not contain text.
+
+    The head does not contain text if the file is empty or the first
+    non-empty line contains a NUL byte.
+    """
+    data = self.data.lstrip(b'\r\n')
+    if not data:
+      return True
+
+    first_line, _, _ = data.partition(b'\n')
+    return b'\x00' in first_line
+
+  def GetFileObject(self):
+    """Retrieves a file-like object of the head.
+
+    Returns:
+      A file-like object (instance of io.BytesIO).
+    """
+    return io.BytesIO(self.data)
+
+  def HasSize(self, size):
+    """Determines if the head contains the first bytes of the file.
+
+    Args:
+      size: the number of bytes.
+
+    Returns:
+      A boolean value that indicates the head contains the first size bytes
+      of the file or the entire file.
+    """
+    return self._is_complete or len(self.data) >= size
+
+
 class PyparsingSingleLineTextParser(interface.FileObjectParser):
   """Single line text parser based on the pyparsing library."""
 
@@ -730,6 +796,9 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
   # attribute.
   _ENCODING = u'ascii'
 
+  # The maximum number of empty lines that are skipped when reading a line.
+  _MAXIMUM_NUMBER_OF_EMPTY_LINES = 40
+
   def __init__(self):
     """Initializes the pyparsing single-line text parser object."""
     super(PyparsingSingleLineTextParser, self).__init__()
@@ -767,7 +836,7 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
     # If line is empty, skip it and go on.
     if line in [b'\n', b'\r\n']:
       # Max 40 new lines in a row before we bail out.
-      if depth == 40:
+      if depth == self._MAXIMUM_NUMBER_OF_EMPTY_LINES:
         return u''
 
       return self._ReadLine(
@@ -788,12 +857,42 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
                 repr(line[1:30]), self.encoding, display_name))
       return line.strip()
 
-  def ParseFileObject(self, parser_mediator, file_object, **kwargs):
+  def _ReadFirstLineFromHead(self, parser_mediator, text_file_head):
+    """Reads the first line from the head of a text file.
+
+    Args:
+      parser_mediator: a parser mediator object (instance of ParserMediator).
+      text_file_head: the head of the text file (instance of TextFileHead).
+
+    Returns:
+      A tuple containing a boolean value that indicates the head contains
+      the first line and the first line.
+    """
+    # Every empty line that is skipped takes up to 2 bytes.
+    head_size = (
+        (self._MAXIMUM_NUMBER_OF_EMPTY_LINES + 1) * 2 + self.MAX_LINE_LENGTH)
+    if not text_file_head.HasSize(head_size):
+      return False, None
+
+    lines_key = (self.encoding, self.MAX_LINE_LENGTH)
+    if lines_key not in text_file_head.lines:
+      text_file_head.lines[lines_key] = self._ReadLine(
+          parser_mediator, text_file_head.GetFileObject(),
+          max_len=self.MAX_LINE_LENGTH, quiet=True)
+
+    return True, text_file_head.lines[lines_key]
+
+  def ParseFileObject(
+      self, parser_mediator, file_object, text_file_head=None, **kwargs):
     """Parses a text file-like object using a pyparsing definition.
 
     Args:
       parser_mediator: a parser mediator object (instance of ParserMediator).
       file_object: a file-like object.
+      text_file_head: optional head of the text file (instance of
+                      TextFileHead). If the head contains the first line
+                      it is used to verify the structure of the file before
+                      the file-like object is read.
 
     Raises:
       UnableToParseFile: when the file cannot be parsed.
@@ -804,11 +903,18 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
       raise errors.UnableToParseFile(
           u'Line structure undeclared, unable to proceed.')
 
-    text_file_object = text_file.TextFile(file_object)
+    text_file_object = None
+    has_line = False
+    if text_file_head:
+      has_line, line = self._ReadFirstLineFromHead(
+          parser_mediator, text_file_head)
+
+    if not has_line:
+      text_file_object = text_file.TextFile(file_object)
+      line = self._ReadLine(
+          parser_mediator, text_file_object, max_len=self.MAX_LINE_LENGTH,
+          quiet=True)
 
-    line = self._ReadLine(
-        parser_mediator, text_file_object, max_len=self.MAX_LINE_LENGTH,
-        quiet=True)
     if not line:
       raise errors.UnableToParseFile(u'Not a text file.')
 
@@ -826,6 +932,12 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
     if not self.VerifyStructure(parser_mediator, line):
       raise errors.UnableToParseFile(u'Wrong file structure.')
 
+    if not text_file_object:
+      text_file_object = text_file.TextFile(file_object)
+      line = self._ReadLine(
+          parser_mediator, text_file_object, max_len=self.MAX_LINE_LENGTH,
+          quiet=True)
+
     # Set the offset to the beginning of the file.
     self._current_offset = 0
     # Read every line in the text file.
@@ -113,6 +113,32 @@ class EventTagSerializer(object):
     """
 
 
+class PathSpecSerializer(object):
+  """Class that implements the path specification serializer interface."""
+
+  @abc.abstractmethod
+  def ReadSerialized(cls, serialized):
+    """Reads a path specification from serialized form.
+
+    Args:
+      serialized: an object containing the serialized form.
+
+    Returns:
+      A path specification (instance of dfvfs.PathSpec).
+    """
+
+  @abc.abstractmethod
+  def WriteSerialized(cls, path_spec):
+    """Writes a path specification to serialized form.
+
+    Args:
+      path_spec: a path specification (instance of dfvfs.PathSpec).
+
+    Returns:
+      An object containing the serialized form.
+    """
+
+
 class PreprocessObjectSerializer(object):
   """Class that implements the preprocessing object serializer interface."""
 
@@ -152,12 +152,7 @@ class _EventObjectJSONDecoder(json.JSONDecoder):
     Returns:
       A path specification (instance of path.PathSpec).
     """
-    type_indicator = json_dict.get(u'type_indicator', None)
-    if type_indicator:
-      del json_dict[u'type_indicator']
-
-    return dfvfs_path_spec_factory.Factory.NewPathSpec(
-        type_indicator, **json_dict)
+    return JSONPathSpecSerializer.ReadSerializedDict(json_dict)
 
   def _ConvertDictToObject(self, json_dict):
     """Converts a JSON dict into an object.
@@ -785,6 +780,77 @@ class JSONEventTagSerializer(interface.EventTagSerializer):
     return json_dict
 
 
+class JSONPathSpecSerializer(interface.PathSpecSerializer):
+  """Class that implements the JSON path specification serializer."""
+
+  @classmethod
+  def ReadSerialized(cls, json_string):
+    """Reads a path specification from serialized form.
+
+    Args:
+      json_string: a JSON string containing the serialized form.
+
+    Returns:
+      A path specification (instance of dfvfs.PathSpec).
+    """
+    json_decoder = _EventObjectJSONDecoder()
+    return json_decoder.decode(json_string)
+
+  @classmethod
+  def ReadSerializedDict(cls, json_dict):
+    """Reads a path specification from serialized dict form.
+
+    The parent path specification in the dictionary must already have been
+    converted into a path specification object, as the JSON decoder does.
+
+    Args:
+      json_dict: a dictionary of the JSON serialized objects, without
+                 the '__type__' element.
+
+    Returns:
+      A path specification (instance of dfvfs.PathSpec).
+    """
+    type_indicator = json_dict.get(u'type_indicator', None)
+    if type_indicator:
+      del json_dict[u'type_indicator']
+
+    return dfvfs_path_spec_factory.Factory.NewPathSpec(
+        type_indicator, **json_dict)
+
+  @classmethod
+  def WriteSerialized(cls, path_spec):
+    """Writes a path specification to serialized form.
+
+    Args:
+      path_spec: a path specification (instance of dfvfs.PathSpec).
+
+    Returns:
+      A JSON string containing the serialized form.
+
+    Raises:
+      TypeError: if not an instance of dfvfs.PathSpec.
+    """
+    json_dict = cls.WriteSerializedDict(path_spec)
+    return json.dumps(json_dict)
+
+  @classmethod
+  def WriteSerializedDict(cls, path_spec):
+    """Writes a path specification to serialized dict form.
+
+    Args:
+      path_spec: a path specification (instance of dfvfs.PathSpec).
+
+    Returns:
+      A dictionary of the JSON serialized objects.
+
+    Raises:
+      TypeError: if not an instance of dfvfs.PathSpec.
+    """
+    json_encoder = _EventObjectJSONEncoder()
+    # pylint: disable=protected-access
+    return json_encoder._ConvertPathSpecToDict(path_spec)
+
+
 class JSONPreprocessObjectSerializer(interface.PreprocessObjectSerializer):
   """Class that implements the json preprocessing object serializer."""
 
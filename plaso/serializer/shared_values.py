@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""The shared values event object serializer."""
+
+from plaso.containers import events
+from plaso.lib import py2to3
+
+
+class SharedValuesEventObjectSerializer(object):
+  """Class that implements the shared values event object serializer.
+
+  The shared values serializer serializes an event object without the values
+  it typically shares with many other event objects, such as its path
+  specification, data type and parser chain. The shared values are
+  serialized separately, so that the storage can store them once per store
+  instead of with every event object.
+
+  Unlike the other serializers the shared values serializer is an instance,
+  since it wraps the event object and path specification serializers of a
+  specific format and caches the last serialized path specification.
+  """
+
+  # The names of the string attributes that are shared, in the order in
+  # which their values are stored.
+  STRING_ATTRIBUTE_NAMES = (
+      u'data_type', u'display_name', u'filename', u'hostname', u'parser',
+      u'timestamp_desc', u'username')
+
+  def __init__(self, event_object_serializer, path_spec_serializer):
+    """Initializes the shared values event object serializer.
+
+    Args:
+      event_object_serializer: the event object serializer (subclass of
+                               EventObjectSerializer).
+      path_spec_serializer: the path specification serializer (subclass
+                            of PathSpecSerializer).
+    """
+    super(SharedValuesEventObjectSerializer, self).__init__()
+    self._event_object_serializer = event_object_serializer
+    self._path_spec_serializer = path_spec_serializer
+    self._serialized_path_spec = None
+
+  def _GetSerializedPathSpec(self, path_spec):
+    """Retrieves the serialized form of a path specification.
+
+    The event objects of a file entry typically share the same path
+    specification object, hence the last serialized path specification
+    is cached.
+
+    Args:
+      path_spec: a path specification (instance of dfvfs.PathSpec).
+
+    Returns:
+      A binary string containing the serialized path specification.
+    """
+    if self._serialized_path_spec:
+      last_path_spec, path_spec_data = self._serialized_path_spec
+      if last_path_spec is path_spec:
+        return path_spec_data
+
+    path_spec_data = self._path_spec_serializer.WriteSerialized(path_spec)
+    self._serialized_path_spec = (path_spec, path_spec_data)
+    return path_spec_data
+
+  def ReadSerialized(self, serialized_event_object):
+    """Reads an event object from serialized form.
+
+    Args:
+      serialized_event_object: a serialized event object (instance of
+                               SerializedEventObject).
+
+    Returns:
+      An event object (instance of EventObject).
+    """
+    event_object = self._event_object_serializer.ReadSerialized(
+        serialized_event_object.data)
+
+    if serialized_event_object.path_spec_data:
+      event_object.pathspec = self._path_spec_serializer.ReadSerialized(
+          serialized_event_object.path_spec_data)
+
+    if serialized_event_object.string_values:
+      for attribute_name, attribute_value in zip(
+          self.STRING_ATTRIBUTE_NAMES, serialized_event_object.string_values):
+        if attribute_value is not None:
+          setattr(event_object, attribute_name, attribute_value)
+
+    return event_object
+
+  def WriteSerialized(self, event_object):
+    """Writes an event object to serialized form.
+
+    The shared values are removed from the event object while it is
+    serialized and restored afterwards.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Returns:
+      A serialized event object (instance of SerializedEventObject) or None
+      if the event object could not be serialized.
+
+    Raises:
+      UnicodeDecodeError: if the event object contains values that
+                          cannot be serialized.
+    """
+    path_spec = getattr(event_object, u'pathspec', None)
+    path_spec_data = None
+
+    shared_attributes = []
+    string_values = []
+    for attribute_name in self.STRING_ATTRIBUTE_NAMES:
+      attribute_value = getattr(event_object, attribute_name, None)
+      string_value = attribute_value
+      if isinstance(string_value, py2to3.BYTES_TYPE):
+        try:
+          string_value = string_value.decode(u'utf-8')
+        except UnicodeDecodeError:
+          # Values that are not UTF-8 encoded are left to the event object
+          # serializer.
+          string_value = None
+
+      if not string_value or not isinstance(string_value, py2to3.UNICODE_TYPE):
+        string_value = None
+      else:
+        shared_attributes.append((attribute_name, attribute_value))
+
+      string_values.append(string_value)
+
+    parser = getattr(event_object, u'parser', None)
+    plugin = getattr(event_object, u'plugin', None)
+
+    try:
+      if path_spec is not None:
+        path_spec_data = self._GetSerializedPathSpec(path_spec)
+        event_object.pathspec = None
+
+      for attribute_name, _ in shared_attributes:
+        setattr(event_object, attribute_name, None)
+
+      # The data type is required by the protobuf serializer.
+      if string_values[0] is not None:
+        event_object.data_type = u''
+
+      event_object_data = self._event_object_serializer.WriteSerialized(
+          event_object)
+
+    finally:
+      if path_spec is not None:
+        event_object.pathspec = path_spec
+
+      for attribute_name, attribute_value in shared_attributes:
+        setattr(event_object, attribute_name, attribute_value)
+
+    if event_object_data is None:
+      return
+
+    return events.SerializedEventObject(
+        event_object.timestamp, event_object_data, parser=parser,
+        path_spec_data=path_spec_data, plugin=plugin,
+        string_values=tuple(string_values))
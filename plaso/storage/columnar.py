@@ -0,0 +1,992 @@
+# -*- coding: utf-8 -*-
+"""The columnar storage.
+
+The columnar storage stores the event objects column-wise in a ZIP archive
+file. The event objects are written in segments, where every segment contains
+the event objects sorted by timestamp.
+
+There are multiple types of streams per segment:
+* column_timestamp.#
+  The timestamps of the event objects as long ints ('<q').
+* column_store_number.#
+  The store numbers of the event objects as unsigned integers ('<I').
+* column_data_type.# and column_parser.#
+  The data types and parser names of the event objects as unsigned integers
+  ('<I'), which are indexes into the list of distinct values stored in
+  the corresponding column_data_type_values.# and column_parser_values.#
+  streams as JSON.
+* column_group.#.@.attribute_name
+  The values of the remaining attributes of the event objects grouped per
+  data type, where @ is the index of the data type in the distinct data type
+  values. Every attribute is stored as a JSON list that contains a value for
+  every event object of the data type in the order of the segment.
+
+The # in the stream names is referred to as the "store number".
+
+A predicate on the timestamp, data type or parser of an event object and
+the projection of a subset of its attributes can be evaluated by reading
+only the streams of the corresponding columns.
+"""
+
+import binascii
+import bisect
+import heapq
+import json
+import logging
+import struct
+import warnings
+import zipfile
+
+from dfvfs.path import path_spec as dfvfs_path_spec
+from dfvfs.serializer import protobuf_serializer as dfvfs_protobuf_serializer
+
+from plaso.containers import events
+from plaso.lib import py2to3
+from plaso.serializer import json_serializer
+from plaso.serializer import protobuf_serializer
+from plaso.serializer import shared_values
+from plaso.storage import factory
+from plaso.storage import reader
+from plaso.storage import writer
+
+
+class _ColumnValuesJSONDecoder(json.JSONDecoder):
+  """A class that implements a column values JSON decoder."""
+
+  _CLASS_TYPES = frozenset([u'bytes', u'EventTag', u'PathSpec'])
+
+  def __init__(self, *args, **kargs):
+    """Initializes the JSON decoder object."""
+    super(_ColumnValuesJSONDecoder, self).__init__(
+        *args, object_hook=self._ConvertDictToObject, **kargs)
+
+  def _ConvertDictToObject(self, json_dict):
+    """Converts a JSON dict into an object.
+
+    Args:
+      json_dict: a dictionary of the JSON serialized objects.
+
+    Returns:
+      A deserialized object which can be:
+        * a byte string;
+        * a dictionary;
+        * an event tag (instance of EventTag);
+        * a path specification (instance of dfvfs.PathSpec).
+    """
+    # Use __type__ to indicate the object class type.
+    class_type = json_dict.get(u'__type__', None)
+
+    if class_type not in self._CLASS_TYPES:
+      # Dealing with a regular dict.
+      return json_dict
+
+    # Remove the class type from the JSON dict since we cannot pass it.
+    del json_dict[u'__type__']
+
+    if class_type == u'bytes':
+      return binascii.a2b_qp(json_dict[u'stream'])
+
+    elif class_type == u'EventTag':
+      return json_serializer.JSONEventTagSerializer.ReadSerializedDict(
+          json_dict)
+
+    return json_serializer.JSONPathSpecSerializer.ReadSerializedDict(json_dict)
+
+
+class _ColumnValuesJSONEncoder(json.JSONEncoder):
+  """A class that implements a column values JSON encoder."""
+
+  # Note: that the following functions do not follow the style guide
+  # because they are part of the json.JSONEncoder object interface.
+
+  # pylint: disable=method-hidden
+  def default(self, value):
+    """Converts a column value into a JSON dictionary.
+
+    Args:
+      value: the column value.
+
+    Returns:
+      A dictionary of the JSON serialized objects.
+
+    Raises:
+      TypeError: if the value type is not supported.
+    """
+    if isinstance(value, dfvfs_path_spec.PathSpec):
+      return json_serializer.JSONPathSpecSerializer.WriteSerializedDict(value)
+
+    elif isinstance(value, events.EventTag):
+      return json_serializer.JSONEventTagSerializer.WriteSerializedDict(value)
+
+    return super(_ColumnValuesJSONEncoder, self).default(value)
+
+
+class _Segment(object):
+  """Class that defines a columnar storage segment.
+
+  The columns of a segment are read on demand and cached, where the least
+  recently used column is removed from the cache when the maximum number
+  of cached columns is reached.
+  """
+
+  # The maximum number of cached columns.
+  _MAXIMUM_NUMBER_OF_CACHED_COLUMNS = 32
+
+  def __init__(self, zip_file, segment_number):
+    """Initializes a segment object.
+
+    Args:
+      zip_file: the ZIP file object that contains the segment.
+      segment_number: an integer containing the number of the segment.
+    """
+    super(_Segment, self).__init__()
+    self._columns = {}
+    self._columns_lru = []
+    self._group_attribute_names = None
+    self._group_row_indexes = None
+    self._zip_file = zip_file
+    self.segment_number = segment_number
+
+  def _CacheColumn(self, column_name, column_values):
+    """Caches the values of a column.
+
+    Args:
+      column_name: string containing the name of the column.
+      column_values: a list or tuple containing the column values.
+    """
+    if len(self._columns) >= self._MAXIMUM_NUMBER_OF_CACHED_COLUMNS:
+      lru_column_name = self._columns_lru.pop(0)
+      del self._columns[lru_column_name]
+
+    self._columns[column_name] = column_values
+    self._columns_lru.append(column_name)
+
+  def _GetCachedColumn(self, column_name):
+    """Retrieves the values of a cached column.
+
+    Args:
+      column_name: string containing the name of the column.
+
+    Returns:
+      A list or tuple containing the column values or None if the column
+      is not cached.
+    """
+    column_values = self._columns.get(column_name, None)
+    if column_values is not None:
+      self._columns_lru.remove(column_name)
+      self._columns_lru.append(column_name)
+
+    return column_values
+
+  def _GetStreamName(self, column_name):
+    """Retrieves the name of the stream of a column.
+
+    Args:
+      column_name: string containing the name of the column.
+
+    Returns:
+      A string containing the name of the stream.
+    """
+    return u'column_{0:s}.{1:06d}'.format(column_name, self.segment_number)
+
+  def _ReadStream(self, stream_name):
+    """Reads data from a stream.
+
+    Args:
+      stream_name: string containing the name of the stream.
+
+    Returns:
+      A byte string containing the data of the stream.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    try:
+      file_object = self._zip_file.open(stream_name, mode='r')
+    except KeyError as exception:
+      raise IOError(
+          u'Unable to open stream with error: {0!s}'.format(exception))
+
+    try:
+      return file_object.read()
+    finally:
+      file_object.close()
+
+  def _ReadGroupColumn(self, group_index, attribute_name):
+    """Reads a data type group column.
+
+    Args:
+      group_index: an integer containing the index of the data type group.
+      attribute_name: string containing the name of the attribute.
+
+    Returns:
+      A list containing the column values.
+
+    Raises:
+      IOError: if the column cannot be read.
+    """
+    stream_name = u'column_group.{0:06d}.{1:d}.{2:s}'.format(
+        self.segment_number, group_index, attribute_name)
+
+    column_values = self._GetCachedColumn(stream_name)
+    if column_values is None:
+      column_values = self._ReadJSONStream(stream_name)
+      self._CacheColumn(stream_name, column_values)
+
+    return column_values
+
+  def _ReadIntegerColumn(self, column_name, format_character):
+    """Reads an integer column.
+
+    Args:
+      column_name: string containing the name of the column.
+      format_character: string containing the struct format character of
+                        the integer values.
+
+    Returns:
+      A tuple of integers containing the column values.
+
+    Raises:
+      IOError: if the column cannot be read.
+    """
+    column_values = self._GetCachedColumn(column_name)
+    if column_values is None:
+      data = self._ReadStream(self._GetStreamName(column_name))
+      value_size = struct.calcsize(format_character)
+      if len(data) % value_size:
+        raise IOError(u'Invalid size of column: {0:s}.'.format(column_name))
+
+      column_values = struct.unpack(
+          '<{0:d}{1:s}'.format(len(data) // value_size, format_character),
+          data)
+      self._CacheColumn(column_name, column_values)
+
+    return column_values
+
+  def _ReadJSONColumn(self, column_name):
+    """Reads a JSON column.
+
+    Args:
+      column_name: string containing the name of the column.
+
+    Returns:
+      A list containing the column values.
+
+    Raises:
+      IOError: if the column cannot be read.
+    """
+    column_values = self._GetCachedColumn(column_name)
+    if column_values is None:
+      column_values = self._ReadJSONStream(self._GetStreamName(column_name))
+      self._CacheColumn(column_name, column_values)
+
+    return column_values
+
+  def _ReadJSONStream(self, stream_name):
+    """Reads JSON serialized column values from a stream.
+
+    Args:
+      stream_name: string containing the name of the stream.
+
+    Returns:
+      A list containing the column values.
+
+    Raises:
+      IOError: if the stream cannot be read.
+    """
+    data = self._ReadStream(stream_name)
+    try:
+      return _ColumnValuesJSONDecoder().decode(data)
+    except ValueError as exception:
+      raise IOError(
+          u'Unable to read stream: {0:s} with error: {1!s}'.format(
+              stream_name, exception))
+
+  def _GetGroupAttributeNames(self):
+    """Retrieves the attribute names of the data type groups.
+
+    Returns:
+      A dictionary containing a list of the attribute names per data type
+      group index.
+    """
+    if self._group_attribute_names is None:
+      self._group_attribute_names = {}
+
+      stream_name_prefix = u'column_group.{0:06d}.'.format(self.segment_number)
+      for stream_name in self._zip_file.namelist():
+        if not stream_name.startswith(stream_name_prefix):
+          continue
+
+        group_index, _, attribute_name = stream_name[
+            len(stream_name_prefix):].partition(u'.')
+        try:
+          group_index = int(group_index, 10)
+        except ValueError:
+          logging.error(u'Unsupported column group stream: {0:s}'.format(
+              stream_name))
+          continue
+
+        self._group_attribute_names.setdefault(group_index, []).append(
+            attribute_name)
+
+    return self._group_attribute_names
+
+  def _GetGroupRowIndex(self, row_index):
+    """Retrieves the row index of an event object within its data type group.
+
+    Args:
+      row_index: an integer containing the row index within the segment.
+
+    Returns:
+      An integer containing the row index within the data type group.
+    """
+    if self._group_row_indexes is None:
+      group_sizes = {}
+      self._group_row_indexes = []
+      for group_index in self.GetDataTypeIndexes():
+        group_row_index = group_sizes.get(group_index, 0)
+        self._group_row_indexes.append(group_row_index)
+        group_sizes[group_index] = group_row_index + 1
+
+    return self._group_row_indexes[row_index]
+
+  @property
+  def number_of_rows(self):
+    """The number of rows (event objects) in the segment."""
+    return len(self.GetTimestamps())
+
+  def GetDataTypeIndexes(self):
+    """Retrieves the data type column.
+
+    Returns:
+      A tuple of integers containing the indexes of the data type values.
+    """
+    return self._ReadIntegerColumn(u'data_type', u'I')
+
+  def GetDataTypeValues(self):
+    """Retrieves the distinct data type values.
+
+    Returns:
+      A list of strings containing the data types.
+    """
+    return self._ReadJSONColumn(u'data_type_values')
+
+  def GetEventObject(self, row_index, attribute_names=None):
+    """Retrieves an event object.
+
+    Args:
+      row_index: an integer containing the row index within the segment.
+      attribute_names: an optional list of strings containing the names of
+                       the attributes to read in addition to the fixed
+                       columns, where None represents all attributes.
+
+    Returns:
+      An event object (instance of EventObject).
+    """
+    data_type_index = self.GetDataTypeIndexes()[row_index]
+
+    event_object = events.EventObject()
+    event_object.data_type = self.GetDataTypeValues()[data_type_index]
+    event_object.parser = self.GetParserValues()[
+        self.GetParserIndexes()[row_index]]
+    event_object.store_index = row_index
+    event_object.store_number = self.GetStoreNumbers()[row_index]
+    event_object.timestamp = self.GetTimestamps()[row_index]
+
+    group_attribute_names = self._GetGroupAttributeNames().get(
+        data_type_index, [])
+    if attribute_names is not None:
+      group_attribute_names = [
+          attribute_name for attribute_name in group_attribute_names
+          if attribute_name in attribute_names]
+
+    if group_attribute_names:
+      group_row_index = self._GetGroupRowIndex(row_index)
+
+    for attribute_name in group_attribute_names:
+      column_values = self._ReadGroupColumn(data_type_index, attribute_name)
+      attribute_value = column_values[group_row_index]
+      if attribute_value is not None:
+        setattr(event_object, attribute_name, attribute_value)
+
+    return event_object
+
+  def GetParserIndexes(self):
+    """Retrieves the parser column.
+
+    Returns:
+      A tuple of integers containing the indexes of the parser values.
+    """
+    return self._ReadIntegerColumn(u'parser', u'I')
+
+  def GetParserValues(self):
+    """Retrieves the distinct parser values.
+
+    Returns:
+      A list of strings containing the parser names.
+    """
+    return self._ReadJSONColumn(u'parser_values')
+
+  def GetStoreNumbers(self):
+    """Retrieves the store number column.
+
+    Returns:
+      A tuple of integers containing the store numbers.
+    """
+    return self._ReadIntegerColumn(u'store_number', u'I')
+
+  def GetTimestamps(self):
+    """Retrieves the timestamp column.
+
+    Returns:
+      A tuple of integers containing the timestamps.
+    """
+    return self._ReadIntegerColumn(u'timestamp', u'q')
+
+
+class ColumnarStorageFile(object):
+  """Class that defines the columnar storage file."""
+
+  NAME = u'columnar'
+  DESCRIPTION = u'Columnar event storage file.'
+
+  # The maximum number of event objects per segment.
+  MAXIMUM_SEGMENT_SIZE = 100000
+
+  # The names of the attributes that are stored in the fixed columns or
+  # are derived from the position of the event object in the storage.
+  _FIXED_ATTRIBUTE_NAMES = frozenset([
+      u'data_type', u'parser', u'store_index', u'store_number', u'timestamp'])
+
+  # The maximum number of cached segments. The event objects of the segments
+  # are read alternately, hence the segments are cached but the number of
+  # cached segments is bounded to limit the memory usage.
+  _MAXIMUM_NUMBER_OF_CACHED_SEGMENTS = 16
+
+  def __init__(self, maximum_segment_size=MAXIMUM_SEGMENT_SIZE):
+    """Initializes a columnar storage file object.
+
+    Args:
+      maximum_segment_size: optional integer containing the maximum number of
+                            event objects per segment.
+    """
+    super(ColumnarStorageFile, self).__init__()
+    self._buffer = []
+    self._maximum_segment_size = maximum_segment_size
+    self._number_of_filtered_event_objects = 0
+    self._read_only = True
+    self._segment_number = 1
+    self._segments = {}
+    self._segments_lru = []
+    self._zipfile = None
+
+  @property
+  def number_of_filtered_event_objects(self):
+    """The number of event objects that did not meet the predicates.
+
+    The event objects are counted by GetEvents, where the event objects
+    outside the time range are not counted.
+    """
+    return self._number_of_filtered_event_objects
+
+  def _GetSegmentNumbers(self):
+    """Retrieves the available segment numbers.
+
+    Returns:
+      A sorted list of integers of the available segment numbers.
+    """
+    segment_numbers = []
+    for stream_name in self._zipfile.namelist():
+      if not stream_name.startswith(u'column_timestamp.'):
+        continue
+
+      _, _, segment_number = stream_name.partition(u'.')
+      try:
+        segment_numbers.append(int(segment_number, 10))
+      except ValueError:
+        logging.error(
+            u'Unable to determine segment number from stream: {0:s}'.format(
+                stream_name))
+
+    return sorted(segment_numbers)
+
+  def _GetSegment(self, segment_number):
+    """Retrieves a segment.
+
+    Args:
+      segment_number: an integer containing the number of the segment.
+
+    Returns:
+      A segment (instance of _Segment).
+    """
+    segment = self._segments.get(segment_number, None)
+    if not segment:
+      if len(self._segments) >= self._MAXIMUM_NUMBER_OF_CACHED_SEGMENTS:
+        lru_segment_number = self._segments_lru.pop(0)
+        del self._segments[lru_segment_number]
+
+      segment = _Segment(self._zipfile, segment_number)
+      self._segments[segment_number] = segment
+
+    else:
+      self._segments_lru.remove(segment_number)
+
+    self._segments_lru.append(segment_number)
+    return segment
+
+  def _WriteBuffer(self):
+    """Writes the buffered event objects to a segment."""
+    if not self._buffer:
+      return
+
+    self._buffer.sort(key=lambda event_object: event_object.timestamp)
+
+    data_type_values = []
+    data_type_indexes = {}
+    parser_values = []
+    parser_indexes = {}
+    data_type_column = []
+    parser_column = []
+    timestamp_column = []
+    group_columns = {}
+    group_sizes = {}
+
+    for event_object in self._buffer:
+      data_type = getattr(event_object, u'data_type', None)
+      data_type_index = data_type_indexes.get(data_type, None)
+      if data_type_index is None:
+        data_type_index = len(data_type_values)
+        data_type_indexes[data_type] = data_type_index
+        data_type_values.append(data_type)
+
+      parser = getattr(event_object, u'parser', None)
+      parser_index = parser_indexes.get(parser, None)
+      if parser_index is None:
+        parser_index = len(parser_values)
+        parser_indexes[parser] = parser_index
+        parser_values.append(parser)
+
+      data_type_column.append(data_type_index)
+      parser_column.append(parser_index)
+      timestamp_column.append(event_object.timestamp)
+
+      group_row_index = group_sizes.get(data_type_index, 0)
+      group_sizes[data_type_index] = group_row_index + 1
+
+      group = group_columns.setdefault(data_type_index, {})
+      for attribute_name, attribute_value in event_object.GetAttributes():
+        if attribute_name in self._FIXED_ATTRIBUTE_NAMES:
+          continue
+
+        if isinstance(attribute_value, py2to3.BYTES_TYPE):
+          attribute_value = {
+              u'__type__': u'bytes',
+              u'stream': u'{0:s}'.format(binascii.b2a_qp(attribute_value))
+          }
+
+        column_values = group.get(attribute_name, None)
+        if column_values is None:
+          column_values = [None] * group_row_index
+          group[attribute_name] = column_values
+        elif len(column_values) < group_row_index:
+          column_values.extend([None] * (group_row_index - len(column_values)))
+
+        column_values.append(attribute_value)
+
+    number_of_rows = len(self._buffer)
+    self._WriteStream(
+        u'column_timestamp', struct.pack(
+            '<{0:d}q'.format(number_of_rows), *timestamp_column))
+    self._WriteStream(
+        u'column_store_number', struct.pack(
+            '<{0:d}I'.format(number_of_rows),
+            *([self._segment_number] * number_of_rows)))
+    self._WriteStream(
+        u'column_data_type', struct.pack(
+            '<{0:d}I'.format(number_of_rows), *data_type_column))
+    self._WriteStream(
+        u'column_data_type_values', json.dumps(data_type_values))
+    self._WriteStream(
+        u'column_parser', struct.pack(
+            '<{0:d}I'.format(number_of_rows), *parser_column))
+    self._WriteStream(u'column_parser_values', json.dumps(parser_values))
+
+    json_encoder = _ColumnValuesJSONEncoder()
+    for data_type_index, group in iter(group_columns.items()):
+      group_size = group_sizes[data_type_index]
+      for attribute_name, column_values in iter(group.items()):
+        if len(column_values) < group_size:
+          column_values.extend([None] * (group_size - len(column_values)))
+
+        column_name = u'column_group.{0:06d}.{1:d}.{2:s}'.format(
+            self._segment_number, data_type_index, attribute_name)
+        self._zipfile.writestr(column_name, json_encoder.encode(column_values))
+
+    self._segment_number += 1
+    self._buffer = []
+
+  def _WriteStream(self, column_name, stream_data):
+    """Writes a column stream of the current segment.
+
+    Args:
+      column_name: string containing the name of the column stream.
+      stream_data: the data of the steam.
+    """
+    stream_name = u'{0:s}.{1:06d}'.format(column_name, self._segment_number)
+    self._zipfile.writestr(stream_name, stream_data)
+
+  def AddEventObject(self, event_object):
+    """Adds an event object to the storage.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Raises:
+      IOError: when the storage file is closed or read-only.
+    """
+    if not self._zipfile:
+      raise IOError(u'Trying to add an entry to a closed storage file.')
+
+    if self._read_only:
+      raise IOError(u'Trying to add an entry to a read-only storage file.')
+
+    self._buffer.append(event_object)
+    if len(self._buffer) >= self._maximum_segment_size:
+      self._WriteBuffer()
+
+  def Close(self):
+    """Closes the storage file.
+
+    Buffered event objects are written to the storage file before closing.
+    """
+    if not self._zipfile:
+      return
+
+    if not self._read_only:
+      self._WriteBuffer()
+
+    self._zipfile.close()
+    self._zipfile = None
+    self._segments = {}
+    self._segments_lru = []
+
+  def GetEvents(
+      self, attribute_names=None, data_types=None, filter_time_range=None,
+      parsers=None, store_numbers=None, time_range=None):
+    """Retrieves the event objects sorted by timestamp.
+
+    The predicates are evaluated on the fixed columns, hence the remaining
+    attributes are only read for the event objects that match. The event
+    objects in the time range that do not meet the predicates are counted
+    as filtered.
+
+    Args:
+      attribute_names: an optional list of strings containing the names of
+                       the attributes to read in addition to the fixed
+                       columns, where None represents all attributes.
+      data_types: an optional list of strings containing the data types
+                  of the event objects to retrieve.
+      filter_time_range: an optional time range object (instance of
+                         TimeRange) within the time range of the event
+                         objects to retrieve. Unlike the time range
+                         the event objects outside it are counted as
+                         filtered.
+      parsers: an optional list of strings containing the names of
+               the parsers of the event objects to retrieve.
+      store_numbers: an optional list of integers containing the store
+                     numbers of the event objects to retrieve.
+      time_range: an optional time range object (instance of TimeRange).
+
+    Yields:
+      An event object (instance of EventObject).
+    """
+    if store_numbers is not None:
+      store_numbers = frozenset(store_numbers)
+
+    self._number_of_filtered_event_objects = 0
+
+    merge_buffer = []
+    for segment_number in self._GetSegmentNumbers():
+      segment = self._GetSegment(segment_number)
+
+      timestamps = segment.GetTimestamps()
+      if not timestamps:
+        continue
+
+      first_row_index = 0
+      last_row_index = len(timestamps)
+      if time_range:
+        first_row_index = bisect.bisect_left(
+            timestamps, time_range.start_timestamp)
+        last_row_index = bisect.bisect_right(
+            timestamps, time_range.end_timestamp)
+
+      number_of_rows = max(0, last_row_index - first_row_index)
+
+      data_type_indexes = None
+      if data_types is not None:
+        data_type_indexes = frozenset([
+            index for index, data_type in enumerate(
+                segment.GetDataTypeValues())
+            if data_type in data_types])
+        if not data_type_indexes:
+          self._number_of_filtered_event_objects += number_of_rows
+          continue
+
+      parser_indexes = None
+      if parsers is not None:
+        parser_indexes = frozenset([
+            index for index, parser in enumerate(segment.GetParserValues())
+            if parser in parsers])
+        if not parser_indexes:
+          self._number_of_filtered_event_objects += number_of_rows
+          continue
+
+      if filter_time_range:
+        first_row_index = max(first_row_index, bisect.bisect_left(
+            timestamps, filter_time_range.start_timestamp))
+        last_row_index = min(last_row_index, bisect.bisect_right(
+            timestamps, filter_time_range.end_timestamp))
+
+      row_indexes = range(first_row_index, last_row_index)
+      if data_type_indexes is not None:
+        segment_data_type_indexes = segment.GetDataTypeIndexes()
+        row_indexes = [
+            row_index for row_index in row_indexes
+            if segment_data_type_indexes[row_index] in data_type_indexes]
+
+      if parser_indexes is not None:
+        segment_parser_indexes = segment.GetParserIndexes()
+        row_indexes = [
+            row_index for row_index in row_indexes
+            if segment_parser_indexes[row_index] in parser_indexes]
+
+      if store_numbers is not None:
+        segment_store_numbers = segment.GetStoreNumbers()
+        row_indexes = [
+            row_index for row_index in row_indexes
+            if segment_store_numbers[row_index] in store_numbers]
+
+      self._number_of_filtered_event_objects += (
+          number_of_rows - len(row_indexes))
+
+      row_indexes = iter(row_indexes)
+      for row_index in row_indexes:
+        heapq.heappush(merge_buffer, (
+            timestamps[row_index], segment_number, row_index, row_indexes))
+        break
+
+    while merge_buffer:
+      _, segment_number, row_index, row_indexes = heapq.heappop(merge_buffer)
+      segment = self._GetSegment(segment_number)
+
+      for next_row_index in row_indexes:
+        heapq.heappush(merge_buffer, (
+            segment.GetTimestamps()[next_row_index], segment_number,
+            next_row_index, row_indexes))
+        break
+
+      yield segment.GetEventObject(row_index, attribute_names=attribute_names)
+
+  def GetStorageInformation(self):
+    """Retrieves storage (preprocessing) information stored in the storage file.
+
+    Returns:
+      A list of preprocessing objects (instances of PreprocessingObject)
+      that contain the storage information.
+    """
+    try:
+      file_object = self._zipfile.open(u'information.json', mode='r')
+    except KeyError:
+      return []
+
+    try:
+      stream_data = file_object.read()
+    finally:
+      file_object.close()
+
+    serializer = json_serializer.JSONPreprocessObjectSerializer
+    return [
+        serializer.ReadSerialized(line)
+        for line in stream_data.split(b'\n') if line]
+
+  def Open(self, path, read_only=True):
+    """Opens the storage file.
+
+    Args:
+      path: string containing the path of the storage file.
+      read_only: optional boolean value to indicate the storage file should
+                 be opened in read-only mode.
+
+    Raises:
+      IOError: if the storage file is already opened or cannot be opened.
+    """
+    if self._zipfile:
+      raise IOError(u'Storage file already opened.')
+
+    if read_only:
+      access_mode = 'r'
+    else:
+      access_mode = 'a'
+
+    try:
+      self._zipfile = zipfile.ZipFile(
+          path, mode=access_mode, compression=zipfile.ZIP_DEFLATED,
+          allowZip64=True)
+    except zipfile.BadZipfile as exception:
+      raise IOError(
+          u'Unable to open storage file: {0:s} with error: {1!s}'.format(
+              path, exception))
+
+    self._read_only = read_only
+    self._segment_number = 1
+
+    segment_numbers = self._GetSegmentNumbers()
+    if segment_numbers:
+      self._segment_number = segment_numbers[-1] + 1
+
+  def WritePreprocessObject(self, preprocess_object):
+    """Writes a preprocess object to the storage file.
+
+    Args:
+      preprocess_object: the preprocess object (instance of PreprocessObject).
+    """
+    serializer = json_serializer.JSONPreprocessObjectSerializer
+    preprocess_objects = self.GetStorageInformation()
+    preprocess_objects.append(preprocess_object)
+
+    stream_data = b'\n'.join([
+        serializer.WriteSerialized(preprocess_object)
+        for preprocess_object in preprocess_objects])
+
+    # The stream is rewritten every time a preprocess object is added.
+    # Prevent zipfile from generating "UserWarning: Duplicate name:".
+    with warnings.catch_warnings():
+      warnings.simplefilter(u'ignore')
+      self._zipfile.writestr(u'information.json', stream_data)
+
+
+class ColumnarStorageFileReader(reader.StorageReader):
+  """Class that implements the columnar storage file reader."""
+
+  def __init__(self, columnar_storage_file):
+    """Initializes a storage reader object.
+
+    Args:
+      columnar_storage_file: a columnar storage file (instance of
+                             ColumnarStorageFile).
+    """
+    super(ColumnarStorageFileReader, self).__init__()
+    self._columnar_storage_file = columnar_storage_file
+
+  def __exit__(self, unused_type, unused_value, unused_traceback):
+    """Make usable with "with" statement."""
+    self._columnar_storage_file.Close()
+
+  def GetEvents(self, event_predicates=None, time_range=None):
+    """Retrieves events.
+
+    Args:
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet.
+      time_range: an optional time range object (instance of TimeRange).
+
+    Yields:
+      An event object (instance of EventObject).
+    """
+    data_types = None
+    filter_time_range = None
+    parsers = None
+    store_numbers = None
+
+    if event_predicates and event_predicates.is_restricted:
+      is_satisfiable = event_predicates.is_satisfiable
+      if is_satisfiable:
+        try:
+          filter_time_range = event_predicates.GetTimeRange(
+              time_range=time_range)
+        except ValueError:
+          is_satisfiable = False
+
+      if is_satisfiable:
+        data_types = event_predicates.data_types
+        parsers = event_predicates.parsers
+        store_numbers = event_predicates.store_numbers
+      else:
+        # No event object can meet the event predicates, hence all the event
+        # objects in the time range are counted as filtered.
+        data_types = frozenset()
+
+    self.number_of_filtered_events = 0
+
+    for event_object in self._columnar_storage_file.GetEvents(
+        data_types=data_types, filter_time_range=filter_time_range,
+        parsers=parsers, store_numbers=store_numbers, time_range=time_range):
+      self.number_of_filtered_events = (
+          self._columnar_storage_file.number_of_filtered_event_objects)
+      yield event_object
+
+    self.number_of_filtered_events = (
+        self._columnar_storage_file.number_of_filtered_event_objects)
+
+
+class ColumnarStorageFileWriter(writer.StorageWriter):
+  """Class that implements the columnar storage file writer."""
+
+  def __init__(
+      self, event_object_queue, output_file, preprocess_object,
+      serializer_format=u'proto'):
+    """Initializes a storage writer object.
+
+    Args:
+      event_object_queue: an event object queue (instance of Queue).
+      output_file: a string containing the path to the output file.
+      preprocess_object: a preprocess object (instance of PreprocessObject).
+      serializer_format: a string containing the format of serialized event
+                         objects either "proto" or "json".
+    """
+    super(ColumnarStorageFileWriter, self).__init__(event_object_queue)
+    self._output_file = output_file
+    self._preprocess_object = preprocess_object
+    self._storage_file = None
+
+    if serializer_format == u'json':
+      self._event_object_serializer = (
+          json_serializer.JSONEventObjectSerializer)
+      path_spec_serializer = json_serializer.JSONPathSpecSerializer
+    else:
+      self._event_object_serializer = (
+          protobuf_serializer.ProtobufEventObjectSerializer)
+      path_spec_serializer = (
+          dfvfs_protobuf_serializer.ProtobufPathSpecSerializer)
+
+    self._shared_values_serializer = (
+        shared_values.SharedValuesEventObjectSerializer(
+            self._event_object_serializer, path_spec_serializer))
+
+  def _Close(self):
+    """Closes the storage writer."""
+    self._storage_file.WritePreprocessObject(self._preprocess_object)
+    self._storage_file.Close()
+
+  def _ConsumeItem(self, event_object, **unused_kwargs):
+    """Consumes an item callback for ConsumeItems.
+
+    Args:
+      event_object: an event object (instance of EventObject) or
+                    a serialized event object (instance of
+                    SerializedEventObject).
+    """
+    if isinstance(event_object, events.SerializedEventObject):
+      event_object = self._shared_values_serializer.ReadSerialized(
+          event_object)
+
+    self._storage_file.AddEventObject(event_object)
+
+  def _Open(self):
+    """Opens the storage writer."""
+    self._storage_file = ColumnarStorageFile()
+    self._storage_file.Open(self._output_file, read_only=False)
+
+
+factory.StorageFactory.RegisterStorage(ColumnarStorageFile)
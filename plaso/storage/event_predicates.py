@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""Storage event predicates objects."""
+
+from plaso.storage import time_range as storage_time_range
+
+
+class EventPredicates(object):
+  """A class that defines event predicates that the storage can evaluate.
+
+  The event predicates are necessary conditions of an event filter, which
+  means that an event object that does not meet the event predicates cannot
+  match the filter. The storage can use the event predicates to skip event
+  objects before they are deserialized.
+
+  Attributes:
+    data_types: frozenset of strings containing the data types of the event
+                objects that can match or None if not restricted.
+    end_timestamp: integer containing the upper bound timestamp of the event
+                   objects that can match or None if not restricted.
+    parsers: frozenset of strings containing the parser names of the event
+             objects that can match or None if not restricted.
+    start_timestamp: integer containing the lower bound timestamp of the event
+                     objects that can match or None if not restricted.
+    store_numbers: frozenset of integers containing the store numbers of the
+                   event objects that can match or None if not restricted.
+  """
+
+  # The timestamps are 64-bit signed integers.
+  _MINIMUM_TIMESTAMP = -(2 ** 63)
+  _MAXIMUM_TIMESTAMP = (2 ** 63) - 1
+
+  def __init__(
+      self, data_types=None, end_timestamp=None, parsers=None,
+      start_timestamp=None, store_numbers=None):
+    """Initializes event predicates.
+
+    Args:
+      data_types: optional list of strings containing the data types of
+                  the event objects that can match.
+      end_timestamp: optional integer containing the upper bound timestamp
+                     of the event objects that can match.
+      parsers: optional list of strings containing the parser names of
+               the event objects that can match.
+      start_timestamp: optional integer containing the lower bound timestamp
+                       of the event objects that can match.
+      store_numbers: optional list of integers containing the store numbers
+                     of the event objects that can match.
+    """
+    super(EventPredicates, self).__init__()
+    self.data_types = self._GetFrozenSet(data_types)
+    self.end_timestamp = end_timestamp
+    self.parsers = self._GetFrozenSet(parsers)
+    self.start_timestamp = start_timestamp
+    self.store_numbers = self._GetFrozenSet(store_numbers)
+
+  def _GetFrozenSet(self, values):
+    """Retrieves a frozen set of values.
+
+    Args:
+      values: an iterable of values or None.
+
+    Returns:
+      A frozenset containing the values or None.
+    """
+    if values is None:
+      return
+    return frozenset(values)
+
+  @property
+  def is_restricted(self):
+    """Determines if the event predicates restrict the event objects."""
+    return (
+        self.data_types is not None or self.end_timestamp is not None or
+        self.parsers is not None or self.start_timestamp is not None or
+        self.store_numbers is not None)
+
+  @property
+  def is_satisfiable(self):
+    """Determines if any event object can meet the event predicates."""
+    if (self.start_timestamp is not None and self.end_timestamp is not None and
+        self.start_timestamp > self.end_timestamp):
+      return False
+
+    for values in (self.data_types, self.parsers, self.store_numbers):
+      if values is not None and not values:
+        return False
+
+    return True
+
+  def GetTimeRange(self, time_range=None):
+    """Retrieves the time range of the event objects that can match.
+
+    Args:
+      time_range: optional time range object (instance of TimeRange) to
+                  further restrict the time range.
+
+    Returns:
+      A time range object (instance of TimeRange) or None if the time
+      is not restricted.
+
+    Raises:
+      ValueError: if the resulting time range is empty.
+    """
+    start_timestamp = self.start_timestamp
+    end_timestamp = self.end_timestamp
+
+    if time_range:
+      if start_timestamp is None:
+        start_timestamp = time_range.start_timestamp
+      else:
+        start_timestamp = max(start_timestamp, time_range.start_timestamp)
+
+      if end_timestamp is None:
+        end_timestamp = time_range.end_timestamp
+      else:
+        end_timestamp = min(end_timestamp, time_range.end_timestamp)
+
+    if start_timestamp is None and end_timestamp is None:
+      return
+
+    if start_timestamp is None:
+      start_timestamp = self._MINIMUM_TIMESTAMP
+    if end_timestamp is None:
+      end_timestamp = self._MAXIMUM_TIMESTAMP
+
+    return storage_time_range.TimeRange(start_timestamp, end_timestamp)
+
+  def Intersection(self, event_predicates):
+    """Combines event predicates that both must be met.
+
+    Args:
+      event_predicates: the other event predicates (instance of
+                        EventPredicates).
+
+    Returns:
+      The combined event predicates (instance of EventPredicates).
+    """
+    def _IntersectValues(values, other_values):
+      if values is None:
+        return other_values
+      if other_values is None:
+        return values
+      return values.intersection(other_values)
+
+    def _CombineTimestamps(timestamp, other_timestamp, function):
+      if timestamp is None:
+        return other_timestamp
+      if other_timestamp is None:
+        return timestamp
+      return function(timestamp, other_timestamp)
+
+    return EventPredicates(
+        data_types=_IntersectValues(
+            self.data_types, event_predicates.data_types),
+        end_timestamp=_CombineTimestamps(
+            self.end_timestamp, event_predicates.end_timestamp, min),
+        parsers=_IntersectValues(self.parsers, event_predicates.parsers),
+        start_timestamp=_CombineTimestamps(
+            self.start_timestamp, event_predicates.start_timestamp, max),
+        store_numbers=_IntersectValues(
+            self.store_numbers, event_predicates.store_numbers))
+
+  def MatchesValues(
+      self, data_type=None, parser=None, store_number=None, timestamp=None):
+    """Determines if event object values meet the event predicates.
+
+    Only the values that are provided are checked.
+
+    Args:
+      data_type: optional string containing the data type.
+      parser: optional string containing the parser name.
+      store_number: optional integer containing the store number.
+      timestamp: optional integer containing the timestamp.
+
+    Returns:
+      A boolean value that indicates the values meet the event predicates.
+    """
+    if (data_type is not None and self.data_types is not None and
+        data_type not in self.data_types):
+      return False
+
+    if (parser is not None and self.parsers is not None and
+        parser not in self.parsers):
+      return False
+
+    if (store_number is not None and self.store_numbers is not None and
+        store_number not in self.store_numbers):
+      return False
+
+    if timestamp is not None:
+      if self.start_timestamp is not None and timestamp < self.start_timestamp:
+        return False
+      if self.end_timestamp is not None and timestamp > self.end_timestamp:
+        return False
+
+    return True
+
+  def Matches(self, event_object):
+    """Determines if an event object meets the event predicates.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Returns:
+      A boolean value that indicates the event object meets the event
+      predicates.
+    """
+    if not self.MatchesAttributes(event_object):
+      return False
+
+    return self.MatchesValues(
+        timestamp=getattr(event_object, u'timestamp', None))
+
+  def MatchesAttributes(self, event_object):
+    """Determines if the attributes of an event object meet the predicates.
+
+    The timestamp of the event object is not checked, since the storage
+    determines the time range of the event objects it reads separately.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Returns:
+      A boolean value that indicates the data type, parser and store number
+      of the event object meet the event predicates.
+    """
+    data_type = getattr(event_object, u'data_type', None)
+    if self.data_types is not None and data_type not in self.data_types:
+      return False
+
+    parser = getattr(event_object, u'parser', None)
+    if self.parsers is not None and parser not in self.parsers:
+      return False
+
+    store_number = getattr(event_object, u'store_number', None)
+    if (self.store_numbers is not None and
+        store_number not in self.store_numbers):
+      return False
+
+    return True
+
+  def Union(self, event_predicates):
+    """Combines event predicates of which either must be met.
+
+    Args:
+      event_predicates: the other event predicates (instance of
+                        EventPredicates).
+
+    Returns:
+      The combined event predicates (instance of EventPredicates).
+    """
+    def _UnionValues(values, other_values):
+      if values is None or other_values is None:
+        return
+      return values.union(other_values)
+
+    def _CombineTimestamps(timestamp, other_timestamp, function):
+      if timestamp is None or other_timestamp is None:
+        return
+      return function(timestamp, other_timestamp)
+
+    return EventPredicates(
+        data_types=_UnionValues(self.data_types, event_predicates.data_types),
+        end_timestamp=_CombineTimestamps(
+            self.end_timestamp, event_predicates.end_timestamp, max),
+        parsers=_UnionValues(self.parsers, event_predicates.parsers),
+        start_timestamp=_CombineTimestamps(
+            self.start_timestamp, event_predicates.start_timestamp, min),
+        store_numbers=_UnionValues(
+            self.store_numbers, event_predicates.store_numbers))
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""The storage checkpoint journal."""
+
+import base64
+import json
+import logging
+import os
+
+
+class CheckpointJournal(object):
+  """Class that defines a storage checkpoint journal.
+
+  The checkpoint journal is stored next to the ZIP-based storage file and
+  makes it possible to resume an extraction that was interrupted. Every
+  checkpoint is stored as a line of JSON that contains:
+  * the offset and data of the ZIP central directory at the checkpoint;
+  * the comparables of the path specifications of which all event objects
+    were committed to the storage file since the previous checkpoint.
+
+  A checkpoint line is only considered valid when it was completely written,
+  which makes the journal resilient against being interrupted during a write.
+  The journal is read and written as UTF-8 encoded binary data.
+  """
+
+  def __init__(self, path):
+    """Initializes a checkpoint journal.
+
+    Args:
+      path: string containing the path of the checkpoint journal.
+    """
+    super(CheckpointJournal, self).__init__()
+    self._path = path
+
+  @property
+  def path(self):
+    """The path of the checkpoint journal."""
+    return self._path
+
+  def _ReadCheckpoints(self):
+    """Reads the checkpoints from the journal.
+
+    Yields:
+      A dictionary containing the values of a checkpoint.
+    """
+    if not os.path.exists(self._path):
+      return
+
+    with open(self._path, 'rb') as file_object:
+      for line_number, line in enumerate(file_object):
+        # A line without end-of-line character was not completely written.
+        if not line.endswith(b'\n'):
+          logging.warning(
+              u'Ignoring incomplete checkpoint at line: {0:d}.'.format(
+                  line_number + 1))
+          break
+
+        try:
+          checkpoint = json.loads(line.decode(u'utf-8'))
+        except (UnicodeDecodeError, ValueError):
+          logging.warning(
+              u'Ignoring invalid checkpoint at line: {0:d}.'.format(
+                  line_number + 1))
+          break
+
+        yield checkpoint
+
+  def Clear(self):
+    """Removes the checkpoint journal."""
+    if os.path.exists(self._path):
+      os.remove(self._path)
+
+  def RestoreStorageFile(self, storage_file_path):
+    """Restores a storage file to its last checkpoint.
+
+    The data written to the storage file after the last checkpoint is
+    discarded and the ZIP central directory of the last checkpoint is
+    written after the streams that were committed.
+
+    Args:
+      storage_file_path: string containing the path of the storage file.
+
+    Returns:
+      A frozenset containing the comparables of the path specifications
+      that were completed at the last checkpoint.
+
+    Raises:
+      IOError: if the journal does not contain a checkpoint or if the storage
+               file cannot be restored.
+    """
+    completed_path_specs = set()
+    last_checkpoint = None
+    for checkpoint in self._ReadCheckpoints():
+      completed_path_specs.update(checkpoint.get(u'completed_path_specs', []))
+      last_checkpoint = checkpoint
+
+    if not last_checkpoint:
+      raise IOError(u'Missing checkpoint in journal: {0:s}.'.format(
+          self._path))
+
+    if not os.path.isfile(storage_file_path):
+      raise IOError(u'Missing storage file: {0:s}.'.format(storage_file_path))
+
+    central_directory_offset = last_checkpoint.get(
+        u'central_directory_offset', None)
+    central_directory_data = base64.b64decode(
+        last_checkpoint.get(u'central_directory_data', u''))
+
+    if (central_directory_offset is None or
+        central_directory_offset > os.path.getsize(storage_file_path)):
+      raise IOError(u'Unable to restore storage file: {0:s}.'.format(
+          storage_file_path))
+
+    with open(storage_file_path, 'r+b') as file_object:
+      file_object.truncate(central_directory_offset)
+      file_object.seek(central_directory_offset, os.SEEK_SET)
+      file_object.write(central_directory_data)
+      file_object.flush()
+      os.fsync(file_object.fileno())
+
+    return frozenset(completed_path_specs)
+
+  def WriteCheckpoint(
+      self, central_directory_offset, central_directory_data,
+      completed_path_specs):
+    """Writes a checkpoint to the journal.
+
+    The storage file must have been committed, including the ZIP central
+    directory, before the checkpoint is written.
+
+    Args:
+      central_directory_offset: integer containing the offset of the ZIP
+                                central directory in the storage file.
+      central_directory_data: binary string containing the ZIP central
+                              directory and end of central directory records.
+      completed_path_specs: list of the comparables of the path specifications
+                            that were completed since the previous checkpoint.
+    """
+    # The base64 encoded data is decoded to a text string since json cannot
+    # serialize a binary string on Python 3.
+    central_directory_data = base64.b64encode(central_directory_data)
+
+    checkpoint = {
+        u'central_directory_data': central_directory_data.decode(u'ascii'),
+        u'central_directory_offset': central_directory_offset,
+        u'completed_path_specs': completed_path_specs}
+
+    line = u'{0:s}\n'.format(json.dumps(checkpoint, separators=(u',', u':')))
+
+    with open(self._path, 'ab') as file_object:
+      file_object.write(line.encode(u'utf-8'))
+      file_object.flush()
+      os.fsync(file_object.fileno())
@@ -5,7 +5,18 @@ import abc
 
 
 class StorageReader(object):
-  """Class that defines the storage reader interface."""
+  """Class that defines the storage reader interface.
+
+  Attributes:
+    number_of_filtered_events: an integer containing the number of events
+                               that the storage reader skipped, since they
+                               did not meet the event predicates.
+  """
+
+  def __init__(self):
+    """Initializes a storage reader object."""
+    super(StorageReader, self).__init__()
+    self.number_of_filtered_events = 0
 
   def __enter__(self):
     """Make usable with "with" statement."""
@@ -16,11 +27,17 @@ class StorageReader(object):
     return
 
   @abc.abstractmethod
-  def GetEvents(self, time_range=None):
+  def GetEvents(self, event_predicates=None, time_range=None):
     """Retrieves events.
 
     Args:
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet.
+                        The storage reader uses the event predicates to
+                        skip event objects that cannot match a filter.
       time_range: an optional time range object (instance of TimeRange).
+                  The events outside the time range are not counted
+                  as filtered events.
 
     Yields:
       An event object (instance of EventObject).
@@ -18,6 +18,7 @@ class StorageWriter(plaso_queue.ItemQueueConsumer):
       event_object_queue: the event object queue (instance of Queue).
     """
     super(StorageWriter, self).__init__(event_object_queue)
+    self._number_of_completed_path_specs = 0
 
     # Attributes that contain the current status of the storage writer.
     self._status = definitions.PROCESSING_STATUS_INITIALIZED
@@ -37,7 +38,9 @@ class StorageWriter(plaso_queue.ItemQueueConsumer):
   def GetStatus(self):
     """Returns a dictionary containing the status."""
     return {
-        u'number_of_events': self.number_of_consumed_items,
+        u'number_of_events': (
+            self.number_of_consumed_items -
+            self._number_of_completed_path_specs),
         u'processing_status': self._status,
         u'type': definitions.PROCESS_TYPE_STORAGE_WRITER}
 
@@ -101,6 +104,10 @@ class BypassStorageWriter(StorageWriter):
 
   def _ConsumeItem(self, event_object, **unused_kwargs):
     """Consumes an item callback for ConsumeItems."""
+    if isinstance(event_object, plaso_queue.PathSpecCompleted):
+      self._number_of_completed_path_specs += 1
+      return
+
     # Set the store number and index to default values since they are not used.
     event_object.store_number = 1
     event_object.store_index = -1
@@ -47,6 +47,62 @@ The structure is:
 | timestamp | timestamp | ... |
 +-----------+-----------+-...-+
 
+  + plaso_timestamp_ranges.#
+
+These files contain a summary of the first and last timestamp of every
+"proto file", which allows a reader to skip the "proto files" that are
+outside a time range without reading their timestamps. A file is written
+every time the storage file is checkpointed or closed and contains
+the "proto files" written since the previous one, so that a stream name
+is never written twice.
+
+The structure is:
++--------------+-----------------+----------------+-...-+
+| store number | first timestamp | last timestamp | ... |
++--------------+-----------------+----------------+-...-+
+
+Where the store number is an unsigned integer '<I' and the timestamps are
+long ints ('<q').
+
+  + plaso_path_specs
+
+This file contains every distinct serialized path specification of the
+event objects in the "proto file" once. The path specifications are stored
+in the same format as the "proto file".
+
+  + plaso_path_spec_index
+
+This file contains for every entry within the proto file the index of its
+path specification in the plaso_path_specs file. Rather than storing the
+path specification with every event object, which is typically the same
+for all the event objects extracted from a file entry, the event object
+refers to its path specification. The structure is:
+
++-----------+-----------+-...-+
+| reference | reference | ... |
++-----------+-----------+-...-+
+
+Where the reference is an unsigned integer '<I' and 0xffffffff represents
+an event object without a path specification. The path specifications are
+resolved when the event objects are read. Event objects that contain their
+own serialized path specification, such as those of older storage files,
+are supported as well.
+
+  + plaso_strings
+
+This file contains every distinct value of the shared string attributes,
+such as the data type, parser chain and hostname, of the event objects in
+the "proto file" once. The strings are stored UTF-8 encoded in the same
+format as the "proto file".
+
+  + plaso_string_index
+
+This file contains for every entry within the proto file a reference into
+the plaso_strings file per shared string attribute, in the order defined by
+SharedValuesEventObjectSerializer.STRING_ATTRIBUTE_NAMES. The references are
+unsigned integers '<I' where 0xffffffff represents an attribute without
+a shared value, which is then stored with the event object if set.
+
 + The proto file
 
 A proto file consists of:
@@ -55,23 +111,46 @@ A proto file consists of:
 +------+-----------------+------+-...-+
 
 Historically the data was serialized using protobuf.
+
++ Uncompressed storage
+
+The streams are normally stored DEFLATE compressed. If the storage file is
+written without compression the streams are stored as-is (ZIP_STORED) and
+the reader can memory map the storage file to read the event object streams
+without copying or inflating the data.
 """
 
+import array
+import bisect
 import collections
 import heapq
 import logging
+import mmap
+import multiprocessing
 import os
+import Queue
+import signal
+import struct
 import sys
+import threading
+import time
 import warnings
 import zipfile
 
 import construct
 
+from dfvfs.serializer import protobuf_serializer as dfvfs_protobuf_serializer
+
+from plaso.containers import events
+from plaso.engine import plaso_queue
 from plaso.engine import profiler
 from plaso.lib import definitions
 from plaso.lib import errors
+from plaso.lib import py2to3
+from plaso.proto import plaso_storage_pb2
 from plaso.serializer import json_serializer
 from plaso.serializer import protobuf_serializer
+from plaso.serializer import shared_values
 from plaso.storage import reader
 from plaso.storage import writer
 
@@ -236,6 +315,21 @@ class _SerializedDataStream(object):
 
     return data
 
+  def ReadEntryView(self):
+    """Reads an entry from the data stream.
+
+    The stream data is inflated when read, hence unlike the memory mapped
+    serialized data stream the data is always copied.
+
+    Returns:
+      A binary string containing the data or None if there is no data
+      remaining.
+
+    Raises:
+      IOError: if the entry cannot be read.
+    """
+    return self.ReadEntry()
+
   def SeekEntryAtOffset(self, entry_index, stream_offset):
     """Seeks a specific serialized data stream entry at a specific offset.
 
@@ -269,8 +363,9 @@ class _SerializedDataStream(object):
       self._file_object.close()
       self._file_object = None
 
-    if os.path.exists(self._stream_name):
-      os.remove(self._stream_name)
+    stream_file_path = os.path.join(self._path, self._stream_name)
+    if os.path.exists(stream_file_path):
+      os.remove(stream_file_path)
 
   def WriteEntry(self, data):
     """Writes an entry to the file-like object.
@@ -305,13 +400,13 @@ class _SerializedDataStream(object):
     self._file_object.close()
     self._file_object = None
 
-    current_working_directory = os.getcwd()
+    # The working directory is not changed, since the stream can be written
+    # by a buffer writer thread.
+    stream_file_path = os.path.join(self._path, self._stream_name)
     try:
-      os.chdir(self._path)
-      self._zip_file.write(self._stream_name)
+      self._zip_file.write(stream_file_path, arcname=self._stream_name)
     finally:
-      os.remove(self._stream_name)
-      os.chdir(current_working_directory)
+      os.remove(stream_file_path)
 
     return offset
 
@@ -331,6 +426,121 @@ class _SerializedDataStream(object):
     return self._file_object.tell()
 
 
+class _MemoryMappedSerializedDataStream(object):
+  """Class that defines a memory mapped serialized data stream.
+
+  The memory mapped serialized data stream provides access to the entries
+  of an uncompressed (ZIP_STORED) serialized data stream without copying or
+  inflating the stream data.
+  """
+
+  _DATA_ENTRY_SIZE = 4
+
+  # The maximum serialized data size (40 MiB).
+  _MAXIMUM_DATA_SIZE = 40 * 1024 * 1024
+
+  def __init__(self, memory_map, data_offset, data_size):
+    """Initializes a memory mapped serialized data stream object.
+
+    Args:
+      memory_map: the memory map of the storage file (instance of mmap.mmap).
+      data_offset: an integer containing the offset of the stream data
+                   relative to the start of the storage file.
+      data_size: an integer containing the size of the stream data.
+    """
+    super(_MemoryMappedSerializedDataStream, self).__init__()
+    self._data_offset = data_offset
+    self._data_size = data_size
+    self._entry_index = 0
+    self._memory_map = memory_map
+    self._stream_offset = 0
+
+  @property
+  def entry_index(self):
+    """The entry index."""
+    return self._entry_index
+
+  def _GetEntryRange(self):
+    """Retrieves the range of the data of the entry at the current offset.
+
+    Returns:
+      A tuple of the start and end offset of the data relative to the start
+      of the storage file or None if there is no data remaining.
+
+    Raises:
+      IOError: if the entry cannot be read.
+    """
+    if self._stream_offset + self._DATA_ENTRY_SIZE > self._data_size:
+      return
+
+    entry_offset = self._data_offset + self._stream_offset
+    data_size, = struct.unpack_from(b'<I', self._memory_map, entry_offset)
+
+    if data_size > self._MAXIMUM_DATA_SIZE:
+      raise IOError(
+          u'Unable to read data entry size value out of bounds.')
+
+    data_start_offset = entry_offset + self._DATA_ENTRY_SIZE
+    data_end_offset = data_start_offset + data_size
+    if data_end_offset > self._data_offset + self._data_size:
+      raise IOError(u'Unable to read data.')
+
+    self._stream_offset += self._DATA_ENTRY_SIZE + data_size
+    self._entry_index += 1
+
+    return data_start_offset, data_end_offset
+
+  def ReadEntry(self):
+    """Reads an entry from the data stream.
+
+    Returns:
+      A binary string containing the data or None if there is no data
+      remaining.
+
+    Raises:
+      IOError: if the entry cannot be read.
+    """
+    entry_range = self._GetEntryRange()
+    if not entry_range:
+      return
+
+    data_start_offset, data_end_offset = entry_range
+    return self._memory_map[data_start_offset:data_end_offset]
+
+  def ReadEntryView(self):
+    """Reads an entry from the data stream without copying the data.
+
+    Returns:
+      A read-only view of the data (instance of buffer or memoryview) or
+      None if there is no data remaining.
+
+    Raises:
+      IOError: if the entry cannot be read.
+    """
+    entry_range = self._GetEntryRange()
+    if not entry_range:
+      return
+
+    data_start_offset, data_end_offset = entry_range
+    if sys.version_info[0] < 3:
+      # pylint: disable=undefined-variable
+      return buffer(
+          self._memory_map, data_start_offset,
+          data_end_offset - data_start_offset)
+
+    return memoryview(self._memory_map)[data_start_offset:data_end_offset]
+
+  def SeekEntryAtOffset(self, entry_index, stream_offset):
+    """Seeks a specific serialized data stream entry at a specific offset.
+
+    Args:
+      entry_index: an integer containing the serialized data stream entry index.
+      stream_offset: an integer containing the data stream offset.
+    """
+    self._entry_index = entry_index
+    self._stream_offset = stream_offset
+
+
 class _SerializedDataOffsetTable(object):
   """Class that defines a serialized data offset table."""
 
@@ -414,7 +624,11 @@ class _SerializedDataOffsetTable(object):
 
 
 class _SerializedDataTimestampTable(object):
-  """Class that defines a serialized data timestamp table."""
+  """Class that defines a serialized data timestamp table.
+
+  The timestamps are stored in an array of 64-bit signed integers
+  (instance of array.array), if supported by the platform.
+  """
 
   _TABLE = construct.GreedyRange(
       construct.SLInt64(u'timestamp'))
@@ -432,7 +646,7 @@ class _SerializedDataTimestampTable(object):
       stream_name: string containing the name of the stream.
     """
     super(_SerializedDataTimestampTable, self).__init__()
-    self._timestamps = []
+    self._timestamps = self._CreateTimestampsArray()
     self._stream_name = stream_name
     self._zip_file = zip_file
 
@@ -441,6 +655,42 @@ class _SerializedDataTimestampTable(object):
     """The number of timestamps."""
     return len(self._timestamps)
 
+  @classmethod
+  def _CreateTimestampsArray(cls, data=None):
+    """Creates an array of 64-bit signed integers.
+
+    Args:
+      data: optional binary string containing little-endian 64-bit signed
+            integers.
+
+    Returns:
+      An array (instance of array.array) or a list if the platform does
+      not support an array of 64-bit signed integers.
+    """
+    for type_code in ('q', 'l'):
+      try:
+        timestamps = array.array(type_code)
+      except ValueError:
+        # Python 2 does not support the "q" type code.
+        continue
+
+      if timestamps.itemsize != cls._TABLE_ENTRY_SIZE:
+        continue
+
+      if data:
+        timestamps.extend(array.array(type_code, data))
+        if sys.byteorder != u'little':
+          timestamps.byteswap()
+
+      return timestamps
+
+    if not data:
+      return []
+
+    number_of_timestamps = len(data) // cls._TABLE_ENTRY_SIZE
+    return list(struct.unpack(
+        '<{0:d}q'.format(number_of_timestamps), data))
+
   def AddTimestamp(self, timestamp):
     """Adds a timestamp.
 
@@ -449,6 +699,23 @@ class _SerializedDataTimestampTable(object):
     """
     self._timestamps.append(timestamp)
 
+  def GetFirstEntryIndex(self, timestamp):
+    """Retrieves the index of the first entry at or after a timestamp.
+
+    Since the timestamps in the table are sorted a binary search is used.
+
+    Args:
+      timestamp: an integer containing the timestamp.
+
+    Returns:
+      An integer containing the table entry index or None if all the
+      timestamps in the table are before the timestamp.
+    """
+    entry_index = bisect.bisect_left(self._timestamps, timestamp)
+    if entry_index >= len(self._timestamps):
+      return
+    return entry_index
+
   def GetTimestamp(self, entry_index):
     """Retrieves a specific timestamp.
 
@@ -475,12 +742,110 @@ class _SerializedDataTimestampTable(object):
       raise IOError(
           u'Unable to open stream with error: {0:s}'.format(exception))
 
+    try:
+      table_data = file_object.read()
+    finally:
+      file_object.close()
+
+    if len(table_data) % self._TABLE_ENTRY_SIZE:
+      raise IOError(u'Unable to read table with unsupported size.')
+
+    self._timestamps = self._CreateTimestampsArray(data=table_data)
+
+  def Write(self):
+    """Writes the timestamp table.
+
+    Raises:
+      IOError: if the timestamp table cannot be written.
+    """
+    table_data = self._TABLE.build(self._timestamps)
+    self._zip_file.writestr(self._stream_name, table_data)
+
+
+class _SerializedDataTimestampRangeTable(object):
+  """Class that defines a serialized data timestamp range table.
+
+  The timestamp range table contains the first and last timestamp of
+  the serialized data streams.
+  """
+
+  _TABLE_ENTRY = construct.Struct(
+      u'table_entry',
+      construct.ULInt32(u'stream_number'),
+      construct.SLInt64(u'first_timestamp'),
+      construct.SLInt64(u'last_timestamp'))
+  _TABLE_ENTRY_SIZE = _TABLE_ENTRY.sizeof()
+
+  def __init__(self, zip_file, stream_name):
+    """Initializes a serialized data timestamp range table object.
+
+    Args:
+      zip_file: the ZIP file object that contains the stream.
+      stream_name: string containing the name of the stream or None
+                   if the table is not stored in a stream.
+    """
+    super(_SerializedDataTimestampRangeTable, self).__init__()
+    self._stream_name = stream_name
+    self._timestamp_ranges = {}
+    self._zip_file = zip_file
+
+  @property
+  def number_of_entries(self):
+    """The number of timestamp range entries."""
+    return len(self._timestamp_ranges)
+
+  def AddTimestampRange(self, stream_number, first_timestamp, last_timestamp):
+    """Adds a timestamp range.
+
+    Args:
+      stream_number: an integer containing the number of the stream.
+      first_timestamp: an integer containing the first timestamp of
+                       the stream.
+      last_timestamp: an integer containing the last timestamp of the stream.
+    """
+    self._timestamp_ranges[stream_number] = (first_timestamp, last_timestamp)
+
+  def Merge(self, timestamp_range_table):
+    """Merges the timestamp ranges of another timestamp range table.
+
+    Args:
+      timestamp_range_table: the timestamp range table (instance of
+                             _SerializedDataTimestampRangeTable) to merge.
+    """
+    # pylint: disable=protected-access
+    self._timestamp_ranges.update(timestamp_range_table._timestamp_ranges)
+
+  def GetTimestampRange(self, stream_number):
+    """Retrieves the timestamp range of a specific stream.
+
+    Args:
+      stream_number: an integer containing the number of the stream.
+
+    Returns:
+      A tuple containing the first and last timestamp of the stream or None
+      if not available.
+    """
+    return self._timestamp_ranges.get(stream_number, None)
+
+  def Read(self):
+    """Reads the serialized data timestamp range table.
+
+    Raises:
+      IOError: if the timestamp range table cannot be read.
+    """
+    try:
+      file_object = self._zip_file.open(self._stream_name, mode='r')
+    except KeyError as exception:
+      raise IOError(
+          u'Unable to open stream with error: {0:s}'.format(exception))
+
     try:
       entry_data = file_object.read(self._TABLE_ENTRY_SIZE)
-      while entry_data:
+      while len(entry_data) == self._TABLE_ENTRY_SIZE:
         table_entry = self._TABLE_ENTRY.parse(entry_data)
 
-        self._timestamps.append(table_entry.timestamp)
+        self._timestamp_ranges[table_entry.stream_number] = (
+            table_entry.first_timestamp, table_entry.last_timestamp)
         entry_data = file_object.read(self._TABLE_ENTRY_SIZE)
 
     except construct.FieldError as exception:
@@ -491,12 +856,21 @@ class _SerializedDataTimestampTable(object):
       file_object.close()
 
   def Write(self):
-    """Writes the timestamp table.
+    """Writes the timestamp range table.
 
     Raises:
-      IOError: if the timestamp table cannot be written.
+      IOError: if the timestamp range table cannot be written.
     """
-    table_data = self._TABLE.build(self._timestamps)
+    serialized_entries = []
+    for stream_number, timestamp_range in sorted(
+        self._timestamp_ranges.items()):
+      first_timestamp, last_timestamp = timestamp_range
+      entry_data = self._TABLE_ENTRY.build(construct.Container(
+          stream_number=stream_number, first_timestamp=first_timestamp,
+          last_timestamp=last_timestamp))
+      serialized_entries.append(entry_data)
+
+    table_data = b''.join(serialized_entries)
     self._zip_file.writestr(self._stream_name, table_data)
 
 
@@ -635,63 +1009,422 @@ class _SerializedEventTagIndexTable(object):
     self._zip_file.writestr(self._stream_name, table_data)
 
 
-class ZIPStorageFile(object):
-  """Class that defines the ZIP-based storage file.
+class _SerializedDataTable(object):
+  """Class that defines a serialized data table.
 
-  This class contains the lower-level stream management functionality.
+  The data table contains every distinct serialized value of a store once,
+  such as the path specifications of the event objects. The entries are
+  stored in the same format as the serialized data stream.
+  """
 
-  The ZIP-based storagefile contains several streams (files) that contain
-  serialized event objects named:
+  _DATA_ENTRY = construct.Struct(
+      u'data_entry',
+      construct.ULInt32(u'size'))
+  _DATA_ENTRY_SIZE = _DATA_ENTRY.sizeof()
 
-        plaso_proto.###
+  def __init__(self, zip_file, stream_name):
+    """Initializes a serialized data table object.
 
-  Where ### is an increasing integer that starts at 1.
-  """
+    Args:
+      zip_file: the ZIP file object that contains the stream.
+      stream_name: string containing the name of the stream.
+    """
+    super(_SerializedDataTable, self).__init__()
+    self._entries = []
+    self._entry_indexes = {}
+    self._stream_name = stream_name
+    self._zip_file = zip_file
 
-  # The maximum number of cached tables.
-  _MAXIMUM_NUMBER_OF_CACHED_TABLES = 5
+  @property
+  def number_of_entries(self):
+    """The number of entries."""
+    return len(self._entries)
 
-  def __init__(self):
-    """Initializes a ZIP-based storage file object."""
-    super(ZIPStorageFile, self).__init__()
-    self._event_object_streams = {}
-    self._offset_tables = {}
-    self._offset_tables_lfu = []
-    self._path = None
-    self._timestamp_tables = {}
-    self._timestamp_tables_lfu = []
-    self._zipfile = None
+  def AddEntry(self, data):
+    """Adds an entry.
 
-  def _Close(self):
-    """Closes the storage file."""
-    if not self._zipfile:
-      return
+    Data that was added before is not added again.
 
-    self._event_object_streams = {}
-    self._offset_tables = {}
-    self._offset_tables_lfu = []
-    self._timestamp_tables = {}
-    self._timestamp_tables_lfu = []
+    Args:
+      data: a binary string containing the serialized data.
 
-    self._zipfile.close()
-    self._zipfile = None
+    Returns:
+      An integer containing the index of the entry in the table.
+    """
+    table_index = self._entry_indexes.get(data, None)
+    if table_index is None:
+      table_index = len(self._entries)
+      self._entries.append(data)
+      self._entry_indexes[data] = table_index
 
-  def _GetSerializedEventObjectOffsetTable(self, stream_number):
-    """Retrieves the serialized event object stream offset table.
+    return table_index
+
+  def GetEntry(self, table_index):
+    """Retrieves a specific entry.
 
     Args:
-      stream_number: an integer containing the number of the stream.
+      table_index: an integer containing the table entry index.
 
     Returns:
-      A serialized data offset table (instance of _SerializedDataOffsetTable).
+      A binary string containing the serialized data.
 
     Raises:
-      IOError: if the stream cannot be opened.
+      IndexError: if the table entry index is out of bounds.
     """
-    offset_table = self._offset_tables.get(stream_number, None)
-    if not offset_table:
-      stream_name = u'plaso_index.{0:06d}'.format(stream_number)
-      if not self._HasStream(stream_name):
+    return self._entries[table_index]
+
+  def Read(self):
+    """Reads the serialized data table.
+
+    Raises:
+      IOError: if the data table cannot be read.
+    """
+    try:
+      file_object = self._zip_file.open(self._stream_name, mode='r')
+    except KeyError as exception:
+      raise IOError(
+          u'Unable to open stream with error: {0:s}'.format(exception))
+
+    try:
+      table_data = file_object.read()
+    finally:
+      file_object.close()
+
+    table_data_size = len(table_data)
+    table_data_offset = 0
+    while table_data_offset < table_data_size:
+      try:
+        data_entry = self._DATA_ENTRY.parse(table_data[
+            table_data_offset:table_data_offset + self._DATA_ENTRY_SIZE])
+      except construct.FieldError as exception:
+        raise IOError(
+            u'Unable to read data entry with error: {0:s}'.format(exception))
+
+      table_data_offset += self._DATA_ENTRY_SIZE
+      if table_data_offset + data_entry.size > table_data_size:
+        raise IOError(u'Unable to read data entry size value out of bounds.')
+
+      self._entries.append(
+          table_data[table_data_offset:table_data_offset + data_entry.size])
+      table_data_offset += data_entry.size
+
+  def Write(self):
+    """Writes the data table.
+
+    Raises:
+      IOError: if the data table cannot be written.
+    """
+    # The entries are serialized directly into a pre-allocated buffer, which
+    # is written to the stream, to prevent copying the entries twice.
+    table_data_size = sum([
+        self._DATA_ENTRY_SIZE + len(data) for data in self._entries])
+    table_data = bytearray(table_data_size)
+
+    table_data_offset = 0
+    for data in self._entries:
+      data_size = len(data)
+      table_data[
+          table_data_offset:table_data_offset + self._DATA_ENTRY_SIZE] = (
+              self._DATA_ENTRY.build(construct.Container(size=data_size)))
+      table_data_offset += self._DATA_ENTRY_SIZE
+
+      table_data[table_data_offset:table_data_offset + data_size] = data
+      table_data_offset += data_size
+
+    # On Python 2 zipfile only supports strings and read-only buffers.
+    if sys.version_info[0] < 3:
+      # pylint: disable=undefined-variable
+      table_data = buffer(table_data)
+
+    self._zip_file.writestr(self._stream_name, table_data)
+
+
+class _SerializedReferenceTable(object):
+  """Class that defines a serialized reference table.
+
+  The reference table contains for every entry in the serialized data
+  stream a fixed number of references, which are indexes of entries in
+  the data tables of the store. The references are stored in an array of
+  32-bit unsigned integers (instance of array.array), if supported by
+  the platform.
+  """
+
+  # The reference of a value that is not stored in a data table.
+  NO_REFERENCE = 0xffffffff
+
+  _TABLE = construct.GreedyRange(
+      construct.ULInt32(u'reference'))
+
+  _TABLE_ENTRY = construct.Struct(
+      u'table_entry',
+      construct.ULInt32(u'reference'))
+  _TABLE_ENTRY_SIZE = _TABLE_ENTRY.sizeof()
+
+  def __init__(self, zip_file, stream_name, number_of_references=1):
+    """Initializes a serialized reference table object.
+
+    Args:
+      zip_file: the ZIP file object that contains the stream.
+      stream_name: string containing the name of the stream.
+      number_of_references: optional integer containing the number of
+                            references per serialized data stream entry.
+    """
+    super(_SerializedReferenceTable, self).__init__()
+    self._number_of_references = number_of_references
+    self._references = self._CreateReferencesArray()
+    self._stream_name = stream_name
+    self._zip_file = zip_file
+
+  @classmethod
+  def _CreateReferencesArray(cls, data=None):
+    """Creates an array of 32-bit unsigned integers.
+
+    Args:
+      data: optional binary string containing little-endian 32-bit unsigned
+            integers.
+
+    Returns:
+      An array (instance of array.array) or a list if the platform does
+      not support an array of 32-bit unsigned integers.
+    """
+    for type_code in ('I', 'L'):
+      references = array.array(type_code)
+      if references.itemsize != cls._TABLE_ENTRY_SIZE:
+        continue
+
+      if data:
+        references.extend(array.array(type_code, data))
+        if sys.byteorder != u'little':
+          references.byteswap()
+
+      return references
+
+    if not data:
+      return []
+
+    number_of_references = len(data) // cls._TABLE_ENTRY_SIZE
+    return list(struct.unpack(
+        '<{0:d}I'.format(number_of_references), data))
+
+  def AddReference(self, reference):
+    """Adds the reference of an entry with a single reference.
+
+    Args:
+      reference: an integer containing the index of an entry in the data
+                 table or NO_REFERENCE.
+    """
+    self._references.append(reference)
+
+  def AddReferences(self, references):
+    """Adds the references of an entry.
+
+    Args:
+      references: a tuple of integers containing the indexes of entries in
+                  the data table or NO_REFERENCE.
+    """
+    self._references.extend(references)
+
+  def GetReference(self, entry_index):
+    """Retrieves the reference of an entry with a single reference.
+
+    Args:
+      entry_index: an integer containing the serialized data stream entry
+                   index.
+
+    Returns:
+      An integer containing the index of an entry in the data table or
+      NO_REFERENCE.
+
+    Raises:
+      IndexError: if the entry index is out of bounds.
+    """
+    return self._references[entry_index]
+
+  def GetReferences(self, entry_index):
+    """Retrieves the references of an entry.
+
+    Args:
+      entry_index: an integer containing the serialized data stream entry
+                   index.
+
+    Returns:
+      A tuple of integers containing the indexes of entries in the data
+      table or NO_REFERENCE.
+
+    Raises:
+      IndexError: if the entry index is out of bounds.
+    """
+    table_index = entry_index * self._number_of_references
+    if entry_index < 0 or table_index >= len(self._references):
+      raise IndexError(u'Entry index out of bounds.')
+
+    return tuple(self._references[
+        table_index:table_index + self._number_of_references])
+
+  def Read(self):
+    """Reads the serialized reference table.
+
+    Raises:
+      IOError: if the reference table cannot be read.
+    """
+    try:
+      file_object = self._zip_file.open(self._stream_name, mode='r')
+    except KeyError as exception:
+      raise IOError(
+          u'Unable to open stream with error: {0:s}'.format(exception))
+
+    try:
+      table_data = file_object.read()
+    finally:
+      file_object.close()
+
+    table_entries_size = self._TABLE_ENTRY_SIZE * self._number_of_references
+    if len(table_data) % table_entries_size:
+      raise IOError(u'Unable to read table with unsupported size.')
+
+    self._references = self._CreateReferencesArray(data=table_data)
+
+  def Write(self):
+    """Writes the reference table.
+
+    Raises:
+      IOError: if the reference table cannot be written.
+    """
+    table_data = self._TABLE.build(self._references)
+    self._zip_file.writestr(self._stream_name, table_data)
+
+
+class _SerializedStringTable(_SerializedDataTable):
+  """Class that defines a serialized string table.
+
+  The string table contains every distinct value of the shared string
+  attributes of a store once, stored UTF-8 encoded. The strings are decoded
+  once, so that the event objects that refer to the same string share
+  the same string object.
+  """
+
+  def __init__(self, zip_file, stream_name):
+    """Initializes a serialized string table object.
+
+    Args:
+      zip_file: the ZIP file object that contains the stream.
+      stream_name: string containing the name of the stream.
+    """
+    super(_SerializedStringTable, self).__init__(zip_file, stream_name)
+    self._string_indexes = {}
+    self._strings = {}
+
+  def AddString(self, string):
+    """Adds a string.
+
+    Args:
+      string: a Unicode string.
+
+    Returns:
+      An integer containing the index of the string in the table.
+
+    Raises:
+      UnicodeError: if the string cannot be encoded.
+    """
+    table_index = self._string_indexes.get(string, None)
+    if table_index is None:
+      table_index = self.AddEntry(string.encode(u'utf-8'))
+      self._string_indexes[string] = table_index
+
+    return table_index
+
+  def GetString(self, table_index):
+    """Retrieves a specific string.
+
+    Args:
+      table_index: an integer containing the table entry index.
+
+    Returns:
+      A Unicode string.
+
+    Raises:
+      IndexError: if the table entry index is out of bounds.
+      UnicodeDecodeError: if the string cannot be decoded.
+    """
+    string = self._strings.get(table_index, None)
+    if string is None:
+      string = self.GetEntry(table_index).decode(u'utf-8')
+      self._strings[table_index] = string
+
+    return string
+
+
+class ZIPStorageFile(object):
+  """Class that defines the ZIP-based storage file.
+
+  This class contains the lower-level stream management functionality.
+
+  The ZIP-based storagefile contains several streams (files) that contain
+  serialized event objects named:
+
+        plaso_proto.###
+
+  Where ### is an increasing integer that starts at 1.
+  """
+
+  # The maximum number of cached tables.
+  _MAXIMUM_NUMBER_OF_CACHED_TABLES = 5
+
+  # The local file header of a ZIP file member.
+  _ZIP_LOCAL_FILE_HEADER_SIGNATURE = b'PK\x03\x04'
+  _ZIP_LOCAL_FILE_HEADER_SIZE = 30
+
+  def __init__(self):
+    """Initializes a ZIP-based storage file object."""
+    super(ZIPStorageFile, self).__init__()
+    self._event_object_streams = {}
+    self._memory_map = None
+    self._memory_map_file_object = None
+    self._offset_tables = {}
+    self._offset_tables_lfu = []
+    self._path = None
+    self._timestamp_tables = {}
+    self._timestamp_tables_lfu = []
+    self._zipfile = None
+
+  def _Close(self):
+    """Closes the storage file."""
+    if not self._zipfile:
+      return
+
+    self._event_object_streams = {}
+    self._offset_tables = {}
+    self._offset_tables_lfu = []
+    self._timestamp_tables = {}
+    self._timestamp_tables_lfu = []
+
+    if self._memory_map:
+      self._memory_map.close()
+      self._memory_map = None
+
+    if self._memory_map_file_object:
+      self._memory_map_file_object.close()
+      self._memory_map_file_object = None
+
+    self._zipfile.close()
+    self._zipfile = None
+
+  def _GetSerializedEventObjectOffsetTable(self, stream_number):
+    """Retrieves the serialized event object stream offset table.
+
+    Args:
+      stream_number: an integer containing the number of the stream.
+
+    Returns:
+      A serialized data offset table (instance of _SerializedDataOffsetTable).
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    offset_table = self._offset_tables.get(stream_number, None)
+    if not offset_table:
+      stream_name = u'plaso_index.{0:06d}'.format(stream_number)
+      if not self._HasStream(stream_name):
         raise IOError(u'No such stream: {0:s}'.format(stream_name))
 
       offset_table = _SerializedDataOffsetTable(self._zipfile, stream_name)
@@ -729,8 +1462,17 @@ class ZIPStorageFile(object):
       if not self._HasStream(stream_name):
         raise IOError(u'No such stream: {0:s}'.format(stream_name))
 
-      data_stream = _SerializedDataStream(
-          self._zipfile, self._path, stream_name)
+      zip_info = self._zipfile.getinfo(stream_name)
+      if (self._memory_map and
+          zip_info.compress_type == zipfile.ZIP_STORED):
+        data_offset = self._GetStreamDataOffset(zip_info)
+        data_stream = _MemoryMappedSerializedDataStream(
+            self._memory_map, data_offset, zip_info.file_size)
+
+      else:
+        data_stream = _SerializedDataStream(
+            self._zipfile, self._path, stream_name)
+
       self._event_object_streams[stream_number] = data_stream
 
     return data_stream
@@ -791,6 +1533,38 @@ class ZIPStorageFile(object):
 
     return sorted(stream_numbers)
 
+  def _GetStreamDataOffset(self, zip_info):
+    """Retrieves the offset of the data of an uncompressed stream.
+
+    Args:
+      zip_info: the ZIP file member information (instance of zipfile.ZipInfo).
+
+    Returns:
+      An integer containing the offset of the stream data relative to
+      the start of the storage file.
+
+    Raises:
+      IOError: if the local file header of the stream is invalid.
+    """
+    header_offset = zip_info.header_offset
+    header_data = self._memory_map[
+        header_offset:header_offset + self._ZIP_LOCAL_FILE_HEADER_SIZE]
+
+    if (len(header_data) != self._ZIP_LOCAL_FILE_HEADER_SIZE or
+        not header_data.startswith(self._ZIP_LOCAL_FILE_HEADER_SIGNATURE)):
+      raise IOError(
+          u'Invalid local file header of stream: {0:s}'.format(
+              zip_info.filename))
+
+    # The local file header can contain a different file name and
+    # extra field size than the central directory.
+    file_name_size, extra_field_size = struct.unpack(
+        b'<HH', header_data[26:30])
+
+    return (
+        header_offset + self._ZIP_LOCAL_FILE_HEADER_SIZE + file_name_size +
+        extra_field_size)
+
   def _GetStreamNames(self):
     """Retrieves the stream names.
 
@@ -818,12 +1592,14 @@ class ZIPStorageFile(object):
     file_object.close()
     return True
 
-  def _Open(self, path, access_mode='r'):
+  def _Open(self, path, access_mode='r', compress=True):
     """Opens the storage file.
 
     Args:
       path: string containing the path of the storage file.
       access_mode: optional string indicating the access mode.
+      compress: optional boolean value to indicate the streams should be
+                written DEFLATE compressed.
 
     Raises:
       IOError: if the ZIP file is already opened or if the ZIP file cannot
@@ -834,15 +1610,54 @@ class ZIPStorageFile(object):
 
     self._path = path
 
+    if compress:
+      compression = zipfile.ZIP_DEFLATED
+    else:
+      compression = zipfile.ZIP_STORED
+
     try:
       self._zipfile = zipfile.ZipFile(
-          self._path, mode=access_mode, compression=zipfile.ZIP_DEFLATED,
+          self._path, mode=access_mode, compression=compression,
           allowZip64=True)
 
     except zipfile.BadZipfile as exception:
       raise IOError(
           u'Unable to open ZIP file with error: {0:s}'.format(exception))
 
+    if access_mode == 'r':
+      self._OpenMemoryMap()
+
+  def _OpenMemoryMap(self):
+    """Memory maps the storage file if it contains uncompressed streams.
+
+    The memory map is only used for reading. If the storage file cannot
+    be memory mapped, for example due to address space limitations,
+    the streams are read using the zipfile module.
+    """
+    has_uncompressed_streams = False
+    for zip_info in self._zipfile.infolist():
+      if (zip_info.filename.startswith(u'plaso_proto.') and
+          zip_info.compress_type == zipfile.ZIP_STORED):
+        has_uncompressed_streams = True
+        break
+
+    if not has_uncompressed_streams:
+      return
+
+    try:
+      self._memory_map_file_object = open(self._path, 'rb')
+      self._memory_map = mmap.mmap(
+          self._memory_map_file_object.fileno(), 0, access=mmap.ACCESS_READ)
+
+    except (EnvironmentError, OverflowError, ValueError) as exception:
+      logging.warning(
+          u'Unable to memory map storage file with error: {0!s}'.format(
+              exception))
+
+      if self._memory_map_file_object:
+        self._memory_map_file_object.close()
+        self._memory_map_file_object = None
+
   def _OpenStream(self, stream_name, access_mode='r'):
     """Opens a stream.
 
@@ -894,6 +1709,105 @@ class ZIPStorageFile(object):
       self._zipfile.writestr(stream_name, stream_data)
 
 
+class _SerializedEventObjectBufferWriter(threading.Thread):
+  """Class that defines a serialized event object buffer writer thread.
+
+  The buffer writer writes buffers of serialized event objects to
+  the storage file, while the storage file fills the next buffer. Most of
+  the time writing a buffer is spent compressing the streams and zlib
+  releases the GIL while compressing.
+
+  The number of buffers that are queued or being written is limited,
+  to limit the memory used by the buffers. Queuing a buffer blocks until
+  the number of buffers is below the limit.
+  """
+
+  def __init__(self, write_function, maximum_number_of_buffers=1):
+    """Initializes the buffer writer thread.
+
+    Args:
+      write_function: the function that writes a buffer, which is called
+                      with the arguments of QueueBuffer.
+      maximum_number_of_buffers: optional integer containing the maximum
+                                 number of buffers that are queued or being
+                                 written.
+    """
+    super(_SerializedEventObjectBufferWriter, self).__init__()
+    self._buffers_semaphore = threading.BoundedSemaphore(
+        maximum_number_of_buffers)
+    self._exception = None
+    self._queue = Queue.Queue()
+    self._write_function = write_function
+    self.daemon = True
+
+  def _RaiseException(self):
+    """Raises the exception that occurred while writing a buffer.
+
+    Raises:
+      IOError: if a buffer could not be written.
+    """
+    if self._exception:
+      raise IOError(
+          u'Unable to write buffer with error: {0!s}'.format(self._exception))
+
+  def Flush(self):
+    """Waits until the queued buffers have been written.
+
+    Raises:
+      IOError: if a buffer could not be written.
+    """
+    self._queue.join()
+    self._RaiseException()
+
+  def QueueBuffer(self, *arguments):
+    """Queues a buffer to be written.
+
+    Args:
+      arguments: the arguments to call the write function with.
+
+    Raises:
+      IOError: if a previous buffer could not be written.
+    """
+    self._RaiseException()
+
+    self._buffers_semaphore.acquire()
+    self._queue.put(arguments)
+
+  # This method is part of the threading.Thread interface, hence its name
+  # does not follow the style guide.
+  def run(self):
+    """Writes the queued buffers until stopped."""
+    while True:
+      arguments = self._queue.get()
+      try:
+        if arguments is None:
+          return
+
+        # Once a buffer could not be written the subsequent buffers are
+        # discarded, since the storage file is no longer consistent.
+        if not self._exception:
+          try:
+            self._write_function(*arguments)
+          except Exception as exception:  # pylint: disable=broad-except
+            logging.exception(exception)
+            self._exception = exception
+
+        self._buffers_semaphore.release()
+
+      finally:
+        self._queue.task_done()
+
+  def Stop(self):
+    """Writes the queued buffers and stops the thread.
+
+    Raises:
+      IOError: if a buffer could not be written.
+    """
+    self._queue.put(None)
+    self.join()
+    self._RaiseException()
+
+
 class StorageFile(ZIPStorageFile):
   """Class that defines the ZIP-based storage file."""
 
@@ -909,15 +1823,46 @@ class StorageFile(ZIPStorageFile):
   # Set the version of this storage mechanism.
   STORAGE_VERSION = 1
 
+  _STRING_ATTRIBUTE_NAMES = (
+      shared_values.SharedValuesEventObjectSerializer.STRING_ATTRIBUTE_NAMES)
+
+  _DATA_TYPE_STRING_INDEX = _STRING_ATTRIBUTE_NAMES.index(u'data_type')
+  _PARSER_STRING_INDEX = _STRING_ATTRIBUTE_NAMES.index(u'parser')
+
+  # The maximum number of cached event object timestamp tables. This is
+  # larger than the maximum number of cached tables, since the event objects
+  # of the streams are read alternately.
+  _MAXIMUM_NUMBER_OF_CACHED_EVENT_TIMESTAMP_TABLES = 32
+
+  # The maximum number of cached path specification tables, including their
+  # reference tables and deserialized path specifications. The event objects
+  # of the streams are read alternately.
+  _MAXIMUM_NUMBER_OF_CACHED_PATH_SPEC_TABLES = 32
+
+  # The maximum number of cached string tables, including their reference
+  # tables. The event objects of the streams are read alternately.
+  _MAXIMUM_NUMBER_OF_CACHED_STRING_TABLES = 32
+
+  # The maximum number of buffers that are queued to or being written by
+  # the background writer, in addition to the buffer that is being filled.
+  _MAXIMUM_NUMBER_OF_WRITER_BUFFERS = 1
+
   def __init__(
-      self, output_file, buffer_size=0, read_only=False,
+      self, output_file, background_writer=False, buffer_size=0, compress=True,
+      read_only=False,
       serializer_format=definitions.SERIALIZER_FORMAT_PROTOBUF):
     """Initializes the storage file.
 
     Args:
       output_file: a string containing the name of the output file.
+      background_writer: optional boolean to indicate the buffered event
+                         objects should be written by a background thread,
+                         while the next buffer is filled.
       buffer_size: optional maximum size of a single storage (protobuf) file.
                    The default is 0, which indicates no limit.
+      compress: optional boolean to indicate the streams should be written
+                DEFLATE compressed. Uncompressed storage files can be
+                memory mapped when they are read.
       read_only: optional boolean to indicate we are opening the storage file
                  for reading only.
       serializer_format: optional storage serializer format.
@@ -928,22 +1873,43 @@ class StorageFile(ZIPStorageFile):
     """
     super(StorageFile, self).__init__()
     self._analysis_report_serializer = None
+    self._background_writer = background_writer and not read_only
     self._buffer = []
     self._buffer_first_timestamp = sys.maxint
     self._buffer_last_timestamp = -sys.maxint - 1
     self._buffer_size = 0
+    self._buffer_writer = None
     self._event_object_serializer = None
     self._event_tag_index = None
     self._event_tag_serializer = None
+    self._event_timestamp_tables = {}
+    self._event_timestamp_tables_lru = []
     self._file_number = 1
     self._first_file_number = None
+    self._lazy_decoding = False
     self._max_buffer_size = buffer_size or self.MAXIMUM_BUFFER_SIZE
     self._merge_buffer = None
+    self._merge_event_predicates = None
+    self._merge_time_range = None
     self._number_of_events_in_buffer = 0
+    self._number_of_filtered_event_objects = 0
     self._output_file = output_file
+    self._path_spec_reference_tables = {}
+    self._path_spec_serializer = None
+    self._path_spec_table = None
+    self._path_spec_tables = {}
+    self._path_spec_tables_lru = []
+    self._path_specs = {}
     self._preprocess_object_serializer = None
     self._read_only = read_only
+    self._shared_values_serializer = None
+    self._string_reference_tables = {}
+    self._string_table = None
+    self._string_tables = {}
+    self._string_tables_lru = []
     self._serializer_format_string = u''
+    self._timestamp_range_table = None
+    self._timestamp_ranges = []
 
     if self._read_only:
       access_mode = 'r'
@@ -951,7 +1917,7 @@ class StorageFile(ZIPStorageFile):
       access_mode = 'a'
 
     self._Open(
-        output_file, access_mode=access_mode,
+        output_file, access_mode=access_mode, compress=compress,
         serializer_format=serializer_format)
 
     # Attributes for profiling.
@@ -964,11 +1930,33 @@ class StorageFile(ZIPStorageFile):
     """The file path."""
     return self._output_file
 
+  @property
+  def number_of_filtered_event_objects(self):
+    """The number of event objects that did not meet the event predicates.
+
+    The event objects are counted by GetSortedEntry, where the event objects
+    outside the time range are not counted.
+    """
+    return self._number_of_filtered_event_objects
+
   @property
   def serialization_format(self):
     """The serialization format."""
     return self._serializer_format_string
 
+  @property
+  def store_range(self):
+    """The range of the store numbers written since the file was opened.
+
+    The range is a tuple of the first store number and the store number
+    that follows the last store, including the store of the buffered event
+    objects that have not been written yet.
+    """
+    last_file_number = self._file_number
+    if self._buffer_size:
+      last_file_number += 1
+    return self._first_file_number, last_file_number
+
   def _BuildTagIndex(self):
     """Builds the tag index that contains the offsets for each tag.
 
@@ -989,7 +1977,8 @@ class StorageFile(ZIPStorageFile):
         tag_index_value = event_tag_index_table.GetEventTagIndex(entry_index)
         self._event_tag_index[tag_index_value.identifier] = tag_index_value
 
-  def _GetEventObject(self, stream_number, entry_index=-1):
+  def _GetEventObject(
+      self, stream_number, entry_index=-1, event_object_data=None):
     """Reads an event object from a specific stream.
 
     Args:
@@ -998,29 +1987,134 @@ class StorageFile(ZIPStorageFile):
       entry_index: an optional integer containing the number of the serialized
                    event object within the stream. Where -1 represents the next
                    available event object.
+      event_object_data: optional binary string containing the serialized
+                         event object, if already read. The entry index
+                         must be set when the serialized event object
+                         is provided.
 
     Returns:
       An event object (instance of EventObject) or None.
     """
-    event_object_data, entry_index = self._GetEventObjectSerializedData(
-        stream_number, entry_index=entry_index)
+    if event_object_data is None:
+      event_object_data, entry_index = self._GetEventObjectSerializedData(
+          stream_number, entry_index=entry_index)
     if not event_object_data:
       return
 
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming(u'event_object')
 
-    event_object = self._event_object_serializer.ReadSerialized(
-        event_object_data)
+    string_values = None
+    if self._lazy_decoding:
+      string_values = self._GetStringValues(stream_number, entry_index)
+
+    event_object = self._ReadEventObject(
+        stream_number, entry_index, event_object_data, string_values)
 
     if self._serializers_profiler:
       self._serializers_profiler.StopTiming(u'event_object')
 
     event_object.store_number = stream_number
     event_object.store_index = entry_index
+    self._ResolveSharedValues(event_object, string_values=string_values)
 
     return event_object
 
+  def _GetMatchingEventObject(self, stream_number, entry_index=-1):
+    """Reads the next event object that meets the merge event predicates.
+
+    The parser and data type of event objects are checked before the event
+    object is deserialized, using the string table of the stream or, for
+    protobuf serialized event objects without shared strings, the protobuf.
+    The event objects in the merge time range that do not meet the event
+    predicates are counted as filtered.
+
+    Args:
+      stream_number: an integer containing the number of the serialized event
+                     object stream.
+      entry_index: an optional integer containing the number of the serialized
+                   event object within the stream. Where -1 represents the next
+                   available event object.
+
+    Returns:
+      An event object (instance of EventObject) or None.
+    """
+    event_predicates = self._merge_event_predicates
+    if not event_predicates:
+      return self._GetEventObject(stream_number, entry_index=entry_index)
+
+    check_values = (
+        event_predicates.data_types is not None or
+        event_predicates.parsers is not None)
+    check_proto = (
+        check_values and self._serializer_format_string == u'proto')
+
+    while True:
+      event_object_data, event_object_entry_index = (
+          self._GetEventObjectSerializedData(
+              stream_number, entry_index=entry_index))
+      if not event_object_data:
+        return
+
+      # Subsequent event objects are read from the current stream position.
+      entry_index = -1
+
+      if self._serializers_profiler:
+        self._serializers_profiler.StartTiming(u'event_object')
+
+      string_values = None
+      if check_values or self._lazy_decoding:
+        string_values = self._GetStringValues(
+            stream_number, event_object_entry_index)
+
+      event_object = None
+      meets_event_predicates = True
+      if check_values and string_values:
+        meets_event_predicates = event_predicates.MatchesValues(
+            data_type=string_values[self._DATA_TYPE_STRING_INDEX],
+            parser=string_values[self._PARSER_STRING_INDEX])
+        if meets_event_predicates:
+          event_object = self._ReadEventObject(
+              stream_number, event_object_entry_index, event_object_data,
+              string_values)
+
+      elif not check_proto:
+        event_object = self._ReadEventObject(
+            stream_number, event_object_entry_index, event_object_data,
+            string_values)
+
+      else:
+        proto = plaso_storage_pb2.EventObject()
+        proto.ParseFromString(bytes(event_object_data))
+        meets_event_predicates = event_predicates.MatchesValues(
+            data_type=proto.data_type, parser=proto.parser)
+        if meets_event_predicates:
+          event_object = self._event_object_serializer.ReadSerializedObject(
+              proto)
+
+      if self._serializers_profiler:
+        self._serializers_profiler.StopTiming(u'event_object')
+
+      if event_object:
+        event_object.store_number = stream_number
+        event_object.store_index = event_object_entry_index
+        self._ResolveSharedValues(event_object, string_values=string_values)
+
+        meets_event_predicates = event_predicates.MatchesAttributes(
+            event_object)
+        if meets_event_predicates:
+          return event_object
+
+      if not meets_event_predicates:
+        # Event objects outside the merge time range are not counted since
+        # they are not merged regardless of the event predicates.
+        timestamp = self._GetTimestamp(stream_number, event_object_entry_index)
+        time_range = self._merge_time_range
+        if (timestamp is None or not time_range or (
+            time_range.start_timestamp <= timestamp and
+            timestamp <= time_range.end_timestamp)):
+          self._number_of_filtered_event_objects += 1
+
   def _GetEventObjectSerializedData(self, stream_number, entry_index=-1):
     """Retrieves specific event object serialized data.
 
@@ -1033,9 +2127,15 @@ class StorageFile(ZIPStorageFile):
                    event object within the stream. Where -1 represents the next
                    available event object.
 
+    The serialized data is read without copying it where the stream
+    supports this, so that event objects that are skipped before they are
+    deserialized are never copied. The data must be converted to a binary
+    string before it is kept.
+
     Returns:
-      A tuple containing the event object serialized data and the entry index
-      of the event object within the storage file.
+      A tuple containing the event object serialized data, as a binary
+      string or a read-only view (instance of buffer or memoryview), and
+      the entry index of the event object within the storage file.
 
     Raises:
       IOError: if the stream cannot be opened.
@@ -1062,7 +2162,7 @@ class StorageFile(ZIPStorageFile):
 
     event_object_entry_index = data_stream.entry_index
     try:
-      event_object_data = data_stream.ReadEntry()
+      event_object_data = data_stream.ReadEntryView()
     except IOError as exception:
       logging.error((
           u'Unable to read entry from serialized data steam: {0:d} '
@@ -1095,21 +2195,423 @@ class StorageFile(ZIPStorageFile):
 
     return tag_index_value
 
-  def _InitializeMergeBuffer(self, time_range=None):
+  def _GetNumberOfEventObjectsInTimeRange(self, stream_number, time_range):
+    """Retrieves the number of event objects of a stream in a time range.
+
+    Args:
+      stream_number: an integer containing the number of the serialized event
+                     object stream.
+      time_range: a time range object (instance of TimeRange) or None to
+                  represent all the event objects of the stream.
+
+    Returns:
+      An integer containing the number of event objects or None if
+      the stream does not have a timestamp table.
+    """
+    stream_name = u'plaso_timestamps.{0:06d}'.format(stream_number)
+    if not self._HasStream(stream_name):
+      return
+
+    try:
+      timestamp_table = self._GetSerializedEventObjectTimestampTable(
+          stream_number)
+    except IOError as exception:
+      logging.error((
+          u'Unable to read timestamp table from stream: {0:s} '
+          u'with error: {1:s}.').format(stream_name, exception))
+      return
+
+    number_of_timestamps = timestamp_table.number_of_timestamps
+    if not time_range:
+      return number_of_timestamps
+
+    first_entry_index = timestamp_table.GetFirstEntryIndex(
+        time_range.start_timestamp)
+    if first_entry_index is None:
+      return 0
+
+    last_entry_index = timestamp_table.GetFirstEntryIndex(
+        time_range.end_timestamp + 1)
+    if last_entry_index is None:
+      last_entry_index = number_of_timestamps
+
+    return max(0, last_entry_index - first_entry_index)
+
+  def _GetNumberOfFilteredEventObjects(
+      self, stream_numbers, time_range, event_predicates=None,
+      event_predicates_time_range=None):
+    """Determines the number of event objects filtered without reading them.
+
+    These are the event objects in the time range that are in a stream that
+    is excluded by the event predicates or that are outside the time range
+    of the event predicates. Streams without a timestamp table are
+    not counted.
+
+    Args:
+      stream_numbers: a list of integers containing the numbers of the streams
+                      to merge.
+      time_range: a time range object (instance of TimeRange) or None.
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet, where
+                        None represents that no event object can meet them.
+      event_predicates_time_range: optional time range object (instance of
+                                   TimeRange) of the event objects that can
+                                   meet the event predicates.
+
+    Returns:
+      An integer containing the number of filtered event objects.
+    """
+    compare_time_ranges = False
+    if event_predicates_time_range:
+      compare_time_ranges = not time_range or (
+          event_predicates_time_range.start_timestamp !=
+          time_range.start_timestamp or
+          event_predicates_time_range.end_timestamp !=
+          time_range.end_timestamp)
+
+    number_of_filtered_event_objects = 0
+    for stream_number in stream_numbers:
+      if not event_predicates or (
+          event_predicates.store_numbers is not None and
+          stream_number not in event_predicates.store_numbers):
+        number_of_event_objects = self._GetNumberOfEventObjectsInTimeRange(
+            stream_number, time_range)
+        number_of_filtered_event_objects += number_of_event_objects or 0
+
+      elif compare_time_ranges:
+        number_of_event_objects = self._GetNumberOfEventObjectsInTimeRange(
+            stream_number, time_range)
+        number_of_matching_event_objects = (
+            self._GetNumberOfEventObjectsInTimeRange(
+                stream_number, event_predicates_time_range))
+        if (number_of_event_objects is not None and
+            number_of_matching_event_objects is not None):
+          number_of_filtered_event_objects += (
+              number_of_event_objects - number_of_matching_event_objects)
+
+    return number_of_filtered_event_objects
+
+  def _GetPathSpec(self, stream_number, entry_index):
+    """Retrieves the path specification referred to by an event object.
+
+    The path specification tables of a store are only read when an event
+    object of the store is read and every path specification is only
+    deserialized once while the path specification table is cached. The least
+    recently used path specification table is removed when the cache is full.
+
+    Args:
+      stream_number: an integer containing the number of the serialized event
+                     object stream.
+      entry_index: an integer containing the number of the serialized event
+                   object within the stream.
+
+    Returns:
+      A path specification (instance of dfvfs.PathSpec) or None if the event
+      object does not refer to a path specification.
+    """
+    if stream_number not in self._path_spec_reference_tables:
+      reference_table = None
+      stream_name = u'plaso_path_spec_index.{0:06d}'.format(stream_number)
+      if self._HasStream(stream_name):
+        reference_table = _SerializedReferenceTable(
+            self._zipfile, stream_name)
+        try:
+          reference_table.Read()
+        except IOError as exception:
+          logging.error((
+              u'Unable to read path specification references of stream: '
+              u'{0:d} with error: {1:s}.').format(stream_number, exception))
+          reference_table = None
+
+      if (len(self._path_spec_reference_tables) >=
+          self._MAXIMUM_NUMBER_OF_CACHED_PATH_SPEC_TABLES):
+        lru_stream_number = self._path_spec_tables_lru.pop(0)
+        del self._path_spec_reference_tables[lru_stream_number]
+        self._path_spec_tables.pop(lru_stream_number, None)
+        self._path_specs.pop(lru_stream_number, None)
+
+      self._path_spec_reference_tables[stream_number] = reference_table
+
+    if stream_number in self._path_spec_tables_lru:
+      lru_index = self._path_spec_tables_lru.index(stream_number)
+      self._path_spec_tables_lru.pop(lru_index)
+
+    self._path_spec_tables_lru.append(stream_number)
+
+    reference_table = self._path_spec_reference_tables[stream_number]
+    if not reference_table:
+      return
+
+    try:
+      table_index = reference_table.GetReference(entry_index)
+    except IndexError:
+      return
+
+    if table_index == _SerializedReferenceTable.NO_REFERENCE:
+      return
+
+    path_specs = self._path_specs.setdefault(stream_number, {})
+    path_spec = path_specs.get(table_index, None)
+    if path_spec:
+      return path_spec
+
+    try:
+      path_spec_table = self._path_spec_tables.get(stream_number, None)
+      if not path_spec_table:
+        stream_name = u'plaso_path_specs.{0:06d}'.format(stream_number)
+        path_spec_table = _SerializedDataTable(self._zipfile, stream_name)
+        path_spec_table.Read()
+        self._path_spec_tables[stream_number] = path_spec_table
+
+      path_spec_data = path_spec_table.GetEntry(table_index)
+
+    except (IOError, IndexError) as exception:
+      logging.error((
+          u'Unable to read path specification: {0:d} of stream: {1:d} '
+          u'with error: {2!s}.').format(table_index, stream_number, exception))
+      return
+
+    path_spec = self._path_spec_serializer.ReadSerialized(path_spec_data)
+    path_specs[table_index] = path_spec
+    return path_spec
+
+  def _GetStringValues(self, stream_number, entry_index):
+    """Retrieves the shared string values referred to by an event object.
+
+    The string tables of a store are only read when an event object of
+    the store is read and every string is only decoded once while the string
+    table is cached. The least recently used string table is removed when
+    the cache is full.
+
+    Args:
+      stream_number: an integer containing the number of the serialized event
+                     object stream.
+      entry_index: an integer containing the number of the serialized event
+                   object within the stream.
+
+    Returns:
+      A tuple containing the values of the shared string attributes, where
+      None represents an attribute without a shared value, or None if the
+      event object does not refer to shared strings.
+    """
+    if stream_number not in self._string_reference_tables:
+      reference_table = None
+      stream_name = u'plaso_string_index.{0:06d}'.format(stream_number)
+      if self._HasStream(stream_name):
+        reference_table = _SerializedReferenceTable(
+            self._zipfile, stream_name,
+            number_of_references=len(self._STRING_ATTRIBUTE_NAMES))
+
+        string_table = _SerializedStringTable(
+            self._zipfile, u'plaso_strings.{0:06d}'.format(stream_number))
+        try:
+          reference_table.Read()
+          string_table.Read()
+        except IOError as exception:
+          logging.error((
+              u'Unable to read strings of stream: {0:d} with error: '
+              u'{1:s}.').format(stream_number, exception))
+          reference_table = None
+
+        if reference_table:
+          self._string_tables[stream_number] = string_table
+
+      if (len(self._string_reference_tables) >=
+          self._MAXIMUM_NUMBER_OF_CACHED_STRING_TABLES):
+        lru_stream_number = self._string_tables_lru.pop(0)
+        del self._string_reference_tables[lru_stream_number]
+        self._string_tables.pop(lru_stream_number, None)
+
+      self._string_reference_tables[stream_number] = reference_table
+
+    if stream_number in self._string_tables_lru:
+      lru_index = self._string_tables_lru.index(stream_number)
+      self._string_tables_lru.pop(lru_index)
+
+    self._string_tables_lru.append(stream_number)
+
+    reference_table = self._string_reference_tables[stream_number]
+    if not reference_table:
+      return
+
+    try:
+      references = reference_table.GetReferences(entry_index)
+    except IndexError:
+      return
+
+    string_table = self._string_tables[stream_number]
+    string_values = []
+    for table_index in references:
+      string_value = None
+      if table_index != _SerializedReferenceTable.NO_REFERENCE:
+        try:
+          string_value = string_table.GetString(table_index)
+        except (IndexError, UnicodeDecodeError) as exception:
+          logging.error((
+              u'Unable to read string: {0:d} of stream: {1:d} with error: '
+              u'{2!s}.').format(table_index, stream_number, exception))
+
+      string_values.append(string_value)
+
+    return tuple(string_values)
+
+  def _GetTimestamp(self, stream_number, entry_index):
+    """Retrieves the timestamp of an event object from the timestamp table.
+
+    The timestamp tables are cached separately from the timestamp tables
+    that are used to find the first event object of a time range, since
+    the event objects of the streams are read alternately. The least recently
+    used timestamp table is removed when the cache is full.
+
+    Args:
+      stream_number: an integer containing the number of the serialized event
+                     object stream.
+      entry_index: an integer containing the number of the serialized event
+                   object within the stream.
+
+    Returns:
+      An integer containing the timestamp or None if the stream does not have
+      a timestamp table.
+    """
+    if stream_number not in self._event_timestamp_tables:
+      timestamp_table = None
+      stream_name = u'plaso_timestamps.{0:06d}'.format(stream_number)
+      if self._HasStream(stream_name):
+        timestamp_table = _SerializedDataTimestampTable(
+            self._zipfile, stream_name)
+        try:
+          timestamp_table.Read()
+        except IOError as exception:
+          logging.error((
+              u'Unable to read timestamp table from stream: {0:s} '
+              u'with error: {1:s}.').format(stream_name, exception))
+          timestamp_table = None
+
+      if (len(self._event_timestamp_tables) >=
+          self._MAXIMUM_NUMBER_OF_CACHED_EVENT_TIMESTAMP_TABLES):
+        lru_stream_number = self._event_timestamp_tables_lru.pop(0)
+        del self._event_timestamp_tables[lru_stream_number]
+
+      self._event_timestamp_tables[stream_number] = timestamp_table
+
+    if stream_number in self._event_timestamp_tables_lru:
+      lru_index = self._event_timestamp_tables_lru.index(stream_number)
+      self._event_timestamp_tables_lru.pop(lru_index)
+
+    self._event_timestamp_tables_lru.append(stream_number)
+
+    timestamp_table = self._event_timestamp_tables[stream_number]
+    if not timestamp_table:
+      return
+
+    try:
+      return timestamp_table.GetTimestamp(entry_index)
+    except IndexError:
+      return
+
+  def _GetTimestampRangeTable(self):
+    """Retrieves the timestamp range table.
+
+    Returns:
+      The timestamp range table (instance of
+      _SerializedDataTimestampRangeTable).
+    """
+    if not self._timestamp_range_table:
+      # The timestamp ranges are stored in multiple streams and are merged
+      # into a table that is not written.
+      self._timestamp_range_table = _SerializedDataTimestampRangeTable(
+          self._zipfile, None)
+
+      for stream_name in sorted(set(self._GetStreamNames())):
+        if not stream_name.startswith(u'plaso_timestamp_ranges'):
+          continue
+
+        timestamp_range_table = _SerializedDataTimestampRangeTable(
+            self._zipfile, stream_name)
+        try:
+          timestamp_range_table.Read()
+        except IOError as exception:
+          logging.error((
+              u'Unable to read timestamp range table from stream: {0:s} '
+              u'with error: {1:s}.').format(stream_name, exception))
+          continue
+
+        self._timestamp_range_table.Merge(timestamp_range_table)
+
+    return self._timestamp_range_table
+
+  def _InitializeMergeBuffer(
+      self, event_predicates=None, stream_numbers=None, time_range=None):
     """Initializes the event objects into the merge buffer.
 
     This function fills the merge buffer with the first relevant event object
     from each stream.
 
     Args:
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet.
+      stream_numbers: an optional list of integers containing the numbers of
+                      the streams to merge, where None represents all
+                      available streams.
       time_range: an optional time range object (instance of TimeRange).
     """
     self._merge_buffer = []
+    self._merge_event_predicates = None
+    self._merge_time_range = time_range
+    self._number_of_filtered_event_objects = 0
 
-    number_range = self._GetSerializedEventObjectStreamNumbers()
-    for stream_number in number_range:
+    if stream_numbers is None:
+      stream_numbers = self._GetSerializedEventObjectStreamNumbers()
+
+    if event_predicates and event_predicates.is_restricted:
+      event_predicates_time_range = None
+      if not event_predicates.is_satisfiable:
+        is_satisfiable = False
+      else:
+        try:
+          event_predicates_time_range = event_predicates.GetTimeRange(
+              time_range=time_range)
+          is_satisfiable = True
+        except ValueError:
+          # The time range of the event predicates and the time range
+          # do not overlap.
+          is_satisfiable = False
+
+      if not is_satisfiable:
+        self._number_of_filtered_event_objects = (
+            self._GetNumberOfFilteredEventObjects(stream_numbers, time_range))
+        return
+
+      self._number_of_filtered_event_objects = (
+          self._GetNumberOfFilteredEventObjects(
+              stream_numbers, time_range, event_predicates=event_predicates,
+              event_predicates_time_range=event_predicates_time_range))
+
+      time_range = event_predicates_time_range
+      self._merge_event_predicates = event_predicates
+      self._merge_time_range = time_range
+
+    if time_range:
+      timestamp_range_table = self._GetTimestampRangeTable()
+
+    if event_predicates and event_predicates.store_numbers is not None:
+      stream_numbers = [
+          stream_number for stream_number in stream_numbers
+          if stream_number in event_predicates.store_numbers]
+
+    for stream_number in stream_numbers:
       entry_index = -1
       if time_range:
+        # Skip streams that are entirely outside the time range without
+        # reading their timestamp table.
+        timestamp_range = timestamp_range_table.GetTimestampRange(
+            stream_number)
+        if timestamp_range:
+          first_timestamp, last_timestamp = timestamp_range
+          if (last_timestamp < time_range.start_timestamp or
+              first_timestamp > time_range.end_timestamp):
+            continue
+
         stream_name = u'plaso_timestamps.{0:06d}'.format(stream_number)
         if self._HasStream(stream_name):
           try:
@@ -1119,25 +2621,27 @@ class StorageFile(ZIPStorageFile):
             logging.error((
                 u'Unable to read timestamp table from stream: {0:s} '
                 u'with error: {1:s}.').format(stream_name, exception))
+            timestamp_table = None
 
-          # If the start timestamp of the time range filter is larger than the
-          # last timestamp in the timestamp table skip this stream.
-          timestamp_compare = timestamp_table.GetTimestamp(-1)
-          if time_range.start_timestamp > timestamp_compare:
-            continue
+          if timestamp_table and timestamp_table.number_of_timestamps:
+            entry_index = timestamp_table.GetFirstEntryIndex(
+                time_range.start_timestamp)
+
+            # If the start timestamp of the time range filter is larger than
+            # the last timestamp in the timestamp table skip this stream.
+            if entry_index is None:
+              continue
 
-          for table_index in range(timestamp_table.number_of_timestamps - 1):
-            timestamp_compare = timestamp_table.GetTimestamp(table_index)
-            if time_range.start_timestamp >= timestamp_compare:
-              entry_index = table_index
-              break
+            timestamp_compare = timestamp_table.GetTimestamp(entry_index)
+            if timestamp_compare > time_range.end_timestamp:
+              continue
 
-      event_object = self._GetEventObject(
+      event_object = self._GetMatchingEventObject(
           stream_number, entry_index=entry_index)
       # Check the lower bound in case no timestamp table was available.
       while (event_object and time_range and
              event_object.timestamp < time_range.start_timestamp):
-        event_object = self._GetEventObject(stream_number)
+        event_object = self._GetMatchingEventObject(stream_number)
 
       if event_object:
         if (time_range and
@@ -1150,20 +2654,23 @@ class StorageFile(ZIPStorageFile):
 
   # pylint: disable=arguments-differ
   def _Open(
-      self, path, access_mode='r',
+      self, path, access_mode='r', compress=True,
       serializer_format=definitions.SERIALIZER_FORMAT_PROTOBUF):
     """Opens the storage file.
 
     Args:
       path: string containing the path of the storage file.
       access_mode: optional string indicating the access mode.
+      compress: optional boolean value to indicate the streams should be
+                written DEFLATE compressed.
       serializer_format: optional storage serializer format.
 
     Raises:
       IOError: if the file is opened in read only mode and the file does
                not exist.
     """
-    super(StorageFile, self)._Open(path, access_mode=access_mode)
+    super(StorageFile, self)._Open(
+        path, access_mode=access_mode, compress=compress)
 
     serializer_stream_name = u'serializer.txt'
     has_serializer_stream = self._HasStream(serializer_stream_name)
@@ -1202,6 +2709,42 @@ class StorageFile(ZIPStorageFile):
     if self._serializers_profiler:
       self._serializers_profiler.Write()
 
+  def _ReadEventObject(
+      self, stream_number, entry_index, event_object_data, string_values):
+    """Reads an event object.
+
+    If lazy decoding is enabled and the timestamp and data type of the event
+    object are stored separately, a lazy event object is created, otherwise
+    the event object is deserialized.
+
+    Args:
+      stream_number: an integer containing the number of the serialized event
+                     object stream.
+      entry_index: an integer containing the number of the serialized event
+                   object within the stream.
+      event_object_data: the serialized event object, as a binary string or
+                         a read-only view (instance of buffer or memoryview).
+      string_values: a tuple containing the values of the shared string
+                     attributes or None if not available.
+
+    Returns:
+      An event object (instance of EventObject or LazyEventObject).
+    """
+    # The data is copied here, since a view refers to the memory map of
+    # the storage file, which is closed with the storage file.
+    event_object_data = bytes(event_object_data)
+
+    if self._lazy_decoding and string_values:
+      data_type = string_values[self._DATA_TYPE_STRING_INDEX]
+      if data_type is not None:
+        timestamp = self._GetTimestamp(stream_number, entry_index)
+        if timestamp is not None:
+          return events.LazyEventObject(
+              self._event_object_serializer, event_object_data,
+              data_type=data_type, timestamp=timestamp)
+
+    return self._event_object_serializer.ReadSerialized(event_object_data)
+
   def _ReadEventTag(self, data_stream):
     """Reads an event tag.
 
@@ -1281,6 +2824,50 @@ class StorageFile(ZIPStorageFile):
 
     return preprocess_object
 
+  def _ResolveSharedValues(self, event_object, string_values=None):
+    """Resolves the shared values referred to by an event object.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+      string_values: optional tuple containing the values of the shared
+                     string attributes, if already retrieved.
+    """
+    stream_number = event_object.store_number
+    entry_index = event_object.store_index
+
+    # The path specification is only stored separately when it is not part
+    # of the serialized event object, hence it is set without checking
+    # the event object, which would decode a lazy event object.
+    path_spec = self._GetPathSpec(stream_number, entry_index)
+    if path_spec:
+      event_object.pathspec = path_spec
+
+    if string_values is None:
+      string_values = self._GetStringValues(stream_number, entry_index)
+    if string_values:
+      for attribute_name, attribute_value in zip(
+          self._STRING_ATTRIBUTE_NAMES, string_values):
+        if attribute_value is not None:
+          setattr(event_object, attribute_name, attribute_value)
+
+  def _SetEventTag(self, event_object):
+    """Sets the tag of an event object.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+    """
+    if self._event_tag_index is None:
+      self._BuildTagIndex()
+
+    # The identifier of the event object is only needed to look up its tag,
+    # which prevents decoding lazy event objects when there are no tags.
+    if self._event_tag_index:
+      event_object.tag = self._ReadEventTagByIdentifier(
+          event_object.store_number, event_object.store_index,
+          event_object.uuid)
+    else:
+      event_object.tag = None
+
   def _SetSerializerFormat(self, serializer_format):
     """Set the serializer format.
 
@@ -1299,6 +2886,7 @@ class StorageFile(ZIPStorageFile):
           json_serializer.JSONEventObjectSerializer)
       self._event_tag_serializer = (
           json_serializer.JSONEventTagSerializer)
+      self._path_spec_serializer = json_serializer.JSONPathSpecSerializer
       self._preprocess_object_serializer = (
           json_serializer.JSONPreprocessObjectSerializer)
 
@@ -1311,6 +2899,8 @@ class StorageFile(ZIPStorageFile):
           protobuf_serializer.ProtobufEventObjectSerializer)
       self._event_tag_serializer = (
           protobuf_serializer.ProtobufEventTagSerializer)
+      self._path_spec_serializer = (
+          dfvfs_protobuf_serializer.ProtobufPathSpecSerializer)
       self._preprocess_object_serializer = (
           protobuf_serializer.ProtobufPreprocessObjectSerializer)
 
@@ -1318,29 +2908,126 @@ class StorageFile(ZIPStorageFile):
       raise ValueError(
           u'Unsupported serializer format: {0:s}'.format(serializer_format))
 
+    self._shared_values_serializer = (
+        shared_values.SharedValuesEventObjectSerializer(
+            self._event_object_serializer, self._path_spec_serializer))
+
+  def _FlushBuffers(self):
+    """Waits until the buffers queued to the buffer writer have been written.
+
+    The ZIP file can only be accessed by one thread at a time, hence this
+    function must be called before the ZIP file is accessed other than by
+    the buffer writer.
+
+    Raises:
+      IOError: if a buffer could not be written.
+    """
+    if self._buffer_writer:
+      self._buffer_writer.Flush()
+
+  def _StopBufferWriter(self):
+    """Writes the queued buffers and stops the buffer writer.
+
+    Raises:
+      IOError: if a buffer could not be written.
+    """
+    if self._buffer_writer:
+      buffer_writer = self._buffer_writer
+      self._buffer_writer = None
+      buffer_writer.Stop()
+
   def _WriteBuffer(self):
-    """Writes the buffered event objects to the storage file."""
+    """Writes the buffered event objects to the storage file.
+
+    If the background writer is enabled the buffer is queued to the buffer
+    writer, which writes it while the next buffer is filled.
+
+    Raises:
+      IOError: if the background writer could not write a previous buffer.
+    """
     if not self._buffer_size:
       return
 
-    stream_name = u'plaso_index.{0:06d}'.format(self._file_number)
+    buffer_arguments = (
+        self._file_number, self._buffer, self._path_spec_table,
+        self._string_table)
+
+    self._file_number += 1
+    self._buffer_size = 0
+    self._buffer = []
+    self._buffer_first_timestamp = sys.maxint
+    self._buffer_last_timestamp = -sys.maxint - 1
+    self._path_spec_table = None
+    self._string_table = None
+
+    if not self._background_writer:
+      self._WriteSerializedEventObjects(*buffer_arguments)
+      return
+
+    if not self._buffer_writer:
+      self._buffer_writer = _SerializedEventObjectBufferWriter(
+          self._WriteSerializedEventObjects,
+          maximum_number_of_buffers=self._MAXIMUM_NUMBER_OF_WRITER_BUFFERS)
+      self._buffer_writer.start()
+
+    self._buffer_writer.QueueBuffer(*buffer_arguments)
+
+  def _WriteSerializedEventObjects(
+      self, file_number, event_object_buffer, path_spec_table, string_table):
+    """Writes a buffer of serialized event objects to the storage file.
+
+    Args:
+      file_number: an integer containing the number of the streams to write.
+      event_object_buffer: a list containing the buffered serialized event
+                           objects, sorted as a heap.
+      path_spec_table: the path specification table (instance of
+                       _SerializedDataTable) of the buffer or None.
+      string_table: the string table (instance of _SerializedStringTable)
+                    of the buffer or None.
+    """
+    stream_name = u'plaso_index.{0:06d}'.format(file_number)
     offset_table = _SerializedDataOffsetTable(self._zipfile, stream_name)
 
-    stream_name = u'plaso_timestamps.{0:06d}'.format(self._file_number)
+    stream_name = u'plaso_timestamps.{0:06d}'.format(file_number)
     timestamp_table = _SerializedDataTimestampTable(self._zipfile, stream_name)
 
+    path_spec_reference_table = None
+    if path_spec_table:
+      stream_name = u'plaso_path_spec_index.{0:06d}'.format(file_number)
+      path_spec_reference_table = _SerializedReferenceTable(
+          self._zipfile, stream_name)
+
+    string_reference_table = None
+    if string_table:
+      stream_name = u'plaso_string_index.{0:06d}'.format(file_number)
+      string_reference_table = _SerializedReferenceTable(
+          self._zipfile, stream_name,
+          number_of_references=len(self._STRING_ATTRIBUTE_NAMES))
+      no_string_references = (
+          (_SerializedReferenceTable.NO_REFERENCE, ) *
+          len(self._STRING_ATTRIBUTE_NAMES))
+
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming(u'write')
 
-    stream_name = u'plaso_proto.{0:06d}'.format(self._file_number)
+    stream_name = u'plaso_proto.{0:06d}'.format(file_number)
     data_stream = _SerializedDataStream(self._zipfile, self._path, stream_name)
     entry_data_offset = data_stream.WriteInitialize()
+    first_timestamp = None
     try:
-      for _ in range(len(self._buffer)):
-        timestamp, entry_data = heapq.heappop(self._buffer)
+      for _ in range(len(event_object_buffer)):
+        timestamp, entry_data, path_spec_reference, string_references = (
+            heapq.heappop(event_object_buffer))
+        if first_timestamp is None:
+          first_timestamp = timestamp
 
         timestamp_table.AddTimestamp(timestamp)
         offset_table.AddOffset(entry_data_offset)
+        if path_spec_reference_table:
+          path_spec_reference_table.AddReference(path_spec_reference)
+        if string_reference_table:
+          string_reference_table.AddReferences(
+              string_references or no_string_references)
 
         entry_data_offset = data_stream.WriteEntry(entry_data)
 
@@ -1356,14 +3043,54 @@ class StorageFile(ZIPStorageFile):
     data_stream.WriteFinalize()
     timestamp_table.Write()
 
+    if path_spec_reference_table:
+      path_spec_table.Write()
+      path_spec_reference_table.Write()
+
+    if string_reference_table:
+      string_table.Write()
+      string_reference_table.Write()
+
     if self._serializers_profiler:
       self._serializers_profiler.StopTiming(u'write')
 
-    self._file_number += 1
-    self._buffer_size = 0
-    self._buffer = []
-    self._buffer_first_timestamp = sys.maxint
-    self._buffer_last_timestamp = -sys.maxint - 1
+    if first_timestamp is not None:
+      self._timestamp_ranges.append((file_number, first_timestamp, timestamp))
+
+      if self._timestamp_range_table:
+        self._timestamp_range_table.AddTimestampRange(
+            file_number, first_timestamp, timestamp)
+
+  def _WriteTimestampRanges(self):
+    """Writes the timestamp ranges added since they were last written.
+
+    The timestamp ranges are written to a new stream, since a stream
+    in the ZIP file cannot be overwritten.
+    """
+    if not self._timestamp_ranges:
+      return
+
+    stream_number = 1
+    for stream_name in self._GetStreamNames():
+      if not stream_name.startswith(u'plaso_timestamp_ranges.'):
+        continue
+
+      _, _, stream_number_string = stream_name.partition(u'.')
+      try:
+        stream_number = max(stream_number, int(stream_number_string, 10) + 1)
+      except ValueError:
+        pass
+
+    stream_name = u'plaso_timestamp_ranges.{0:06d}'.format(stream_number)
+    timestamp_range_table = _SerializedDataTimestampRangeTable(
+        self._zipfile, stream_name)
+
+    for file_number, first_timestamp, last_timestamp in self._timestamp_ranges:
+      timestamp_range_table.AddTimestampRange(
+          file_number, first_timestamp, last_timestamp)
+
+    timestamp_range_table.Write()
+    self._timestamp_ranges = []
 
   def AddEventObject(self, event_object):
     """Adds an event object to the storage.
@@ -1377,16 +3104,20 @@ class StorageFile(ZIPStorageFile):
     if not self._zipfile:
       raise IOError(u'Trying to add an entry to a closed storage file.')
 
+    # The values that event objects typically share, such as the path
+    # specification, are stored once per store instead of with every event
+    # object.
+
     # We try to serialize the event object first, so we can skip some
     # processing if it's invalid.
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming(u'event_object')
     try:
-      event_object_data = self._event_object_serializer.WriteSerialized(
-          event_object)
+      serialized_event_object = (
+          self._shared_values_serializer.WriteSerialized(event_object))
       # TODO: Re-think this approach with the re-design of the storage.
       # Check if the event object failed to serialize (none is returned).
-      if event_object_data is None:
+      if serialized_event_object is None:
         return
     except UnicodeDecodeError:
       error_message = (
@@ -1400,37 +3131,190 @@ class StorageFile(ZIPStorageFile):
       if self._serializers_profiler:
         self._serializers_profiler.StopTiming(u'event_object')
 
-    if event_object.timestamp > self._buffer_last_timestamp:
-      self._buffer_last_timestamp = event_object.timestamp
+    self.AddSerializedEventObject(
+        event_object.timestamp, serialized_event_object.data,
+        path_spec_data=serialized_event_object.path_spec_data,
+        string_values=serialized_event_object.string_values)
+
+  def AddSerializedEventObject(
+      self, timestamp, event_object_data, path_spec_data=None,
+      string_values=None):
+    """Adds a serialized event object to the storage.
+
+    The serialized event object data and path specification data must have
+    been serialized in the serialization format of the storage file.
+
+    Args:
+      timestamp: an integer containing a timestamp of the number
+                 of micro seconds since January 1, 1970, 00:00:00 UTC.
+      event_object_data: a binary string containing the serialized event
+                         object.
+      path_spec_data: optional binary string containing the serialized path
+                      specification the event object refers to. The serialized
+                      event object should not contain the path specification.
+      string_values: optional tuple containing the Unicode string values of
+                     the shared string attributes the event object refers to,
+                     where None represents an attribute without a shared
+                     value. The serialized event object should not contain
+                     the shared values.
+
+    Raises:
+      IOError: when trying to write to a closed storage file or when
+               the background writer could not write a previous buffer.
+    """
+    if not self._zipfile:
+      raise IOError(u'Trying to add an entry to a closed storage file.')
+
+    if timestamp > self._buffer_last_timestamp:
+      self._buffer_last_timestamp = timestamp
 
     # TODO: support negative timestamps.
-    if (event_object.timestamp < self._buffer_first_timestamp and
-        event_object.timestamp > 0):
-      self._buffer_first_timestamp = event_object.timestamp
+    if timestamp < self._buffer_first_timestamp and timestamp > 0:
+      self._buffer_first_timestamp = timestamp
+
+    path_spec_reference = _SerializedReferenceTable.NO_REFERENCE
+    if path_spec_data:
+      if not self._path_spec_table:
+        stream_name = u'plaso_path_specs.{0:06d}'.format(self._file_number)
+        self._path_spec_table = _SerializedDataTable(
+            self._zipfile, stream_name)
+
+      number_of_entries = self._path_spec_table.number_of_entries
+      path_spec_reference = self._path_spec_table.AddEntry(path_spec_data)
+      if path_spec_reference == number_of_entries:
+        self._buffer_size += len(path_spec_data)
+
+    string_references = None
+    if string_values:
+      if not self._string_table:
+        stream_name = u'plaso_strings.{0:06d}'.format(self._file_number)
+        self._string_table = _SerializedStringTable(self._zipfile, stream_name)
+
+      string_references = []
+      for string_value in string_values:
+        if string_value is None:
+          string_references.append(_SerializedReferenceTable.NO_REFERENCE)
+          continue
+
+        number_of_entries = self._string_table.number_of_entries
+        string_reference = self._string_table.AddString(string_value)
+        if string_reference == number_of_entries:
+          self._buffer_size += len(string_value)
 
-    heapq.heappush(
-        self._buffer, (event_object.timestamp, event_object_data))
+        string_references.append(string_reference)
+
+      string_references = tuple(string_references)
+
+    heapq.heappush(self._buffer, (
+        timestamp, event_object_data, path_spec_reference, string_references))
     self._buffer_size += len(event_object_data)
     self._number_of_events_in_buffer += 1
 
     if self._buffer_size > self._max_buffer_size:
       self._WriteBuffer()
 
+  def Checkpoint(self):
+    """Commits the buffered event objects and streams to the storage file.
+
+    The buffered event objects are written and the ZIP file is closed, so
+    that the ZIP central directory is written, and reopened for appending.
+
+    Returns:
+      A tuple containing an integer with the offset of the ZIP central
+      directory and a binary string containing the ZIP central directory
+      and end of central directory records.
+
+    Raises:
+      IOError: when trying to checkpoint a closed or read-only storage file.
+    """
+    if not self._zipfile or self._read_only:
+      raise IOError(u'Unable to checkpoint a closed or read-only storage file.')
+
+    self._WriteBuffer()
+    self._FlushBuffers()
+    self._WriteTimestampRanges()
+
+    compress = self._zipfile.compression == zipfile.ZIP_DEFLATED
+
+    self._Close()
+    # The tables refer to the closed ZIP file and are read again when needed.
+    self._event_timestamp_tables = {}
+    self._event_timestamp_tables_lru = []
+    self._path_spec_reference_tables = {}
+    self._path_spec_tables = {}
+    self._path_spec_tables_lru = []
+    self._path_specs = {}
+    self._string_reference_tables = {}
+    self._string_tables = {}
+    self._string_tables_lru = []
+    self._timestamp_range_table = None
+
+    super(StorageFile, self)._Open(
+        self._path, access_mode='a', compress=compress)
+
+    central_directory_offset = self._zipfile.start_dir
+    with open(self._path, 'rb') as file_object:
+      os.fsync(file_object.fileno())
+      file_object.seek(central_directory_offset, os.SEEK_SET)
+      central_directory_data = file_object.read()
+
+    return central_directory_offset, central_directory_data
+
   def Close(self):
     """Closes the storage, flush the last buffer and closes the ZIP file."""
     if not self._zipfile:
       return
 
-    if not self._read_only:
-      self._WriteBuffer()
+    try:
+      if not self._read_only:
+        try:
+          self._WriteBuffer()
+        finally:
+          self._StopBufferWriter()
 
-      logging.debug((
-          u'[Storage] Closing the storage, number of events added: '
-          u'{0:d}').format(self._number_of_events_in_buffer))
+        self._WriteTimestampRanges()
 
-    self._Close()
+        logging.debug((
+            u'[Storage] Closing the storage, number of events added: '
+            u'{0:d}').format(self._number_of_events_in_buffer))
+
+    finally:
+      # The ZIP file is closed even if the buffers could not be written.
+      self._Close()
+      self._event_timestamp_tables = {}
+      self._event_timestamp_tables_lru = []
+      self._path_spec_reference_tables = {}
+      self._path_spec_tables = {}
+      self._path_spec_tables_lru = []
+      self._path_specs = {}
+      self._string_reference_tables = {}
+      self._string_tables = {}
+      self._string_tables_lru = []
+
+      self._ProfilingStop()
+
+  def GetEventObject(self, stream_number, entry_index, event_object_data=None):
+    """Retrieves a specific event object.
 
-    self._ProfilingStop()
+    Args:
+      stream_number: an integer containing the number of the serialized event
+                     object stream.
+      entry_index: an integer containing the number of the serialized event
+                   object within the stream.
+      event_object_data: optional binary string containing the serialized
+                         event object, e.g. read by another storage file
+                         object. If not set the serialized event object
+                         is read from the stream.
+
+    Returns:
+      An event object (instance of EventObject) or None.
+    """
+    event_object = self._GetEventObject(
+        stream_number, entry_index=entry_index,
+        event_object_data=event_object_data)
+    if event_object:
+      self._SetEventTag(event_object)
+    return event_object
 
   def GetReports(self):
     """Retrieves the analysis reports.
@@ -1452,17 +3336,40 @@ class StorageFile(ZIPStorageFile):
       report_string = file_object.read(self.MAXIMUM_REPORT_PROTOBUF_SIZE)
       yield self._analysis_report_serializer.ReadSerialized(report_string)
 
-  def GetSortedEntry(self, time_range=None):
+  def GetSerializedEventObjectStreamNumbers(self):
+    """Retrieves the available serialized event object stream numbers.
+
+    Returns:
+      A sorted list of integers of the available serialized data stream numbers.
+    """
+    return self._GetSerializedEventObjectStreamNumbers()
+
+  def GetSortedEntry(
+      self, event_predicates=None, stream_numbers=None, time_range=None):
     """Retrieves a sorted entry.
 
     Args:
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet.
+                        Event objects that do not meet the event predicates
+                        are skipped, where possible before they are
+                        deserialized. The event predicates are determined
+                        on the first call.
+      stream_numbers: an optional list of integers containing the numbers of
+                      the streams to merge, where None represents all
+                      available streams. The streams are determined on
+                      the first call.
       time_range: an optional time range object (instance of TimeRange).
 
     Returns:
       An event object (instance of EventObject).
     """
     if self._merge_buffer is None:
-      self._InitializeMergeBuffer(time_range=time_range)
+      self._InitializeMergeBuffer(
+          event_predicates=event_predicates, stream_numbers=stream_numbers,
+          time_range=time_range)
+
+    time_range = self._merge_time_range
 
     if not self._merge_buffer:
       return
@@ -1476,17 +3383,55 @@ class StorageFile(ZIPStorageFile):
       return
 
     # Read the next event object in a stream.
-    next_event_object = self._GetEventObject(stream_number)
+    next_event_object = self._GetMatchingEventObject(stream_number)
     if next_event_object:
       heapq.heappush(
           self._merge_buffer,
           (next_event_object.timestamp, stream_number, next_event_object))
 
-    event_object.tag = self._ReadEventTagByIdentifier(
-        event_object.store_number, event_object.store_index, event_object.uuid)
-
+    self._SetEventTag(event_object)
     return event_object
 
+  def GetSortedSerializedEntry(
+      self, event_predicates=None, stream_numbers=None, time_range=None):
+    """Retrieves a sorted entry as a serialized event object.
+
+    The entries are determined the same way as by GetSortedEntry. If lazy
+    decoding is enabled, the event objects that were not decoded to check
+    the event predicates or to look up their tag are not decoded.
+
+    Args:
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet.
+                        The event predicates are determined on the first
+                        call.
+      stream_numbers: an optional list of integers containing the numbers of
+                      the streams to merge, where None represents all
+                      available streams. The streams are determined on
+                      the first call.
+      time_range: an optional time range object (instance of TimeRange).
+
+    Returns:
+      A tuple containing the timestamp, store number and store index of
+      the event object and a binary string containing the serialized event
+      object, or None if there are no more entries. The serialized event
+      object is None if the event object was decoded.
+    """
+    event_object = self.GetSortedEntry(
+        event_predicates=event_predicates, stream_numbers=stream_numbers,
+        time_range=time_range)
+    if not event_object:
+      return
+
+    event_object_data = None
+    if isinstance(event_object, events.LazyEventObject):
+      # The serialized event object is no longer available after decoding.
+      event_object_data = getattr(event_object, u'_event_object_data', None)
+
+    return (
+        event_object.timestamp, event_object.store_number,
+        event_object.store_index, event_object_data)
+
   def GetStorageInformation(self):
     """Retrieves storage (preprocessing) information stored in the storage file.
 
@@ -1569,12 +3514,32 @@ class StorageFile(ZIPStorageFile):
           not self._serializers_profiler):
         self._serializers_profiler = profiler.SerializersProfiler(u'Storage')
 
+  def SetLazyDecoding(self, lazy_decoding):
+    """Enables or disables lazy decoding of the event objects.
+
+    With lazy decoding the storage file returns lazy event objects, which
+    are only deserialized when an attribute is accessed other than
+    the timestamp, data type and the values that are stored separately.
+    Lazy decoding only applies to event objects for which the storage file
+    stores the timestamp and data type separately.
+
+    Args:
+      lazy_decoding: boolean value to indicate if lazy decoding should
+                     be enabled.
+    """
+    self._lazy_decoding = lazy_decoding
+
   def StoreReport(self, analysis_report):
     """Store an analysis report.
 
     Args:
       analysis_report: an analysis report object (instance of AnalysisReport).
+
+    Raises:
+      IOError: if a buffer could not be written.
     """
+    self._FlushBuffers()
+
     report_number = 1
     for name in self._GetStreamNames():
       if name.startswith(u'plaso_report.'):
@@ -1614,8 +3579,11 @@ class StorageFile(ZIPStorageFile):
       tags: a list of event tags (instances of EventTag).
 
     Raises:
-      IOError: if the stream cannot be opened.
+      IOError: if the stream cannot be opened or a buffer could not be
+               written.
     """
+    self._FlushBuffers()
+
     tag_number = 1
     for name in self._GetStreamNames():
       if not name.startswith(u'plaso_tagging.'):
@@ -1730,8 +3698,11 @@ class StorageFile(ZIPStorageFile):
       preprocess_object: the preprocess object (instance of PreprocessObject).
 
     Raises:
-      IOError: if the stream cannot be opened.
+      IOError: if the stream cannot be opened or a buffer could not be
+               written.
     """
+    self._FlushBuffers()
+
     existing_stream_data = self._ReadStream(u'information.dump')
 
     # Store information about store range for this particular
@@ -1759,43 +3730,347 @@ class StorageFile(ZIPStorageFile):
 class ZIPStorageFileReader(reader.StorageReader):
   """Class that implements the ZIP-based storage file reader."""
 
-  def __init__(self, zip_storage_file):
+  def __init__(self, zip_storage_file, lazy_decoding=False):
     """Initializes a storage reader object.
 
     Args:
       zip_storage_file: a ZIP-based storage file (instance of ZIPStorageFile).
+      lazy_decoding: optional boolean value to indicate the event objects
+                     should be decoded on first access of their attributes.
     """
     super(ZIPStorageFileReader, self).__init__()
     self._zip_storage_file = zip_storage_file
+    self._zip_storage_file.SetLazyDecoding(lazy_decoding)
 
   def __exit__(self, unused_type, unused_value, unused_traceback):
     """Make usable with "with" statement."""
     self._zip_storage_file.Close()
 
-  def GetEvents(self, time_range=None):
+  def GetEvents(self, event_predicates=None, time_range=None):
     """Retrieves events.
 
     Args:
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet.
       time_range: an optional time range object (instance of TimeRange).
 
     Yields:
       An event object (instance of EventObject).
     """
+    self.number_of_filtered_events = 0
+
     event_object = self._zip_storage_file.GetSortedEntry(
-        time_range=time_range)
+        event_predicates=event_predicates, time_range=time_range)
 
     while event_object:
+      self.number_of_filtered_events = (
+          self._zip_storage_file.number_of_filtered_event_objects)
       yield event_object
       event_object = self._zip_storage_file.GetSortedEntry(
           time_range=time_range)
 
+    self.number_of_filtered_events = (
+        self._zip_storage_file.number_of_filtered_event_objects)
+
+
+class _ZIPStorageFileMergeProcess(multiprocessing.Process):
+  """Class that defines a ZIP-based storage file merge process.
+
+  The merge process merges the event objects of a group of streams into
+  a single sorted run, which is passed to the parent process in batches.
+  The event objects are passed serialized together with their sort key,
+  since pickling decoded event objects is more expensive than decoding
+  them in the parent process. The end of the sorted run is indicated by
+  an integer containing the number of event objects that did not meet
+  the event predicates.
+  """
+
+  def __init__(
+      self, storage_file_path, stream_numbers, event_object_queue,
+      batch_size=1000, event_predicates=None, time_range=None, **kwargs):
+    """Initializes the process object.
+
+    Args:
+      storage_file_path: a string containing the path of the storage file.
+      stream_numbers: a list of integers containing the numbers of the streams
+                      to merge.
+      event_object_queue: the event object queue object (instance of
+                          multiprocessing.Queue).
+      batch_size: optional integer containing the maximum number of event
+                  objects per batch.
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet.
+      time_range: an optional time range object (instance of TimeRange).
+      kwargs: keyword arguments to pass to multiprocessing.Process.
+    """
+    super(_ZIPStorageFileMergeProcess, self).__init__(**kwargs)
+    self._batch_size = batch_size
+    self._event_object_queue = event_object_queue
+    self._event_predicates = event_predicates
+    self._storage_file_path = storage_file_path
+    self._stream_numbers = stream_numbers
+    self._time_range = time_range
+
+  # This method is part of the multiprocessing.Process interface hence
+  # its name does not follow the style guide.
+  def run(self):
+    """Runs the process."""
+    # Prevent the KeyboardInterrupt being raised inside the process.
+    # This will prevent a process to generate a traceback when interrupted.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    try:
+      storage_file = StorageFile(self._storage_file_path, read_only=True)
+      storage_file.SetLazyDecoding(True)
+      try:
+        entries = []
+        entry = storage_file.GetSortedSerializedEntry(
+            event_predicates=self._event_predicates,
+            stream_numbers=self._stream_numbers, time_range=self._time_range)
+        while entry:
+          entries.append(entry)
+          if len(entries) >= self._batch_size:
+            self._event_object_queue.put(entries)
+            entries = []
+
+          entry = storage_file.GetSortedSerializedEntry(
+              time_range=self._time_range)
+
+        if entries:
+          self._event_object_queue.put(entries)
+
+        number_of_filtered_event_objects = (
+            storage_file.number_of_filtered_event_objects)
+
+      finally:
+        storage_file.Close()
+
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.exception(exception)
+      self._event_object_queue.put(
+          u'Unable to merge streams: {0!s} with error: {1!s}'.format(
+              self._stream_numbers, exception))
+      return
+
+    self._event_object_queue.put(number_of_filtered_event_objects)
+
+
+class ZIPStorageFileParallelReader(reader.StorageReader):
+  """Class that implements the ZIP-based storage file parallel reader.
+
+  The serialized event object streams are partitioned into groups. Every
+  group is decoded and merged into a sorted run by a separate process and
+  the sorted runs are merged by the reader. The event objects are returned
+  in the same order as by the ZIP-based storage file reader.
+  """
+
+  _MAXIMUM_NUMBER_OF_QUEUED_BATCHES = 16
+
+  _PROCESS_JOIN_TIMEOUT = 5.0
+
+  # The number of seconds to wait for a batch before checking if the merge
+  # process is still alive.
+  _QUEUE_GET_TIMEOUT = 1.0
+
+  def __init__(self, zip_storage_file, batch_size=1000, number_of_processes=0):
+    """Initializes a storage reader object.
+
+    Args:
+      zip_storage_file: a ZIP-based storage file (instance of ZIPStorageFile).
+      batch_size: optional integer containing the maximum number of event
+                  objects a merge process passes at a time.
+      number_of_processes: optional integer containing the number of merge
+                           processes, where 0 represents the number of CPUs.
+    """
+    if not number_of_processes:
+      number_of_processes = multiprocessing.cpu_count()
+
+    super(ZIPStorageFileParallelReader, self).__init__()
+    self._batch_size = batch_size
+    self._number_of_processes = number_of_processes
+    self._zip_storage_file = zip_storage_file
+
+  def __exit__(self, unused_type, unused_value, unused_traceback):
+    """Make usable with "with" statement."""
+    self._zip_storage_file.Close()
+
+  def _GetSortedRun(self, merge_process, event_object_queue):
+    """Retrieves the entries of a sorted run.
+
+    Args:
+      merge_process: the merge process (instance of
+                     _ZIPStorageFileMergeProcess) of the sorted run.
+      event_object_queue: the event object queue object (instance of
+                          multiprocessing.Queue).
+
+    Yields:
+      A tuple containing the timestamp, store number and store index of
+      the event object and a binary string containing the serialized event
+      object or None.
+
+    Raises:
+      IOError: if a merge process failed or exited unexpectedly.
+    """
+    while True:
+      try:
+        entries = event_object_queue.get(timeout=self._QUEUE_GET_TIMEOUT)
+      except Queue.Empty:
+        if merge_process.is_alive():
+          continue
+
+        # The merge process could have exited after queuing its last batch.
+        try:
+          entries = event_object_queue.get(timeout=self._QUEUE_GET_TIMEOUT)
+        except Queue.Empty:
+          raise IOError((
+              u'Merge process: {0!s} exited unexpectedly with exit code: '
+              u'{1!s}.').format(merge_process.pid, merge_process.exitcode))
+
+      if isinstance(entries, py2to3.STRING_TYPES):
+        raise IOError(entries)
+
+      if isinstance(entries, py2to3.INTEGER_TYPES):
+        self.number_of_filtered_events += entries
+        break
+
+      for entry in entries:
+        yield entry
+
+  def _GetStreamNumberGroups(self, stream_numbers):
+    """Partitions stream numbers into groups.
+
+    The streams are distributed round-robin since consecutive streams
+    normally contain a similar number of event objects.
+
+    Args:
+      stream_numbers: a list of integers containing the stream numbers.
+
+    Returns:
+      A list of lists of integers containing the stream numbers per group.
+    """
+    number_of_groups = min(self._number_of_processes, len(stream_numbers))
+    return [
+        stream_numbers[group_index::number_of_groups]
+        for group_index in range(number_of_groups)]
+
+  def GetEvents(self, event_predicates=None, time_range=None):
+    """Retrieves events.
+
+    Args:
+      event_predicates: optional event predicates (instance of
+                        EventPredicates) the event objects must meet.
+      time_range: an optional time range object (instance of TimeRange).
+
+    Yields:
+      An event object (instance of EventObject).
+
+    Raises:
+      IOError: if a merge process failed or exited unexpectedly.
+    """
+    self.number_of_filtered_events = 0
+
+    stream_numbers = (
+        self._zip_storage_file.GetSerializedEventObjectStreamNumbers())
+
+    excluded_stream_numbers = []
+    if event_predicates and event_predicates.store_numbers is not None:
+      excluded_stream_numbers = [
+          stream_number for stream_number in stream_numbers
+          if stream_number not in event_predicates.store_numbers]
+      stream_numbers = [
+          stream_number for stream_number in stream_numbers
+          if stream_number in event_predicates.store_numbers]
+
+    # pylint: disable=protected-access
+    storage_file_path = self._zip_storage_file._path
+
+    if self._number_of_processes < 2 or len(stream_numbers) < 2:
+      event_object = self._zip_storage_file.GetSortedEntry(
+          event_predicates=event_predicates, time_range=time_range)
+      while event_object:
+        self.number_of_filtered_events = (
+            self._zip_storage_file.number_of_filtered_event_objects)
+        yield event_object
+        event_object = self._zip_storage_file.GetSortedEntry(
+            time_range=time_range)
+
+      self.number_of_filtered_events = (
+          self._zip_storage_file.number_of_filtered_event_objects)
+      return
+
+    stream_number_groups = self._GetStreamNumberGroups(stream_numbers)
+
+    # The event objects of the streams that are excluded by the event
+    # predicates are counted as filtered by the merge processes.
+    for index, stream_number in enumerate(excluded_stream_numbers):
+      group_index = index % len(stream_number_groups)
+      stream_number_groups[group_index].append(stream_number)
+
+    merge_processes = []
+    sorted_runs = []
+    try:
+      for group_stream_numbers in stream_number_groups:
+        event_object_queue = multiprocessing.Queue(
+            maxsize=self._MAXIMUM_NUMBER_OF_QUEUED_BATCHES)
+        merge_process = _ZIPStorageFileMergeProcess(
+            storage_file_path, group_stream_numbers, event_object_queue,
+            batch_size=self._batch_size, event_predicates=event_predicates,
+            time_range=time_range)
+        merge_process.start()
+
+        merge_processes.append(merge_process)
+        sorted_runs.append(
+            self._GetSortedRun(merge_process, event_object_queue))
+
+      # The merge buffer is ordered on timestamp and store number like
+      # the merge buffer of the storage file. Event objects with the same
+      # timestamp and store number originate from the same sorted run
+      # hence the run index preserves their order.
+      merge_buffer = []
+      for run_index, sorted_run in enumerate(sorted_runs):
+        for timestamp, store_number, store_index, data in sorted_run:
+          heapq.heappush(merge_buffer, (
+              timestamp, store_number, run_index, store_index, data))
+          break
+
+      while merge_buffer:
+        _, store_number, run_index, store_index, data = heapq.heappop(
+            merge_buffer)
+        for timestamp, next_store_number, next_store_index, next_data in (
+            sorted_runs[run_index]):
+          heapq.heappush(merge_buffer, (
+              timestamp, next_store_number, run_index, next_store_index,
+              next_data))
+          break
+
+        # The event objects that were decoded by the merge process are read
+        # again from the storage file.
+        event_object = self._zip_storage_file.GetEventObject(
+            store_number, store_index, event_object_data=data)
+        if event_object:
+          yield event_object
+
+      for merge_process in merge_processes:
+        merge_process.join(timeout=self._PROCESS_JOIN_TIMEOUT)
+
+    finally:
+      # Terminate merge processes that are still running, e.g. when
+      # the consumer stopped reading event objects early.
+      for merge_process in merge_processes:
+        if merge_process.is_alive():
+          merge_process.terminate()
+
 
 class ZIPStorageFileWriter(writer.StorageWriter):
   """Class that implements the ZIP-based storage file writer."""
 
+  # The default number of seconds between checkpoints.
+  _DEFAULT_CHECKPOINT_INTERVAL = 300
+
   def __init__(
       self, event_object_queue, output_file, preprocess_object,
-      buffer_size=0, serializer_format=u'proto'):
+      buffer_size=0, checkpoint_interval=_DEFAULT_CHECKPOINT_INTERVAL,
+      checkpoint_journal=None, compress=True, serializer_format=u'proto'):
     """Initializes a storage writer object.
 
     Args:
@@ -1803,11 +4078,25 @@ class ZIPStorageFileWriter(writer.StorageWriter):
       output_file: a string containing the path to the output file.
       preprocess_object: a preprocess object (instance of PreprocessObject).
       buffer_size: an integer containing the estimated size of a protobuf file.
+      checkpoint_interval: optional number of seconds between checkpoints,
+                           where 0 represents checkpoints are disabled.
+      checkpoint_journal: optional checkpoint journal (instance of
+                          CheckpointJournal). If set and checkpoints are
+                          not disabled the storage file is periodically
+                          committed and the path specifications completed
+                          by then are written to the journal.
+      compress: optional boolean to indicate the streams should be written
+                DEFLATE compressed.
       serializer_format: a string containing the serializer format either
                          "proto" or "json".
     """
     super(ZIPStorageFileWriter, self).__init__(event_object_queue)
     self._buffer_size = buffer_size
+    self._checkpoint_interval = checkpoint_interval
+    self._checkpoint_journal = None
+    self._completed_path_specs = []
+    self._compress = compress
+    self._last_checkpoint_time = None
     self._output_file = output_file
     # Counter containing the number of events per parser.
     self._parsers_counter = collections.Counter()
@@ -1817,13 +4106,37 @@ class ZIPStorageFileWriter(writer.StorageWriter):
     self._serializer_format = serializer_format
     self._storage_file = None
 
+    if checkpoint_interval > 0:
+      self._checkpoint_journal = checkpoint_journal
+
+  def _Checkpoint(self):
+    """Commits the storage file and writes a checkpoint to the journal."""
+    central_directory_offset, central_directory_data = (
+        self._storage_file.Checkpoint())
+
+    self._checkpoint_journal.WriteCheckpoint(
+        central_directory_offset, central_directory_data,
+        self._completed_path_specs)
+
+    self._completed_path_specs = []
+    self._last_checkpoint_time = time.time()
+
   def _Close(self):
     """Closes the storage writer."""
+    # The final checkpoint is written before the preprocess object, which
+    # is discarded when the storage file is restored to the checkpoint.
+    if self._checkpoint_journal:
+      self._Checkpoint()
+
     # TODO: move the counters out of preprocessing object.
     # Kept for backwards compatibility for now.
     self._preprocess_object.counter = self._parsers_counter
     self._preprocess_object.plugin_counter = self._plugins_counter
 
+    # The store range maps the stores written by this storage writer to
+    # the preprocess object, since a storage file can be appended to.
+    self._preprocess_object.store_range = self._storage_file.store_range
+
     self._storage_file.WritePreprocessObject(self._preprocess_object)
 
     self._storage_file.Close()
@@ -1832,32 +4145,57 @@ class ZIPStorageFileWriter(writer.StorageWriter):
     """Consumes an item callback for ConsumeItems.
 
     Args:
-      event_object: an event object (instance of EventObject).
+      event_object: an event object (instance of EventObject),
+                    a serialized event object (instance of
+                    SerializedEventObject) or a path specification
+                    completed marker (instance of PathSpecCompleted).
     """
-    self._storage_file.AddEventObject(event_object)
+    if isinstance(event_object, plaso_queue.PathSpecCompleted):
+      self._number_of_completed_path_specs += 1
+
+      if self._checkpoint_journal:
+        self._completed_path_specs.append(event_object.path_spec_comparable)
+
+        if time.time() - self._last_checkpoint_time >= (
+            self._checkpoint_interval):
+          self._Checkpoint()
+      return
+
+    if isinstance(event_object, events.SerializedEventObject):
+      self._storage_file.AddSerializedEventObject(
+          event_object.timestamp, event_object.data,
+          path_spec_data=event_object.path_spec_data,
+          string_values=event_object.string_values)
+    else:
+      self._storage_file.AddEventObject(event_object)
     self._UpdateCounters(event_object)
 
   def _Open(self):
     """Opens the storage writer."""
     self._storage_file = StorageFile(
-        self._output_file, buffer_size=self._buffer_size,
+        self._output_file, background_writer=True,
+        buffer_size=self._buffer_size, compress=self._compress,
         serializer_format=self._serializer_format)
 
     self._storage_file.SetEnableProfiling(
         self._enable_profiling, profiling_type=self._profiling_type)
 
+    self._last_checkpoint_time = time.time()
+
   def _UpdateCounters(self, event_object):
     """Updates the counters.
 
     Args:
-      event_object: an event object (instance of EventObject).
+      event_object: an event object (instance of EventObject) or
+                    a serialized event object (instance of
+                    SerializedEventObject).
     """
     self._parsers_counter[u'total'] += 1
 
-    parser_name = getattr(event_object, u'parser', u'N/A')
+    parser_name = getattr(event_object, u'parser', None) or u'N/A'
     self._parsers_counter[parser_name] += 1
 
     # TODO: remove plugin, add parser chain.
-    if hasattr(event_object, u'plugin'):
-      plugin_name = getattr(event_object, u'plugin', u'N/A')
+    plugin_name = getattr(event_object, u'plugin', None)
+    if plugin_name:
       self._plugins_counter[plugin_name] += 1
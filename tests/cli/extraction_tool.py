@@ -119,7 +119,8 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
       u''])
 
   _EXPECTED_STORAGE_OPTIONS = u'\n'.join([
-      u'usage: extraction_tool_test.py [--serializer-format FORMAT]',
+      (u'usage: extraction_tool_test.py [--serializer-format FORMAT] '
+       u'[--no_compression]'),
       u'',
       u'Test argument parser.',
       u'',
@@ -131,6 +132,12 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
        u'change that'),
       (u'                        behavior. The choices are "proto" and '
        u'"json".'),
+      u'  --no_compression, --no-compression',
+      (u'                        Store the event object streams uncompressed. '
+       u'This'),
+      (u'                        results in a larger storage file that can be '
+       u'memory'),
+      u'                        mapped when read.',
       u''])
 
   def testAddExtractionOptions(self):
@@ -5,6 +5,7 @@
 import unittest
 
 from plaso.containers import events
+from plaso.serializer import json_serializer
 
 from tests.containers import test_lib
 
@@ -231,6 +232,80 @@ class EventObjectTest(test_lib.AttributeContainerTestCase):
       getattr(event_object, u'format_string_short')
 
 
+class LazyEventObjectTest(test_lib.AttributeContainerTestCase):
+  """Tests for the lazy event attributes container object."""
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._event_object = events.EventObject()
+    self._event_object.data_type = u'test:event'
+    self._event_object.hostname = u'MYHOSTNAME'
+    self._event_object.metadata = {u'author': u'Some Random Dude'}
+    self._event_object.timestamp = 1234124
+    self._event_object.timestamp_desc = u'Written'
+
+    self._serializer = json_serializer.JSONEventObjectSerializer
+    self._event_object_data = self._serializer.WriteSerialized(
+        self._event_object)
+
+  def _CreateLazyEventObject(self):
+    """Creates a lazy event object.
+
+    Returns:
+      A lazy event object (instance of LazyEventObject).
+    """
+    return events.LazyEventObject(
+        self._serializer, self._event_object_data, data_type=u'test:event',
+        timestamp=1234124)
+
+  def testGetAttribute(self):
+    """Tests retrieving attributes."""
+    event_object = self._CreateLazyEventObject()
+    event_object.store_number = 1
+
+    self.assertEqual(event_object.data_type, u'test:event')
+    self.assertEqual(event_object.timestamp, 1234124)
+    self.assertNotIn(u'hostname', event_object.__dict__)
+
+    self.assertEqual(event_object.hostname, u'MYHOSTNAME')
+    self.assertEqual(event_object.uuid, self._event_object.uuid)
+    self.assertIsNone(event_object.inode)
+
+    # Attributes set before decoding take precedence.
+    self.assertEqual(event_object.store_number, 1)
+
+    event_object = self._CreateLazyEventObject()
+    self.assertIsNone(getattr(event_object, u'bogus', None))
+    self.assertFalse(hasattr(event_object, u'bogus'))
+
+  def testCopyToDict(self):
+    """Tests the CopyToDict function."""
+    event_object = self._CreateLazyEventObject()
+    self.assertEqual(
+        event_object.CopyToDict(), self._event_object.CopyToDict())
+
+  def testEqualityString(self):
+    """Tests the EqualityString function."""
+    event_object = self._CreateLazyEventObject()
+    self.assertEqual(
+        event_object.EqualityString(), self._event_object.EqualityString())
+
+    self.assertTrue(self._CreateLazyEventObject() == self._event_object)
+    self.assertTrue(self._event_object == self._CreateLazyEventObject())
+
+  def testGetAttributes(self):
+    """Tests the GetAttributes function."""
+    event_object = self._CreateLazyEventObject()
+    self.assertEqual(
+        dict(event_object.GetAttributes()),
+        dict(self._event_object.GetAttributes()))
+
+    event_object = self._CreateLazyEventObject()
+    self.assertEqual(
+        sorted(event_object.GetAttributeNames()),
+        sorted(self._event_object.GetAttributeNames()))
+
+
 class EventTagTest(test_lib.AttributeContainerTestCase):
   """Tests for the event tag attributes container object."""
 
@@ -212,6 +212,66 @@ class CollectorTest(CollectorTestCase):
 
     self.assertEqual(test_collector_queue_consumer.number_of_path_specs, 3)
 
+  def testImageWithVSSCollection(self):
+    """Test collection on a storage media image file with VSS stores."""
+    test_file = self._GetTestFilePath([u'vsstest.qcow2'])
+
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    qcow_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_QCOW, parent=os_path_spec)
+
+    source_path_specs = []
+    for store_index in range(2):
+      vss_path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_VSHADOW, store_index=store_index,
+          parent=qcow_path_spec)
+      source_path_specs.append(path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+          parent=vss_path_spec))
+
+    numbers_of_path_specs = []
+    for duplicate_file_check in (False, True):
+      test_path_spec_queue = single_process.SingleProcessQueue()
+      resolver_context = context.Context()
+      test_collector = collector.Collector(
+          test_path_spec_queue, resolver_context=resolver_context)
+      test_collector.SetDuplicateFileCheck(duplicate_file_check)
+      test_collector.Collect(source_path_specs)
+
+      test_collector_queue_consumer = TestCollectorQueueConsumer(
+          test_path_spec_queue)
+      test_collector_queue_consumer.ConsumeItems()
+
+      numbers_of_path_specs.append(
+          test_collector_queue_consumer.number_of_path_specs)
+
+    # The files that did not change between the stores are only
+    # collected from the first store.
+    number_of_duplicate_files = (
+        test_collector._fs_collector.number_of_duplicate_files)
+    self.assertGreater(number_of_duplicate_files, 0)
+    self.assertLess(numbers_of_path_specs[1], numbers_of_path_specs[0])
+
+    # Without VSS stores no file identities are recorded.
+    test_path_spec_queue = single_process.SingleProcessQueue()
+    resolver_context = context.Context()
+    test_collector = collector.Collector(
+        test_path_spec_queue, resolver_context=resolver_context)
+    test_collector.SetDuplicateFileCheck(True)
+
+    tsk_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=qcow_path_spec)
+    test_collector.Collect([tsk_path_spec])
+
+    test_collector_queue_consumer = TestCollectorQueueConsumer(
+        test_path_spec_queue)
+    test_collector_queue_consumer.ConsumeItems()
+
+    self.assertGreater(test_collector_queue_consumer.number_of_path_specs, 0)
+    self.assertEqual(test_collector._fs_collector._file_identities, set())
+
   def testImageWithFilterCollection(self):
     """Test collection on a storage media image file with a filter."""
     test_file = self._GetTestFilePath([u'ímynd.dd'])
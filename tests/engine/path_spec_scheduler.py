@@ -0,0 +1,57 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the path specification scheduler."""
+
+import os
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso.engine import path_spec_scheduler
+
+
+class PathSpecSchedulerTest(unittest.TestCase):
+  """Tests for the path specification scheduler."""
+
+  _TEST_DATA_PATH = os.path.join(os.getcwd(), u'test_data')
+
+  def testEstimateCost(self):
+    """Tests the EstimateCost function."""
+    scheduler = path_spec_scheduler.PathSpecScheduler(10)
+
+    source_path = os.path.join(self._TEST_DATA_PATH, u'syslog')
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    cost = scheduler.EstimateCost(file_entry)
+    self.assertEqual(cost, os.path.getsize(source_path))
+
+    source_path = os.path.join(self._TEST_DATA_PATH, u'System.evtx')
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    cost = scheduler.EstimateCost(file_entry)
+    self.assertEqual(cost, os.path.getsize(source_path) * 4)
+
+  def testSchedule(self):
+    """Tests the Schedule and Flush functions."""
+    scheduler = path_spec_scheduler.PathSpecScheduler(2)
+
+    self.assertIsNone(scheduler.Schedule(u'small', 10))
+    self.assertIsNone(scheduler.Schedule(u'medium', 100))
+    self.assertEqual(scheduler.number_of_path_specs, 2)
+
+    self.assertEqual(scheduler.Schedule(u'large', 1000), u'large')
+    self.assertEqual(scheduler.Schedule(u'tiny', 1), u'medium')
+
+    self.assertEqual(scheduler.Schedule(u'huge', 10000), u'huge')
+    self.assertEqual(list(scheduler.Flush()), [u'small', u'tiny'])
+    self.assertEqual(scheduler.number_of_path_specs, 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -9,6 +9,7 @@ from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import context
 
+from plaso.engine import plaso_queue
 from plaso.engine import single_process
 from plaso.lib import errors
 
@@ -85,6 +86,30 @@ class SingleProcessQueueTest(unittest.TestCase):
     self.assertEqual(
         test_queue_consumer.number_of_items, expected_number_of_items)
 
+  def testPushPopItemBatch(self):
+    """Tests the PushItem and PopItem functions with batched items."""
+    test_queue = single_process.SingleProcessQueue()
+    test_queue_producer = plaso_queue.ItemQueueProducer(
+        test_queue, maximum_batch_size=3)
+
+    for item in self._ITEMS:
+      test_queue_producer.ProduceItem(item)
+
+    self.assertEqual(test_queue_producer.number_of_produced_batches, 1)
+
+    test_queue_producer.Flush()
+    self.assertEqual(test_queue_producer.number_of_produced_batches, 2)
+
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    expected_number_of_items = len(self._ITEMS)
+    self.assertEqual(
+        test_queue_consumer.number_of_items, expected_number_of_items)
+    self.assertEqual(
+        test_queue_consumer.number_of_consumed_items, expected_number_of_items)
+    self.assertEqual(frozenset(test_queue_consumer.items), self._ITEMS)
+
   def testQueueEmpty(self):
     """Tests the queue raises the QueueEmpty exception."""
     test_queue = single_process.SingleProcessQueue()
@@ -113,6 +138,26 @@ class SingleProcessQueueTest(unittest.TestCase):
     self.assertEqual(
         test_queue_consumer.number_of_items, expected_number_of_items + 1)
 
+  def testQueueFullNonBlocking(self):
+    """Tests the queue raises the QueueFull exception in non blocking mode."""
+    test_queue = single_process.SingleProcessQueue(
+        maximum_number_of_queued_items=5)
+
+    for item in self._ITEMS:
+      test_queue.PushItem(item, block=False)
+
+    test_queue.PushItem(u'item5', block=False)
+
+    with self.assertRaises(errors.QueueFull):
+      test_queue.PushItem(u'item6', block=False)
+
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    expected_number_of_items = len(self._ITEMS)
+    self.assertEqual(
+        test_queue_consumer.number_of_items, expected_number_of_items + 1)
+
 
 if __name__ == '__main__':
   unittest.main()
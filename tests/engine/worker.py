@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests the worker."""
 
+import threading
 import unittest
 
 from dfvfs.lib import definitions as dfvfs_definitions
@@ -9,13 +10,38 @@ from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import context
 
 from plaso.engine import knowledge_base
+from plaso.engine import plaso_queue
 from plaso.engine import single_process
 from plaso.engine import worker
+from plaso.lib import errors
 from plaso.parsers import mediator as parsers_mediator
 
 from tests.engine import test_lib
 
 
+class PathSpecFanOutQueueTest(test_lib.EngineTestCase):
+  """Tests for the path specification fan-out queue."""
+
+  def testPushPopItem(self):
+    """Tests the PushItem and PopItem functions."""
+    path_spec_queue = single_process.SingleProcessQueue(
+        maximum_number_of_queued_items=2)
+    fan_out_queue = worker.PathSpecFanOutQueue(path_spec_queue)
+
+    for item in (u'item1', u'item2', u'item3', u'item4'):
+      fan_out_queue.PushItem(item)
+
+    self.assertEqual(fan_out_queue.number_of_pushed_items, 2)
+    self.assertFalse(fan_out_queue.IsEmpty())
+
+    self.assertEqual(fan_out_queue.PopItem(), u'item3')
+    self.assertEqual(fan_out_queue.PopItem(), u'item4')
+    self.assertTrue(fan_out_queue.IsEmpty())
+
+    with self.assertRaises(errors.QueueEmpty):
+      fan_out_queue.PopItem()
+
+
 class BaseEventExtractionWorkerTest(test_lib.EngineTestCase):
   """Tests for the worker object."""
 
@@ -163,6 +189,95 @@ class BaseEventExtractionWorkerTest(test_lib.EngineTestCase):
 
     self.assertEqual(test_queue_consumer.number_of_items, 17)
 
+  def testExtractionWorkerWithCheckpoints(self):
+    """Tests the extraction worker with checkpoints enabled."""
+    path_spec_queue = single_process.SingleProcessQueue()
+    event_object_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+
+    event_queue_producer = single_process.SingleProcessItemQueueProducer(
+        event_object_queue)
+    parse_error_queue_producer = single_process.SingleProcessItemQueueProducer(
+        parse_error_queue)
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    parser_mediator = parsers_mediator.ParserMediator(
+        event_queue_producer, parse_error_queue_producer,
+        knowledge_base_object)
+
+    extraction_worker = worker.BaseEventExtractionWorker(
+        0, path_spec_queue, event_queue_producer, parse_error_queue_producer,
+        parser_mediator)
+
+    extraction_worker.InitializeParserObjects()
+    extraction_worker.SetEnableCheckpoints(True)
+
+    source_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+
+    path_spec_queue.PushItem(path_spec)
+    extraction_worker.Run()
+
+    test_queue_consumer = test_lib.TestQueueConsumer(event_object_queue)
+    test_queue_consumer.ConsumeItems()
+
+    # The path specification completed marker follows the event objects.
+    self.assertEqual(test_queue_consumer.number_of_items, 17)
+
+    marker = test_queue_consumer.items[-1]
+    self.assertIsInstance(marker, plaso_queue.PathSpecCompleted)
+    self.assertEqual(marker.path_spec_comparable, path_spec.comparable)
+
+  def testExtractionWorkerWithRecycleEvent(self):
+    """Tests the extraction worker with a recycle event."""
+    path_spec_queue = single_process.SingleProcessQueue()
+    event_object_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+
+    event_queue_producer = single_process.SingleProcessItemQueueProducer(
+        event_object_queue)
+    parse_error_queue_producer = single_process.SingleProcessItemQueueProducer(
+        parse_error_queue)
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    parser_mediator = parsers_mediator.ParserMediator(
+        event_queue_producer, parse_error_queue_producer,
+        knowledge_base_object)
+
+    extraction_worker = worker.BaseEventExtractionWorker(
+        0, path_spec_queue, event_queue_producer, parse_error_queue_producer,
+        parser_mediator)
+
+    extraction_worker.InitializeParserObjects()
+
+    recycle_event = threading.Event()
+    recycle_event.set()
+    extraction_worker.SetRecycleEvent(recycle_event)
+
+    source_path = self._GetTestFilePath([u'syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+
+    path_spec_queue.PushItem(path_spec)
+    path_spec_queue.PushItem(path_spec)
+    extraction_worker.Run()
+
+    # The worker stops after the first path specification.
+    self.assertIsNone(extraction_worker.processing_path_spec)
+    self.assertFalse(path_spec_queue.IsEmpty())
+
+    status = extraction_worker.GetStatus()
+    self.assertEqual(status[u'consumed_number_of_path_specs'], 1)
+    self.assertTrue(status[u'recycled'])
+
+    # The parser is only reported while it is parsing a file entry.
+    self.assertIsNone(status[u'parser_name'])
+    self.assertIsNone(status[u'parser_path_spec'])
+    self.assertEqual(status[u'parsing_time'], 0.0)
+
   def testExtractionWorkerHashing(self):
     """Test that the worker sets up and runs hashing code correctly."""
     path_spec_queue = single_process.SingleProcessQueue()
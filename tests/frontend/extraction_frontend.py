@@ -9,6 +9,8 @@ from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 
 from plaso.frontend import extraction_frontend
+from plaso.lib import errors
+from plaso.lib import event
 from plaso.storage import zip_file as storage_zip_file
 
 from tests import test_lib as shared_test_lib
@@ -42,6 +44,23 @@ class ExtractionFrontendTests(test_lib.FrontendTestCase):
   # TODO: add test for _PreprocessSetCollectionInformation
   # TODO: add test for _PreprocessSetTimezone
 
+  def testGetIncrementalParserFilterString(self):
+    """Tests the _GetIncrementalParserFilterString function."""
+    # pylint: disable=protected-access
+    test_front_end = extraction_frontend.ExtractionFrontend()
+
+    pre_obj = event.PreprocessObject()
+    pre_obj.collection_information = {
+        u'parser_selection': u'syslog',
+        u'parsers': [u'syslog']}
+
+    parser_filter_string = test_front_end._GetIncrementalParserFilterString(
+        [pre_obj], u'syslog,winevt,-winevtx')
+    self.assertEqual(parser_filter_string, u'winevt,-winevtx')
+
+    with self.assertRaises(errors.BadConfigOption):
+      test_front_end._GetIncrementalParserFilterString([pre_obj], u'syslog')
+
   def testGetHashersInformation(self):
     """Tests the GetHashersInformation function."""
     test_front_end = extraction_frontend.ExtractionFrontend()
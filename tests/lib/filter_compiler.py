@@ -0,0 +1,202 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the filter compiler."""
+
+import pickle
+import unittest
+
+from plaso.containers import events
+from plaso.formatters import interface as formatters_interface
+from plaso.formatters import manager as formatters_manager
+from plaso.lib import filter_compiler
+from plaso.lib import pfilter
+from plaso.lib import timelib
+
+
+class FilterCompilerTestFormatter(formatters_interface.EventFormatter):
+  """A formatter for the filter compiler test event object."""
+
+  DATA_TYPE = u'test:filter_compiler'
+
+  FORMAT_STRING = u'{text}'
+  FORMAT_STRING_SHORT = u'{text_short}'
+
+  SOURCE_LONG = u'Fake Parsing Source'
+  SOURCE_SHORT = u'REG'
+
+
+formatters_manager.FormattersManager.RegisterFormatter(
+    FilterCompilerTestFormatter)
+
+
+class FilterCompilerTest(unittest.TestCase):
+  """Tests for the filter compiler."""
+
+  _QUERIES = [
+      u'filename contains \'GoodFella\'',
+      u'filename not contains \'sometext\'',
+      u'date >= \'2015-11-18\'',
+      u'date < \'2015-11-19\'',
+      (u'date < \'2015-11-18T01:15:44.341\' and '
+       u'date > \'2015-11-18 01:15:42\''),
+      u'date > \'2015-11-19\'',
+      u'timestamp is 1447809343000000',
+      (u'timestamp_desc CONTAINS \'written\' AND date > \'2015-11-18\' AND '
+       u'date < \'2015-11-25 12:56:21\' AND (source_short contains \'LOG\' or '
+       u'source_short CONTAINS \'REG\')'),
+      u'parser is not \'Made\'',
+      u'parser is not \'Weirdo\'',
+      u'mydict.value is 123',
+      u'mydict.akeywithstuff contains "ere"',
+      u'mydict.value is 134',
+      u'mydict.value < 200',
+      u'mydict.another contains "val"',
+      u'mydict.notthere is 123',
+      u'inode > 1000 and inode <= 1245',
+      u'source_long not contains \'Fake\'',
+      u'source is \'REG\'',
+      u'source is not \'FILE\'',
+      (u'source_long is \'Fake Parsing Source\' AND description_long '
+       u'regexp \'bad, bad thing [\\sa-zA-Z\\.]+ evil\''),
+      (u'source_long is \'Fake Parsing Source\' AND text iregexp '
+       u'\'bad, bad thing [\\sa-zA-Z\\.]+ evil\''),
+      u'message contains \'Dr. Evil\' or message contains \'bogus\'',
+      u'hostname inset \'Agrabah\'']
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._event_object = events.EventObject()
+    self._event_object.data_type = u'test:filter_compiler'
+    self._event_object.timestamp = timelib.Timestamp.CopyFromString(
+        u'2015-11-18 01:15:43')
+    self._event_object.timestamp_desc = u'Last Written'
+    self._event_object.text_short = (
+        u'This description is different than the long one.')
+    self._event_object.text = (
+        u'User did a very bad thing, bad, bad thing that awoke Dr. Evil.')
+    self._event_object.filename = (
+        u'/My Documents/goodfella/Documents/Hideout/myfile.txt')
+    self._event_object.hostname = u'Agrabah'
+    self._event_object.parser = u'Weirdo'
+    self._event_object.inode = 1245
+    self._event_object.mydict = {
+        u'value': 134, u'another': u'value', u'A Key (with stuff)': u'Here'}
+
+  def testCompileExpression(self):
+    """Tests that compiled and interpreted filters have the same result."""
+    compiler = filter_compiler.FilterCompiler()
+
+    for query in self._QUERIES:
+      expression = pfilter.BaseParser(query).Parse()
+      matcher = expression.Compile(
+          pfilter.PlasoAttributeFilterImplementation)
+
+      expression = pfilter.BaseParser(query).Parse()
+      compiled_filter = compiler.CompileExpression(expression)
+
+      self.assertEqual(
+          compiled_filter.Matches(self._event_object),
+          matcher.Matches(self._event_object), msg=query)
+
+  def testMatches(self):
+    """Tests the Matches function."""
+    compiler = filter_compiler.FilterCompiler()
+
+    expression = pfilter.BaseParser(u'filename contains \'GoodFella\'').Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+    self.assertTrue(compiled_filter.Matches(self._event_object))
+
+    self.assertEqual(
+        compiled_filter.Filter([self._event_object, events.EventObject()]),
+        [self._event_object])
+
+    expression = pfilter.BaseParser(u'date > \'2015-11-19\'').Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+    self.assertFalse(compiled_filter.Matches(self._event_object))
+
+    expression = pfilter.BaseParser(
+        u'message contains \'Dr. Evil\' and source is \'REG\'').Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+    self.assertTrue(compiled_filter.Matches(self._event_object))
+
+  def testEventPredicates(self):
+    """Tests the event predicates of the compiled filter."""
+    compiler = filter_compiler.FilterCompiler()
+
+    # The event predicates must be met by every event object that matches.
+    for query in self._QUERIES:
+      expression = pfilter.BaseParser(query).Parse()
+      compiled_filter = compiler.CompileExpression(expression)
+
+      if compiled_filter.Matches(self._event_object):
+        self.assertTrue(
+            compiled_filter.event_predicates.Matches(self._event_object),
+            msg=query)
+
+    expression = pfilter.BaseParser(
+        u'parser is \'Weirdo\' and date > \'2015-11-18\' and '
+        u'date < \'2015-11-19\'').Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+    event_predicates = compiled_filter.event_predicates
+    self.assertEqual(event_predicates.parsers, frozenset([u'Weirdo']))
+    self.assertEqual(
+        event_predicates.start_timestamp,
+        timelib.Timestamp.CopyFromString(u'2015-11-18 00:00:00'))
+    self.assertEqual(
+        event_predicates.end_timestamp,
+        timelib.Timestamp.CopyFromString(u'2015-11-19 00:00:00'))
+    self.assertIsNone(event_predicates.data_types)
+
+    expression = pfilter.BaseParser(
+        u'data_type is \'test:one\' or data_type is \'test:two\'').Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+    event_predicates = compiled_filter.event_predicates
+    self.assertEqual(
+        event_predicates.data_types, frozenset([u'test:one', u'test:two']))
+
+    expression = pfilter.BaseParser(
+        u'parser is \'Weirdo\' or filename contains \'GoodFella\'').Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+    self.assertFalse(compiled_filter.event_predicates.is_restricted)
+
+    expression = pfilter.BaseParser(u'parser is not \'Weirdo\'').Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+    self.assertFalse(compiled_filter.event_predicates.is_restricted)
+
+    expression = pfilter.BaseParser(
+        u'parser is \'Made\' and parser is \'Weirdo\'').Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+    self.assertFalse(compiled_filter.event_predicates.is_satisfiable)
+
+  def testGetMessage(self):
+    """Tests the _GetMessage function."""
+    event_values = filter_compiler._EventValues()
+
+    cache = {}
+    # pylint: disable=protected-access
+    message = event_values._GetMessage(self._event_object, cache)
+    self.assertEqual(
+        message,
+        u'User did a very bad thing, bad, bad thing that awoke Dr. Evil.')
+    self.assertEqual(cache[u'message'], message)
+
+    cache[u'message'] = u'cached'
+    message = event_values._GetMessage(self._event_object, cache)
+    self.assertEqual(message, u'cached')
+
+  def testPickle(self):
+    """Tests that compiled filters can be pickled."""
+    compiler = filter_compiler.FilterCompiler()
+
+    for query in self._QUERIES:
+      expression = pfilter.BaseParser(query).Parse()
+      compiled_filter = compiler.CompileExpression(expression)
+      result = compiled_filter.Matches(self._event_object)
+
+      compiled_filter = pickle.loads(pickle.dumps(compiled_filter))
+      self.assertEqual(
+          compiled_filter.Matches(self._event_object), result, msg=query)
+
+
+if __name__ == '__main__':
+  unittest.main()
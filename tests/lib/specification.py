@@ -7,6 +7,31 @@ import unittest
 from plaso.lib import specification
 
 
+class SignatureTest(unittest.TestCase):
+  """Class to test the signature."""
+
+  def testMatches(self):
+    """Function to test the Matches function."""
+    signature = specification.Signature(b'regf', offset=0)
+    self.assertTrue(signature.is_bound)
+    self.assertTrue(signature.Matches(b'regf\x00\x00'))
+    self.assertFalse(signature.Matches(b'\x00regf'))
+
+    signature = specification.Signature(b'SCCA', offset=4)
+    self.assertTrue(signature.Matches(b'\x11\x00\x00\x00SCCA'))
+    self.assertFalse(signature.Matches(b'\x11\x00'))
+
+    signature = specification.Signature(b'koly', offset=-8)
+    self.assertTrue(signature.Matches(
+        b'koly\x00\x00\x00\x00', data_offset=92, data_size=100))
+    self.assertFalse(signature.Matches(
+        b'\x00\x00\x00\x00koly', data_offset=92, data_size=100))
+
+    signature = specification.Signature(b'floating')
+    self.assertFalse(signature.is_bound)
+    self.assertFalse(signature.Matches(b'floating'))
+
+
 class FormatSpecificationStoreTest(unittest.TestCase):
   """Class to test the specification store."""
 
@@ -26,6 +51,28 @@ class FormatSpecificationStoreTest(unittest.TestCase):
     with self.assertRaises(KeyError):
       store.AddSpecification(format_regf)
 
+  def testSignatureRanges(self):
+    """Function to test the bound signature ranges."""
+    store = specification.FormatSpecificationStore()
+
+    format_esedb = specification.FormatSpecification(u'ESEDB')
+    format_esedb.AddNewSignature(b'\xef\xcd\xab\x89', offset=4)
+
+    format_udif = specification.FormatSpecification(u'UDIF')
+    format_udif.AddNewSignature(b'koly', offset=-512)
+
+    format_floating = specification.FormatSpecification(u'FLOATING')
+    format_floating.AddNewSignature(b'floating')
+
+    store.AddSpecification(format_esedb)
+    store.AddSpecification(format_udif)
+    store.AddSpecification(format_floating)
+
+    self.assertEqual(store.header_size, 8)
+    self.assertEqual(store.footer_size, 512)
+    self.assertEqual(len(store.bound_signatures), 2)
+    self.assertEqual(len(store.floating_signatures), 1)
+
 
 if __name__ == '__main__':
   unittest.main()
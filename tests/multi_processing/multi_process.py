@@ -16,6 +16,28 @@ from tests.engine import test_lib as engine_test_lib
 class MultiProcessEngineTest(engine_test_lib.EngineTestCase):
   """Tests for the multi-process engine object."""
 
+  # pylint: disable=protected-access
+
+  def testCheckWorkerParseTimeout(self):
+    """Tests the _CheckWorkerParseTimeout function."""
+    test_engine = multi_process.MultiProcessEngine(
+        maximum_number_of_queued_items=100)
+
+    process_status = {
+        u'parser_name': u'filestat',
+        u'parser_path_spec': u'type: OS, location: /tmp/test\n',
+        u'parsing_time': 30.0}
+
+    # The parse timeout is disabled by default.
+    self.assertFalse(test_engine._CheckWorkerParseTimeout(1, process_status))
+
+    test_engine._parse_timeout = 60
+    self.assertFalse(test_engine._CheckWorkerParseTimeout(1, process_status))
+
+    process_status[u'parsing_time'] = 90.0
+    with self.assertRaises(KeyError):
+      test_engine._CheckWorkerParseTimeout(1, process_status)
+
   def testProcessSources(self):
     """Tests the PreprocessSources and ProcessSources function."""
     test_engine = multi_process.MultiProcessEngine(
@@ -2,15 +2,130 @@
 # -*- coding: utf-8 -*-
 """Tests for the SQLite database parser."""
 
+import os
+import shutil
+import sys
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
 from plaso.parsers import sqlite
 # Register plugins.
 from plaso.parsers import sqlite_plugins  # pylint: disable=unused-import
 
+from tests import test_lib as shared_test_lib
 from tests.parsers import test_lib
 
 
+class SQLiteCacheTest(test_lib.ParserTestCase):
+  """Tests for the SQLite plugin cache object."""
+
+  def testGetQueryResults(self):
+    """Tests the GetQueryResults function."""
+    test_file = self._GetTestFilePath([u'contacts2.db'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    database = sqlite.SQLiteDatabase(file_entry.name)
+    file_object = file_entry.GetFileObject()
+    try:
+      database.Open(file_object)
+    finally:
+      file_object.close()
+
+    query = u'SELECT name FROM sqlite_master WHERE type="table"'
+
+    try:
+      cache = sqlite.SQLiteCache()
+      cache.RegisterQueries([query])
+      cache.RegisterQueries([query])
+
+      # The results of a shared query are read once.
+      first_results = cache.GetQueryResults(database, query)
+      second_results = cache.GetQueryResults(database, query)
+      self.assertIs(first_results, second_results)
+      self.assertEqual(len(first_results), len(database.tables))
+
+      # The results of a query that is not shared are not kept.
+      cache = sqlite.SQLiteCache()
+      cache.RegisterQueries([query])
+
+      sql_results = cache.GetQueryResults(database, query)
+      self.assertEqual(len(list(sql_results)), len(database.tables))
+
+    finally:
+      database.Close()
+
+
+class SQLiteDatabaseTest(test_lib.ParserTestCase):
+  """Tests for the SQLite database object."""
+
+  # pylint: disable=protected-access
+
+  def testConnectInPlace(self):
+    """Tests the _ConnectInPlace function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_file = os.path.join(temp_directory, u'contacts2.db')
+      shutil.copyfile(self._GetTestFilePath([u'contacts2.db']), test_file)
+
+      database = sqlite.SQLiteDatabase(u'contacts2.db')
+      connection = database._ConnectInPlace(test_file)
+
+      # Without URI support the database file cannot be opened read-only
+      # and a temporary copy must be used.
+      if sys.version_info < (3, 4):
+        self.assertIsNone(connection)
+        return
+
+      self.assertIsNotNone(connection)
+
+      try:
+        sql_results = connection.execute(
+            u'SELECT name FROM sqlite_master WHERE type="table"')
+        self.assertNotEqual(list(sql_results), [])
+
+        with self.assertRaises(sqlite.sqlite3.Error):
+          connection.execute(u'CREATE TABLE bogus (value INTEGER)')
+
+      finally:
+        connection.close()
+
+      self.assertEqual(os.listdir(temp_directory), [u'contacts2.db'])
+
+  def testOpenAndClose(self):
+    """Tests the Open and Close functions."""
+    test_file = self._GetTestFilePath([u'contacts2.db'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    database = sqlite.SQLiteDatabase(file_entry.name)
+    file_object = file_entry.GetFileObject()
+    try:
+      database.Open(file_object)
+    finally:
+      file_object.close()
+
+    expected_table_names = database.tables
+    self.assertNotEqual(expected_table_names, [])
+    database.Close()
+    self.assertEqual(database.tables, [])
+
+    # Test opening the database in place.
+    database = sqlite.SQLiteDatabase(file_entry.name)
+    file_object = file_entry.GetFileObject()
+    try:
+      database.Open(file_object, path_spec=path_spec)
+    finally:
+      file_object.close()
+
+    self.assertEqual(database.tables, expected_table_names)
+    database.Close()
+
+
 class SQLiteParserTest(test_lib.ParserTestCase):
   """Tests for the SQLite database parser."""
 
@@ -45,6 +160,23 @@ class SQLiteParserTest(test_lib.ParserTestCase):
     self.assertTrue(u'chrome_history' in plugin_names)
     self.assertTrue(u'firefox_history' in plugin_names)
 
+  def testGetPluginsForTables(self):
+    """Tests the _GetPluginsForTables function."""
+    parser = sqlite.SQLiteParser()
+
+    # pylint: disable=protected-access
+    plugin_objects = parser._GetPluginsForTables([u'calls', u'bogus'])
+    plugin_names = [plugin_object.NAME for plugin_object in plugin_objects]
+    self.assertEqual(plugin_names, [u'android_calls'])
+
+    plugin_objects = parser._GetPluginsForTables([u'moz_cookies', u'sms'])
+    plugin_names = [plugin_object.NAME for plugin_object in plugin_objects]
+    self.assertEqual(
+        sorted(plugin_names), [u'android_sms', u'firefox_cookies'])
+
+    plugin_objects = parser._GetPluginsForTables([u'files'])
+    self.assertEqual(plugin_objects, [])
+
   def testFileParserChainMaintenance(self):
     """Tests that the parser chain is correctly maintained by the parser."""
     parser = sqlite.SQLiteParser()
@@ -50,7 +50,7 @@ class SQLitePluginTestCase(test_lib.ParserTestCase):
     database = sqlite.SQLiteDatabase(file_entry.name)
     file_object = file_entry.GetFileObject()
     try:
-      database.Open(file_object)
+      database.Open(file_object, path_spec=path_spec)
     finally:
       file_object.close()
 
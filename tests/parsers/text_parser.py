@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """This file contains the tests for the generic text parser."""
 
+import io
 import unittest
 
 import pyparsing
@@ -14,6 +15,7 @@ from plaso.lib import errors
 from plaso.lib import lexer
 from plaso.lib import timelib
 from plaso.parsers import text_parser
+from plaso.parsers import xchatlog
 
 from tests.parsers import test_lib
 
@@ -207,5 +209,56 @@ class PyparsingConstantsTest(test_lib.ParserTestCase):
           u'a9', parseAll=True)
 
 
+class TextFileHeadTest(test_lib.ParserTestCase):
+  """Tests the text file head object."""
+
+  def testIsBinary(self):
+    """Tests the is_binary property."""
+    text_file_head = text_parser.TextFileHead(io.BytesIO(b''))
+    self.assertTrue(text_file_head.is_binary)
+
+    text_file_head = text_parser.TextFileHead(io.BytesIO(b'MZ\x90\x00\x03'))
+    self.assertTrue(text_file_head.is_binary)
+
+    text_file_head = text_parser.TextFileHead(
+        io.BytesIO(b'\r\n\nfirst line\nsecond\x00line\n'))
+    self.assertFalse(text_file_head.is_binary)
+
+  def testHasSize(self):
+    """Tests the HasSize function."""
+    file_object = io.BytesIO(b'A' * 32)
+
+    text_file_head = text_parser.TextFileHead(file_object, maximum_size=16)
+    self.assertEqual(file_object.tell(), 0)
+    self.assertTrue(text_file_head.HasSize(16))
+    self.assertFalse(text_file_head.HasSize(17))
+
+    text_file_head = text_parser.TextFileHead(file_object, maximum_size=64)
+    self.assertTrue(text_file_head.HasSize(128))
+
+  def testReadFirstLineFromHead(self):
+    """Tests reading the first line of a single-line text parser."""
+    parser_object = xchatlog.XChatLogParser()
+    test_file = self._GetTestFilePath([u'xchat.log'])
+
+    with open(test_file, 'rb') as file_object:
+      text_file_head = text_parser.TextFileHead(file_object)
+
+    # pylint: disable=protected-access
+    has_line, line = parser_object._ReadFirstLineFromHead(None, text_file_head)
+    self.assertTrue(has_line)
+    self.assertEqual(line, u'**** BEGIN LOGGING AT Mon Dec 31 21:11:55 2011')
+    self.assertIn(
+        (parser_object.encoding, parser_object.MAX_LINE_LENGTH),
+        text_file_head.lines)
+
+    # The head does not contain the first line if it is too small.
+    with open(test_file, 'rb') as file_object:
+      text_file_head = text_parser.TextFileHead(file_object, maximum_size=32)
+
+    has_line, _ = parser_object._ReadFirstLineFromHead(None, text_file_head)
+    self.assertFalse(has_line)
+
+
 if __name__ == u'__main__':
   unittest.main()
@@ -6,6 +6,9 @@ import collections
 import json
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
 from plaso.containers import events
 from plaso.containers import reports
 from plaso.lib import event
@@ -260,6 +263,30 @@ class JSONEventTagSerializerTest(JSONSerializerTestCase):
         sorted(event_tag_dict.items()), sorted(self._event_tag_dict.items()))
 
 
+class JSONPathSpecSerializerTest(JSONSerializerTestCase):
+  """Tests for the JSON path specification serializer object."""
+
+  def testReadAndWriteSerialized(self):
+    """Test the ReadSerialized and WriteSerialized functions."""
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/tmp/image.raw')
+    test_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, inode=15,
+        location=u'/a_directory/another_file', parent=os_path_spec)
+
+    serialized_path_spec = (
+        json_serializer.JSONPathSpecSerializer.WriteSerialized(
+            test_path_spec))
+
+    self.assertIsNotNone(serialized_path_spec)
+
+    path_spec = json_serializer.JSONPathSpecSerializer.ReadSerialized(
+        serialized_path_spec)
+
+    self.assertIsNotNone(path_spec)
+    self.assertEqual(path_spec.comparable, test_path_spec.comparable)
+
+
 class JSONPreprocessObjectSerializerTest(JSONSerializerTestCase):
   """Tests for the JSON preprocessing object serializer object."""
 
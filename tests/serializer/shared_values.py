@@ -0,0 +1,78 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the shared values event object serializer."""
+
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.serializer import protobuf_serializer as dfvfs_protobuf_serializer
+
+from plaso.containers import events
+from plaso.serializer import protobuf_serializer
+from plaso.serializer import shared_values
+
+
+class SharedValuesEventObjectSerializerTest(unittest.TestCase):
+  """Tests for the shared values event object serializer."""
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._serializer = shared_values.SharedValuesEventObjectSerializer(
+        protobuf_serializer.ProtobufEventObjectSerializer,
+        dfvfs_protobuf_serializer.ProtobufPathSpecSerializer)
+
+    self._path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/tmp/test.txt')
+
+    self._event_object = events.EventObject()
+    self._event_object.data_type = u'test:event'
+    self._event_object.hostname = u'MYHOSTNAME'
+    self._event_object.offset = 12
+    self._event_object.parser = u'test_parser'
+    self._event_object.pathspec = self._path_spec
+    self._event_object.timestamp = 1234124
+    self._event_object.timestamp_desc = u'Written'
+    self._event_object.username = b'joesmith'
+
+  def testReadAndWriteSerialized(self):
+    """Tests the ReadSerialized and WriteSerialized functions."""
+    serialized_event_object = self._serializer.WriteSerialized(
+        self._event_object)
+
+    # The shared values are restored after serialization.
+    self.assertEqual(self._event_object.data_type, u'test:event')
+    self.assertEqual(self._event_object.pathspec, self._path_spec)
+    self.assertEqual(self._event_object.username, b'joesmith')
+
+    self.assertEqual(serialized_event_object.timestamp, 1234124)
+    self.assertEqual(serialized_event_object.parser, u'test_parser')
+    self.assertIsNotNone(serialized_event_object.path_spec_data)
+
+    expected_string_values = (
+        u'test:event', None, None, u'MYHOSTNAME', u'test_parser', u'Written',
+        u'joesmith')
+    self.assertEqual(
+        serialized_event_object.string_values, expected_string_values)
+
+    # The serialized event object does not contain the shared values.
+    event_object = (
+        protobuf_serializer.ProtobufEventObjectSerializer.ReadSerialized(
+            serialized_event_object.data))
+    self.assertEqual(event_object.data_type, u'')
+    self.assertIsNone(event_object.pathspec)
+    self.assertFalse(hasattr(event_object, u'parser'))
+
+    event_object = self._serializer.ReadSerialized(serialized_event_object)
+    self.assertEqual(event_object.data_type, u'test:event')
+    self.assertEqual(event_object.hostname, u'MYHOSTNAME')
+    self.assertEqual(event_object.offset, 12)
+    self.assertEqual(event_object.parser, u'test_parser')
+    self.assertEqual(
+        event_object.pathspec.comparable, self._path_spec.comparable)
+    self.assertEqual(event_object.timestamp_desc, u'Written')
+    self.assertEqual(event_object.username, u'joesmith')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the columnar storage."""
+
+import os
+import unittest
+
+from plaso.lib import event
+from plaso.lib import timelib
+from plaso.storage import columnar
+from plaso.storage import event_predicates
+from plaso.storage import factory
+from plaso.storage import time_range
+
+from tests import test_lib as shared_test_lib
+from tests.storage import test_lib
+
+
+class ColumnarStorageFileTest(unittest.TestCase):
+  """Tests for the columnar storage file object."""
+
+  def _CreateTestStorageFile(self, path):
+    """Creates a columnar storage file for testing.
+
+    Args:
+      path: string containing the path of the storage file.
+    """
+    storage_file = columnar.ColumnarStorageFile(maximum_segment_size=3)
+    storage_file.Open(path, read_only=False)
+
+    for event_object in test_lib.CreateTestEventObjects():
+      storage_file.AddEventObject(event_object)
+
+    storage_file.Close()
+
+  def testFactory(self):
+    """Tests the registration with the storage factory."""
+    storage_file = factory.StorageFactory.NewStorage(u'columnar')
+    self.assertIsInstance(storage_file, columnar.ColumnarStorageFile)
+
+  def testGetEvents(self):
+    """Tests the GetEvents function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.columnar')
+      self._CreateTestStorageFile(temp_file)
+
+      storage_file = columnar.ColumnarStorageFile()
+      storage_file.Open(temp_file)
+
+      event_objects = list(storage_file.GetEvents())
+      self.assertEqual(len(event_objects), 4)
+
+      timestamps = [event_object.timestamp for event_object in event_objects]
+      self.assertEqual(timestamps, sorted(timestamps))
+
+      event_object = event_objects[0]
+      self.assertEqual(event_object.data_type, u'text:entry')
+      self.assertEqual(event_object.parser, u'UNKNOWN')
+      self.assertEqual(event_object.hostname, u'nomachine')
+      self.assertEqual(event_object.username, u'johndoe')
+      self.assertEqual(event_object.store_number, 2)
+      self.assertEqual(event_object.store_index, 0)
+
+      event_object = event_objects[-1]
+      self.assertEqual(event_object.data_type, u'windows:registry:key_value')
+      self.assertEqual(
+          event_object.regvalue, {u'Value': u'send all the exes to the other '
+                                            u'world'})
+
+      # Test the data type predicate.
+      event_objects = list(storage_file.GetEvents(
+          data_types=[u'windows:registry:key_value']))
+      self.assertEqual(len(event_objects), 3)
+
+      event_objects = list(storage_file.GetEvents(data_types=[u'bogus']))
+      self.assertEqual(len(event_objects), 0)
+
+      # Test the parser predicate.
+      event_objects = list(storage_file.GetEvents(parsers=[u'UNKNOWN']))
+      self.assertEqual(len(event_objects), 4)
+
+      # Test the time range predicate.
+      test_time_range = time_range.TimeRange(
+          timelib.Timestamp.CopyFromString(u'2012-04-20 00:00:00'),
+          timelib.Timestamp.CopyFromString(u'2012-04-30 00:00:00'))
+
+      event_objects = list(storage_file.GetEvents(time_range=test_time_range))
+      self.assertEqual(len(event_objects), 2)
+
+      # Test the attribute projection.
+      event_objects = list(storage_file.GetEvents(attribute_names=[u'text']))
+      self.assertEqual(len(event_objects), 4)
+
+      event_object = event_objects[0]
+      self.assertTrue(event_object.text.startswith(u'This is a line'))
+      self.assertFalse(hasattr(event_object, u'username'))
+
+      storage_file.Close()
+
+  def testGetEventsWithCachedSegments(self):
+    """Tests the GetEvents function with a bounded segment cache."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.columnar')
+      self._CreateTestStorageFile(temp_file)
+
+      storage_file = columnar.ColumnarStorageFile()
+      storage_file._MAXIMUM_NUMBER_OF_CACHED_SEGMENTS = 1
+      storage_file.Open(temp_file)
+
+      event_objects = list(storage_file.GetEvents())
+      self.assertEqual(len(event_objects), 4)
+
+      timestamps = [event_object.timestamp for event_object in event_objects]
+      self.assertEqual(timestamps, sorted(timestamps))
+
+      self.assertEqual(len(storage_file._segments), 1)
+      self.assertEqual(len(storage_file._segments_lru), 1)
+
+      storage_file.Close()
+
+  def testWritePreprocessObject(self):
+    """Tests the WritePreprocessObject function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.columnar')
+
+      storage_file = columnar.ColumnarStorageFile()
+      storage_file.Open(temp_file, read_only=False)
+
+      preprocess_object = event.PreprocessObject()
+      preprocess_object.hostname = u'nomachine'
+      storage_file.WritePreprocessObject(preprocess_object)
+      storage_file.WritePreprocessObject(preprocess_object)
+      storage_file.Close()
+
+      storage_file = columnar.ColumnarStorageFile()
+      storage_file.Open(temp_file)
+
+      storage_information = storage_file.GetStorageInformation()
+      self.assertEqual(len(storage_information), 2)
+      self.assertEqual(storage_information[0].hostname, u'nomachine')
+
+      storage_file.Close()
+
+
+class ColumnarStorageFileReaderTest(unittest.TestCase):
+  """Tests for the columnar storage file reader object."""
+
+  def testGetEvents(self):
+    """Tests the GetEvents function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.columnar')
+
+      storage_file = columnar.ColumnarStorageFile()
+      storage_file.Open(temp_file, read_only=False)
+
+      for event_object in test_lib.CreateTestEventObjects():
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      storage_file = columnar.ColumnarStorageFile()
+      storage_file.Open(temp_file)
+
+      with columnar.ColumnarStorageFileReader(storage_file) as storage_reader:
+        event_objects = list(storage_reader.GetEvents())
+
+      self.assertEqual(len(event_objects), 4)
+      self.assertEqual(storage_reader.number_of_filtered_events, 0)
+
+  def testGetEventsWithEventPredicates(self):
+    """Tests the GetEvents function with event predicates."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.columnar')
+
+      storage_file = columnar.ColumnarStorageFile()
+      storage_file.Open(temp_file, read_only=False)
+
+      for event_object in test_lib.CreateTestEventObjects():
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      test_event_predicates = event_predicates.EventPredicates(
+          parsers=[u'bogus'])
+
+      storage_file = columnar.ColumnarStorageFile()
+      storage_file.Open(temp_file)
+
+      with columnar.ColumnarStorageFileReader(storage_file) as storage_reader:
+        event_objects = list(storage_reader.GetEvents(
+            event_predicates=test_event_predicates))
+
+      self.assertEqual(event_objects, [])
+      self.assertEqual(storage_reader.number_of_filtered_events, 4)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the storage event predicates."""
+
+import unittest
+
+from plaso.containers import events
+from plaso.storage import event_predicates
+from plaso.storage import time_range
+
+
+class EventPredicatesTest(unittest.TestCase):
+  """Tests for the event predicates object."""
+
+  def testIntersection(self):
+    """Tests the Intersection function."""
+    predicates = event_predicates.EventPredicates(
+        parsers=[u'winreg', u'filestat'], start_timestamp=100)
+    other_predicates = event_predicates.EventPredicates(
+        end_timestamp=200, parsers=[u'filestat'], start_timestamp=150)
+
+    combined_predicates = predicates.Intersection(other_predicates)
+    self.assertIsNone(combined_predicates.data_types)
+    self.assertEqual(combined_predicates.parsers, frozenset([u'filestat']))
+    self.assertEqual(combined_predicates.start_timestamp, 150)
+    self.assertEqual(combined_predicates.end_timestamp, 200)
+    self.assertTrue(combined_predicates.is_satisfiable)
+
+    other_predicates = event_predicates.EventPredicates(parsers=[u'olecf'])
+    combined_predicates = predicates.Intersection(other_predicates)
+    self.assertFalse(combined_predicates.is_satisfiable)
+
+  def testUnion(self):
+    """Tests the Union function."""
+    predicates = event_predicates.EventPredicates(
+        parsers=[u'winreg'], start_timestamp=100)
+    other_predicates = event_predicates.EventPredicates(
+        end_timestamp=200, parsers=[u'filestat'], start_timestamp=50)
+
+    combined_predicates = predicates.Union(other_predicates)
+    self.assertEqual(
+        combined_predicates.parsers, frozenset([u'filestat', u'winreg']))
+    self.assertEqual(combined_predicates.start_timestamp, 50)
+    self.assertIsNone(combined_predicates.end_timestamp)
+
+    other_predicates = event_predicates.EventPredicates()
+    combined_predicates = predicates.Union(other_predicates)
+    self.assertFalse(combined_predicates.is_restricted)
+
+  def testGetTimeRange(self):
+    """Tests the GetTimeRange function."""
+    predicates = event_predicates.EventPredicates()
+    self.assertIsNone(predicates.GetTimeRange())
+
+    predicates = event_predicates.EventPredicates(start_timestamp=100)
+    test_time_range = predicates.GetTimeRange(
+        time_range=time_range.TimeRange(50, 200))
+    self.assertEqual(test_time_range.start_timestamp, 100)
+    self.assertEqual(test_time_range.end_timestamp, 200)
+
+    with self.assertRaises(ValueError):
+      predicates.GetTimeRange(time_range=time_range.TimeRange(0, 50))
+
+  def testMatches(self):
+    """Tests the Matches function."""
+    event_object = events.EventObject()
+    event_object.data_type = u'windows:registry:key_value'
+    event_object.parser = u'winreg'
+    event_object.store_number = 1
+    event_object.timestamp = 150
+
+    predicates = event_predicates.EventPredicates(
+        data_types=[u'windows:registry:key_value'], parsers=[u'winreg'],
+        start_timestamp=100, store_numbers=[1])
+    self.assertTrue(predicates.Matches(event_object))
+
+    predicates = event_predicates.EventPredicates(end_timestamp=100)
+    self.assertFalse(predicates.Matches(event_object))
+    self.assertTrue(predicates.MatchesAttributes(event_object))
+
+    predicates = event_predicates.EventPredicates(parsers=[u'filestat'])
+    self.assertFalse(predicates.Matches(event_object))
+    self.assertFalse(predicates.MatchesValues(parser=u'winreg'))
+    self.assertTrue(predicates.MatchesValues(data_type=u'fs:stat'))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the storage checkpoint journal."""
+
+import os
+import unittest
+import zipfile
+
+from plaso.storage import journal
+
+from tests import test_lib as shared_test_lib
+
+
+class CheckpointJournalTest(unittest.TestCase):
+  """Tests for the storage checkpoint journal."""
+
+  def _CommitZipFile(self, path):
+    """Determines the central directory of a committed ZIP file.
+
+    Args:
+      path: string containing the path of the ZIP file.
+
+    Returns:
+      A tuple containing the central directory offset and data.
+    """
+    zip_file_object = zipfile.ZipFile(path, mode='a')
+    central_directory_offset = zip_file_object.start_dir
+    zip_file_object.close()
+
+    with open(path, 'rb') as file_object:
+      file_object.seek(central_directory_offset, os.SEEK_SET)
+      central_directory_data = file_object.read()
+
+    return central_directory_offset, central_directory_data
+
+  def testRestoreStorageFile(self):
+    """Tests the WriteCheckpoint and RestoreStorageFile functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      storage_file_path = os.path.join(temp_directory, u'plaso.db')
+      test_journal = journal.CheckpointJournal(
+          os.path.join(temp_directory, u'plaso.db.journal'))
+
+      with self.assertRaises(IOError):
+        test_journal.RestoreStorageFile(storage_file_path)
+
+      zip_file_object = zipfile.ZipFile(storage_file_path, mode='w')
+      zip_file_object.writestr(u'plaso_proto.000001', b'first')
+      zip_file_object.close()
+
+      central_directory_offset, central_directory_data = self._CommitZipFile(
+          storage_file_path)
+      test_journal.WriteCheckpoint(
+          central_directory_offset, central_directory_data, [u'first'])
+
+      zip_file_object = zipfile.ZipFile(storage_file_path, mode='a')
+      zip_file_object.writestr(u'plaso_proto.000002', b'second')
+      zip_file_object.close()
+
+      central_directory_offset, central_directory_data = self._CommitZipFile(
+          storage_file_path)
+      test_journal.WriteCheckpoint(
+          central_directory_offset, central_directory_data, [u'second'])
+
+      zip_file_object = zipfile.ZipFile(storage_file_path, mode='a')
+      zip_file_object.writestr(u'plaso_proto.000003', b'third')
+      zip_file_object.close()
+
+      # An incompletely written checkpoint is ignored.
+      with open(test_journal.path, 'ab') as file_object:
+        file_object.write(b'{"central_directory_offset":')
+
+      completed_path_specs = test_journal.RestoreStorageFile(
+          storage_file_path)
+      self.assertEqual(completed_path_specs, frozenset([u'first', u'second']))
+
+      zip_file_object = zipfile.ZipFile(storage_file_path, mode='r')
+      self.assertEqual(
+          sorted(zip_file_object.namelist()),
+          [u'plaso_proto.000001', u'plaso_proto.000002'])
+      self.assertEqual(zip_file_object.read(u'plaso_proto.000002'), b'second')
+      zip_file_object.close()
+
+      test_journal.Clear()
+      self.assertFalse(os.path.exists(test_journal.path))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,10 +2,14 @@
 # -*- coding: utf-8 -*-
 """This file contains the tests for the event storage."""
 
+import multiprocessing
 import os
 import unittest
 import zipfile
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
 from plaso.containers import events
 from plaso.engine import plaso_queue
 from plaso.formatters import manager as formatters_manager
@@ -16,6 +20,8 @@ from plaso.lib import timelib
 from plaso.formatters import winreg   # pylint: disable=unused-import
 from plaso.multi_processing import multi_process
 from plaso.serializer import protobuf_serializer
+from plaso.storage import event_predicates
+from plaso.storage import journal
 from plaso.storage import time_range
 from plaso.storage import zip_file
 
@@ -33,7 +39,7 @@ class SerializedDataStream(test_lib.StorageTestCase):
   # pylint: disable=protected-access
 
   def testReadAndSeek(self):
-    """Tests the ReadEntry and SeekEntryAtOffset functions."""
+    """Tests the ReadEntry, ReadEntryView and SeekEntryAtOffset functions."""
     test_file = self._GetTestFilePath([u'psort_test.proto.plaso'])
     zip_file_object = zipfile.ZipFile(
         test_file, 'r', zipfile.ZIP_DEFLATED, allowZip64=True)
@@ -74,6 +80,11 @@ class SerializedDataStream(test_lib.StorageTestCase):
     self.assertEqual(data_stream._stream_offset, 271)
     self.assertEqual(entry_data, entry_data1)
 
+    data_stream.SeekEntryAtOffset(0, 0)
+    entry_data = data_stream.ReadEntryView()
+    self.assertEqual(data_stream.entry_index, 1)
+    self.assertEqual(entry_data, entry_data1)
+
     with self.assertRaises(IOError):
       data_stream.SeekEntryAtOffset(0, 10)
       data_stream.ReadEntry()
@@ -88,6 +99,64 @@ class SerializedDataStream(test_lib.StorageTestCase):
     zip_file_object.close()
 
 
+class MemoryMappedSerializedDataStreamTest(test_lib.StorageTestCase):
+  """Tests for the memory mapped serialized data stream object."""
+
+  # pylint: disable=protected-access
+
+  def testReadAndSeek(self):
+    """Tests the ReadEntry, ReadEntryView and SeekEntryAtOffset functions."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file, compress=False)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      zip_file_object = zipfile.ZipFile(temp_file, mode='r')
+      zip_info = zip_file_object.getinfo(u'plaso_proto.000001')
+      self.assertEqual(zip_info.compress_type, zipfile.ZIP_STORED)
+      zip_file_object.close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+      self.assertIsNotNone(storage_file._memory_map)
+
+      data_stream = storage_file._GetSerializedEventObjectStream(1)
+      self.assertIsInstance(
+          data_stream, zip_file._MemoryMappedSerializedDataStream)
+
+      offset_table = storage_file._GetSerializedEventObjectOffsetTable(1)
+
+      data = data_stream.ReadEntry()
+      self.assertIsNotNone(data)
+      self.assertEqual(data_stream.entry_index, 1)
+
+      stream_offset = offset_table.GetOffset(1)
+      data_stream.SeekEntryAtOffset(1, stream_offset)
+      data_view = data_stream.ReadEntryView()
+      self.assertEqual(data_stream.entry_index, 2)
+
+      data_stream.SeekEntryAtOffset(1, stream_offset)
+      data = data_stream.ReadEntry()
+      self.assertEqual(bytes(data_view), data)
+
+      data_stream.SeekEntryAtOffset(len(event_objects), zip_info.file_size)
+      data = data_stream.ReadEntry()
+      self.assertIsNone(data)
+
+      # The sorted entries are read from the current position in the stream.
+      data_stream.SeekEntryAtOffset(0, offset_table.GetOffset(0))
+
+      event_object = storage_file.GetSortedEntry()
+      self.assertEqual(event_object.timestamp, 1238934459000000)
+
+      storage_file.Close()
+
+
 class SerializedDataOffsetTable(test_lib.StorageTestCase):
   """Tests for the serialized data offset table object."""
 
@@ -140,6 +209,27 @@ class SerializedDataTimestampTable(test_lib.StorageTestCase):
 
   # pylint: disable=protected-access
 
+  def testGetFirstEntryIndex(self):
+    """Tests the GetFirstEntryIndex function."""
+    test_file = self._GetTestFilePath([u'psort_test.proto.plaso'])
+    zip_file_object = zipfile.ZipFile(
+        test_file, 'r', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    stream_name = u'plaso_timestamps.000003'
+    timestamp_table = zip_file._SerializedDataTimestampTable(
+        zip_file_object, stream_name)
+    timestamp_table.Read()
+
+    self.assertEqual(timestamp_table.GetFirstEntryIndex(0), 0)
+    self.assertEqual(
+        timestamp_table.GetFirstEntryIndex(1390377181000000), 0)
+    self.assertEqual(
+        timestamp_table.GetFirstEntryIndex(1390377181000001), 1)
+    self.assertEqual(
+        timestamp_table.GetFirstEntryIndex(1390377241000000), 1)
+    self.assertIsNone(
+        timestamp_table.GetFirstEntryIndex(1390377241000001))
+
   def testGetTimestamp(self):
     """Tests the GetTimestamp function."""
     test_file = self._GetTestFilePath([u'psort_test.proto.plaso'])
@@ -182,6 +272,198 @@ class SerializedDataTimestampTable(test_lib.StorageTestCase):
       offset_table.Read()
 
 
+class SerializedDataTimestampRangeTable(unittest.TestCase):
+  """Tests for the serialized data timestamp range table object."""
+
+  # pylint: disable=protected-access
+
+  def testReadAndWrite(self):
+    """Tests the Read and Write functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.zip')
+      zip_file_object = zipfile.ZipFile(
+          temp_file, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+      stream_name = u'plaso_timestamp_ranges.000001'
+      timestamp_range_table = zip_file._SerializedDataTimestampRangeTable(
+          zip_file_object, stream_name)
+      timestamp_range_table.AddTimestampRange(2, 300, 400)
+      timestamp_range_table.AddTimestampRange(1, 100, 200)
+      timestamp_range_table.Write()
+      zip_file_object.close()
+
+      zip_file_object = zipfile.ZipFile(
+          temp_file, 'r', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+      timestamp_range_table = zip_file._SerializedDataTimestampRangeTable(
+          zip_file_object, stream_name)
+      timestamp_range_table.Read()
+
+      self.assertEqual(timestamp_range_table.number_of_entries, 2)
+      self.assertEqual(
+          timestamp_range_table.GetTimestampRange(1), (100, 200))
+      self.assertEqual(
+          timestamp_range_table.GetTimestampRange(2), (300, 400))
+      self.assertIsNone(timestamp_range_table.GetTimestampRange(3))
+
+      zip_file_object.close()
+
+
+class SerializedDataTablesTest(unittest.TestCase):
+  """Tests for the serialized data and reference table objects."""
+
+  # pylint: disable=protected-access
+
+  def testReadAndWrite(self):
+    """Tests the Read and Write functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.zip')
+      zip_file_object = zipfile.ZipFile(
+          temp_file, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+      data_table = zip_file._SerializedDataTable(
+          zip_file_object, u'plaso_path_specs.000001')
+      reference_table = zip_file._SerializedReferenceTable(
+          zip_file_object, u'plaso_path_spec_index.000001')
+
+      for data in [b'first', b'second', b'first']:
+        reference = data_table.AddEntry(data)
+        reference_table.AddReference(reference)
+      reference_table.AddReference(reference_table.NO_REFERENCE)
+
+      self.assertEqual(data_table.number_of_entries, 2)
+
+      data_table.Write()
+      reference_table.Write()
+      zip_file_object.close()
+
+      zip_file_object = zipfile.ZipFile(
+          temp_file, 'r', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+      data_table = zip_file._SerializedDataTable(
+          zip_file_object, u'plaso_path_specs.000001')
+      data_table.Read()
+
+      self.assertEqual(data_table.number_of_entries, 2)
+      self.assertEqual(data_table.GetEntry(0), b'first')
+      self.assertEqual(data_table.GetEntry(1), b'second')
+
+      reference_table = zip_file._SerializedReferenceTable(
+          zip_file_object, u'plaso_path_spec_index.000001')
+      reference_table.Read()
+
+      self.assertEqual(reference_table.GetReference(0), 0)
+      self.assertEqual(reference_table.GetReference(1), 1)
+      self.assertEqual(reference_table.GetReference(2), 0)
+      self.assertEqual(
+          reference_table.GetReference(3), reference_table.NO_REFERENCE)
+
+      with self.assertRaises(IndexError):
+        reference_table.GetReference(4)
+
+      zip_file_object.close()
+
+  def testStringTable(self):
+    """Tests the string table with multiple references per entry."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.zip')
+      zip_file_object = zipfile.ZipFile(
+          temp_file, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+      string_table = zip_file._SerializedStringTable(
+          zip_file_object, u'plaso_strings.000001')
+      reference_table = zip_file._SerializedReferenceTable(
+          zip_file_object, u'plaso_string_index.000001',
+          number_of_references=2)
+
+      reference_table.AddReferences((
+          string_table.AddString(u'fs:stat'),
+          string_table.AddString(u'filestat')))
+      reference_table.AddReferences((
+          string_table.AddString(u'fs:stat'),
+          string_table.AddString(u'h\xe9llo')))
+
+      string_table.Write()
+      reference_table.Write()
+      zip_file_object.close()
+
+      zip_file_object = zipfile.ZipFile(
+          temp_file, 'r', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+      string_table = zip_file._SerializedStringTable(
+          zip_file_object, u'plaso_strings.000001')
+      string_table.Read()
+
+      reference_table = zip_file._SerializedReferenceTable(
+          zip_file_object, u'plaso_string_index.000001',
+          number_of_references=2)
+      reference_table.Read()
+
+      self.assertEqual(string_table.number_of_entries, 3)
+      self.assertEqual(reference_table.GetReferences(0), (0, 1))
+      self.assertEqual(reference_table.GetReferences(1), (0, 2))
+      self.assertEqual(string_table.GetString(2), u'h\xe9llo')
+
+      # The same decoded string object is shared.
+      self.assertIs(string_table.GetString(0), string_table.GetString(0))
+
+      with self.assertRaises(IndexError):
+        reference_table.GetReferences(2)
+
+      zip_file_object.close()
+
+
+class SerializedEventObjectBufferWriterTest(unittest.TestCase):
+  """Tests for the serialized event object buffer writer thread."""
+
+  def _FailWrite(self, unused_buffer_number):
+    """Fails to write a buffer.
+
+    Raises:
+      IOError: always.
+    """
+    raise IOError(u'Unable to write buffer.')
+
+  def testQueueBuffer(self):
+    """Tests the QueueBuffer function."""
+    written_buffers = []
+
+    buffer_writer = zip_file._SerializedEventObjectBufferWriter(
+        written_buffers.append)
+    buffer_writer.start()
+
+    for buffer_number in range(5):
+      buffer_writer.QueueBuffer(buffer_number)
+
+    buffer_writer.Flush()
+    self.assertEqual(written_buffers, [0, 1, 2, 3, 4])
+
+    buffer_writer.QueueBuffer(5)
+    buffer_writer.Stop()
+    self.assertEqual(written_buffers, [0, 1, 2, 3, 4, 5])
+    self.assertFalse(buffer_writer.is_alive())
+
+  def testQueueBufferWithError(self):
+    """Tests the QueueBuffer function when a buffer cannot be written."""
+    buffer_writer = zip_file._SerializedEventObjectBufferWriter(
+        self._FailWrite)
+    buffer_writer.start()
+
+    buffer_writer.QueueBuffer(0)
+
+    with self.assertRaises(IOError):
+      buffer_writer.Flush()
+
+    # Subsequent buffers are discarded.
+    with self.assertRaises(IOError):
+      buffer_writer.QueueBuffer(1)
+
+    with self.assertRaises(IOError):
+      buffer_writer.Stop()
+
+    self.assertFalse(buffer_writer.is_alive())
+
+
 class ZIPStorageFile(test_lib.StorageTestCase):
   """Tests for the ZIP-based storage file object."""
 
@@ -385,8 +667,363 @@ class StorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+  def testAddEventObjectWithSharedValues(self):
+    """Tests the AddEventObject function with shared values."""
+    event_objects = test_lib.CreateTestEventObjects()
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/tmp/test.txt')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        event_object.pathspec = path_spec
+        storage_file.AddEventObject(event_object)
+        self.assertEqual(event_object.pathspec, path_spec)
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+
+      self.assertTrue(storage_file._HasStream(u'plaso_path_specs.000001'))
+      self.assertTrue(
+          storage_file._HasStream(u'plaso_path_spec_index.000001'))
+      self.assertTrue(storage_file._HasStream(u'plaso_strings.000001'))
+      self.assertTrue(storage_file._HasStream(u'plaso_string_index.000001'))
+
+      hostnames = set()
+      number_of_event_objects = 0
+      event_object = storage_file.GetSortedEntry()
+      while event_object:
+        self.assertEqual(event_object.pathspec.comparable, path_spec.comparable)
+        self.assertEqual(event_object.parser, u'UNKNOWN')
+        self.assertIsNotNone(event_object.data_type)
+        hostnames.add(event_object.hostname)
+        number_of_event_objects += 1
+        event_object = storage_file.GetSortedEntry()
+
+      self.assertEqual(number_of_event_objects, len(event_objects))
+      self.assertIn(u'nomachine', hostnames)
+
+      storage_file.Close()
+
+  def testAddEventObjectWithBackgroundWriter(self):
+    """Tests the AddEventObject function with the background writer."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      # A buffer size of 1 byte writes every event object in its own store.
+      storage_file = zip_file.StorageFile(
+          temp_file, background_writer=True, buffer_size=1)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      self.assertEqual(
+          storage_file.store_range, (1, len(event_objects) + 1))
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+
+      stream_numbers = storage_file.GetSerializedEventObjectStreamNumbers()
+      self.assertEqual(
+          stream_numbers, list(range(1, len(event_objects) + 1)))
+
+      timestamp_range_table = storage_file._GetTimestampRangeTable()
+      self.assertEqual(
+          timestamp_range_table.number_of_entries, len(event_objects))
+
+      timestamps = []
+      event_object = storage_file.GetSortedEntry()
+      while event_object:
+        timestamps.append(event_object.timestamp)
+        event_object = storage_file.GetSortedEntry()
+
+      expected_timestamps = sorted([
+          event_object.timestamp for event_object in event_objects])
+      self.assertEqual(timestamps, expected_timestamps)
+
+      storage_file.Close()
+
+  def testCloseWithBackgroundWriterError(self):
+    """Tests the Close function when the background writer fails."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file, background_writer=True)
+
+      def _FailWrite(*unused_arguments):
+        """Fails to write a buffer."""
+        raise IOError(u'Unable to write buffer.')
+
+      storage_file._WriteSerializedEventObjects = _FailWrite
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      with self.assertRaises(IOError):
+        storage_file.Close()
+
+      self.assertIsNone(storage_file._buffer_writer)
+      self.assertIsNone(storage_file._zipfile)
+
+  def testGetSortedEntryWithLazyDecoding(self):
+    """Tests the GetSortedEntry function with lazy decoding."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      expected_equality_strings = sorted([
+          event_object.EqualityString() for event_object in event_objects])
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+      storage_file.SetLazyDecoding(True)
+
+      equality_strings = []
+      event_object = storage_file.GetSortedEntry()
+      while event_object:
+        self.assertIsInstance(event_object, events.LazyEventObject)
+        self.assertNotIn(u'uuid', event_object.__dict__)
+        self.assertIsNotNone(event_object.data_type)
+        self.assertIsNotNone(event_object.timestamp)
+
+        equality_strings.append(event_object.EqualityString())
+        self.assertIn(u'uuid', event_object.__dict__)
+        event_object = storage_file.GetSortedEntry()
+
+      self.assertEqual(sorted(equality_strings), expected_equality_strings)
+
+      storage_file.Close()
+
+  def testAddSerializedEventObject(self):
+    """Tests the AddSerializedEventObject function."""
+    event_objects = test_lib.CreateTestEventObjects()
+    serializer = protobuf_serializer.ProtobufEventObjectSerializer
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        event_object_data = serializer.WriteSerialized(event_object)
+        storage_file.AddSerializedEventObject(
+            event_object.timestamp, event_object_data)
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+
+      event_object = storage_file.GetSortedEntry()
+      self.assertIsNotNone(event_object)
+      self.assertEqual(event_object.timestamp, 1238934459000000)
+
+      storage_file.Close()
+
+  def testCheckpoint(self):
+    """Tests the Checkpoint function."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      central_directory_offset, central_directory_data = (
+          storage_file.Checkpoint())
+
+      self.assertEqual(
+          central_directory_offset + len(central_directory_data),
+          os.path.getsize(temp_file))
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+
+      stream_numbers = storage_file.GetSerializedEventObjectStreamNumbers()
+      self.assertEqual(stream_numbers, [1, 2])
+
+      storage_file.Close()
+
+  def testGetSortedEntryWithTimestampRanges(self):
+    """Tests the GetSortedEntry function with a timestamp range table."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+      self.assertTrue(
+          storage_file._HasStream(u'plaso_timestamp_ranges.000001'))
+
+      timestamp_range_table = storage_file._GetTimestampRangeTable()
+      self.assertEqual(timestamp_range_table.number_of_entries, 1)
+
+      test_time_range = time_range.TimeRange(
+          timelib.Timestamp.CopyFromString(u'2030-01-01 00:00:00'),
+          timelib.Timestamp.CopyFromString(u'2030-12-31 23:59:59'))
+
+      event_object = storage_file.GetSortedEntry(time_range=test_time_range)
+      self.assertIsNone(event_object)
+
+      storage_file.Close()
+
+  def testGetStringValues(self):
+    """Tests the _GetStringValues function."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Checkpoint()
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+      storage_file._MAXIMUM_NUMBER_OF_CACHED_STRING_TABLES = 1
+
+      string_values = storage_file._GetStringValues(1, 0)
+      self.assertIn(u'UNKNOWN', string_values)
+      self.assertEqual(storage_file._GetStringValues(2, 0), string_values)
+      self.assertEqual(list(storage_file._string_tables.keys()), [2])
+      self.assertIsNone(storage_file._GetStringValues(3, 0))
+      self.assertEqual(
+          list(storage_file._string_reference_tables.keys()), [3])
+      self.assertEqual(storage_file._string_tables, {})
+
+      storage_file.Close()
+
+  def testGetTimestamp(self):
+    """Tests the _GetTimestamp function."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Checkpoint()
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+      storage_file._MAXIMUM_NUMBER_OF_CACHED_EVENT_TIMESTAMP_TABLES = 1
+
+      self.assertIsNotNone(storage_file._GetTimestamp(1, 0))
+      self.assertIsNotNone(storage_file._GetTimestamp(2, 0))
+      self.assertEqual(list(storage_file._event_timestamp_tables.keys()), [2])
+      self.assertIsNone(storage_file._GetTimestamp(3, 0))
+      self.assertEqual(list(storage_file._event_timestamp_tables.keys()), [3])
+
+      storage_file.Close()
+
+  def testGetTimestampRangeTableWithMultipleStreams(self):
+    """Tests the _GetTimestampRangeTable function with multiple streams."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Checkpoint()
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+
+      stream_names = list(storage_file._GetStreamNames())
+      self.assertEqual(len(stream_names), len(set(stream_names)))
+      self.assertTrue(
+          storage_file._HasStream(u'plaso_timestamp_ranges.000001'))
+      self.assertTrue(
+          storage_file._HasStream(u'plaso_timestamp_ranges.000002'))
+
+      timestamp_range_table = storage_file._GetTimestampRangeTable()
+      self.assertEqual(timestamp_range_table.number_of_entries, 2)
+
+      storage_file.Close()
+
   # TODO: add test for GetReports
 
+  def testGetPathSpec(self):
+    """Tests the _GetPathSpec function."""
+    event_objects = test_lib.CreateTestEventObjects()
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/tmp/test.txt')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        event_object.pathspec = path_spec
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Checkpoint()
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+      storage_file._MAXIMUM_NUMBER_OF_CACHED_PATH_SPEC_TABLES = 1
+
+      test_path_spec = storage_file._GetPathSpec(1, 0)
+      self.assertEqual(test_path_spec.comparable, path_spec.comparable)
+      self.assertIs(storage_file._GetPathSpec(1, 0), test_path_spec)
+
+      test_path_spec = storage_file._GetPathSpec(2, 0)
+      self.assertEqual(test_path_spec.comparable, path_spec.comparable)
+      self.assertEqual(list(storage_file._path_spec_tables.keys()), [2])
+      self.assertEqual(list(storage_file._path_specs.keys()), [2])
+
+      self.assertIsNone(storage_file._GetPathSpec(3, 0))
+      self.assertEqual(
+          list(storage_file._path_spec_reference_tables.keys()), [3])
+      self.assertEqual(storage_file._path_spec_tables, {})
+
+      storage_file.Close()
+
   def testGetSortedEntry(self):
     """Tests the GetSortedEntry function."""
     test_file = self._GetTestFilePath([u'psort_test.proto.plaso'])
@@ -428,6 +1065,52 @@ class StorageFileTest(test_lib.StorageTestCase):
 
     storage_file.Close()
 
+  def testGetSortedSerializedEntry(self):
+    """Tests the GetSortedSerializedEntry and GetEventObject functions."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_file = zip_file.StorageFile(temp_file)
+
+      for event_object in event_objects:
+        storage_file.AddEventObject(event_object)
+
+      storage_file.Close()
+
+      expected_equality_strings = sorted([
+          event_object.EqualityString() for event_object in event_objects])
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+      storage_file.SetLazyDecoding(True)
+
+      serialized_entries = []
+      serialized_entry = storage_file.GetSortedSerializedEntry()
+      while serialized_entry:
+        timestamp, _, _, event_object_data = serialized_entry
+        self.assertIsNotNone(timestamp)
+        self.assertIsNotNone(event_object_data)
+
+        serialized_entries.append(serialized_entry)
+        serialized_entry = storage_file.GetSortedSerializedEntry()
+
+      storage_file.Close()
+
+      self.assertEqual(len(serialized_entries), len(event_objects))
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+
+      equality_strings = []
+      for serialized_entry in serialized_entries:
+        _, store_number, store_index, event_object_data = serialized_entry
+        event_object = storage_file.GetEventObject(
+            store_number, store_index, event_object_data=event_object_data)
+        equality_strings.append(event_object.EqualityString())
+
+      storage_file.Close()
+
+      self.assertEqual(sorted(equality_strings), expected_equality_strings)
+
   def testGetStorageInformation(self):
     """Tests the GetStorageInformation function."""
     test_file = self._GetTestFilePath([u'psort_test.proto.plaso'])
@@ -679,6 +1362,131 @@ class ZIPStorageFileReaderTest(test_lib.StorageTestCase):
 
     self.assertEqual(sorted(timestamps), expected_timestamps)
 
+  def testGetEventsWithEventPredicates(self):
+    """Tests the GetEvents function with event predicates."""
+    test_file = self._GetTestFilePath([u'psort_test.proto.plaso'])
+
+    storage_file = zip_file.StorageFile(test_file, read_only=True)
+    with zip_file.ZIPStorageFileReader(storage_file) as storage_reader:
+      all_event_objects = list(storage_reader.GetEvents())
+
+    parser = all_event_objects[0].parser
+    test_event_predicates = event_predicates.EventPredicates(
+        parsers=[parser],
+        start_timestamp=timelib.Timestamp.CopyFromString(
+            u'2012-01-01 00:00:00'))
+
+    expected_identifiers = [
+        (event_object.timestamp, event_object.store_number,
+         event_object.store_index)
+        for event_object in all_event_objects
+        if test_event_predicates.Matches(event_object)]
+
+    storage_file = zip_file.StorageFile(test_file, read_only=True)
+    with zip_file.ZIPStorageFileReader(storage_file) as storage_reader:
+      identifiers = [
+          (event_object.timestamp, event_object.store_number,
+           event_object.store_index)
+          for event_object in storage_reader.GetEvents(
+              event_predicates=test_event_predicates)]
+
+      number_of_filtered_events = storage_reader.number_of_filtered_events
+
+    self.assertNotEqual(identifiers, [])
+    self.assertEqual(identifiers, expected_identifiers)
+    self.assertEqual(
+        number_of_filtered_events,
+        len(all_event_objects) - len(expected_identifiers))
+
+    test_event_predicates = event_predicates.EventPredicates(
+        parsers=[u'bogus'])
+
+    storage_file = zip_file.StorageFile(test_file, read_only=True)
+    with zip_file.ZIPStorageFileReader(storage_file) as storage_reader:
+      event_objects = list(storage_reader.GetEvents(
+          event_predicates=test_event_predicates))
+
+      number_of_filtered_events = storage_reader.number_of_filtered_events
+
+    self.assertEqual(event_objects, [])
+    self.assertEqual(number_of_filtered_events, len(all_event_objects))
+
+
+class ZIPStorageFileParallelReaderTest(test_lib.StorageTestCase):
+  """Tests for the ZIP-based storage file parallel reader object."""
+
+  def _GetEventIdentifiers(self, storage_reader, time_range=None):
+    """Retrieves the identifiers of the events in order.
+
+    Args:
+      storage_reader: a storage reader object (instance of StorageReader).
+      time_range: an optional time range object (instance of TimeRange).
+
+    Returns:
+      A list of tuples containing the timestamp, store number and store
+      index of the events.
+    """
+    return [
+        (event_object.timestamp, event_object.store_number,
+         event_object.store_index)
+        for event_object in storage_reader.GetEvents(time_range=time_range)]
+
+  def testGetEvents(self):
+    """Tests the GetEvents function."""
+    test_file = self._GetTestFilePath([u'psort_test.proto.plaso'])
+
+    storage_file = zip_file.StorageFile(test_file, read_only=True)
+    with zip_file.ZIPStorageFileReader(storage_file) as storage_reader:
+      expected_identifiers = self._GetEventIdentifiers(storage_reader)
+
+    storage_file = zip_file.StorageFile(test_file, read_only=True)
+    with zip_file.ZIPStorageFileParallelReader(
+        storage_file, batch_size=2, number_of_processes=3) as storage_reader:
+      identifiers = self._GetEventIdentifiers(storage_reader)
+
+    self.assertEqual(len(identifiers), 15)
+    self.assertEqual(identifiers, expected_identifiers)
+
+    # Test lower bound time range filter.
+    test_time_range = time_range.TimeRange(
+        timelib.Timestamp.CopyFromString(u'2014-02-16 00:00:00'),
+        timelib.Timestamp.CopyFromString(u'2030-12-31 23:59:59'))
+
+    storage_file = zip_file.StorageFile(test_file, read_only=True)
+    with zip_file.ZIPStorageFileReader(storage_file) as storage_reader:
+      expected_identifiers = self._GetEventIdentifiers(
+          storage_reader, time_range=test_time_range)
+
+    storage_file = zip_file.StorageFile(test_file, read_only=True)
+    with zip_file.ZIPStorageFileParallelReader(
+        storage_file, batch_size=2, number_of_processes=3) as storage_reader:
+      identifiers = self._GetEventIdentifiers(
+          storage_reader, time_range=test_time_range)
+
+    self.assertEqual(len(identifiers), 6)
+    self.assertEqual(identifiers, expected_identifiers)
+
+  def testGetSortedRunWithExitedProcess(self):
+    """Tests the _GetSortedRun function with a merge process that exited."""
+    # pylint: disable=protected-access
+    test_file = self._GetTestFilePath([u'psort_test.proto.plaso'])
+    storage_file = zip_file.StorageFile(test_file, read_only=True)
+
+    # A process without a target exits without queuing a sorted run.
+    merge_process = multiprocessing.Process()
+    merge_process.start()
+    merge_process.join()
+
+    event_object_queue = multiprocessing.Queue()
+
+    with zip_file.ZIPStorageFileParallelReader(storage_file) as storage_reader:
+      storage_reader._QUEUE_GET_TIMEOUT = 0.1
+
+      sorted_run = storage_reader._GetSortedRun(
+          merge_process, event_object_queue)
+      with self.assertRaises(IOError):
+        list(sorted_run)
+
 
 class ZIPStorageFileWriterTest(unittest.TestCase):
   """Tests for the ZIP-based storage file writer object."""
@@ -714,12 +1522,122 @@ class ZIPStorageFileWriterTest(unittest.TestCase):
 
       expected_filename_list = [
           u'information.dump', u'plaso_index.000001', u'plaso_proto.000001',
-          u'plaso_timestamps.000001', u'serializer.txt']
+          u'plaso_string_index.000001', u'plaso_strings.000001',
+          u'plaso_timestamp_ranges.000001', u'plaso_timestamps.000001',
+          u'serializer.txt']
+
+      filename_list = sorted(storage_file.namelist())
+      self.assertEqual(len(filename_list), 8)
+      self.assertEqual(filename_list, expected_filename_list)
+
+      self.assertEqual(preprocessing_object.store_range, (1, 2))
+
+  def testStorageWriterWithSerializedEventObjects(self):
+    """Test the storage writer with serialized event objects."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    test_queue = multi_process.MultiProcessingQueue(timeout=0.1)
+    test_queue_producer = plaso_queue.SerializedEventObjectQueueProducer(
+        test_queue, protobuf_serializer.ProtobufEventObjectSerializer)
+    test_queue_producer.ProduceItems(event_objects)
+
+    test_queue_producer.SignalAbort()
+
+    preprocessing_object = event.PreprocessObject()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      storage_writer = zip_file.ZIPStorageFileWriter(
+          test_queue, temp_file, preprocessing_object)
+      storage_writer.WriteEventObjects()
+
+      self.assertEqual(
+          preprocessing_object.counter[u'total'], len(event_objects))
+
+      storage_file = zip_file.StorageFile(temp_file, read_only=True)
+
+      number_of_event_objects = 0
+      event_object = storage_file.GetSortedEntry()
+      while event_object:
+        number_of_event_objects += 1
+        event_object = storage_file.GetSortedEntry()
+
+      storage_file.Close()
+
+      self.assertEqual(number_of_event_objects, len(event_objects))
+
+  def testStorageWriterWithCheckpointJournal(self):
+    """Test the storage writer with a checkpoint journal."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    test_queue = multi_process.MultiProcessingQueue(timeout=0.1)
+    test_queue_producer = plaso_queue.ItemQueueProducer(test_queue)
+    test_queue_producer.ProduceItems(event_objects)
+    test_queue_producer.ProduceItem(plaso_queue.PathSpecCompleted(u'first'))
+    test_queue_producer.ProduceItem(plaso_queue.PathSpecCompleted(u'second'))
+
+    test_queue_producer.SignalAbort()
+
+    preprocessing_object = event.PreprocessObject()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      checkpoint_journal = journal.CheckpointJournal(
+          os.path.join(temp_directory, u'plaso.db.journal'))
+
+      storage_writer = zip_file.ZIPStorageFileWriter(
+          test_queue, temp_file, preprocessing_object,
+          checkpoint_journal=checkpoint_journal)
+      storage_writer.WriteEventObjects()
+
+      status = storage_writer.GetStatus()
+      self.assertEqual(status[u'number_of_events'], len(event_objects))
+
+      # The storage file is restored to the final checkpoint which is
+      # written before the preprocess object.
+      completed_path_specs = checkpoint_journal.RestoreStorageFile(temp_file)
+      self.assertEqual(completed_path_specs, frozenset([u'first', u'second']))
+
+      storage_file = zipfile.ZipFile(
+          temp_file, mode='r', compression=zipfile.ZIP_DEFLATED)
+
+      expected_filename_list = [
+          u'plaso_index.000001', u'plaso_proto.000001',
+          u'plaso_string_index.000001', u'plaso_strings.000001',
+          u'plaso_timestamp_ranges.000001', u'plaso_timestamps.000001',
+          u'serializer.txt']
 
       filename_list = sorted(storage_file.namelist())
-      self.assertEqual(len(filename_list), 5)
       self.assertEqual(filename_list, expected_filename_list)
 
+  def testStorageWriterWithCheckpointsDisabled(self):
+    """Test the storage writer with checkpoints disabled."""
+    event_objects = test_lib.CreateTestEventObjects()
+
+    test_queue = multi_process.MultiProcessingQueue(timeout=0.1)
+    test_queue_producer = plaso_queue.ItemQueueProducer(test_queue)
+    test_queue_producer.ProduceItems(event_objects)
+    test_queue_producer.ProduceItem(plaso_queue.PathSpecCompleted(u'first'))
+
+    test_queue_producer.SignalAbort()
+
+    preprocessing_object = event.PreprocessObject()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'plaso.db')
+      checkpoint_journal = journal.CheckpointJournal(
+          os.path.join(temp_directory, u'plaso.db.journal'))
+
+      storage_writer = zip_file.ZIPStorageFileWriter(
+          test_queue, temp_file, preprocessing_object, checkpoint_interval=0,
+          checkpoint_journal=checkpoint_journal)
+      storage_writer.WriteEventObjects()
+
+      status = storage_writer.GetStatus()
+      self.assertEqual(status[u'number_of_events'], len(event_objects))
+
+      self.assertFalse(os.path.exists(checkpoint_journal.path))
+
 
 if __name__ == '__main__':
   unittest.main()
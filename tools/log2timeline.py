@@ -25,6 +25,7 @@ from plaso.cli import views as cli_views
 from plaso.frontend import log2timeline
 from plaso.lib import definitions
 from plaso.lib import errors
+from plaso.lib import filter_compiler
 from plaso.lib import pfilter
 
 
@@ -83,7 +84,9 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     self._filter_expression = None
     self._foreman_verbose = False
     self._front_end = log2timeline.Log2TimelineFrontend()
+    self._incremental = False
     self._number_of_extraction_workers = 0
+    self._resume = False
     self._stdout_output_writer = isinstance(
         self._output_writer, cli_tools.StdoutOutputWriter)
     self._source_type = None
@@ -160,6 +163,30 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     return u'{0:s}\t{1:d}\t{2:s}\t{3:s}\t{4:s}'.format(
         identifier, pid, status, events, display_name)
 
+  def _FormatEventBatchStatus(self, processing_status):
+    """Formats the event batch status of the extraction workers.
+
+    Args:
+      processing_status: the processing status (instance of ProcessingStatus).
+
+    Returns:
+      A string containing the event batch status or an empty string if
+      the extraction workers did not push event batches.
+    """
+    number_of_event_batches = processing_status.GetNumberOfEventBatches()
+    if not number_of_event_batches:
+      return u''
+
+    event_batch_size = (
+        processing_status.GetNumberOfExtractedEvents() //
+        number_of_event_batches)
+
+    return (
+        u'Event batches\t: {0:d} (average size: {1:d}), waited on event '
+        u'queue: {2:.1f} seconds\n').format(
+            number_of_event_batches, event_batch_size,
+            processing_status.GetEventQueueWaitTime())
+
   def _GetMatcher(self, filter_expression):
     """Retrieves a filter object for a specific filter expression.
 
@@ -167,11 +194,12 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
       filter_expression: string that contains the filter expression.
 
     Returns:
-      A filter object (instance of objectfilter.TODO) or None.
+      A compiled filter object (instance of filter_compiler.CompiledFilter)
+      or None.
     """
     try:
       parser = pfilter.BaseParser(filter_expression).Parse()
-      return parser.Compile(pfilter.PlasoAttributeFilterImplementation)
+      return filter_compiler.FilterCompiler().CompileExpression(parser)
 
     except errors.ParseError as exception:
       logging.error(
@@ -183,11 +211,25 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
 
     Args:
       options: the command line arguments (instance of argparse.Namespace).
+
+    Raises:
+      BadConfigOption: if the options are invalid.
     """
     use_zeromq = getattr(options, u'use_zeromq', False)
     if use_zeromq:
       self._front_end.SetUseZeroMQ(use_zeromq)
 
+    serialize_in_workers = getattr(options, u'serialize_in_workers', False)
+    if serialize_in_workers:
+      self._front_end.SetSerializeInWorkers(serialize_in_workers)
+
+    event_batch_size = getattr(options, u'event_batch_size', 0)
+    if event_batch_size:
+      if event_batch_size < 0:
+        raise errors.BadConfigOption(
+            u'Invalid event batch size: {0:d}.'.format(event_batch_size))
+      self._front_end.SetEventBatchSize(event_batch_size)
+
   def _ParseOutputOptions(self, options):
     """Parses the output options.
 
@@ -216,12 +258,48 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     """
     self._single_process_mode = getattr(options, u'single_process', False)
 
+    self._resume = getattr(options, u'resume', False)
+
+    if getattr(options, u'no_checkpoints', False):
+      if self._resume:
+        raise errors.BadConfigOption(
+            u'Unable to resume an extraction with checkpoints disabled.')
+      self._front_end.SetEnableCheckpoints(False)
+
+    self._incremental = getattr(options, u'incremental', False)
+
     self._foreman_verbose = getattr(options, u'foreman_verbose', False)
 
     self._number_of_extraction_workers = getattr(options, u'workers', 0)
 
     # TODO: add code to parse the worker options.
 
+    if getattr(options, u'process_unchanged_vss_files', False):
+      self._front_end.SetDuplicateFileCheck(False)
+
+    parse_timeout = getattr(options, u'parse_timeout', 0)
+    if parse_timeout:
+      if parse_timeout < 0:
+        raise errors.BadConfigOption(
+            u'Invalid parse timeout: {0:d}.'.format(parse_timeout))
+      self._front_end.SetParseTimeout(parse_timeout)
+
+    worker_memory_limit = getattr(options, u'worker_memory_limit', 0)
+    worker_path_spec_limit = getattr(options, u'worker_path_spec_limit', 0)
+    if worker_memory_limit or worker_path_spec_limit:
+      if worker_memory_limit < 0:
+        raise errors.BadConfigOption(
+            u'Invalid worker memory limit: {0:d}.'.format(worker_memory_limit))
+
+      if worker_path_spec_limit < 0:
+        raise errors.BadConfigOption(
+            u'Invalid worker path specification limit: {0:d}.'.format(
+                worker_path_spec_limit))
+
+      self._front_end.SetWorkerLimits(
+          memory_limit=worker_memory_limit * 1024 * 1024,
+          path_spec_limit=worker_path_spec_limit)
+
   def _PrintStatusHeader(self):
     """Prints the processing status header."""
     self._output_writer.Write(
@@ -293,6 +371,11 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     self._output_writer.Write(u'\n'.join(status_table))
     self._output_writer.Write(u'\n')
 
+    event_batch_status = self._FormatEventBatchStatus(processing_status)
+    if event_batch_status:
+      self._output_writer.Write(event_batch_status)
+      self._output_writer.Write(u'\n')
+
     if processing_status.GetExtractionCompleted():
       self._output_writer.Write(
           u'All extraction workers completed - waiting for storage.\n')
@@ -318,9 +401,19 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     else:
       for extraction_worker_status in processing_status.extraction_workers:
         status = extraction_worker_status.status
+
+        event_batch_status = u''
+        if extraction_worker_status.number_of_event_batches:
+          event_batch_status = (
+              u' - event batches: {0:d} (average size: {1:d}) - waited on '
+              u'event queue: {2:.1f} seconds').format(
+                  extraction_worker_status.number_of_event_batches,
+                  extraction_worker_status.event_batch_size,
+                  extraction_worker_status.event_queue_wait_time)
+
         self._output_writer.Write((
             u'{0:s} (PID: {1:d}) - events extracted: {2:d} - file: {3:s} '
-            u'- running: {4!s} <{5:s}>\n').format(
+            u'- running: {4!s} <{5:s}>{6:s}\n').format(
                 extraction_worker_status.identifier,
                 extraction_worker_status.pid,
                 extraction_worker_status.number_of_events,
@@ -328,7 +421,7 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
                 status in [definitions.PROCESSING_STATUS_RUNNING,
                            definitions.PROCESSING_STATUS_HASHING,
                            definitions.PROCESSING_STATUS_PARSING],
-                extraction_worker_status.process_status))
+                extraction_worker_status.process_status, event_batch_status))
 
   def AddExperimentalOptions(self, argument_group):
     """Adds experimental options to the argument group
@@ -341,6 +434,19 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         u'--use_zeromq', action=u'store_true', dest=u'use_zeromq', help=(
             u'Enables experimental queueing using ZeroMQ'))
 
+    argument_group.add_argument(
+        u'--serialize_in_workers', u'--serialize-in-workers',
+        action=u'store_true', dest=u'serialize_in_workers', help=(
+            u'Enables experimental serialization of the event objects in the '
+            u'extraction workers instead of the storage writer.'))
+
+    argument_group.add_argument(
+        u'--event_batch_size', u'--event-batch-size', dest=u'event_batch_size',
+        action=u'store', type=int, default=0, metavar=u'SIZE', help=(
+            u'Enables experimental batching of the events passed from the '
+            u'extraction workers to the storage writer, where SIZE is the '
+            u'maximum number of events in a batch.'))
+
   def AddOutputOptions(self, argument_group):
     """Adds the output options to the argument group.
 
@@ -377,6 +483,46 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         action=u'store_true', default=False, help=(
             u'Indicate that the tool should run in a single process.'))
 
+    argument_group.add_argument(
+        u'--resume', dest=u'resume', action=u'store_true', default=False,
+        help=(
+            u'Resume an interrupted extraction. The storage file is restored '
+            u'to its last checkpoint and the file entries that were '
+            u'completely processed by then are skipped.'))
+
+    argument_group.add_argument(
+        u'--no_checkpoints', u'--no-checkpoints', dest=u'no_checkpoints',
+        action=u'store_true', default=False, help=(
+            u'Do not periodically checkpoint the storage file. This avoids '
+            u'the cost of committing the storage file but an interrupted '
+            u'extraction cannot be resumed.'))
+
+    argument_group.add_argument(
+        u'--incremental', dest=u'incremental', action=u'store_true',
+        default=False, help=(
+            u'Add the parsers and plugins defined by the parser filter '
+            u'expression to an existing storage file. Only the parsers and '
+            u'plugins that were not run before are run and the preprocessing '
+            u'information of the prior run is reused.'))
+
+    argument_group.add_argument(
+        u'--parse_timeout', u'--parse-timeout', dest=u'parse_timeout',
+        action=u'store', type=int, default=0, metavar=u'SECONDS', help=(
+            u'The maximum number of seconds a parser can spend parsing a '
+            u'single file. The worker process of a parser that exceeds the '
+            u'timeout is killed and replaced, and the file is reported as '
+            u'having caused an error. The parse timeout is not supported '
+            u'in single process mode. The default is 0, which represents '
+            u'no timeout.'))
+
+    argument_group.add_argument(
+        u'--process_unchanged_vss_files', u'--process-unchanged-vss-files',
+        dest=u'process_unchanged_vss_files', action=u'store_true',
+        default=False, help=(
+            u'Process the files in Volume Shadow Snapshots (VSS) that have '
+            u'not changed since they were processed from the volume or from '
+            u'another VSS. By default these files are skipped.'))
+
     argument_group.add_argument(
         u'--show_memory_usage', u'--show-memory-usage', action=u'store_true',
         default=False, dest=u'foreman_verbose', help=(
@@ -389,6 +535,23 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         help=(u'The number of worker threads [defaults to available system '
               u'CPUs minus three].'))
 
+    argument_group.add_argument(
+        u'--worker_memory_limit', u'--worker-memory-limit',
+        dest=u'worker_memory_limit', action=u'store', type=int, default=0,
+        metavar=u'MEGABYTES', help=(
+            u'The maximum amount of resident memory, in megabytes, a worker '
+            u'can use. A worker that reaches the limit is replaced by a new '
+            u'worker after it has processed its current file entry. The '
+            u'default is 0, which represents no limit.'))
+
+    argument_group.add_argument(
+        u'--worker_path_spec_limit', u'--worker-path-spec-limit',
+        dest=u'worker_path_spec_limit', action=u'store', type=int, default=0,
+        metavar=u'NUMBER', help=(
+            u'The maximum number of path specifications a worker processes '
+            u'before it is replaced by a new worker. The default is 0, which '
+            u'represents no limit.'))
+
   def ListHashers(self):
     """Lists information about the available hashers."""
     hashers_information = self._front_end.GetHashersInformation()
@@ -724,12 +887,14 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     processing_status = self._front_end.ProcessSources(
         self._source_path_specs, self._source_type,
         command_line_arguments=self._command_line_arguments,
+        compress_storage=self._compress_storage,
         enable_sigsegv_handler=self._enable_sigsegv_handler,
         filter_file=self._filter_file,
         hasher_names_string=self._hasher_names_string,
+        incremental=self._incremental,
         number_of_extraction_workers=self._number_of_extraction_workers,
         parser_filter_string=self._parser_filter_string,
-        preferred_encoding=self.preferred_encoding,
+        preferred_encoding=self.preferred_encoding, resume=self._resume,
         single_process_mode=self._single_process_mode,
         status_update_callback=status_update_callback,
         storage_serializer_format=self._storage_serializer_format,
@@ -108,11 +108,24 @@ class PsortTool(analysis_tool.AnalysisTool):
 
     Args:
       options: the command line arguments (instance of argparse.Namespace).
+
+    Raises:
+      BadConfigOption: if the options are invalid.
     """
     use_zeromq = getattr(options, u'use_zeromq', False)
     if use_zeromq:
       self._front_end.SetUseZeroMQ(use_zeromq)
 
+    number_of_merge_processes = getattr(options, u'merge_processes', 0)
+    if number_of_merge_processes:
+      if number_of_merge_processes < 0:
+        raise errors.BadConfigOption(
+            u'Invalid number of merge processes: {0:d}.'.format(
+                number_of_merge_processes))
+
+      self._front_end.SetNumberOfMergeProcesses(
+          number_of_merge_processes=number_of_merge_processes)
+
   def _ParseFilterOptions(self, options):
     """Parses the filter options.
 
@@ -308,6 +321,13 @@ class PsortTool(analysis_tool.AnalysisTool):
       argument_group: The argparse argument group (instance of
                       argparse._ArgumentGroup).
     """
+    argument_group.add_argument(
+        u'--merge_processes', u'--merge-processes', dest=u'merge_processes',
+        action=u'store', type=int, default=0, metavar=u'NUMBER', help=(
+            u'The number of processes used to decode and merge the event '
+            u'object streams in parallel. The default is to merge the '
+            u'streams in the main process.'))
+
     argument_group.add_argument(
         u'--use_zeromq', u'--use-zeromq', action=u'store_true',
         dest=u'use_zeromq', help=u'Enables experimental queueing using ZeroMQ')
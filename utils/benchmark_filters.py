@@ -0,0 +1,129 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to compare the performance of interpreted and compiled filters."""
+
+from __future__ import print_function
+import argparse
+import sys
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from plaso import formatters  # pylint: disable=unused-import
+from plaso.lib import filter_compiler
+from plaso.lib import pfilter
+from plaso.storage import zip_file
+
+
+DEFAULT_FILTER_EXPRESSIONS = [
+    u'parser is \'winreg\'',
+    u'date > \'2014-01-01\' and date < \'2015-01-01\'',
+    u'timestamp_desc contains \'written\' and data_type contains \'registry\'',
+    u'filename regexp \'[Ww]indows\' or filename iregexp \'system32\'',
+    u'message contains \'evil\' or message contains \'malware\'',
+    u'source is \'REG\' and source_long contains \'Registry\'']
+
+
+def BenchmarkFilter(filter_object, event_objects, number_of_iterations):
+  """Benchmarks a filter.
+
+  Args:
+    filter_object: the filter object that provides a Matches function.
+    event_objects: a list of event objects (instances of EventObject).
+    number_of_iterations: the number of times the event objects are matched.
+
+  Returns:
+    A tuple containing the elapsed time in seconds and the list of matches
+    of the last iteration.
+  """
+  start_time = time.time()
+  for _ in range(number_of_iterations):
+    matches = [
+        filter_object.Matches(event_object) for event_object in event_objects]
+
+  return time.time() - start_time, matches
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    A boolean containing True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Compares the performance of the interpreted and compiled filters.'))
+
+  argument_parser.add_argument(
+      u'-f', u'--filter', dest=u'filter_expressions', action=u'append',
+      metavar=u'EXPRESSION', help=(
+          u'filter expression to benchmark, can be used multiple times. '
+          u'The default is to use a set of example filter expressions.'))
+
+  argument_parser.add_argument(
+      u'-n', u'--iterations', dest=u'number_of_iterations', action=u'store',
+      type=int, default=10, metavar=u'NUMBER', help=(
+          u'the number of times the events are matched per filter.'))
+
+  argument_parser.add_argument(
+      u'storage_file', nargs=u'?', action=u'store', metavar=u'STORAGE_FILE',
+      default=u'test_data/psort_test.proto.plaso',
+      help=u'path of the storage file that contains the events.')
+
+  options = argument_parser.parse_args()
+
+  storage_file = zip_file.StorageFile(options.storage_file, read_only=True)
+  try:
+    with zip_file.ZIPStorageFileReader(storage_file) as storage_reader:
+      event_objects = list(storage_reader.GetEvents())
+  except IOError as exception:
+    print(u'Unable to read storage file with error: {0:s}'.format(exception))
+    return False
+
+  print(u'Number of events\t: {0:d}'.format(len(event_objects)))
+  print(u'Number of iterations\t: {0:d}'.format(options.number_of_iterations))
+  print(u'')
+
+  compiler = filter_compiler.FilterCompiler()
+  result = True
+
+  filter_expressions = (
+      options.filter_expressions or DEFAULT_FILTER_EXPRESSIONS)
+  for filter_expression in filter_expressions:
+    expression = pfilter.BaseParser(filter_expression).Parse()
+    interpreted_filter = expression.Compile(
+        pfilter.PlasoAttributeFilterImplementation)
+
+    expression = pfilter.BaseParser(filter_expression).Parse()
+    compiled_filter = compiler.CompileExpression(expression)
+
+    interpreted_time, interpreted_matches = BenchmarkFilter(
+        interpreted_filter, event_objects, options.number_of_iterations)
+    compiled_time, compiled_matches = BenchmarkFilter(
+        compiled_filter, event_objects, options.number_of_iterations)
+
+    if compiled_time:
+      speedup = interpreted_time / compiled_time
+    else:
+      speedup = 0.0
+
+    print(u'Filter\t\t: {0:s}'.format(filter_expression))
+    print(u'Matches\t\t: {0:d}'.format(sum(compiled_matches)))
+    print(u'Interpreted\t: {0:.3f} seconds'.format(interpreted_time))
+    print(u'Compiled\t: {0:.3f} seconds ({1:.1f}x)'.format(
+        compiled_time, speedup))
+
+    if compiled_matches != interpreted_matches:
+      print(u'WARNING: compiled and interpreted filter results differ.')
+      result = False
+
+    print(u'')
+
+  return result
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,151 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to compare the performance of the event object serializers."""
+
+from __future__ import print_function
+import argparse
+import sys
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from plaso.serializer import json_serializer
+from plaso.serializer import protobuf_serializer
+from plaso.storage import zip_file
+
+from utils import struct_serializer
+
+
+SERIALIZERS = [
+    (u'Protobuf', protobuf_serializer.ProtobufEventObjectSerializer),
+    (u'JSON', json_serializer.JSONEventObjectSerializer),
+    (u'Struct', struct_serializer.StructEventObjectSerializer())]
+
+
+def BenchmarkSerializer(serializer, event_objects, number_of_iterations):
+  """Benchmarks an event object serializer.
+
+  Args:
+    serializer: the event object serializer (subclass or instance of
+                EventObjectSerializer).
+    event_objects: a list of event objects (instances of EventObject).
+    number_of_iterations: the number of times the event objects are
+                          serialized and deserialized.
+
+  Returns:
+    A tuple containing the elapsed write time in seconds, the elapsed read
+    time in seconds, the list of serialized event objects and the list of
+    deserialized event objects of the last iteration.
+  """
+  start_time = time.time()
+  for _ in range(number_of_iterations):
+    serialized_event_objects = [
+        serializer.WriteSerialized(event_object)
+        for event_object in event_objects]
+
+  write_time = time.time() - start_time
+
+  start_time = time.time()
+  for _ in range(number_of_iterations):
+    deserialized_event_objects = [
+        serializer.ReadSerialized(serialized_event_object)
+        for serialized_event_object in serialized_event_objects]
+
+  read_time = time.time() - start_time
+
+  return (
+      write_time, read_time, serialized_event_objects,
+      deserialized_event_objects)
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    A boolean containing True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Compares the performance of the event object serializers.'))
+
+  argument_parser.add_argument(
+      u'-n', u'--iterations', dest=u'number_of_iterations', action=u'store',
+      type=int, default=10, metavar=u'NUMBER', help=(
+          u'the number of times the events are serialized per serializer.'))
+
+  argument_parser.add_argument(
+      u'storage_file', nargs=u'?', action=u'store', metavar=u'STORAGE_FILE',
+      default=u'test_data/psort_test.proto.plaso',
+      help=u'path of the storage file that contains the events.')
+
+  options = argument_parser.parse_args()
+
+  storage_file = zip_file.StorageFile(options.storage_file, read_only=True)
+  try:
+    with zip_file.ZIPStorageFileReader(storage_file) as storage_reader:
+      event_objects = list(storage_reader.GetEvents())
+  except IOError as exception:
+    print(u'Unable to read storage file with error: {0:s}'.format(exception))
+    return False
+
+  print(u'Number of events\t: {0:d}'.format(len(event_objects)))
+  print(u'Number of iterations\t: {0:d}'.format(options.number_of_iterations))
+  print(u'')
+
+  expected_equality_strings = [
+      event_object.EqualityString() for event_object in event_objects]
+
+  baseline_write_time = None
+  baseline_read_time = None
+  result = True
+
+  for name, serializer in SERIALIZERS:
+    benchmark_results = BenchmarkSerializer(
+        serializer, event_objects, options.number_of_iterations)
+    write_time, read_time, serialized_event_objects = benchmark_results[:3]
+    deserialized_event_objects = benchmark_results[3]
+
+    if baseline_write_time is None:
+      baseline_write_time = write_time
+      baseline_read_time = read_time
+
+    write_speedup = 0.0
+    if write_time:
+      write_speedup = baseline_write_time / write_time
+
+    read_speedup = 0.0
+    if read_time:
+      read_speedup = baseline_read_time / read_time
+
+    data_size = sum([
+        len(serialized_event_object)
+        for serialized_event_object in serialized_event_objects])
+
+    # The layout table is stored once instead of with every event object.
+    if isinstance(serializer, struct_serializer.StructEventObjectSerializer):
+      data_size += len(serializer.WriteLayoutTable())
+
+    print(u'Serializer\t: {0:s}'.format(name))
+    print(u'Size\t\t: {0:d} bytes'.format(data_size))
+    print(u'Write\t\t: {0:.3f} seconds ({1:.1f}x)'.format(
+        write_time, write_speedup))
+    print(u'Read\t\t: {0:.3f} seconds ({1:.1f}x)'.format(
+        read_time, read_speedup))
+
+    equality_strings = [
+        event_object.EqualityString()
+        for event_object in deserialized_event_objects]
+    if equality_strings != expected_equality_strings:
+      print(u'WARNING: deserialized event objects differ.')
+      result = False
+
+    print(u'')
+
+  return result
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+"""The struct-based event object serializer.
+
+The serializer is not a storage serializer format, it is used by
+the benchmark_serializers.py script to compare serializers.
+"""
+
+import struct
+
+from plaso.containers import events
+from plaso.lib import errors
+from plaso.lib import py2to3
+from plaso.serializer import interface
+from plaso.serializer import json_serializer
+
+
+class _EventObjectLayout(object):
+  """Class that defines the attribute layout of event objects.
+
+  The event objects of a data type typically have the same set of attributes
+  with values of the same type. The layout describes these attributes and
+  defines a precompiled struct to pack and unpack their values, so that
+  the attribute values do not have to be type-dispatched individually.
+
+  The integer, floating-point and boolean values are stored in the struct,
+  the string values are stored after the struct with their size in
+  the struct. The values of other types, such as dictionaries and path
+  specifications, are not part of the struct and are serialized by
+  the generic JSON serializer instead.
+
+  Attributes:
+    attribute_names: a tuple containing the names of the attributes
+                     in the struct.
+    data: a binary string containing the serialized layout.
+    data_type: a string containing the event data type indicator or None.
+    fallback_attribute_names: a tuple containing the names of the attributes
+                              that are serialized by the JSON serializer.
+  """
+
+  # The type code of the attributes that are serialized by the JSON
+  # serializer.
+  FALLBACK_TYPE_CODE = u'*'
+
+  # The separator of the elements of the serialized layout.
+  _SEPARATOR = u'\x00'
+
+  def __init__(
+      self, data_type, attribute_names, type_codes, fallback_attribute_names):
+    """Initializes the event object layout.
+
+    Args:
+      data_type: a string containing the event data type indicator or None.
+      attribute_names: a tuple containing the names of the attributes
+                       in the struct.
+      type_codes: a tuple containing the type codes of the attributes
+                  in the struct.
+      fallback_attribute_names: a tuple containing the names of the attributes
+                                that are serialized by the JSON serializer.
+    """
+    super(_EventObjectLayout, self).__init__()
+    self._unicode_indexes = []
+    self._variable_size_indexes = []
+    self.attribute_names = attribute_names
+    self.data_type = data_type
+    self.fallback_attribute_names = fallback_attribute_names
+
+    format_string = [u'<']
+    for index, type_code in enumerate(type_codes):
+      if type_code in (u'B', u'U'):
+        format_string.append(u'I')
+        self._variable_size_indexes.append(index)
+        if type_code == u'U':
+          self._unicode_indexes.append(index)
+      else:
+        format_string.append(type_code)
+
+    self._struct = struct.Struct(str(u''.join(format_string)))
+
+    layout_elements = [data_type or u'']
+    layout_elements.extend([
+        u'{0:s}{1:s}'.format(type_code, attribute_name)
+        for type_code, attribute_name in zip(type_codes, attribute_names)])
+    layout_elements.extend([
+        u'{0:s}{1:s}'.format(self.FALLBACK_TYPE_CODE, attribute_name)
+        for attribute_name in fallback_attribute_names])
+
+    self.data = self._SEPARATOR.join(layout_elements).encode(u'utf-8')
+
+  @classmethod
+  def FromData(cls, data):
+    """Creates an event object layout from serialized form.
+
+    Args:
+      data: a binary string containing the serialized layout.
+
+    Returns:
+      An event object layout (instance of _EventObjectLayout).
+
+    Raises:
+      SerializationError: if the layout cannot be read.
+    """
+    try:
+      layout_elements = data.decode(u'utf-8').split(cls._SEPARATOR)
+    except UnicodeDecodeError as exception:
+      raise errors.SerializationError(
+          u'Unable to read layout with error: {0:s}'.format(exception))
+
+    attribute_names = []
+    fallback_attribute_names = []
+    type_codes = []
+    for layout_element in layout_elements[1:]:
+      type_code = layout_element[:1]
+      attribute_name = layout_element[1:]
+      if type_code == cls.FALLBACK_TYPE_CODE:
+        fallback_attribute_names.append(attribute_name)
+      elif type_code in StructEventObjectSerializer.TYPE_CODES:
+        attribute_names.append(attribute_name)
+        type_codes.append(type_code)
+      else:
+        raise errors.SerializationError(
+            u'Unsupported type code: {0:s} of attribute: {1:s}'.format(
+                type_code, attribute_name))
+
+    return cls(
+        layout_elements[0] or None, tuple(attribute_names), tuple(type_codes),
+        tuple(fallback_attribute_names))
+
+  def Pack(self, attributes):
+    """Packs the attribute values.
+
+    Args:
+      attributes: a dictionary containing the event object attributes.
+
+    Returns:
+      A binary string containing the packed attribute values.
+
+    Raises:
+      struct.error: if an attribute value cannot be packed.
+    """
+    values = [attributes[attribute_name]
+              for attribute_name in self.attribute_names]
+
+    for index in self._unicode_indexes:
+      values[index] = values[index].encode(u'utf-8')
+
+    variable_size_data = []
+    for index in self._variable_size_indexes:
+      variable_size_data.append(values[index])
+      values[index] = len(values[index])
+
+    return self._struct.pack(*values) + b''.join(variable_size_data)
+
+  def Unpack(self, data, offset, attributes):
+    """Unpacks the attribute values.
+
+    Args:
+      data: a binary string containing the serialized event object.
+      offset: an integer containing the offset of the packed attribute
+              values in the data.
+      attributes: a dictionary to which the event object attributes
+                  are added.
+
+    Returns:
+      An integer containing the offset of the data that follows the packed
+      attribute values.
+
+    Raises:
+      struct.error: if the attribute values cannot be unpacked.
+    """
+    values = list(self._struct.unpack_from(data, offset))
+    offset += self._struct.size
+
+    for index in self._variable_size_indexes:
+      value_size = values[index]
+      values[index] = data[offset:offset + value_size]
+      offset += value_size
+
+    for index in self._unicode_indexes:
+      values[index] = values[index].decode(u'utf-8')
+
+    attributes.update(zip(self.attribute_names, values))
+    return offset
+
+
+class StructEventObjectSerializer(interface.EventObjectSerializer):
+  """Class that implements the struct-based event object serializer.
+
+  The serializer learns the attribute layout of the event objects per data
+  type and packs the attribute values with a precompiled struct. Attributes
+  with values that cannot be packed are serialized by the JSON event object
+  serializer.
+
+  The layouts are stored once in a layout table, instead of with every event
+  object, and the event objects refer to their layout by its identifier.
+  Unlike the other serializers the struct serializer is an instance, since
+  it maintains the layout table. The layout table must be stored together
+  with the event objects and read back, with ReadLayoutTable, before
+  the event objects are read. An instance should be used per store, so that
+  the layout table is limited to the event objects of the store.
+
+  The serialized form consists of:
+  +-------------------+---------------+---------------+---------------+
+  | layout identifier | packed values | fallback size | fallback data |
+  +-------------------+---------------+---------------+---------------+
+
+  Where the layout identifier is an unsigned 16-bit integer '<H' and
+  the fallback size an unsigned 32-bit integer '<I'. Event objects that do
+  not have a layout, for example because the layout table is full, are
+  serialized entirely by the JSON serializer as fallback data.
+
+  The serialized form of the layout table consists of:
+  +-------------+--------+-------------+--------+-...-+
+  | layout size | layout | layout size | layout | ... |
+  +-------------+--------+-------------+--------+-...-+
+
+  Where the layout identifier is the index of the layout in the table.
+  """
+
+  # The identifier of event objects that do not have a layout.
+  NO_LAYOUT_IDENTIFIER = 0xffff
+
+  # The maximum number of layouts in the layout table.
+  MAXIMUM_NUMBER_OF_LAYOUTS = NO_LAYOUT_IDENTIFIER
+
+  # The type codes of the attribute value types that can be packed.
+  TYPE_CODES = frozenset([u'?', u'B', u'U', u'd', u'q'])
+
+  _TYPE_CODES_PER_TYPE = {
+      bool: u'?',
+      float: u'd',
+      int: u'q',
+      py2to3.BYTES_TYPE: u'B',
+      py2to3.LONG_TYPE: u'q',
+      py2to3.UNICODE_TYPE: u'U'}
+
+  _LAYOUT_IDENTIFIER = struct.Struct('<H')
+  _SIZE = struct.Struct('<I')
+
+  # The default attributes of an event object.
+  _DEFAULT_ATTRIBUTES = dict.fromkeys(events.EventObject().__dict__.keys())
+
+  def __init__(self):
+    """Initializes the struct-based event object serializer."""
+    super(StructEventObjectSerializer, self).__init__()
+    # The layouts in the layout table, where the index is the identifier.
+    self._layouts = []
+    # The identifiers of the layouts per serialized layout.
+    self._layout_identifiers = {}
+    # The identifiers of the layouts per data type and attribute types.
+    self._write_layout_identifiers = {}
+
+  @property
+  def number_of_layouts(self):
+    """The number of layouts in the layout table."""
+    return len(self._layouts)
+
+  def _CreateLayout(self, data_type, attributes):
+    """Creates an event object layout.
+
+    Args:
+      data_type: a string containing the event data type indicator or None.
+      attributes: a dictionary containing the event object attributes.
+
+    Returns:
+      An event object layout (instance of _EventObjectLayout).
+    """
+    attribute_names = []
+    fallback_attribute_names = []
+    type_codes = []
+    for attribute_name, attribute_value in iter(attributes.items()):
+      if attribute_value is None or attribute_name == u'data_type':
+        continue
+
+      type_code = self._TYPE_CODES_PER_TYPE.get(type(attribute_value), None)
+      if type_code:
+        attribute_names.append(attribute_name)
+        type_codes.append(type_code)
+      else:
+        fallback_attribute_names.append(attribute_name)
+
+    return _EventObjectLayout(
+        data_type, tuple(attribute_names), tuple(type_codes),
+        tuple(fallback_attribute_names))
+
+  def _GetLayoutIdentifier(self, data_type, attributes):
+    """Retrieves the identifier of the layout of the event object attributes.
+
+    The layout is added to the layout table if the table does not contain it.
+
+    Args:
+      data_type: a string containing the event data type indicator or None.
+      attributes: a dictionary containing the event object attributes.
+
+    Returns:
+      An integer containing the layout identifier or NO_LAYOUT_IDENTIFIER
+      if the layout table is full.
+    """
+    # Event objects with the same attributes typically have the same
+    # attribute order, since the attributes are set by the same code.
+    layout_key = (data_type, tuple([
+        (attribute_name, type(attribute_value))
+        for attribute_name, attribute_value in iter(attributes.items())
+        if attribute_value is not None]))
+
+    layout_identifier = self._write_layout_identifiers.get(layout_key, None)
+    if layout_identifier is not None:
+      return layout_identifier
+
+    layout = self._CreateLayout(data_type, attributes)
+    layout_identifier = self._layout_identifiers.get(layout.data, None)
+    if layout_identifier is None:
+      if len(self._layouts) >= self.MAXIMUM_NUMBER_OF_LAYOUTS:
+        return self.NO_LAYOUT_IDENTIFIER
+
+      layout_identifier = len(self._layouts)
+      self._layouts.append(layout)
+      self._layout_identifiers[layout.data] = layout_identifier
+
+    self._write_layout_identifiers[layout_key] = layout_identifier
+    return layout_identifier
+
+  def _WriteSerializedWithLayout(
+      self, layout_identifier, layout, event_object):
+    """Writes an event object to serialized form with a specific layout.
+
+    Args:
+      layout_identifier: an integer containing the layout identifier.
+      layout: the event object layout (instance of _EventObjectLayout).
+      event_object: an event object (instance of EventObject).
+
+    Returns:
+      A binary string containing the serialized form.
+
+    Raises:
+      struct.error: if an attribute value cannot be packed.
+    """
+    attributes = event_object.__dict__
+    packed_data = layout.Pack(attributes)
+
+    fallback_data = b''
+    if layout.fallback_attribute_names:
+      fallback_event_object = events.EventObject()
+      fallback_event_object.__dict__ = dict([
+          (attribute_name, attributes[attribute_name])
+          for attribute_name in layout.fallback_attribute_names])
+      fallback_data = (
+          json_serializer.JSONEventObjectSerializer.WriteSerialized(
+              fallback_event_object))
+
+    return b''.join([
+        self._LAYOUT_IDENTIFIER.pack(layout_identifier), packed_data,
+        self._SIZE.pack(len(fallback_data)), fallback_data])
+
+  def _WriteSerializedWithoutLayout(self, event_object):
+    """Writes an event object to serialized form without a layout.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Returns:
+      A binary string containing the serialized form.
+    """
+    fallback_data = json_serializer.JSONEventObjectSerializer.WriteSerialized(
+        event_object)
+
+    return b''.join([
+        self._LAYOUT_IDENTIFIER.pack(self.NO_LAYOUT_IDENTIFIER),
+        self._SIZE.pack(len(fallback_data)), fallback_data])
+
+  def ReadLayoutTable(self, serialized):
+    """Reads the layout table from serialized form.
+
+    The layout table replaces the layout table of the serializer.
+
+    Args:
+      serialized: a binary string containing the serialized layout table.
+
+    Raises:
+      SerializationError: if the layout table cannot be read.
+    """
+    layouts = []
+    layout_identifiers = {}
+
+    offset = 0
+    serialized_size = len(serialized)
+    while offset < serialized_size:
+      try:
+        layout_size = self._SIZE.unpack_from(serialized, offset)[0]
+      except struct.error as exception:
+        raise errors.SerializationError(
+            u'Unable to read layout table with error: {0:s}'.format(
+                exception))
+
+      offset += self._SIZE.size
+      layout_data = serialized[offset:offset + layout_size]
+      offset += layout_size
+
+      if len(layouts) >= self.MAXIMUM_NUMBER_OF_LAYOUTS:
+        raise errors.SerializationError(
+            u'Unsupported number of layouts in layout table.')
+
+      layout_identifiers[layout_data] = len(layouts)
+      layouts.append(_EventObjectLayout.FromData(layout_data))
+
+    self._layouts = layouts
+    self._layout_identifiers = layout_identifiers
+    self._write_layout_identifiers = {}
+
+  def ReadSerialized(self, serialized):
+    """Reads an event object from serialized form.
+
+    Args:
+      serialized: a binary string containing the serialized form.
+
+    Returns:
+      An event object (instance of EventObject).
+
+    Raises:
+      SerializationError: if the event object cannot be read.
+    """
+    try:
+      layout_identifier = self._LAYOUT_IDENTIFIER.unpack_from(serialized, 0)[0]
+      offset = self._LAYOUT_IDENTIFIER.size
+
+      if layout_identifier == self.NO_LAYOUT_IDENTIFIER:
+        fallback_size = self._SIZE.unpack_from(serialized, offset)[0]
+        offset += self._SIZE.size
+
+        return json_serializer.JSONEventObjectSerializer.ReadSerialized(
+            serialized[offset:offset + fallback_size])
+
+      try:
+        layout = self._layouts[layout_identifier]
+      except IndexError:
+        raise errors.SerializationError(
+            u'Missing layout: {0:d} in layout table.'.format(
+                layout_identifier))
+
+      # The event object is not initialized to prevent generating
+      # an identifier that is overwritten.
+      event_object = events.EventObject.__new__(events.EventObject)
+      attributes = event_object.__dict__
+      attributes.update(self._DEFAULT_ATTRIBUTES)
+      attributes[u'data_type'] = layout.data_type
+
+      offset = layout.Unpack(serialized, offset, attributes)
+
+      fallback_size = self._SIZE.unpack_from(serialized, offset)[0]
+      offset += self._SIZE.size
+
+    except struct.error as exception:
+      raise errors.SerializationError(
+          u'Unable to read event object with error: {0:s}'.format(exception))
+
+    if fallback_size:
+      fallback_event_object = (
+          json_serializer.JSONEventObjectSerializer.ReadSerialized(
+              serialized[offset:offset + fallback_size]))
+
+      for attribute_name in layout.fallback_attribute_names:
+        attributes[attribute_name] = getattr(
+            fallback_event_object, attribute_name, None)
+
+    return event_object
+
+  def WriteLayoutTable(self):
+    """Writes the layout table to serialized form.
+
+    Returns:
+      A binary string containing the serialized layout table.
+    """
+    serialized_layouts = []
+    for layout in self._layouts:
+      serialized_layouts.append(self._SIZE.pack(len(layout.data)))
+      serialized_layouts.append(layout.data)
+
+    return b''.join(serialized_layouts)
+
+  def WriteSerialized(self, event_object):
+    """Writes an event object to serialized form.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Returns:
+      A binary string containing the serialized form.
+    """
+    attributes = event_object.__dict__
+    data_type = attributes.get(u'data_type', None)
+
+    layout_identifier = self._GetLayoutIdentifier(data_type, attributes)
+    if layout_identifier == self.NO_LAYOUT_IDENTIFIER:
+      return self._WriteSerializedWithoutLayout(event_object)
+
+    layout = self._layouts[layout_identifier]
+    try:
+      return self._WriteSerializedWithLayout(
+          layout_identifier, layout, event_object)
+
+    except struct.error:
+      # For example an integer that does not fit in 64-bit.
+      return self._WriteSerializedWithoutLayout(event_object)
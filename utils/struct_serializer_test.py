@@ -0,0 +1,134 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the struct-based event object serializer."""
+
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.containers import events
+from plaso.lib import errors
+
+from utils import struct_serializer
+
+
+class StructEventObjectSerializerTest(unittest.TestCase):
+  """Tests for the struct-based event object serializer."""
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/tmp/test.txt')
+
+    self._event_object = events.EventObject()
+    self._event_object.data_type = u'test:event'
+    self._event_object.hostname = u'MYHOSTNAME'
+    self._event_object.inode = 12345678
+    self._event_object.is_allocated = True
+    self._event_object.my_dict = {u'a': u'not b', u'c': 34}
+    self._event_object.my_list = [u'asf', 4234, 2, 54, u'asf']
+    self._event_object.offset = 12
+    self._event_object.pathspec = self._path_spec
+    self._event_object.text = u'Ünicode text'
+    self._event_object.timestamp = 1234124
+    self._event_object.timestamp_desc = u'Written'
+    self._event_object.username = b'joesmith'
+    self._event_object.value = 1.5
+
+  def testReadAndWriteLayoutTable(self):
+    """Tests the ReadLayoutTable and WriteLayoutTable functions."""
+    serializer = struct_serializer.StructEventObjectSerializer()
+    serialized_event_object = serializer.WriteSerialized(self._event_object)
+
+    layout_table_data = serializer.WriteLayoutTable()
+
+    serializer = struct_serializer.StructEventObjectSerializer()
+
+    with self.assertRaises(errors.SerializationError):
+      serializer.ReadSerialized(serialized_event_object)
+
+    serializer.ReadLayoutTable(layout_table_data)
+    self.assertEqual(serializer.number_of_layouts, 1)
+
+    event_object = serializer.ReadSerialized(serialized_event_object)
+    self.assertEqual(
+        event_object.EqualityString(), self._event_object.EqualityString())
+
+    with self.assertRaises(errors.SerializationError):
+      serializer.ReadLayoutTable(b'\x10\x00')
+
+  def testReadAndWriteSerialized(self):
+    """Tests the ReadSerialized and WriteSerialized functions."""
+    serializer = struct_serializer.StructEventObjectSerializer()
+
+    serialized_event_object = serializer.WriteSerialized(self._event_object)
+    event_object = serializer.ReadSerialized(serialized_event_object)
+
+    self.assertEqual(event_object.data_type, u'test:event')
+    self.assertEqual(event_object.hostname, u'MYHOSTNAME')
+    self.assertEqual(event_object.inode, 12345678)
+    self.assertTrue(event_object.is_allocated)
+    self.assertEqual(event_object.my_dict, {u'a': u'not b', u'c': 34})
+    self.assertEqual(event_object.my_list, [u'asf', 4234, 2, 54, u'asf'])
+    self.assertEqual(event_object.offset, 12)
+    self.assertEqual(
+        event_object.pathspec.comparable, self._path_spec.comparable)
+    self.assertEqual(event_object.text, u'Ünicode text')
+    self.assertEqual(event_object.timestamp, 1234124)
+    self.assertEqual(event_object.timestamp_desc, u'Written')
+    self.assertEqual(event_object.username, b'joesmith')
+    self.assertEqual(event_object.uuid, self._event_object.uuid)
+    self.assertEqual(event_object.value, 1.5)
+
+    # Attributes that were not set are initialized to None.
+    self.assertIsNone(event_object.display_name)
+    self.assertIsNone(event_object.tag)
+
+    self.assertEqual(
+        event_object.EqualityString(), self._event_object.EqualityString())
+
+    # Event objects with the same attributes share the same layout.
+    self._event_object.offset = 24
+    self._event_object.text = u'Other text'
+    other_serialized_event_object = serializer.WriteSerialized(
+        self._event_object)
+
+    self.assertEqual(serializer.number_of_layouts, 1)
+    self.assertEqual(
+        other_serialized_event_object[:2], serialized_event_object[:2])
+
+    event_object = serializer.ReadSerialized(other_serialized_event_object)
+    self.assertEqual(event_object.offset, 24)
+    self.assertEqual(event_object.text, u'Other text')
+
+  def testReadAndWriteSerializedWithFallback(self):
+    """Tests the ReadSerialized and WriteSerialized functions with fallback."""
+    serializer = struct_serializer.StructEventObjectSerializer()
+
+    # An integer that does not fit in 64-bit cannot be packed.
+    self._event_object.offset = 2 ** 64
+
+    serialized_event_object = serializer.WriteSerialized(self._event_object)
+    event_object = serializer.ReadSerialized(serialized_event_object)
+
+    self.assertEqual(event_object.data_type, u'test:event')
+    self.assertEqual(event_object.hostname, u'MYHOSTNAME')
+    self.assertEqual(event_object.offset, 2 ** 64)
+    self.assertEqual(event_object.timestamp, 1234124)
+
+  def testWriteSerializedWithFullLayoutTable(self):
+    """Tests the WriteSerialized function with a full layout table."""
+    serializer = struct_serializer.StructEventObjectSerializer()
+    serializer.MAXIMUM_NUMBER_OF_LAYOUTS = 0
+
+    serialized_event_object = serializer.WriteSerialized(self._event_object)
+    self.assertEqual(serializer.number_of_layouts, 0)
+
+    event_object = serializer.ReadSerialized(serialized_event_object)
+    self.assertEqual(
+        event_object.EqualityString(), self._event_object.EqualityString())
+
+
+if __name__ == '__main__':
+  unittest.main()